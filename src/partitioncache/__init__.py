@@ -9,15 +9,19 @@ from datetime import datetime
 
 from partitioncache.apply_cache import (
     apply_cache,
+    apply_cache_async,
     apply_cache_lazy,
+    apply_cache_lazy_async,
     extend_query_with_partition_keys,
     extend_query_with_partition_keys_lazy,
     extend_query_with_spatial_filter,
     extend_query_with_spatial_filter_lazy,
     get_partition_keys,
+    get_partition_keys_async,
     get_partition_keys_lazy,
+    get_partition_keys_lazy_async,
 )
-from partitioncache.cache_handler import get_cache_handler
+from partitioncache.cache_handler import get_async_cache_handler, get_cache_handler
 from partitioncache.cache_handler.helper import PartitionCacheHelper, create_partitioncache_helper
 
 try:
@@ -29,7 +33,14 @@ except ImportError:
     RocksDBCacheHandler = None  # type: ignore[misc, assignment]
     RocksDBBitCacheHandler = None  # type: ignore[misc, assignment]
     ROCKSDB_AVAILABLE = False
-from partitioncache.queue import get_queue_lengths, push_to_original_query_queue, push_to_query_fragment_queue
+from partitioncache.queue import (
+    flush_queue_async,
+    get_queue_lengths,
+    push_to_original_query_queue,
+    push_to_original_query_queue_async,
+    push_to_query_fragment_queue,
+    push_to_query_fragment_queue_async,
+)
 
 # Type aliases for better API clarity
 DataType = int | str | float | datetime
@@ -94,17 +105,25 @@ __all__ = [
     "create_cache_helper",
     "create_partitioncache_helper",
     "get_cache_handler",
+    "get_async_cache_handler",
     "list_cache_types",
     "get_partition_keys",
     "get_partition_keys_lazy",
+    "get_partition_keys_async",
+    "get_partition_keys_lazy_async",
     "extend_query_with_partition_keys",
     "extend_query_with_partition_keys_lazy",
     "extend_query_with_spatial_filter",
     "extend_query_with_spatial_filter_lazy",
     "apply_cache_lazy",
     "apply_cache",
+    "apply_cache_lazy_async",
+    "apply_cache_async",
     "push_to_original_query_queue",
     "push_to_query_fragment_queue",
+    "push_to_original_query_queue_async",
+    "push_to_query_fragment_queue_async",
+    "flush_queue_async",
     "get_queue_lengths",
     "PartitionCacheHelper",
     "DataType",
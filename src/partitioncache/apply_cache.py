@@ -15,6 +15,7 @@ import sqlglot
 import sqlglot.expressions as exp
 
 from partitioncache.cache_handler.abstract import AbstractCacheHandler, AbstractCacheHandler_Lazy
+from partitioncache.cache_handler.async_abstract import AsyncAbstractCacheHandler, AsyncAbstractCacheHandler_Lazy
 from partitioncache.query_processor import compute_buffer_distance, detect_star_join_from_query, generate_all_hashes
 
 logger = getLogger("PartitionCache")
@@ -640,6 +641,32 @@ def extend_query_with_spatial_filter(
     return parsed_query.sql()
 
 
+def _rewrite_with_p0_table(
+    query: str, partition_key: str, use_p0_table: bool, p0_alias: str | None, p0_table_name: str | None
+) -> tuple[str, int, str | None]:
+    """
+    Optionally rewrite the query to use a p0 table and determine the alias the cache restrictions target.
+
+    Returns:
+        tuple[str, int, str | None]: The working query, 1 if it was p0-rewritten (else 0), and the cache target alias.
+    """
+    if not use_p0_table:
+        return query, 0, p0_alias
+
+    p0_table_alias = p0_alias if p0_alias else "p0"
+    working_query = rewrite_query_with_p0_table(
+        query=query,
+        partition_key=partition_key,
+        mv_table_name=p0_table_name,
+        p0_alias=p0_table_alias,
+    )
+    if working_query == query:
+        # Regular query, use the provided p0_alias or auto-detect
+        return working_query, 0, p0_alias
+    # P0 table was added, target the p0 table for cache restrictions
+    return working_query, 1, p0_table_alias
+
+
 def apply_cache_lazy(
     query: str,
     cache_handler: AbstractCacheHandler_Lazy,
@@ -776,17 +803,7 @@ def apply_cache_lazy(
     )
 
     # Step 2: Optionally rewrite with p0 table
-    working_query = query
-    p0_rewritten = 0
-    if use_p0_table:
-        p0_table_alias = p0_alias if p0_alias else "p0"
-        working_query = rewrite_query_with_p0_table(
-            query=query,
-            partition_key=partition_key,
-            mv_table_name=p0_table_name,
-            p0_alias=p0_table_alias,
-        )
-        p0_rewritten = 1 if working_query != query else 0
+    working_query, p0_rewritten, cache_target_alias = _rewrite_with_p0_table(query, partition_key, use_p0_table, p0_alias, p0_table_name)
 
     # Create statistics
     stats = {"generated_variants": generated_variants, "cache_hits": used_hashes, "enhanced": 0, "p0_rewritten": p0_rewritten}
@@ -796,12 +813,6 @@ def apply_cache_lazy(
         return working_query, stats
 
     # Step 3: Apply partition key restrictions
-    cache_target_alias: str | None
-    if use_p0_table and p0_rewritten:
-        cache_target_alias = p0_alias if p0_alias else "p0"
-    else:
-        cache_target_alias = p0_alias
-
     enhanced_query = extend_query_with_partition_keys_lazy(
         query=working_query,
         lazy_subquery=lazy_cache_subquery,
@@ -989,17 +1000,7 @@ def apply_cache(
     )
 
     # Step 2: Optionally rewrite original query with p0 table
-    working_query = query
-    p0_rewritten = 0
-    if use_p0_table:
-        p0_table_alias = p0_alias if p0_alias else "p0"
-        working_query = rewrite_query_with_p0_table(
-            query=query,
-            partition_key=partition_key,
-            mv_table_name=p0_table_name,
-            p0_alias=p0_table_alias,
-        )
-        p0_rewritten = 1 if working_query != query else 0
+    working_query, p0_rewritten, cache_target_alias = _rewrite_with_p0_table(query, partition_key, use_p0_table, p0_alias, p0_table_name)
 
     # Create statistics dictionary
     stats = {"generated_variants": generated_variants, "cache_hits": used_hashes, "enhanced": 0, "p0_rewritten": p0_rewritten}
@@ -1010,14 +1011,158 @@ def apply_cache(
         return working_query, stats
 
     # Step 3: Apply the partition keys to the working query
-    # Determine the correct alias for cache restrictions
-    cache_target_alias: str | None
-    if use_p0_table and p0_rewritten:
-        # P0 table was added, target the p0 table for cache restrictions
-        cache_target_alias = p0_alias if p0_alias else "p0"
-    else:
-        # Regular query, use the provided p0_alias or auto-detect
-        cache_target_alias = p0_alias
+    enhanced_query = extend_query_with_partition_keys(
+        query=working_query,
+        partition_keys=partition_keys,
+        partition_key=partition_key,
+        method=method,
+        p0_alias=cache_target_alias,
+        analyze_tmp_table=analyze_tmp_table,
+        auto_detect_star_join=auto_detect_star_join,
+        star_join_table=star_join_table,
+    )
+
+    stats["enhanced"] = 1
+    logger.info(f"Successfully enhanced query with cache. Generated {generated_variants} subqueries, {used_hashes} cache hits")
+
+    return enhanced_query, stats
+
+
+async def get_partition_keys_async(
+    query: str,
+    cache_handler: AsyncAbstractCacheHandler,
+    partition_key: str,
+    min_component_size=2,
+    canonicalize_queries=False,
+    auto_detect_star_join: bool = True,
+    star_join_table: str | None = None,
+    bucket_steps: float = 1.0,
+    add_constraints: dict[str, str] | None = None,
+    remove_constraints_all: list[str] | None = None,
+    remove_constraints_add: list[str] | None = None,
+) -> tuple[set[int] | set[str] | set[float] | set[datetime] | None, int, int]:
+    """
+    Asyncio variant of get_partition_keys using an async cache handler (see get_async_cache_handler).
+    Arguments and return value are the same as for get_partition_keys.
+    """
+    cache_entry_hashes = generate_all_hashes(
+        query=query,
+        partition_key=partition_key,
+        min_component_size=min_component_size,
+        follow_graph=True,
+        fix_attributes=False,
+        canonicalize_queries=canonicalize_queries,
+        auto_detect_star_join=auto_detect_star_join,
+        star_join_table=star_join_table,
+        bucket_steps=bucket_steps,
+        add_constraints=add_constraints,
+        remove_constraints_all=remove_constraints_all,
+        remove_constraints_add=remove_constraints_add,
+    )
+
+    logger.info(f"Found {len(cache_entry_hashes)} subqueries in query")
+
+    partition_keys, count = await cache_handler.get_intersected(set(cache_entry_hashes), partition_key=partition_key)
+
+    logger.info(f"Extended query with {count} hashes")
+    return partition_keys, len(cache_entry_hashes), count
+
+
+async def get_partition_keys_lazy_async(
+    query: str,
+    cache_handler: AsyncAbstractCacheHandler_Lazy,
+    partition_key: str,
+    min_component_size=2,
+    canonicalize_queries=False,
+    follow_graph=True,
+    auto_detect_star_join: bool = True,
+    star_join_table: str | None = None,
+    bucket_steps: float = 1.0,
+    add_constraints: dict[str, str] | None = None,
+    remove_constraints_all: list[str] | None = None,
+    remove_constraints_add: list[str] | None = None,
+) -> tuple[str | None, int, int]:
+    """
+    Asyncio variant of get_partition_keys_lazy using an async cache handler (see get_async_cache_handler).
+    Arguments and return value are the same as for get_partition_keys_lazy.
+
+    Raises:
+        ValueError: If cache handler does not support lazy intersection.
+    """
+    if not isinstance(cache_handler, AsyncAbstractCacheHandler_Lazy):
+        raise ValueError("Cache handler does not support lazy intersection")
+
+    hashes = generate_all_hashes(
+        query=query,
+        partition_key=partition_key,
+        min_component_size=min_component_size,
+        fix_attributes=False,
+        canonicalize_queries=canonicalize_queries,
+        follow_graph=follow_graph,
+        auto_detect_star_join=auto_detect_star_join,
+        star_join_table=star_join_table,
+        bucket_steps=bucket_steps,
+        add_constraints=add_constraints,
+        remove_constraints_all=remove_constraints_all,
+        remove_constraints_add=remove_constraints_add,
+    )
+
+    lazy_cache_subquery, used_hashes = await cache_handler.get_intersected_lazy(set(hashes), partition_key=partition_key)
+
+    return lazy_cache_subquery, len(hashes), used_hashes
+
+
+async def apply_cache_async(
+    query: str,
+    cache_handler: AsyncAbstractCacheHandler,
+    partition_key: str,
+    method: Literal["IN", "VALUES", "TMP_TABLE_JOIN", "TMP_TABLE_IN"] = "IN",
+    p0_alias: str | None = None,
+    min_component_size: int = 2,
+    canonicalize_queries: bool = False,
+    analyze_tmp_table: bool = True,
+    use_p0_table: bool = False,
+    p0_table_name: str | None = None,
+    auto_detect_star_join: bool = True,
+    star_join_table: str | None = None,
+    bucket_steps: float = 1.0,
+    add_constraints: dict[str, str] | None = None,
+    remove_constraints_all: list[str] | None = None,
+    remove_constraints_add: list[str] | None = None,
+) -> tuple[str, dict[str, int]]:
+    """
+    Asyncio variant of apply_cache for use in async applications.
+
+    Only the cache lookup is awaited; query variant generation and rewriting run on the event loop
+    as they do not perform I/O. Spatial mode (geometry_column) is not supported, use apply_cache instead.
+    Arguments and return value are the same as for apply_cache.
+
+    Example:
+        ```python
+        cache_handler = await partitioncache.get_async_cache_handler("postgresql_array")
+        enhanced_query, stats = await partitioncache.apply_cache_async(query, cache_handler, partition_key="zipcode")
+        ```
+    """
+    partition_keys, generated_variants, used_hashes = await get_partition_keys_async(
+        query=query,
+        cache_handler=cache_handler,
+        partition_key=partition_key,
+        min_component_size=min_component_size,
+        canonicalize_queries=canonicalize_queries,
+        auto_detect_star_join=auto_detect_star_join,
+        star_join_table=star_join_table,
+        bucket_steps=bucket_steps,
+        add_constraints=add_constraints,
+        remove_constraints_all=remove_constraints_all,
+        remove_constraints_add=remove_constraints_add,
+    )
+
+    working_query, p0_rewritten, cache_target_alias = _rewrite_with_p0_table(query, partition_key, use_p0_table, p0_alias, p0_table_name)
+    stats = {"generated_variants": generated_variants, "cache_hits": used_hashes, "enhanced": 0, "p0_rewritten": p0_rewritten}
+
+    if not partition_keys:
+        logger.info(f"No cache hits found for query. Generated {generated_variants} subqueries, {used_hashes} cache hits")
+        return working_query, stats
 
     enhanced_query = extend_query_with_partition_keys(
         query=working_query,
@@ -1032,5 +1177,65 @@ def apply_cache(
 
     stats["enhanced"] = 1
     logger.info(f"Successfully enhanced query with cache. Generated {generated_variants} subqueries, {used_hashes} cache hits")
+    return enhanced_query, stats
+
 
+async def apply_cache_lazy_async(
+    query: str,
+    cache_handler: AsyncAbstractCacheHandler_Lazy,
+    partition_key: str,
+    method: Literal["IN_SUBQUERY", "TMP_TABLE_IN", "TMP_TABLE_JOIN"] = "IN_SUBQUERY",
+    p0_alias: str | None = None,
+    min_component_size: int = 2,
+    canonicalize_queries: bool = False,
+    follow_graph: bool = True,
+    analyze_tmp_table: bool = True,
+    use_p0_table: bool = False,
+    p0_table_name: str | None = None,
+    auto_detect_star_join: bool = True,
+    star_join_table: str | None = None,
+    bucket_steps: float = 1.0,
+    add_constraints: dict[str, str] | None = None,
+    remove_constraints_all: list[str] | None = None,
+    remove_constraints_add: list[str] | None = None,
+) -> tuple[str, dict[str, int]]:
+    """
+    Asyncio variant of apply_cache_lazy for use in async applications.
+
+    Spatial mode (geometry_column) is not supported, use apply_cache_lazy instead.
+    Arguments and return value are the same as for apply_cache_lazy.
+    """
+    lazy_cache_subquery, generated_variants, used_hashes = await get_partition_keys_lazy_async(
+        query=query,
+        cache_handler=cache_handler,
+        partition_key=partition_key,
+        min_component_size=min_component_size,
+        canonicalize_queries=canonicalize_queries,
+        follow_graph=follow_graph,
+        auto_detect_star_join=auto_detect_star_join,
+        star_join_table=star_join_table,
+        bucket_steps=bucket_steps,
+        add_constraints=add_constraints,
+        remove_constraints_all=remove_constraints_all,
+        remove_constraints_add=remove_constraints_add,
+    )
+
+    working_query, p0_rewritten, cache_target_alias = _rewrite_with_p0_table(query, partition_key, use_p0_table, p0_alias, p0_table_name)
+    stats = {"generated_variants": generated_variants, "cache_hits": used_hashes, "enhanced": 0, "p0_rewritten": p0_rewritten}
+
+    if not lazy_cache_subquery or not lazy_cache_subquery.strip():
+        return working_query, stats
+
+    enhanced_query = extend_query_with_partition_keys_lazy(
+        query=working_query,
+        lazy_subquery=lazy_cache_subquery,
+        partition_key=partition_key,
+        method=method,
+        p0_alias=cache_target_alias,
+        analyze_tmp_table=analyze_tmp_table,
+        auto_detect_star_join=auto_detect_star_join,
+        star_join_table=star_join_table,
+    )
+
+    stats["enhanced"] = 1
     return enhanced_query, stats
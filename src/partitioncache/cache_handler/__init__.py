@@ -1,6 +1,7 @@
 import os
 
 from partitioncache.cache_handler.abstract import AbstractCacheHandler
+from partitioncache.cache_handler.async_abstract import AsyncAbstractCacheHandler
 from partitioncache.cache_handler.environment_config import EnvironmentConfigManager
 
 
@@ -117,3 +118,43 @@ def get_cache_handler(cache_type: str, singleton: bool = False) -> AbstractCache
             return PostGISBBoxCacheHandler(**config)  # type: ignore[no-any-return]
     else:
         raise ValueError(f"Unsupported cache type: {cache_type}")
+
+
+async def get_async_cache_handler(cache_type: str) -> AsyncAbstractCacheHandler:
+    """
+    Create an asyncio cache handler for the given cache type.
+
+    PostgreSQL (array, bit, roaringbit) and Redis handlers perform lookups natively on an asyncio connection;
+    all other backends are wrapped by an adapter that runs the synchronous handler in worker threads.
+    The synchronous handler is created with the same configuration as get_cache_handler.
+
+    Args:
+        cache_type: The cache type, see get_cache_handler.
+
+    Returns:
+        AsyncAbstractCacheHandler: The async cache handler (lazy-capable if the backend supports it).
+    """
+    import asyncio
+
+    from partitioncache.cache_handler.async_threaded import wrap_async_cache_handler
+
+    if cache_type == "redis":
+        cache_type = "redis_set"
+    elif cache_type == "rocksdb":
+        cache_type = "rocksdb_set"
+
+    handler = await asyncio.to_thread(get_cache_handler, cache_type)
+
+    if cache_type in ("postgresql_array", "postgresql_bit", "postgresql_roaringbit"):
+        from partitioncache.cache_handler.async_postgresql import AsyncPostgreSQLCacheHandler
+
+        config = EnvironmentConfigManager.get_postgresql_config()
+        return await AsyncPostgreSQLCacheHandler.connect(handler, **config)  # type: ignore[arg-type]
+    elif cache_type in ("redis_set", "redis_bit", "redis_roaringbit"):
+        from partitioncache.cache_handler.async_redis import AsyncRedisCacheHandler
+
+        config = EnvironmentConfigManager.get_redis_config(cache_type.split("_", 1)[1])
+        return await AsyncRedisCacheHandler.connect(handler, **config)  # type: ignore[arg-type]
+
+    # DuckDB uses per-thread cursors and may be called concurrently
+    return wrap_async_cache_handler(handler, thread_safe=cache_type == "duckdb_bit")
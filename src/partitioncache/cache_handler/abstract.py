@@ -13,6 +13,9 @@ class AbstractCacheHandler(ABC):
     The Cache handler also store the original query together with the last seen timestamp.
     """
 
+    # Whether set_cache accepts a columnar integer array (see datatype_utils.is_integer_array) in place of a set
+    accepts_integer_arrays = False
+
     @classmethod
     @abstractmethod
     def get_supported_datatypes(cls) -> set[str]:
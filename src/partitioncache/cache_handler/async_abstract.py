@@ -0,0 +1,128 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class AsyncAbstractCacheHandler(ABC):
+    """
+    Abstract class for asyncio cache handlers.
+    Async cache handlers expose the lookup and population subset of the AbstractCacheHandler interface as coroutines,
+    so that asyncio applications can use the cache without pushing every call onto a thread.
+    Administrative operations (registering partition keys, eviction, listing queries) stay on the synchronous handlers.
+    """
+
+    @abstractmethod
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the cache handler.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self, key: str, partition_key: str = "partition_key") -> set[int] | set[str] | set[float] | set[datetime] | None:
+        """
+        Retrieve a set of partition keys from the cache associated with the given key.
+
+        Args:
+            key (str): The key to look up in the cache.
+            partition_key (str, optional): The partition key namespace. Defaults to "partition_key".
+
+        Returns:
+            set[int] | set[str] | set[float] | set[datetime] | None: The set of partition keys associated with the key, or None if not found.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_intersected(self, keys: set[str], partition_key: str = "partition_key") -> tuple[set[int] | set[str] | set[float] | set[datetime] | None, int]:
+        """
+        Get the intersection of all sets in the cache associated with the given keys.
+
+        Args:
+            keys (set[str]): A set of keys to intersect.
+            partition_key (str, optional): The partition key. Defaults to "partition_key".
+
+        Returns:
+            tuple[set[int] | set[str] | set[float] | set[datetime] | None, int]: A tuple containing the intersected set and the count of matched keys.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def exists(self, key: str, partition_key: str = "partition_key", check_query: bool = False) -> bool:
+        """
+        Check if a key exists in the cache.
+
+        Args:
+            key (str): The hash to check.
+            partition_key (str, optional): The partition key (column). Defaults to "partition_key".
+            check_query (bool, optional): See AbstractCacheHandler.exists. Defaults to False.
+
+        Returns:
+            bool: True if the hash exists (and meets criteria), False otherwise.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def filter_existing_keys(self, keys: set, partition_key: str = "partition_key", check_query: bool = False) -> set:
+        """
+        Filter and return the set of keys that exist in the cache of the given set.
+
+        Args:
+            keys (set): A set of hashes to verify.
+            partition_key (str, optional): The partition key (column). Defaults to "partition_key".
+            check_query (bool, optional): See AbstractCacheHandler.filter_existing_keys. Defaults to False.
+
+        Returns:
+            set: The subset set of hashes that exist in the cache (and meet criteria).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_entry(
+        self,
+        key: str,
+        partition_key_identifiers: set[int] | set[str] | set[float] | set[datetime],
+        query_text: str,
+        partition_key: str = "partition_key",
+        force_update: bool = False,
+    ) -> bool:
+        """
+        Store cache data and query metadata, see AbstractCacheHandler.set_entry.
+
+        Args:
+            key (str): Cache key (query hash).
+            partition_key_identifiers (set): Set of partition key identifiers to cache.
+            query_text (str): SQL query text to store.
+            partition_key (str, optional): Partition key (column) namespace. Defaults to "partition_key".
+            force_update (bool, optional): If True, always update cache data. Defaults to False.
+
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Close the cache handler and release any resources allocated by the cache handler.
+        """
+        raise NotImplementedError
+
+
+class AsyncAbstractCacheHandler_Lazy(AsyncAbstractCacheHandler):
+    """
+    Abstract class for asyncio cache handlers that support lazy intersection.
+    """
+
+    @abstractmethod
+    async def get_intersected_lazy(self, keys: set[str], partition_key: str = "partition_key") -> tuple[str | None, int]:
+        """
+        Lazily get the intersection representation of all sets in the cache associated with the given keys.
+        See AbstractCacheHandler_Lazy.get_intersected_lazy.
+
+        Args:
+            keys (set[str]): A set of keys to intersect.
+            partition_key (str, optional): The partition key. Defaults to "partition_key".
+
+        Returns:
+            tuple[str | None, int]: The SQL subquery (or None) and the number of keys used.
+        """
+        raise NotImplementedError
@@ -0,0 +1,201 @@
+from datetime import datetime
+from logging import getLogger
+
+import psycopg
+from bitarray import bitarray
+from psycopg import sql
+from pyroaring import BitMap
+
+from partitioncache.cache_handler.async_threaded import AsyncThreadedCacheHandler_Lazy
+from partitioncache.cache_handler.postgresql_abstract import PostgreSQLAbstractCacheHandler
+
+logger = getLogger("PartitionCache")
+
+
+class AsyncPostgreSQLCacheHandler(AsyncThreadedCacheHandler_Lazy):
+    """
+    Asyncio cache handler for the PostgreSQL array, bit and roaringbit cache handlers.
+
+    Lookups (get, get_intersected, exists, filter_existing_keys, get_intersected_lazy) run natively on a
+    psycopg AsyncConnection. Writes are delegated to the wrapped synchronous handler in a worker thread,
+    as partition table creation and bitsize expansion are implemented there.
+    """
+
+    SUPPORTED_HANDLERS = {"postgresql_array", "postgresql_bit", "postgresql_roaringbit"}
+
+    handler: PostgreSQLAbstractCacheHandler
+
+    def __init__(self, handler: PostgreSQLAbstractCacheHandler, conn: psycopg.AsyncConnection) -> None:
+        """
+        Args:
+            handler: The synchronous PostgreSQL cache handler (used for writes and SQL generation).
+            conn: An autocommit AsyncConnection to the same database.
+        """
+        if repr(handler) not in self.SUPPORTED_HANDLERS:
+            raise ValueError(f"Unsupported handler for AsyncPostgreSQLCacheHandler: {handler!r}")
+        super().__init__(handler)
+        self.conn = conn
+        self.tableprefix = handler.tableprefix
+        self._cached_datatype: dict[str, str] = {}
+
+    @classmethod
+    async def connect(
+        cls,
+        handler: PostgreSQLAbstractCacheHandler,
+        db_name: str,
+        db_host: str,
+        db_user: str,
+        db_password: str,
+        db_port: str | int,
+        timeout: str = "0",
+        **kwargs,
+    ) -> "AsyncPostgreSQLCacheHandler":
+        """
+        Open an AsyncConnection with the given connection parameters and wrap the handler.
+
+        Args:
+            handler: The synchronous PostgreSQL cache handler.
+            db_name, db_host, db_user, db_password, db_port: Connection parameters of the cache database.
+            timeout: Statement timeout in seconds (default: "0" for no timeout).
+            **kwargs: Ignored, allows passing the full handler configuration.
+
+        Returns:
+            AsyncPostgreSQLCacheHandler: The connected async handler.
+        """
+        conn = await psycopg.AsyncConnection.connect(
+            dbname=db_name,
+            host=db_host,
+            password=db_password,
+            port=db_port,
+            user=db_user,
+            autocommit=True,
+            options=f"-c statement_timeout={int(timeout) * 1000}",
+        )
+        return cls(handler, conn)
+
+    def _table(self, partition_key: str) -> sql.Identifier:
+        return sql.Identifier(f"{self.tableprefix}_cache_{partition_key}")
+
+    def _log_error(self, message: str, e: Exception) -> None:
+        # Missing tables mean nothing has been cached yet for this partition key
+        if "does not exist" in str(e).lower() or "relation" in str(e).lower():
+            return
+        logger.error(f"{message}: {e}")
+
+    async def _get_partition_datatype(self, partition_key: str) -> str | None:
+        """Get the datatype for a partition key from metadata."""
+        if partition_key in self._cached_datatype:
+            return self._cached_datatype[partition_key]
+
+        try:
+            cur = await self.conn.execute(
+                sql.SQL("SELECT datatype FROM {0} WHERE partition_key = %s").format(sql.Identifier(self.tableprefix + "_partition_metadata")), (partition_key,)
+            )
+            result = await cur.fetchone()
+        except Exception as e:
+            self._log_error(f"Failed to get datatype for partition {partition_key}", e)
+            return None
+        if result:
+            self._cached_datatype[partition_key] = result[0]
+        return result[0] if result else None
+
+    def _decode(self, value) -> set[int] | set[str] | set[float] | set[datetime] | BitMap:
+        """Convert a partition_keys value as returned by PostgreSQL into the format of the synchronous handler."""
+        handler_type = repr(self.handler)
+        if handler_type == "postgresql_bit":
+            return set(bitarray(value).search(bitarray("1")))
+        if handler_type == "postgresql_roaringbit":
+            return BitMap.deserialize(value)
+        return set(value)
+
+    async def get(self, key: str, partition_key: str = "partition_key") -> set[int] | set[str] | set[float] | set[datetime] | None:
+        """Get value from partition-specific cache table."""
+        if await self._get_partition_datatype(partition_key) is None:
+            return None
+
+        column = sql.SQL("partition_keys::bytea" if repr(self.handler) == "postgresql_roaringbit" else "partition_keys")
+        try:
+            cur = await self.conn.execute(sql.SQL("SELECT {0} FROM {1} WHERE query_hash = %s").format(column, self._table(partition_key)), (key,))
+            result = await cur.fetchone()
+        except Exception as e:
+            self._log_error(f"Failed to get value for key {key} in partition {partition_key}", e)
+            return None
+        if result is None or result[0] is None:
+            return None
+        return self._decode(result[0])  # type: ignore[return-value]
+
+    async def get_intersected(self, keys: set[str], partition_key: str = "partition_key") -> tuple[set[int] | set[str] | set[float] | set[datetime] | None, int]:
+        """Get intersection from partition-specific table."""
+        datatype = await self._get_partition_datatype(partition_key)
+        if datatype is None:
+            return None, 0
+
+        filtered_keys = await self.filter_existing_keys(keys, partition_key)
+        if not filtered_keys:
+            return None, 0
+
+        try:
+            if repr(self.handler) == "postgresql_array":
+                cur = await self.conn.execute(self.handler.get_intersected_sql(filtered_keys, partition_key, datatype))  # type: ignore[attr-defined]
+            else:
+                cur = await self.conn.execute(self.handler.get_intersected_sql(partition_key), (list(filtered_keys),))  # type: ignore[attr-defined]
+            result = await cur.fetchone()
+        except Exception as e:
+            self._log_error(f"Failed to get intersected values for keys {keys} in partition {partition_key}", e)
+            return None, 0
+        if result is None or result[0] is None:
+            return None, 0
+        return self._decode(result[0]), len(filtered_keys)  # type: ignore[return-value]
+
+    async def get_intersected_lazy(self, keys: set[str], partition_key: str = "partition_key") -> tuple[str | None, int]:
+        """Get lazy intersection for partition-specific table."""
+        datatype = await self._get_partition_datatype(partition_key)
+        if datatype is None:
+            return None, 0
+
+        filtered_keys = await self.filter_existing_keys(keys, partition_key)
+        if not filtered_keys:
+            return None, 0
+        return self.handler.get_intersected_lazy_sql(filtered_keys, partition_key, datatype), len(filtered_keys)  # type: ignore[attr-defined]
+
+    async def exists(self, key: str, partition_key: str = "partition_key", check_query: bool = False) -> bool:
+        """Check if hash exists in partition-specific cache and optionally validate query status."""
+        if await self._get_partition_datatype(partition_key) is None:
+            return False
+
+        try:
+            if not check_query:
+                cur = await self.conn.execute(sql.SQL("SELECT 1 FROM {0} WHERE query_hash = %s").format(self._table(partition_key)), (key,))
+            else:
+                cur = await self.conn.execute(self.handler._check_query_sql(partition_key), (partition_key, [key]))
+            return await cur.fetchone() is not None
+        except Exception as e:
+            self._log_error(f"Failed to check existence for hash {key} in partition {partition_key}", e)
+            return False
+
+    async def filter_existing_keys(self, keys: set, partition_key: str = "partition_key", check_query: bool = False) -> set:
+        """Return the set of keys that exist in the partition-specific cache."""
+        if await self._get_partition_datatype(partition_key) is None:
+            return set()
+
+        try:
+            if not check_query:
+                cur = await self.conn.execute(
+                    sql.SQL("SELECT query_hash FROM {0} WHERE query_hash = ANY(%s) AND partition_keys IS NOT NULL").format(self._table(partition_key)),
+                    (list(keys),),
+                )
+            else:
+                cur = await self.conn.execute(self.handler._check_query_sql(partition_key), (partition_key, list(keys)))
+            keys_set = {x[0] for x in await cur.fetchall()}
+        except Exception as e:
+            self._log_error(f"Failed to filter existing keys in partition {partition_key}", e)
+            return set()
+        logger.info(f"Found {len(keys_set)} existing hashkeys for partition {partition_key}")
+        return keys_set
+
+    async def close(self) -> None:
+        try:
+            await self.conn.close()
+        except Exception as e:
+            logger.error(f"Error closing async PostgreSQL connection: {e}")
+        await super().close()
@@ -0,0 +1,218 @@
+import uuid
+from datetime import datetime
+from logging import getLogger
+
+import redis.asyncio as aioredis
+from bitarray import bitarray
+from pyroaring import BitMap
+
+from partitioncache.cache_handler.async_threaded import AsyncThreadedCacheHandler
+from partitioncache.cache_handler.redis_abstract import RedisAbstractCacheHandler
+
+logger = getLogger("PartitionCache")
+
+
+class AsyncRedisCacheHandler(AsyncThreadedCacheHandler):
+    """
+    Asyncio cache handler for the Redis set, bit and roaringbit cache handlers.
+
+    Lookups run natively on a redis.asyncio client and use pipelines so that each call needs
+    at most a few round trips independent of the number of keys. Writes are delegated to the
+    wrapped synchronous handler in a worker thread.
+    """
+
+    SUPPORTED_HANDLERS = {"redis_set", "redis_bit", "redis_roaringbit"}
+
+    handler: RedisAbstractCacheHandler
+
+    def __init__(self, handler: RedisAbstractCacheHandler, db: aioredis.Redis) -> None:
+        """
+        Args:
+            handler: The synchronous Redis cache handler (used for writes).
+            db: An asyncio Redis client for the same database.
+        """
+        if repr(handler) not in self.SUPPORTED_HANDLERS:
+            raise ValueError(f"Unsupported handler for AsyncRedisCacheHandler: {handler!r}")
+        super().__init__(handler)
+        self.db = db
+        self._cached_datatype: dict[str, str] = {}
+
+    @classmethod
+    async def connect(cls, handler: RedisAbstractCacheHandler, db_name, db_host, db_password, db_port, **kwargs) -> "AsyncRedisCacheHandler":
+        """
+        Create an asyncio Redis client with the given connection parameters and wrap the handler.
+
+        Args:
+            handler: The synchronous Redis cache handler.
+            db_name, db_host, db_password, db_port: Connection parameters of the cache database.
+            **kwargs: Ignored, allows passing the full handler configuration.
+
+        Returns:
+            AsyncRedisCacheHandler: The async handler.
+        """
+        db = aioredis.Redis(host=db_host, port=db_port, db=db_name, password=db_password, socket_connect_timeout=5, socket_timeout=5)
+        await db.ping()
+        return cls(handler, db)
+
+    def _get_cache_key(self, key: str, partition_key: str) -> str:
+        return f"cache:{partition_key}:{key}"
+
+    async def _get_partition_datatype(self, partition_key: str) -> str | None:
+        """Get the datatype for a partition key from metadata."""
+        if partition_key in self._cached_datatype:
+            return self._cached_datatype[partition_key]
+
+        metadata_key = f"_partition_metadata:{partition_key}"
+        key_type = await self.db.type(metadata_key)
+        if key_type == b"string":
+            datatype = await self.db.get(metadata_key)
+        elif key_type == b"hash":
+            datatype = await self.db.hget(metadata_key, "datatype")
+        else:
+            return None
+        if datatype is None or not isinstance(datatype, bytes):
+            return None
+        self._cached_datatype[partition_key] = datatype.decode()
+        return datatype.decode()
+
+    def _decode_set(self, members, datatype: str) -> set[int] | set[str]:
+        if datatype == "integer":
+            return {int(member) for member in members}
+        elif datatype == "text":
+            return {member.decode() for member in members}
+        raise ValueError(f"Unsupported datatype: {datatype}")
+
+    def _decode_value(self, value: bytes) -> set[int] | BitMap:
+        if repr(self.handler) == "redis_roaringbit":
+            return BitMap.deserialize(value)
+        return set(bitarray(value.decode()).search(bitarray("1")))
+
+    async def get(self, key: str, partition_key: str = "partition_key") -> set[int] | set[str] | set[float] | set[datetime] | None:
+        """Get value from partition-specific cache namespace."""
+        datatype = await self._get_partition_datatype(partition_key)
+        if datatype is None:
+            return None
+
+        cache_key = self._get_cache_key(key, partition_key)
+        key_type = await self.db.type(cache_key)
+        if key_type == b"none":
+            return None
+        if key_type == b"set":
+            return self._decode_set(await self.db.smembers(cache_key), datatype)  # type: ignore[misc]
+
+        value = await self.db.get(cache_key)
+        if value is None or value == b"\x00":  # Null byte marker
+            return None
+        if repr(self.handler) == "redis_set":
+            raise ValueError(f"The key '{cache_key}' contains a string, not a set")
+        return self._decode_value(value)  # type: ignore[return-value, arg-type]
+
+    async def _valid_cache_keys(self, keys: set[str], partition_key: str) -> list[str]:
+        """Return the cache keys holding a (non-null) value, using one pipeline for types and one for null markers."""
+        cache_keys = [self._get_cache_key(key, partition_key) for key in keys]
+        async with self.db.pipeline(transaction=False) as pipe:
+            for cache_key in cache_keys:
+                pipe.type(cache_key)
+            key_types = await pipe.execute()
+
+        if repr(self.handler) == "redis_set":
+            return [cache_key for cache_key, key_type in zip(cache_keys, key_types, strict=False) if key_type == b"set"]
+
+        string_cache_keys = [cache_key for cache_key, key_type in zip(cache_keys, key_types, strict=False) if key_type == b"string"]
+        if not string_cache_keys:
+            return []
+        async with self.db.pipeline(transaction=False) as pipe:
+            for cache_key in string_cache_keys:
+                pipe.getrange(cache_key, 0, 0)
+            first_bytes = await pipe.execute()
+        return [cache_key for cache_key, first_byte in zip(string_cache_keys, first_bytes, strict=False) if first_byte != b"\x00"]
+
+    async def get_intersected(self, keys: set[str], partition_key: str = "partition_key") -> tuple[set[int] | set[str] | set[float] | set[datetime] | None, int]:
+        """
+        Returns the intersection of all sets in the cache that are associated with the given keys.
+        """
+        datatype = await self._get_partition_datatype(partition_key)
+        if datatype is None:
+            return None, 0
+
+        valid_cache_keys = await self._valid_cache_keys(keys, partition_key)
+        if not valid_cache_keys:
+            return None, 0
+
+        handler_type = repr(self.handler)
+        if handler_type == "redis_set":
+            intersected = await self.db.sinter(valid_cache_keys)  # type: ignore[misc]
+            return self._decode_set(intersected, datatype), len(valid_cache_keys)
+
+        if handler_type == "redis_roaringbit":
+            result: BitMap | None = None
+            for value in await self.db.mget(valid_cache_keys):
+                if value is None or value == b"\x00":
+                    continue
+                bm = BitMap.deserialize(value)  # type: ignore[arg-type]
+                result = bm if result is None else result & bm
+            return result, len(valid_cache_keys)  # type: ignore[return-value, arg-type]
+
+        if len(valid_cache_keys) == 1:
+            value = await self.db.get(valid_cache_keys[0])
+        else:
+            # AND into a temporary key, read and drop it in a single round trip
+            temp_key = f"temp_{uuid.uuid4()}"
+            async with self.db.pipeline(transaction=True) as pipe:
+                pipe.bitop("AND", temp_key, *valid_cache_keys)
+                pipe.get(temp_key)
+                pipe.delete(temp_key)
+                _, value, _ = await pipe.execute()
+        if value is None:
+            return None, 0
+        return self._decode_value(value), len(valid_cache_keys)  # type: ignore[return-value, arg-type]
+
+    async def exists(self, key: str, partition_key: str = "partition_key", check_query: bool = False) -> bool:
+        """
+        Returns True if the key exists in the partition-specific cache, otherwise False.
+        """
+        return key in await self.filter_existing_keys({key}, partition_key, check_query)
+
+    async def filter_existing_keys(self, keys: set, partition_key: str = "partition_key", check_query: bool = False) -> set:
+        """
+        Filter and return the set of keys that exist in the cache.
+        With check_query, the query status (termination bits and query metadata) of all keys is fetched in one pipeline.
+        """
+        if await self._get_partition_datatype(partition_key) is None:
+            return set()
+
+        key_list = list(keys)
+        if not check_query:
+            async with self.db.pipeline(transaction=False) as pipe:
+                for key in key_list:
+                    pipe.exists(self._get_cache_key(key, partition_key))
+                existence_results = await pipe.execute()
+            return {key for key, exists_result in zip(key_list, existence_results, strict=False) if exists_result}
+
+        async with self.db.pipeline(transaction=False) as pipe:
+            for key in key_list:
+                pipe.exists(self._get_cache_key(f"_LIMIT_{key}", partition_key))
+                pipe.exists(self._get_cache_key(f"_TIMEOUT_{key}", partition_key))
+                pipe.exists(f"query:{partition_key}:{key}")
+                pipe.hget(f"query:{partition_key}:{key}", "status")
+                pipe.exists(self._get_cache_key(key, partition_key))
+            results = await pipe.execute()
+
+        existing_keys = set()
+        for i, key in enumerate(key_list):
+            has_limit, has_timeout, has_query, status, has_cache = results[5 * i : 5 * i + 5]
+            if has_limit or has_timeout:
+                existing_keys.add(key)  # Query has error status -> include key
+            elif has_query and status and status.decode() != "ok":
+                existing_keys.add(key)
+            elif has_cache:
+                # Query OK (or no query but cache entry) -> cache entry exists
+                existing_keys.add(key)
+        return existing_keys
+
+    async def close(self) -> None:
+        try:
+            await self.db.aclose()
+        except Exception as e:
+            logger.error(f"Error closing async Redis connection: {e}")
+        await super().close()
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from datetime import datetime
+from logging import getLogger
+from typing import Any
+
+from partitioncache.cache_handler.abstract import AbstractCacheHandler, AbstractCacheHandler_Lazy
+from partitioncache.cache_handler.async_abstract import AsyncAbstractCacheHandler, AsyncAbstractCacheHandler_Lazy
+
+logger = getLogger("PartitionCache")
+
+
+class AsyncThreadedCacheHandler(AsyncAbstractCacheHandler):
+    """
+    Async adapter that runs a synchronous cache handler in worker threads.
+
+    Used for backends without an asyncio client (RocksDB, RocksDict, DuckDB, PostGIS) and
+    by the native async handlers for the operations they delegate to their synchronous counterpart.
+    Calls are serialized unless the wrapped handler is thread-safe, since most handlers share
+    a single connection or cursor.
+    """
+
+    def __init__(self, handler: AbstractCacheHandler, thread_safe: bool = False) -> None:
+        """
+        Args:
+            handler: The synchronous cache handler to wrap.
+            thread_safe: Whether the handler may be called from several threads at once.
+        """
+        self.handler = handler
+        self._lock: threading.Lock | None = None if thread_safe else threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"async_{self.handler!r}"
+
+    def _call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        if self._lock is None:
+            return func(*args, **kwargs)
+        with self._lock:
+            return func(*args, **kwargs)
+
+    async def _run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking handler method in a worker thread."""
+        return await asyncio.to_thread(self._call, func, *args, **kwargs)
+
+    async def get(self, key: str, partition_key: str = "partition_key") -> set[int] | set[str] | set[float] | set[datetime] | None:
+        return await self._run(self.handler.get, key, partition_key)  # type: ignore[no-any-return]
+
+    async def get_intersected(self, keys: set[str], partition_key: str = "partition_key") -> tuple[set[int] | set[str] | set[float] | set[datetime] | None, int]:
+        return await self._run(self.handler.get_intersected, keys, partition_key)  # type: ignore[no-any-return]
+
+    async def exists(self, key: str, partition_key: str = "partition_key", check_query: bool = False) -> bool:
+        return await self._run(self.handler.exists, key, partition_key, check_query)  # type: ignore[no-any-return]
+
+    async def filter_existing_keys(self, keys: set, partition_key: str = "partition_key", check_query: bool = False) -> set:
+        return await self._run(self.handler.filter_existing_keys, keys, partition_key, check_query)  # type: ignore[no-any-return]
+
+    async def set_entry(
+        self,
+        key: str,
+        partition_key_identifiers: set[int] | set[str] | set[float] | set[datetime],
+        query_text: str,
+        partition_key: str = "partition_key",
+        force_update: bool = False,
+    ) -> bool:
+        return await self._run(self.handler.set_entry, key, partition_key_identifiers, query_text, partition_key, force_update)  # type: ignore[no-any-return]
+
+    async def close(self) -> None:
+        await self._run(self.handler.close)
+
+
+class AsyncThreadedCacheHandler_Lazy(AsyncThreadedCacheHandler, AsyncAbstractCacheHandler_Lazy):
+    """
+    Async adapter for synchronous cache handlers that support lazy intersection.
+    """
+
+    handler: AbstractCacheHandler_Lazy
+
+    def __init__(self, handler: AbstractCacheHandler_Lazy, thread_safe: bool = False) -> None:
+        super().__init__(handler, thread_safe)
+
+    async def get_intersected_lazy(self, keys: set[str], partition_key: str = "partition_key") -> tuple[str | None, int]:
+        return await self._run(self.handler.get_intersected_lazy, keys, partition_key)  # type: ignore[no-any-return]
+
+
+def wrap_async_cache_handler(handler: AbstractCacheHandler, thread_safe: bool = False) -> AsyncThreadedCacheHandler:
+    """
+    Wrap a synchronous cache handler into an async adapter, keeping lazy intersection support if available.
+
+    Args:
+        handler: The synchronous cache handler to wrap.
+        thread_safe: Whether the handler may be called from several threads at once.
+
+    Returns:
+        AsyncThreadedCacheHandler: The async adapter (AsyncThreadedCacheHandler_Lazy for lazy handlers).
+    """
+    if isinstance(handler, AbstractCacheHandler_Lazy):
+        return AsyncThreadedCacheHandler_Lazy(handler, thread_safe)
+    return AsyncThreadedCacheHandler(handler, thread_safe)
@@ -3,7 +3,9 @@ Utility functions for datatype conversions.
 These are helper functions for converting between Python types and datatype strings.
 """
 
+from array import array
 from datetime import datetime
+from typing import Any
 
 # Python type to datatype string mapping
 PYTHON_TYPE_TO_DATATYPE: dict[type, str] = {
@@ -58,3 +60,51 @@ def get_python_type_from_datatype(datatype: str) -> type:
         raise ValueError(f"Unsupported datatype: {datatype}")
 
     return DATATYPE_TO_PYTHON_TYPE[datatype]
+
+
+def is_integer_array(values: Any) -> bool:
+    """
+    Check whether partition key identifiers are given as a columnar integer array.
+
+    Columnar arrays are array.array instances with an integer typecode and one-dimensional NumPy
+    arrays with an integer dtype. NumPy itself is not required.
+
+    Args:
+        values: The partition key identifiers
+
+    Returns:
+        bool: True if the values are an integer array
+    """
+    if isinstance(values, array):
+        return values.typecode in "bBhHiIlLqQ"
+    dtype = getattr(values, "dtype", None)
+    return dtype is not None and getattr(dtype, "kind", None) in ("i", "u") and getattr(values, "ndim", 0) == 1
+
+
+def to_uint32_array(values: Any) -> array:
+    """
+    Convert an integer array to an unsigned 32 bit array.array, the input pyroaring and bitarray index without
+    creating a Python object per value. NumPy arrays are converted through their buffer.
+
+    Args:
+        values: An integer array as accepted by is_integer_array
+
+    Returns:
+        array: The values as array.array with typecode "I"
+
+    Raises:
+        ValueError: If a value is negative or does not fit into 32 bits
+    """
+    if len(values) == 0:
+        return array("I")
+    if isinstance(values, array):
+        low, high = min(values), max(values)
+    else:
+        low, high = int(values.min()), int(values.max())
+    if low < 0:
+        raise ValueError("Partition key identifiers must not be negative")
+    if high > 0xFFFFFFFF:
+        raise ValueError("Partition key identifiers must fit into 32 bits")
+    if isinstance(values, array):
+        return values if values.typecode == "I" else array("I", values)
+    return array("I", values.astype(f"u{array('I').itemsize}").tobytes())
@@ -13,12 +13,15 @@ Features:
 - High-performance analytical queries
 """
 
+import inspect
 import re
 import threading
+import weakref
 from datetime import datetime
 from logging import getLogger
 
 import duckdb
+from bitarray import bitarray
 
 from partitioncache.cache_handler.abstract import AbstractCacheHandler_Lazy
 
@@ -57,31 +60,43 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
     - DuckDB BIT_AND aggregate for high-performance intersections
     - Native bitwise operators (&, |, ^, ~) for set operations
     - Lazy cache SQL generation for cross-database queries
-    - Thread-safe operations with connection per instance
+    - Thread-safe operations: reads use a per-thread cursor and run in parallel,
+      writes are serialized through the instance's main connection
+    - Optional read-only mode so multiple processes can share one cache file
 
     Implementation:
     Uses DuckDB's native BITSTRING data type and bitwise functions for optimal
     performance in analytical workloads.
     """
 
-    _instance = None
+    _instance: "DuckDBBitCacheHandler | None" = None
+    # Arguments the shared instance was created with (see get_instance)
+    _instance_config: dict = {}
     _refcount = 0
     _lock = threading.Lock()
 
     @classmethod
     def get_instance(cls, *args, **kwargs):
-        """Get singleton instance with thread safety."""
-        with cls._lock:
-            # Skip singleton for multi-threaded environments
-            if threading.active_count() > 1:
-                return cls(*args, **kwargs)
+        """
+        Get singleton instance with thread safety. The instance can be shared across threads.
 
+        Raises:
+            ValueError: If the shared instance was created with a different configuration.
+        """
+        bound = inspect.signature(cls).bind(*args, **kwargs)
+        bound.apply_defaults()
+        config = dict(bound.arguments)
+        with cls._lock:
             if cls._instance is None:
                 cls._instance = cls(*args, **kwargs)
+                cls._instance_config = config
+            elif cls._instance_config != config:
+                changed = sorted(name for name in config if config[name] != cls._instance_config.get(name))
+                raise ValueError(f"{cls.__name__} shared instance already exists with a different configuration ({', '.join(changed)})")
             cls._refcount += 1
             return cls._instance
 
-    def __init__(self, database: str = ":memory:", table_prefix: str = "partitioncache", bitsize: int = 100000) -> None:
+    def __init__(self, database: str = ":memory:", table_prefix: str = "partitioncache", bitsize: int = 100000, read_only: bool = False) -> None:
         """
         Initialize DuckDB bit cache handler.
 
@@ -89,29 +104,60 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
             database: Path to DuckDB database file or ":memory:" for in-memory
             table_prefix: Prefix for cache tables
             bitsize: Default bitsize for bit arrays
+            read_only: Open the database file in read-only mode, allowing multiple processes
+                to read the same cache file. All write operations will fail.
         """
         # Validate table prefix to prevent SQL injection
         validate_identifier(table_prefix, "table prefix")
 
+        if read_only and database == ":memory:":
+            raise ValueError("Read-only mode requires a DuckDB database file")
+
         self.database = database
         self.table_prefix = table_prefix
         self.default_bitsize = bitsize
+        self.read_only = read_only
         self._cached_datatypes = {}
 
+        # Writes go through the main connection and are serialized by this lock,
+        # reads go through a cursor per thread (see _cursor)
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._cursors: weakref.WeakSet = weakref.WeakSet()
+
         # Create connection
-        self.conn = duckdb.connect(database)
+        self.conn = duckdb.connect(database, read_only=read_only)
 
         # Enable memory optimization for large bit arrays
         self.conn.execute("SET memory_limit = '2GB'")
         self.conn.execute("SET threads = 4")
 
-        # Initialize tables
-        self._create_metadata_tables()
+        # Initialize tables (a read-only cache file must already contain them)
+        if not read_only:
+            self._create_metadata_tables()
 
     def __repr__(self) -> str:
         """Return string representation."""
         return "duckdb_bit"
 
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        """
+        Get the cursor used by the calling thread for read operations.
+
+        A DuckDB connection must not be used by several threads at once. Each thread
+        therefore reads through its own cursor, a duplicate connection to the same database,
+        so concurrent reads do not block each other or the writer.
+
+        Returns:
+            DuckDB cursor bound to the calling thread
+        """
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self.conn.cursor()
+            self._local.cursor = cursor
+            self._cursors.add(cursor)
+        return cursor
+
     def _get_safe_table_name(self, partition_key: str) -> str:
         """
         Get safe table name for partition after validation.
@@ -135,34 +181,35 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
 
     def _create_metadata_tables(self) -> None:
         """Create metadata and queries tables."""
-        try:
-            # Create partition metadata table
-            self.conn.execute(f"""
-                CREATE TABLE IF NOT EXISTS {self.table_prefix}_partition_metadata (
-                    partition_key TEXT PRIMARY KEY,
-                    datatype TEXT NOT NULL CHECK (datatype = 'integer'),
-                    bitsize INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT now()
-                )
-            """)
-
-            # Create queries table for metadata
-            self.conn.execute(f"""
-                CREATE TABLE IF NOT EXISTS {self.table_prefix}_queries (
-                    query_hash TEXT NOT NULL,
-                    query TEXT NOT NULL,
-                    partition_key TEXT NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'ok' CHECK (status IN ('ok', 'timeout', 'failed')),
-                    last_seen TIMESTAMP DEFAULT now(),
-                    PRIMARY KEY (query_hash, partition_key)
-                )
-            """)
+        with self._write_lock:
+            try:
+                # Create partition metadata table
+                self.conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {self.table_prefix}_partition_metadata (
+                        partition_key TEXT PRIMARY KEY,
+                        datatype TEXT NOT NULL CHECK (datatype = 'integer'),
+                        bitsize INTEGER NOT NULL,
+                        created_at TIMESTAMP DEFAULT now()
+                    )
+                """)
+
+                # Create queries table for metadata
+                self.conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {self.table_prefix}_queries (
+                        query_hash TEXT NOT NULL,
+                        query TEXT NOT NULL,
+                        partition_key TEXT NOT NULL,
+                        status TEXT NOT NULL DEFAULT 'ok' CHECK (status IN ('ok', 'timeout', 'failed')),
+                        last_seen TIMESTAMP DEFAULT now(),
+                        PRIMARY KEY (query_hash, partition_key)
+                    )
+                """)
 
-            logger.debug("Created metadata tables for DuckDB bit cache handler")
+                logger.debug("Created metadata tables for DuckDB bit cache handler")
 
-        except Exception as e:
-            logger.error(f"Failed to create metadata tables: {e}")
-            raise
+            except Exception as e:
+                logger.error(f"Failed to create metadata tables: {e}")
+                raise
 
     def _ensure_partition_table(self, partition_key: str, bitsize: int) -> bool:
         """
@@ -175,54 +222,55 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
         Returns:
             bool: True if successful
         """
-        try:
-            # Get safe table name (includes validation)
-            table_name = self._get_safe_table_name(partition_key)
-
-            # Create cache table with native DuckDB BITSTRING
-            self.conn.execute(f"""
-                CREATE TABLE IF NOT EXISTS {table_name} (
-                    query_hash TEXT PRIMARY KEY,
-                    partition_keys BITSTRING,  -- Native DuckDB BITSTRING type
-                    partition_keys_count INTEGER,
-                    created_at TIMESTAMP DEFAULT now()
-                )
-            """)
-
-            # Insert metadata - use INSERT OR REPLACE for DuckDB compatibility
+        with self._write_lock:
             try:
-                self.conn.execute(
-                    f"""
-                    INSERT INTO {self.table_prefix}_partition_metadata
-                    (partition_key, datatype, bitsize)
-                    VALUES (?, 'integer', ?)
-                """,
-                    (partition_key, bitsize),
-                )
-            except duckdb.ConstraintException:
-                # Update existing entry if insert fails due to primary key constraint
-                self.conn.execute(
-                    f"""
-                    UPDATE {self.table_prefix}_partition_metadata
-                    SET bitsize = ?
-                    WHERE partition_key = ?
-                """,
-                    (bitsize, partition_key),
-                )
+                # Get safe table name (includes validation)
+                table_name = self._get_safe_table_name(partition_key)
 
-            return True
+                # Create cache table with native DuckDB BITSTRING
+                self.conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table_name} (
+                        query_hash TEXT PRIMARY KEY,
+                        partition_keys BITSTRING,  -- Native DuckDB BITSTRING type
+                        partition_keys_count INTEGER,
+                        created_at TIMESTAMP DEFAULT now()
+                    )
+                """)
+
+                # Insert metadata - use INSERT OR REPLACE for DuckDB compatibility
+                try:
+                    self.conn.execute(
+                        f"""
+                        INSERT INTO {self.table_prefix}_partition_metadata
+                        (partition_key, datatype, bitsize)
+                        VALUES (?, 'integer', ?)
+                    """,
+                        (partition_key, bitsize),
+                    )
+                except duckdb.ConstraintException:
+                    # Update existing entry if insert fails due to primary key constraint
+                    self.conn.execute(
+                        f"""
+                        UPDATE {self.table_prefix}_partition_metadata
+                        SET bitsize = ?
+                        WHERE partition_key = ?
+                    """,
+                        (bitsize, partition_key),
+                    )
 
-        except Exception as e:
-            # Don't treat "table already exists" as an error
-            if "already exists" in str(e).lower():
                 return True
-            logger.error(f"Failed to create partition table for {partition_key}: {e}")
-            return False
+
+            except Exception as e:
+                # Don't treat "table already exists" as an error
+                if "already exists" in str(e).lower():
+                    return True
+                logger.error(f"Failed to create partition table for {partition_key}: {e}")
+                return False
 
     def _get_partition_bitsize(self, partition_key: str) -> int | None:
         """Get bitsize for a partition from metadata."""
         try:
-            result = self.conn.execute(
+            result = self._cursor().execute(
                 f"""
                 SELECT bitsize FROM {self.table_prefix}_partition_metadata
                 WHERE partition_key = ?
@@ -240,7 +288,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
             return self._cached_datatypes[partition_key]
 
         try:
-            result = self.conn.execute(f"""
+            result = self._cursor().execute(f"""
                 SELECT datatype FROM {self.table_prefix}_partition_metadata
                 WHERE partition_key = ?
             """, (partition_key,)).fetchone()
@@ -340,6 +388,19 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
 
         return bitstring_expr
 
+    @staticmethod
+    def _decode_bitstring(bits: str) -> set[int]:
+        """
+        Decode a DuckDB BITSTRING value into the set of positions that are set.
+
+        Args:
+            bits: Bitstring as returned by DuckDB (e.g. "0101")
+
+        Returns:
+            Set of integer positions with the bit set to 1
+        """
+        return set(bitarray(bits).search(bitarray("1")))
+
     def _store_cache_entry(self, table_name: str, key: str, bitstring_expr: str, bitsize: int, count: int) -> None:
         """
         Store or update cache entry in the table.
@@ -351,24 +412,25 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
             bitsize: Size of the bitstring
             count: Number of partition keys
         """
-        try:
-            self.conn.execute(
-                f"""
-                INSERT INTO {table_name} (query_hash, partition_keys, partition_keys_count)
-                VALUES (?, {bitstring_expr}, ?)
-            """,
-                (key, bitsize, count),
-            )
-        except duckdb.ConstraintException:
-            # If insert fails due to primary key constraint, do update
-            self.conn.execute(
-                f"""
-                UPDATE {table_name}
-                SET partition_keys = {bitstring_expr}, partition_keys_count = ?
-                WHERE query_hash = ?
-            """,
-                (bitsize, count, key),
-            )
+        with self._write_lock:
+            try:
+                self.conn.execute(
+                    f"""
+                    INSERT INTO {table_name} (query_hash, partition_keys, partition_keys_count)
+                    VALUES (?, {bitstring_expr}, ?)
+                """,
+                    (key, bitsize, count),
+                )
+            except duckdb.ConstraintException:
+                # If insert fails due to primary key constraint, do update
+                self.conn.execute(
+                    f"""
+                    UPDATE {table_name}
+                    SET partition_keys = {bitstring_expr}, partition_keys_count = ?
+                    WHERE query_hash = ?
+                """,
+                    (bitsize, count, key),
+                )
 
     def set_cache(self, key: str, partition_key_identifiers: set[int] | set[str] | set[float] | set[datetime], partition_key: str = "partition_key") -> bool:
         """
@@ -387,49 +449,50 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
         if not partition_key_identifiers:
             return True
 
-        try:
-            # Convert all values to integers
-            int_keys = self._convert_to_integers(partition_key_identifiers)
-            if int_keys is None:
-                return False
+        with self._write_lock:
+            try:
+                # Convert all values to integers
+                int_keys = self._convert_to_integers(partition_key_identifiers)
+                if int_keys is None:
+                    return False
 
-            # Validate and prepare bitsize
-            actual_bitsize = self._validate_and_prepare_bitsize(int_keys, partition_key)
-            if actual_bitsize is None:
-                return False
+                # Validate and prepare bitsize
+                actual_bitsize = self._validate_and_prepare_bitsize(int_keys, partition_key)
+                if actual_bitsize is None:
+                    return False
 
-            # Build bitstring expression
-            bitstring_expr = self._build_bitstring_expression(int_keys, actual_bitsize)
+                # Build bitstring expression
+                bitstring_expr = self._build_bitstring_expression(int_keys, actual_bitsize)
 
-            # Store cache entry
-            table_name = self._get_safe_table_name(partition_key)
-            self._store_cache_entry(table_name, key, bitstring_expr, actual_bitsize, len(int_keys))
+                # Store cache entry
+                table_name = self._get_safe_table_name(partition_key)
+                self._store_cache_entry(table_name, key, bitstring_expr, actual_bitsize, len(int_keys))
 
-            # Also store in queries table for existence checks
-            try:
-                self.conn.execute(
-                    f"""
-                    INSERT INTO {self.table_prefix}_queries (query_hash, partition_key, query)
-                    VALUES (?, ?, '')
-                """,
-                    (key, partition_key),
-                )
-            except duckdb.ConstraintException:
-                # Update if insert fails due to primary key constraint
-                self.conn.execute(
-                    f"""
-                    UPDATE {self.table_prefix}_queries
-                    SET last_seen = now()
-                    WHERE query_hash = ? AND partition_key = ?
-                """,
-                    (key, partition_key),
-                )
+                # Also store in queries table for existence checks
+                try:
+                    self.conn.execute(
+                        f"""
+                        INSERT INTO {self.table_prefix}_queries (query_hash, partition_key, query)
+                        VALUES (?, ?, '')
+                    """,
+                        (key, partition_key),
+                    )
+                except duckdb.ConstraintException:
+                    # Update if insert fails due to primary key constraint
+                    self.conn.execute(
+                        f"""
+                        UPDATE {self.table_prefix}_queries
+                        SET last_seen = now()
+                        WHERE query_hash = ? AND partition_key = ?
+                    """,
+                        (key, partition_key),
+                    )
 
-            return True
+                return True
 
-        except Exception as e:
-            logger.error(f"Failed to set cache for key {key}: {e}")
-            return False
+            except Exception as e:
+                logger.error(f"Failed to set cache for key {key}: {e}")
+                return False
 
     def get(self, key: str, partition_key: str = "partition_key") -> set[int] | None:
         """
@@ -445,31 +508,17 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
         try:
             table_name = self._get_safe_table_name(partition_key)
 
-            # Use DuckDB's native bitstring functions to extract set bits
-            result = self.conn.execute(
+            result = self._cursor().execute(
                 f"""
-                WITH bit_positions AS (
-                    SELECT
-                        range(bit_length(partition_keys)) AS pos_array
-                    FROM {table_name}
-                    WHERE query_hash = ?
-                ),
-                positions AS (
-                    SELECT UNNEST(pos_array) AS pos
-                    FROM bit_positions
-                )
-                SELECT pos AS position
-                FROM positions
-                WHERE get_bit(
-                    (SELECT partition_keys FROM {table_name} WHERE query_hash = ?),
-                    pos::INTEGER
-                ) = 1
-            """, (key, key)).fetchall()
-
-            if not result:
+                SELECT partition_keys FROM {table_name} WHERE query_hash = ?
+            """,
+                (key,),
+            ).fetchone()
+
+            if result is None or result[0] is None:
                 return None
 
-            return {row[0] for row in result}
+            return self._decode_bitstring(result[0])
 
         except Exception as e:
             logger.debug(f"Failed to get cache for key {key}: {e}")
@@ -487,51 +536,35 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
             Tuple of (intersected set, number of keys that existed)
 
         Note: Uses DuckDB's native BIT_AND aggregate for high-performance intersection.
+            Intersection and existence counting run in a single statement; the resulting
+            bitstring is decoded in Python with bitarray instead of unnesting every bit position in SQL.
         """
-        try:
-            # Filter to existing keys
-            existing_keys = self.filter_existing_keys(keys, partition_key)
-            if not existing_keys:
-                return None, 0
-
-            if len(existing_keys) == 1:
-                # Single key - just return its value
-                key = next(iter(existing_keys))
-                result = self.get(key, partition_key)
-                return result, 1
+        if not keys:
+            return None, 0
 
-            # Multiple keys - use DuckDB's BIT_AND aggregate for intersection
+        try:
             table_name = self._get_safe_table_name(partition_key)
-            key_placeholders = ",".join("?" * len(existing_keys))
-
-            # Use BIT_AND aggregate to compute intersection of all bitstrings
-            intersection_query = f"""
-                WITH intersection_result AS (
-                    SELECT bit_and(partition_keys) AS intersection_bits
-                    FROM {table_name}
-                    WHERE query_hash IN ({key_placeholders})
-                ),
-                bit_positions AS (
-                    SELECT range(bit_length(intersection_bits)) AS pos_array
-                    FROM intersection_result
-                ),
-                positions AS (
-                    SELECT UNNEST(pos_array) AS pos
-                    FROM bit_positions
-                )
-                SELECT pos AS position
-                FROM positions, intersection_result
-                WHERE get_bit(intersection_bits, pos::INTEGER) = 1
-            """
+            key_placeholders = ",".join("?" * len(keys))
 
-            result = self.conn.execute(intersection_query, tuple(existing_keys)).fetchall()
+            # BIT_AND and COUNT ignore NULL entries, matching the PostgreSQL bit handler
+            result = self._cursor().execute(
+                f"""
+                SELECT bit_and(partition_keys), count(partition_keys)
+                FROM {table_name}
+                WHERE query_hash IN ({key_placeholders})
+            """,
+                tuple(keys),
+            ).fetchone()
 
-            if not result:
-                return set(), len(existing_keys)
+            if result is None or not result[1]:
+                return None, 0
 
-            return {row[0] for row in result}, len(existing_keys)
+            return self._decode_bitstring(result[0]), result[1]
 
         except Exception as e:
+            # Cache table might not exist yet - this is OK, return None
+            if "does not exist" in str(e).lower():
+                return None, 0
             logger.error(f"Failed to get intersection for keys {keys}: {e}")
             return None, 0
 
@@ -617,86 +650,87 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            # Security check
-            if "DELETE " in query.upper() or "DROP " in query.upper():
-                logger.error("Query contains DELETE or DROP")
-                return False
-
-            # Get or determine bitsize
-            existing_bitsize = self._get_partition_bitsize(partition_key)
-            if existing_bitsize is None:
-                # Create new partition with default bitsize
-                if not self._ensure_partition_table(partition_key, self.default_bitsize):
+        with self._write_lock:
+            try:
+                # Security check
+                if "DELETE " in query.upper() or "DROP " in query.upper():
+                    logger.error("Query contains DELETE or DROP")
                     return False
-                actual_bitsize = self.default_bitsize
-            else:
-                actual_bitsize = existing_bitsize
 
-            table_name = self._get_safe_table_name(partition_key)
+                # Get or determine bitsize
+                existing_bitsize = self._get_partition_bitsize(partition_key)
+                if existing_bitsize is None:
+                    # Create new partition with default bitsize
+                    if not self._ensure_partition_table(partition_key, self.default_bitsize):
+                        return False
+                    actual_bitsize = self.default_bitsize
+                else:
+                    actual_bitsize = existing_bitsize
 
-            # Create DuckDB BITSTRING using lazy query execution
-            # Build a query that creates the bitstring from the input query results
-            lazy_insert_query = f"""
-            WITH query_result AS (
-                {query}
-            ),
-            bit_positions AS (
-                SELECT {partition_key}::INTEGER AS position
-                FROM query_result
-                WHERE {partition_key}::INTEGER >= 0 AND {partition_key}::INTEGER < {actual_bitsize}
-            ),
-            bit_array AS (
-                SELECT generate_series(0, {actual_bitsize} - 1) AS bit_index
-            ),
-            bit_string AS (
-                SELECT string_agg(
-                    CASE WHEN bit_array.bit_index IN (SELECT position FROM bit_positions)
-                         THEN '1'
-                         ELSE '0'
-                    END,
-                    ''
-                    ORDER BY bit_array.bit_index
-                ) AS bit_value,
-                COUNT(DISTINCT bit_positions.position) AS partition_count
-                FROM bit_array
-                LEFT JOIN bit_positions ON bit_array.bit_index = bit_positions.position
-            )
-            INSERT INTO {table_name} (query_hash, partition_keys, partition_keys_count)
-            SELECT ?, bit_value::BITSTRING, partition_count
-            FROM bit_string
-            ON CONFLICT (query_hash) DO UPDATE SET
-                partition_keys = EXCLUDED.partition_keys,
-                partition_keys_count = EXCLUDED.partition_keys_count
-            """
-
-            self.conn.execute(lazy_insert_query, (key,))
-
-            # Also store in queries table for existence checks
-            try:
-                self.conn.execute(
-                    f"""
-                    INSERT INTO {self.table_prefix}_queries (query_hash, partition_key, query)
-                    VALUES (?, ?, '')
-                """,
-                    (key, partition_key),
-                )
-            except duckdb.ConstraintException:
-                # Update if insert fails due to primary key constraint
-                self.conn.execute(
-                    f"""
-                    UPDATE {self.table_prefix}_queries
-                    SET last_seen = now()
-                    WHERE query_hash = ? AND partition_key = ?
-                """,
-                    (key, partition_key),
+                table_name = self._get_safe_table_name(partition_key)
+
+                # Create DuckDB BITSTRING using lazy query execution
+                # Build a query that creates the bitstring from the input query results
+                lazy_insert_query = f"""
+                WITH query_result AS (
+                    {query}
+                ),
+                bit_positions AS (
+                    SELECT {partition_key}::INTEGER AS position
+                    FROM query_result
+                    WHERE {partition_key}::INTEGER >= 0 AND {partition_key}::INTEGER < {actual_bitsize}
+                ),
+                bit_array AS (
+                    SELECT generate_series(0, {actual_bitsize} - 1) AS bit_index
+                ),
+                bit_string AS (
+                    SELECT string_agg(
+                        CASE WHEN bit_array.bit_index IN (SELECT position FROM bit_positions)
+                             THEN '1'
+                             ELSE '0'
+                        END,
+                        ''
+                        ORDER BY bit_array.bit_index
+                    ) AS bit_value,
+                    COUNT(DISTINCT bit_positions.position) AS partition_count
+                    FROM bit_array
+                    LEFT JOIN bit_positions ON bit_array.bit_index = bit_positions.position
                 )
+                INSERT INTO {table_name} (query_hash, partition_keys, partition_keys_count)
+                SELECT ?, bit_value::BITSTRING, partition_count
+                FROM bit_string
+                ON CONFLICT (query_hash) DO UPDATE SET
+                    partition_keys = EXCLUDED.partition_keys,
+                    partition_keys_count = EXCLUDED.partition_keys_count
+                """
 
-            return True
+                self.conn.execute(lazy_insert_query, (key,))
 
-        except Exception as e:
-            logger.error(f"Failed to set cache lazily for key {key}: {e}")
-            return False
+                # Also store in queries table for existence checks
+                try:
+                    self.conn.execute(
+                        f"""
+                        INSERT INTO {self.table_prefix}_queries (query_hash, partition_key, query)
+                        VALUES (?, ?, '')
+                    """,
+                        (key, partition_key),
+                    )
+                except duckdb.ConstraintException:
+                    # Update if insert fails due to primary key constraint
+                    self.conn.execute(
+                        f"""
+                        UPDATE {self.table_prefix}_queries
+                        SET last_seen = now()
+                        WHERE query_hash = ? AND partition_key = ?
+                    """,
+                        (key, partition_key),
+                    )
+
+                return True
+
+            except Exception as e:
+                logger.error(f"Failed to set cache lazily for key {key}: {e}")
+                return False
 
     def exists(self, key: str, partition_key: str = "partition_key", check_query: bool = False) -> bool:
         """
@@ -721,7 +755,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
 
             # Check cache entry
             table_name = self._get_safe_table_name(partition_key)
-            result = self.conn.execute(
+            result = self._cursor().execute(
                 f"""
                 SELECT 1 FROM {table_name} WHERE query_hash = ?
             """,
@@ -744,31 +778,32 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
         Returns:
             bool: True if successful
         """
-        try:
-            table_name = self._get_safe_table_name(partition_key)
+        with self._write_lock:
+            try:
+                table_name = self._get_safe_table_name(partition_key)
 
-            # Delete from cache table
-            self.conn.execute(
-                f"""
-                DELETE FROM {table_name} WHERE query_hash = ?
-            """,
-                (key,),
-            )
+                # Delete from cache table
+                self.conn.execute(
+                    f"""
+                    DELETE FROM {table_name} WHERE query_hash = ?
+                """,
+                    (key,),
+                )
 
-            # Delete from queries table
-            self.conn.execute(
-                f"""
-                DELETE FROM {self.table_prefix}_queries
-                WHERE query_hash = ? AND partition_key = ?
-            """,
-                (key, partition_key),
-            )
+                # Delete from queries table
+                self.conn.execute(
+                    f"""
+                    DELETE FROM {self.table_prefix}_queries
+                    WHERE query_hash = ? AND partition_key = ?
+                """,
+                    (key, partition_key),
+                )
 
-            return True
+                return True
 
-        except Exception as e:
-            logger.error(f"Failed to delete cache entry {key}: {e}")
-            return False
+            except Exception as e:
+                logger.error(f"Failed to delete cache entry {key}: {e}")
+                return False
 
     def set_null(self, key: str, partition_key: str = "partition_key") -> bool:
         """
@@ -781,27 +816,28 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
         Returns:
             bool: True if successful
         """
-        try:
-            # Ensure partition table exists
-            if not self._get_partition_bitsize(partition_key):
-                self.register_partition_key(partition_key, "integer")
+        with self._write_lock:
+            try:
+                # Ensure partition table exists
+                if not self._get_partition_bitsize(partition_key):
+                    self.register_partition_key(partition_key, "integer")
 
-            table_name = self._get_safe_table_name(partition_key)
-            self.conn.execute(
-                f"""
-                INSERT INTO {table_name} (query_hash, partition_keys, partition_keys_count)
-                VALUES (?, NULL, NULL)
-                ON CONFLICT (query_hash) DO UPDATE SET
-                partition_keys = NULL, partition_keys_count = NULL
-            """,
-                (key,),
-            )
+                table_name = self._get_safe_table_name(partition_key)
+                self.conn.execute(
+                    f"""
+                    INSERT INTO {table_name} (query_hash, partition_keys, partition_keys_count)
+                    VALUES (?, NULL, NULL)
+                    ON CONFLICT (query_hash) DO UPDATE SET
+                    partition_keys = NULL, partition_keys_count = NULL
+                """,
+                    (key,),
+                )
 
-            return True
+                return True
 
-        except Exception as e:
-            logger.error(f"Failed to set null for key {key}: {e}")
-            return False
+            except Exception as e:
+                logger.error(f"Failed to set null for key {key}: {e}")
+                return False
 
     def is_null(self, key: str, partition_key: str = "partition_key") -> bool:
         """
@@ -816,7 +852,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
         """
         try:
             table_name = self._get_safe_table_name(partition_key)
-            result = self.conn.execute(
+            result = self._cursor().execute(
                 f"""
                 SELECT partition_keys FROM {table_name} WHERE query_hash = ?
             """,
@@ -846,7 +882,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
         try:
             if check_query:
                 # Check queries table first
-                result = self.conn.execute(
+                result = self._cursor().execute(
                     f"""
                     SELECT query_hash FROM {self.table_prefix}_queries
                     WHERE query_hash IN ({",".join("?" * len(keys))})
@@ -859,7 +895,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
                 query_keys = {row[0] for row in result}
 
                 # For 'ok' status, also check cache exists
-                ok_keys = self.conn.execute(
+                ok_keys = self._cursor().execute(
                     f"""
                     SELECT query_hash FROM {self.table_prefix}_queries
                     WHERE query_hash IN ({",".join("?" * len(query_keys))})
@@ -870,7 +906,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
 
                 if ok_keys:
                     table_name = self._get_safe_table_name(partition_key)
-                    cache_keys = self.conn.execute(
+                    cache_keys = self._cursor().execute(
                         f"""
                         SELECT query_hash FROM {table_name}
                         WHERE query_hash IN ({",".join("?" * len(ok_keys))})
@@ -889,7 +925,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
             else:
                 # Just check cache table
                 table_name = self._get_safe_table_name(partition_key)
-                result = self.conn.execute(
+                result = self._cursor().execute(
                     f"""
                     SELECT query_hash FROM {table_name}
                     WHERE query_hash IN ({",".join("?" * len(keys))})
@@ -915,7 +951,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
         """
         try:
             table_name = self._get_safe_table_name(partition_key)
-            result = self.conn.execute(f"""
+            result = self._cursor().execute(f"""
                 SELECT query_hash FROM {table_name} ORDER BY created_at DESC
             """).fetchall()
 
@@ -936,22 +972,23 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
         Returns:
             bool: True if successful
         """
-        try:
-            self.conn.execute(
-                f"""
-                INSERT INTO {self.table_prefix}_queries (query_hash, partition_key, query)
-                VALUES (?, ?, ?)
-                ON CONFLICT (query_hash, partition_key) DO UPDATE SET
-                query = EXCLUDED.query, last_seen = now()
-            """,
-                (key, partition_key, querytext),
-            )
+        with self._write_lock:
+            try:
+                self.conn.execute(
+                    f"""
+                    INSERT INTO {self.table_prefix}_queries (query_hash, partition_key, query)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (query_hash, partition_key) DO UPDATE SET
+                    query = EXCLUDED.query, last_seen = now()
+                """,
+                    (key, partition_key, querytext),
+                )
 
-            return True
+                return True
 
-        except Exception as e:
-            logger.error(f"Failed to set query for key {key}: {e}")
-            return False
+            except Exception as e:
+                logger.error(f"Failed to set query for key {key}: {e}")
+                return False
 
     def get_query(self, key: str, partition_key: str = "partition_key") -> str | None:
         """
@@ -965,7 +1002,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
             Query text or None if not found
         """
         try:
-            result = self.conn.execute(
+            result = self._cursor().execute(
                 f"""
                 SELECT query FROM {self.table_prefix}_queries
                 WHERE query_hash = ? AND partition_key = ?
@@ -989,7 +1026,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
             List of (query_hash, query_text) tuples
         """
         try:
-            result = self.conn.execute(
+            result = self._cursor().execute(
                 f"""
                 SELECT query_hash, query FROM {self.table_prefix}_queries
                 WHERE partition_key = ? ORDER BY last_seen DESC
@@ -1014,21 +1051,22 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
         Returns:
             bool: True if successful
         """
-        try:
-            self.conn.execute(
-                f"""
-                UPDATE {self.table_prefix}_queries
-                SET status = ?, last_seen = now()
-                WHERE query_hash = ? AND partition_key = ?
-            """,
-                (status, key, partition_key),
-            )
+        with self._write_lock:
+            try:
+                self.conn.execute(
+                    f"""
+                    UPDATE {self.table_prefix}_queries
+                    SET status = ?, last_seen = now()
+                    WHERE query_hash = ? AND partition_key = ?
+                """,
+                    (status, key, partition_key),
+                )
 
-            return True
+                return True
 
-        except Exception as e:
-            logger.error(f"Failed to set query status for key {key}: {e}")
-            return False
+            except Exception as e:
+                logger.error(f"Failed to set query status for key {key}: {e}")
+                return False
 
     def get_query_status(self, key: str, partition_key: str = "partition_key") -> str | None:
         """
@@ -1042,7 +1080,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
             Status string or None if not found
         """
         try:
-            result = self.conn.execute(
+            result = self._cursor().execute(
                 f"""
                 SELECT status FROM {self.table_prefix}_queries
                 WHERE query_hash = ? AND partition_key = ?
@@ -1075,7 +1113,7 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
             List of (partition_key, datatype) tuples
         """
         try:
-            result = self.conn.execute(f"""
+            result = self._cursor().execute(f"""
                 SELECT partition_key, datatype FROM {self.table_prefix}_partition_metadata
                 ORDER BY created_at
             """).fetchall()
@@ -1097,11 +1135,17 @@ class DuckDBBitCacheHandler(AbstractCacheHandler_Lazy):
                     if cls._refcount > 0:
                         return
 
+                # Close the per-thread read cursors before the main connection
+                for cursor in list(self._cursors):
+                    cursor.close()
+                self._cursors.clear()
+
                 if self.conn:
                     self.conn.close()
 
                 if is_singleton_instance:
                     cls._instance = None
+                    cls._instance_config = {}
                     cls._refcount = 0
         except Exception as e:
             logger.error(f"Error closing DuckDB connection: {e}")
@@ -38,6 +38,19 @@ class EnvironmentConfigManager:
 
         return config
 
+    @staticmethod
+    def get_postgresql_pool_config() -> dict[str, int]:
+        """
+        Get the connection pool size of the PostgreSQL cache handlers from environment variables.
+
+        Returns:
+            Dictionary with pool_min_size (PG_CACHE_POOL_MIN_SIZE, default: 1) and pool_max_size (PG_CACHE_POOL_MAX_SIZE, default: 10)
+        """
+        return {
+            "pool_min_size": int(os.getenv("PG_CACHE_POOL_MIN_SIZE", "1")),
+            "pool_max_size": int(os.getenv("PG_CACHE_POOL_MAX_SIZE", "10")),
+        }
+
     @staticmethod
     def get_postgresql_array_config() -> dict[str, Any]:
         """
@@ -56,6 +69,7 @@ class EnvironmentConfigManager:
             raise ValueError("PG_ARRAY_CACHE_TABLE_PREFIX environment variable not set")
 
         config["db_tableprefix"] = table_prefix
+        config.update(EnvironmentConfigManager.get_postgresql_pool_config())
         return config
 
     @staticmethod
@@ -81,6 +95,7 @@ class EnvironmentConfigManager:
 
         config["db_tableprefix"] = table_prefix
         config["bitsize"] = int(bitsize)
+        config.update(EnvironmentConfigManager.get_postgresql_pool_config())
         return config
 
     @staticmethod
@@ -101,6 +116,7 @@ class EnvironmentConfigManager:
             raise ValueError("PG_ROARINGBIT_CACHE_TABLE_PREFIX environment variable not set")
 
         config["db_tableprefix"] = table_prefix
+        config.update(EnvironmentConfigManager.get_postgresql_pool_config())
         return config
 
     @staticmethod
@@ -117,7 +133,7 @@ class EnvironmentConfigManager:
         Raises:
             ValueError: If required environment variables are missing
         """
-        config = {}
+        config: dict[str, Any] = {}
 
         if cache_type == "set":
             # Support both REDIS_SET_DB (preferred) and REDIS_CACHE_DB (legacy)
@@ -209,12 +225,13 @@ class EnvironmentConfigManager:
             DUCKDB_BIT_PATH: Path to DuckDB database file (default: ":memory:")
             DUCKDB_BIT_TABLE_PREFIX: Table prefix for cache tables (default: "partitioncache")
             DUCKDB_BIT_BITSIZE: Default bitsize for DuckDB BITSTRING (default: "100000")
+            DUCKDB_BIT_READ_ONLY: Open the database file read-only so several processes can share it (default: "false")
 
         Note:
             This handler uses DuckDB's native BITSTRING data type with native
             bitwise operations and BIT_AND aggregates for optimal performance.
         """
-        config = {}
+        config: dict[str, Any] = {}
 
         # Database path (optional, defaults to in-memory)
         db_path = os.getenv("DUCKDB_BIT_PATH", ":memory:")
@@ -228,6 +245,10 @@ class EnvironmentConfigManager:
         bitsize = os.getenv("DUCKDB_BIT_BITSIZE", "100000")
         config["bitsize"] = int(bitsize)
 
+        # Read-only mode (optional)
+        read_only = os.getenv("DUCKDB_BIT_READ_ONLY", "false")
+        config["read_only"] = read_only.lower() in ("true", "1", "yes")
+
         return config
 
     @staticmethod
@@ -271,6 +292,7 @@ class EnvironmentConfigManager:
         config["geometry_column"] = os.getenv("PG_H3_GEOMETRY_COLUMN", "geom")
         config["srid"] = int(os.getenv("PG_H3_SRID", "4326"))
 
+        config.update(EnvironmentConfigManager.get_postgresql_pool_config())
         return config
 
     @staticmethod
@@ -314,6 +336,7 @@ class EnvironmentConfigManager:
         config["geometry_column"] = os.getenv("PG_BBOX_GEOMETRY_COLUMN", "geom")
         config["srid"] = int(os.getenv("PG_BBOX_SRID", "4326"))
 
+        config.update(EnvironmentConfigManager.get_postgresql_pool_config())
         return config
 
     @staticmethod
@@ -330,7 +353,7 @@ class EnvironmentConfigManager:
         Raises:
             ValueError: If required environment variables are missing
         """
-        config = {}
+        config: dict[str, Any] = {}
 
         if cache_type == "set":
             db_path = os.getenv("ROCKSDB_PATH")
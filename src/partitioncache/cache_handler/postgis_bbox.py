@@ -11,6 +11,7 @@ from logging import getLogger
 from psycopg import sql
 
 from partitioncache.cache_handler.postgis_spatial_abstract import PostGISSpatialAbstractCacheHandler
+from partitioncache.cache_handler.postgresql_abstract import pooled
 
 logger = getLogger("PartitionCache")
 
@@ -37,10 +38,12 @@ class PostGISBBoxCacheHandler(PostGISSpatialAbstractCacheHandler):
         geometry_column: str = "geom",
         srid: int = 4326,
         timeout: str = "0",
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
     ) -> None:
         self.cell_size = cell_size
         self.half_cell = cell_size / 2.0
-        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix, geometry_column, srid, timeout)
+        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix, geometry_column, srid, timeout, pool_min_size, pool_max_size)
 
     def __repr__(self) -> str:
         return "postgis_bbox"
@@ -90,6 +93,7 @@ class PostGISBBoxCacheHandler(PostGISSpatialAbstractCacheHandler):
                 pass
             raise
 
+    @pooled
     def set_cache(self, key, partition_key_identifiers, partition_key="partition_key"):
         """
         Store bounding box geometry in the cache.
@@ -130,6 +134,7 @@ class PostGISBBoxCacheHandler(PostGISSpatialAbstractCacheHandler):
                 pass
             return False
 
+    @pooled
     def set_cache_lazy(self, key: str, query: str, partition_key: str = "partition_key") -> bool:
         """
         Store bounding box geometry by wrapping the fragment query with grid-based BB aggregation.
@@ -192,6 +197,7 @@ class PostGISBBoxCacheHandler(PostGISSpatialAbstractCacheHandler):
                 self.db.rollback()
             return False
 
+    @pooled
     def get(self, key, partition_key="partition_key"):  # type: ignore[override]
         """Get bounding box geometry as WKB bytes from cache."""
         datatype = self._get_partition_datatype(partition_key)
@@ -210,6 +216,7 @@ class PostGISBBoxCacheHandler(PostGISSpatialAbstractCacheHandler):
             return None
         return bytes(result[0])
 
+    @pooled
     def get_intersected(self, keys, partition_key="partition_key"):  # type: ignore[override]
         """Get geometric intersection of all cached bounding boxes. Returns WKB bytes."""
         try:
@@ -265,6 +272,7 @@ class PostGISBBoxCacheHandler(PostGISSpatialAbstractCacheHandler):
 
         return result
 
+    @pooled
     def get_intersected_lazy(self, keys, partition_key="partition_key"):
         """Get lazy intersection SQL for BBox geometries."""
         try:
@@ -332,6 +340,7 @@ class PostGISBBoxCacheHandler(PostGISSpatialAbstractCacheHandler):
 
         return result
 
+    @pooled
     def get_spatial_filter(
         self,
         keys: set[str],
@@ -378,6 +387,7 @@ class PostGISBBoxCacheHandler(PostGISSpatialAbstractCacheHandler):
             logger.error(f"Failed to get BBox spatial filter as WKB: {e}")
             return None
 
+    @pooled
     def get_spatial_filter_lazy(
         self,
         keys: set[str],
@@ -11,6 +11,7 @@ from logging import getLogger
 from psycopg import sql
 
 from partitioncache.cache_handler.postgis_spatial_abstract import PostGISSpatialAbstractCacheHandler
+from partitioncache.cache_handler.postgresql_abstract import pooled
 
 logger = getLogger("PartitionCache")
 
@@ -36,9 +37,11 @@ class PostGISH3CacheHandler(PostGISSpatialAbstractCacheHandler):
         geometry_column: str = "geom",
         srid: int = 4326,
         timeout: str = "0",
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
     ) -> None:
         self.resolution = resolution
-        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix, geometry_column, srid, timeout)
+        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix, geometry_column, srid, timeout, pool_min_size, pool_max_size)
 
     def _check_extensions(self) -> None:
         """Verify h3-pg extension is available."""
@@ -91,6 +94,7 @@ class PostGISH3CacheHandler(PostGISSpatialAbstractCacheHandler):
                 pass
             raise
 
+    @pooled
     def set_cache(self, key, partition_key_identifiers, partition_key="partition_key"):
         """Store H3 cell indices in the cache."""
         if not partition_key_identifiers:
@@ -126,6 +130,7 @@ class PostGISH3CacheHandler(PostGISSpatialAbstractCacheHandler):
                 pass
             return False
 
+    @pooled
     def set_cache_lazy(self, key: str, query: str, partition_key: str = "partition_key") -> bool:
         """
         Store H3 cell indices by wrapping the fragment query with H3 conversion.
@@ -189,6 +194,7 @@ class PostGISH3CacheHandler(PostGISSpatialAbstractCacheHandler):
                 self.db.rollback()
             return False
 
+    @pooled
     def get(self, key, partition_key="partition_key"):
         """Get H3 cell indices from cache."""
         datatype = self._get_partition_datatype(partition_key)
@@ -207,6 +213,7 @@ class PostGISH3CacheHandler(PostGISSpatialAbstractCacheHandler):
             return None
         return set(result[0])
 
+    @pooled
     def get_intersected(self, keys, partition_key="partition_key"):
         """Get intersection of H3 cell arrays (standard BIGINT[] intersection)."""
         try:
@@ -254,6 +261,7 @@ class PostGISH3CacheHandler(PostGISSpatialAbstractCacheHandler):
             intersect=intersect_query,
         )
 
+    @pooled
     def get_intersected_lazy(self, keys, partition_key="partition_key"):
         """Get lazy intersection SQL for H3 cell arrays."""
         try:
@@ -275,6 +283,7 @@ class PostGISH3CacheHandler(PostGISSpatialAbstractCacheHandler):
             logger.error(f"Failed to get H3 lazy intersection: {e}")
             return None, 0
 
+    @pooled
     def get_spatial_filter(
         self,
         keys: set[str],
@@ -315,6 +324,7 @@ class PostGISH3CacheHandler(PostGISSpatialAbstractCacheHandler):
             logger.error(f"Failed to get H3 spatial filter as WKB: {e}")
             return None
 
+    @pooled
     def get_spatial_filter_lazy(
         self,
         keys: set[str],
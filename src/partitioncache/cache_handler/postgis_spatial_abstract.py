@@ -41,24 +41,27 @@ class PostGISSpatialAbstractCacheHandler(PostgreSQLAbstractCacheHandler):
         geometry_column: str = "geom",
         srid: int = 4326,
         timeout: str = "0",
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
     ) -> None:
         self.geometry_column = geometry_column
         self.srid = srid
-        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix, timeout)
+        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix, timeout, pool_min_size, pool_max_size)
 
-        # Verify PostGIS is available
-        try:
-            self.cursor.execute("SELECT PostGIS_Version()")
-            self.db.commit()
-        except Exception as e:
-            logger.warning(f"PostGIS extension check failed: {e}. Ensure PostGIS is installed.")
+        with self._checkout():
+            # Verify PostGIS is available
             try:
-                self.db.rollback()
-            except Exception:
-                pass
-
-        # Subclass-specific extension checks (e.g. h3-pg)
-        self._check_extensions()
+                self.cursor.execute("SELECT PostGIS_Version()")
+                self.db.commit()
+            except Exception as e:
+                logger.warning(f"PostGIS extension check failed: {e}. Ensure PostGIS is installed.")
+                try:
+                    self.db.rollback()
+                except Exception:
+                    pass
+
+            # Subclass-specific extension checks (e.g. h3-pg)
+            self._check_extensions()
 
     @classmethod
     def get_supported_datatypes(cls) -> set[str]:
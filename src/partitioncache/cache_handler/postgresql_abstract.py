@@ -1,48 +1,243 @@
+import functools
+import inspect
 import threading
+import time
+import types
+import typing
 from abc import abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from logging import getLogger
+from typing import Any, TypeVar, cast
 
 import psycopg
 from psycopg import sql
+from psycopg.conninfo import make_conninfo
 
 from partitioncache.cache_handler.abstract import AbstractCacheHandler_Lazy
 
+try:
+    from psycopg_pool import ConnectionPool, PoolTimeout
+except ImportError:
+    ConnectionPool = None  # type: ignore[assignment, misc]
+    PoolTimeout = None  # type: ignore[assignment, misc]
+
 logger = getLogger("PartitionCache")
 
 
+def _failure_value(annotation: Any) -> Callable[[], Any] | None:
+    """
+    Return a factory of the value a method returns on failure, derived from its return annotation.
+
+    Returns:
+        Factory of False, 0, an empty list or set, None, or a tuple of these; None for methods annotated
+        to return None, which raise on failure.
+    """
+    if annotation is None or annotation is type(None):
+        return None
+    origin = typing.get_origin(annotation) or annotation
+    if origin is bool:
+        return lambda: False
+    if origin is int:
+        return lambda: 0
+    if origin is list:
+        return list
+    if origin is set:
+        return set
+    if origin is tuple:
+        items = [_failure_value(item) or (lambda: None) for item in typing.get_args(annotation)]
+        return lambda: tuple(item() for item in items)
+    if origin in (typing.Union, types.UnionType) and type(None) in typing.get_args(annotation):
+        return lambda: None
+    # Unannotated methods and other types
+    return lambda: None
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def pooled(method: F) -> F:  # noqa: UP047
+    """
+    Run a cache handler method on a connection checked out for the calling thread (see _checkout).
+
+    Nested calls of pooled methods reuse the connection of the outermost call. If no pooled connection
+    becomes available within the pool timeout, the error is logged and the method returns its failure
+    value (False, 0, an empty collection, or None), like the method does for database errors. Methods
+    annotated to return None raise the PoolTimeout instead.
+    """
+    failure_value = _failure_value(method.__annotations__.get("return", inspect.Signature.empty))
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            with self._checkout():
+                return method(self, *args, **kwargs)
+        except Exception as e:
+            if PoolTimeout is None or not isinstance(e, PoolTimeout) or failure_value is None:
+                raise
+            logger.error(f"{self.__class__.__name__}.{method.__name__}: no pooled connection available: {e}")
+            return failure_value()
+
+    return cast(F, wrapper)
+
+
 class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
-    _instance = None
+    _instance: "PostgreSQLAbstractCacheHandler | None" = None
+    # Arguments the shared instance was created with (see get_instance)
+    _instance_config: dict = {}
     _refcount = 0
-    _cached_datatype: dict[str, str] = {}
+    _lock = threading.Lock()
+    # Seconds for which the metadata of a partition key is reused before it is read again (0 disables caching)
+    METADATA_TTL: float = 60.0
+    # Columns of the metadata table loaded per partition key (see _partition_metadata)
+    _metadata_columns: tuple[str, ...] = ("datatype",)
 
     @classmethod
     def get_instance(cls, *args, **kwargs):
-        # If externally threaded, skip singleton pattern and always create new instances
-        if hasattr(threading.current_thread(), "ident") and threading.active_count() > 1:
-            return cls(*args, **kwargs)
-
-        if cls._instance is None:
-            cls._instance = cls(*args, **kwargs)
-        cls._refcount += 1
-        return cls._instance
+        """
+        Get the shared instance. Its operations check out pooled connections, so it can be shared across threads.
 
-    def __init__(self, db_name: str, db_host: str, db_user: str, db_password: str, db_port: str | int, db_tableprefix: str, timeout: str = "0") -> None:
+        Raises:
+            ValueError: If the shared instance was created with a different configuration.
+        """
+        bound = inspect.signature(cls).bind(*args, **kwargs)
+        bound.apply_defaults()
+        config = dict(bound.arguments)
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls(*args, **kwargs)
+                cls._instance_config = config
+            elif cls._instance_config != config:
+                changed = sorted(name for name in config if config[name] != cls._instance_config.get(name))
+                raise ValueError(f"{cls.__name__} shared instance already exists with a different configuration ({', '.join(changed)})")
+            cls._refcount += 1
+            return cls._instance
+
+    def __init__(
+        self,
+        db_name: str,
+        db_host: str,
+        db_user: str,
+        db_password: str,
+        db_port: str | int,
+        db_tableprefix: str,
+        timeout: str = "0",
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
+    ) -> None:
         """
         Initialize the cache handler with the given db name.
         This handler supports multiple partition keys with datatypes: integer, float, text, timestamp.
         Creates distinct tables per partition key based on datatype.
 
+        Each operation checks out a connection from a pool (requires psycopg_pool), so one handler
+        can be shared by several threads with a bounded number of connections. Connections are not
+        checked on checkout; the pool discards connections returned in a broken state and replaces
+        connections idle for longer than its max_idle. Without psycopg_pool, every thread uses its
+        own connection.
+
         Args:
             timeout: Statement timeout in seconds (default: "0" for no timeout)
+            pool_min_size: Minimum number of pooled connections
+            pool_max_size: Maximum number of pooled connections
         """
-        self.db = psycopg.connect(dbname=db_name, host=db_host, password=db_password, port=db_port, user=db_user, options=f"-c statement_timeout={int(timeout)*1000}" )
         self.tableprefix = db_tableprefix
-        self.cursor = self.db.cursor()
+        self._connect_kwargs = {
+            "dbname": db_name,
+            "host": db_host,
+            "password": db_password,
+            "port": db_port,
+            "user": db_user,
+            "options": f"-c statement_timeout={int(timeout) * 1000}",
+        }
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self._pool = None
+        if ConnectionPool is not None:
+            self._pool = ConnectionPool(
+                make_conninfo(**self._connect_kwargs),  # type: ignore[arg-type]
+                min_size=pool_min_size,
+                max_size=pool_max_size,
+                name=f"partitioncache_{db_tableprefix}",
+                open=True,
+            )
+        # Connection and cursor of the operation running in each thread (see _checkout)
+        self._local = threading.local()
+        # Per-thread connections if no pool is available, closed with the handler
+        self._thread_connections: list[psycopg.Connection] = []
+        self._thread_connections_lock = threading.Lock()
+        # Composed statements of the lookup operations, per statement template and table (see _statement)
+        self._statements: dict[tuple[str, str], sql.Composed] = {}
+        # Metadata rows per partition key with their expiry time (see _partition_metadata)
+        self._metadata: dict[str, tuple[float, tuple]] = {}
 
         # Create metadata tables with supported datatypes
-        self._recreate_metadata_table(self.get_supported_datatypes())
+        with self._checkout():
+            self._recreate_metadata_table(self.get_supported_datatypes())
         logger.info(f"CACHE_HANDLER {self.__class__.__name__}: Initialization complete for tableprefix={db_tableprefix}")
 
+    @contextmanager
+    def _checkout(self) -> Iterator[psycopg.Connection]:
+        """
+        Bind a connection and cursor to the calling thread for the duration of an operation.
+
+        The connection is borrowed from the pool and returned when the outermost operation ends;
+        the pool commits an open transaction on return, or rolls it back if the operation raised.
+        Without psycopg_pool, the thread keeps its own connection for the lifetime of the handler.
+
+        Yields:
+            psycopg.Connection: The connection bound to the calling thread
+        """
+        local = self._local
+        if getattr(local, "db", None) is not None:
+            yield local.db
+            return
+
+        if self._pool is None:
+            conn = psycopg.connect(**self._connect_kwargs)  # type: ignore[arg-type]
+            with self._thread_connections_lock:
+                self._thread_connections.append(conn)
+            local.db = conn
+            local.cursor = conn.cursor()
+            yield conn
+            return
+
+        with self._pool.connection() as conn:
+            local.db = conn
+            local.cursor = conn.cursor()
+            try:
+                yield conn
+            finally:
+                try:
+                    local.cursor.close()
+                finally:
+                    local.db = None
+                    local.cursor = None
+
+    @property
+    def db(self) -> psycopg.Connection:
+        """Connection of the operation running in the calling thread."""
+        conn = getattr(self._local, "db", None)
+        if conn is None:
+            raise RuntimeError(f"{self.__class__.__name__}: no connection checked out, database access must run inside a pooled operation")
+        return cast(psycopg.Connection, conn)
+
+    @db.setter
+    def db(self, conn: psycopg.Connection) -> None:
+        self._local.db = conn
+
+    @property
+    def cursor(self) -> psycopg.Cursor:
+        """Cursor of the operation running in the calling thread."""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            raise RuntimeError(f"{self.__class__.__name__}: no connection checked out, database access must run inside a pooled operation")
+        return cast(psycopg.Cursor, cursor)
+
+    @cursor.setter
+    def cursor(self, cursor: psycopg.Cursor) -> None:
+        self._local.cursor = cursor
+
     def _recreate_metadata_table(self, supported_datatypes: set[str]) -> None:
         """
         Recreate metadata table if it was dropped during cleanup.
@@ -95,19 +290,67 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
             logger.info(f"Creating metadata table: {self.tableprefix}_partition_metadata")
             self._recreate_metadata_table(self.get_supported_datatypes())
 
+    def _statement(self, template: str, table_name: str) -> sql.Composed:
+        """
+        Return a statement on a table, composed on first use and reused afterwards.
+
+        Statements obtained here are executed with prepare=True, so that PostgreSQL parses and plans them
+        once per connection instead of on every lookup.
+
+        Args:
+            template: SQL template with the table as placeholder {0}
+            table_name: Name of the table
+
+        Returns:
+            sql.Composed: The composed statement
+        """
+        key = (template, table_name)
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = sql.SQL(template).format(sql.Identifier(table_name))  # type: ignore[arg-type]
+            self._statements[key] = statement
+        return statement
+
+    def _partition_metadata(self, partition_key: str) -> tuple | None:
+        """
+        Get the metadata row of a partition key, with the columns in _metadata_columns.
+
+        Rows are cached per handler for METADATA_TTL seconds. A cached row also means that the partition table
+        exists, so operations on a known partition key run without metadata queries. Changes made through this
+        handler invalidate the row (see _invalidate_partition_metadata); changes made by other processes are
+        picked up once the row expires. Unknown partition keys are not cached.
+
+        Args:
+            partition_key: The partition key
+
+        Returns:
+            tuple | None: The metadata row, or None if the partition key is not registered
+        """
+        cached = self._metadata.get(partition_key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
+        self.cursor.execute(
+            self._statement(f"SELECT {', '.join(self._metadata_columns)} FROM {{0}} WHERE partition_key = %s", self.tableprefix + "_partition_metadata"),
+            (partition_key,),
+            prepare=True,
+        )
+        row = self.cursor.fetchone()
+        if row is None:
+            self._metadata.pop(partition_key, None)
+        elif self.METADATA_TTL > 0:
+            self._metadata[partition_key] = (time.monotonic() + self.METADATA_TTL, row)
+        return row
+
+    def _invalidate_partition_metadata(self, partition_key: str) -> None:
+        """Drop the cached metadata row of a partition key, so that the next operation reads it again."""
+        self._metadata.pop(partition_key, None)
+
     def _get_partition_datatype(self, partition_key: str) -> str | None:
         """Get the datatype for a partition key from metadata."""
-        if partition_key in self._cached_datatype:
-            return self._cached_datatype[partition_key]
-
         try:
-            self.cursor.execute(
-                sql.SQL("SELECT datatype FROM {0} WHERE partition_key = %s").format(sql.Identifier(self.tableprefix + "_partition_metadata")), (partition_key,)
-            )
-            result = self.cursor.fetchone()
-            if result:
-                self._cached_datatype[partition_key] = result[0]
-            return result[0] if result else None
+            row = self._partition_metadata(partition_key)
+            return row[0] if row else None
         except Exception as e:
             # Metadata table might not exist - rollback and return None
             try:
@@ -130,29 +373,39 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
             if cls._refcount > 0:
                 return
 
-        # Actually close the connection
+        # Actually close the pool or the per-thread connections
         try:
-            if self.cursor:
-                self.cursor.close()
-            if self.db:
-                self.db.close()
+            if self._pool is not None:
+                self._pool.close()
+            cursor = getattr(self._local, "cursor", None)
+            if cursor is not None:
+                cursor.close()
+            with self._thread_connections_lock:
+                for conn in self._thread_connections:
+                    conn.close()
+                self._thread_connections.clear()
+            self._local.db = None
+            self._local.cursor = None
         except Exception as e:
             logger.error(f"Error closing PostgreSQL connection: {e}")
         finally:
             if is_singleton_instance:
                 cls._instance = None
+                cls._instance_config = {}
                 cls._refcount = 0
 
+    @pooled
     def set_query(self, key: str, querytext: str, partition_key: str = "partition_key") -> bool:
         """Store a query in the cache associated with the given key."""
         try:
-            query_sql = sql.SQL(
+            query_sql = self._statement(
                 "INSERT INTO {0} (query_hash, partition_key, query) VALUES (%s, %s, %s) "
                 "ON CONFLICT (query_hash, partition_key) DO UPDATE SET "
-                "query = EXCLUDED.query, last_seen = now()"
-            ).format(sql.Identifier(self.tableprefix + "_queries"))
+                "query = EXCLUDED.query, last_seen = now()",
+                self.tableprefix + "_queries",
+            )
 
-            self.cursor.execute(query_sql, (key, partition_key, querytext))
+            self.cursor.execute(query_sql, (key, partition_key, querytext), prepare=True)
             self.db.commit()
             return True
         except Exception as e:
@@ -164,18 +417,20 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
                 logger.error(f"Failed to rollback transaction: {rollback_error}")
             return False
 
+    @pooled
     def get_query(self, key: str, partition_key: str = "partition_key") -> str | None:
         """Retrieve the query text associated with the given key."""
         try:
-            query_sql = sql.SQL("SELECT query FROM {0} WHERE query_hash = %s AND partition_key = %s").format(sql.Identifier(self.tableprefix + "_queries"))
+            query_sql = self._statement("SELECT query FROM {0} WHERE query_hash = %s AND partition_key = %s", self.tableprefix + "_queries")
 
-            self.cursor.execute(query_sql, (key, partition_key))
+            self.cursor.execute(query_sql, (key, partition_key), prepare=True)
             result = self.cursor.fetchone()
             return result[0] if result else None
         except Exception as e:
             logger.debug(f"Failed to get query for key {key}: {e}")
             return None
 
+    @pooled
     def get_all_queries(self, partition_key: str) -> list[tuple[str, str]]:
         """Retrieve all query hash and text pairs for a specific partition."""
         try:
@@ -189,6 +444,7 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
             logger.debug(f"Failed to get all queries for partition {partition_key}: {e}")
             return []
 
+    @pooled
     def set_null(self, key: str, partition_key: str = "partition_key") -> bool:
         """Set null value in partition-specific table."""
         try:
@@ -222,6 +478,7 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
                 logger.error(f"Failed to rollback transaction: {rollback_error}")
             return False
 
+    @pooled
     def is_null(self, key: str, partition_key: str = "partition_key") -> bool:
         """Check if key has null value in partition-specific table."""
         datatype = self._get_partition_datatype(partition_key)
@@ -240,6 +497,7 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
             return True
         return False
 
+    @pooled
     def exists(self, key: str, partition_key: str = "partition_key", check_query: bool = False) -> bool:
         """Check if hash exists in partition-specific cache and optionally validate query status."""
         try:
@@ -276,19 +534,36 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
                 # Rollback failed - return False anyway
                 return False
 
+    def _check_query_sql(self, partition_key: str) -> sql.Composed:
+        """
+        Select the hashes that have a query entry and either an error status (timeout/failed)
+        or status 'ok' with an existing cache entry, in a single round trip.
+
+        Parameters are the partition key and the list of hashes to check.
+        """
+        table_name = f"{self.tableprefix}_cache_{partition_key}"
+        key = ("check_query", table_name)
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = sql.SQL(
+                """
+                SELECT q.query_hash FROM {queries} q
+                LEFT JOIN {cache_table} c ON c.query_hash = q.query_hash
+                WHERE q.partition_key = %s AND q.query_hash = ANY(%s)
+                AND (q.status <> 'ok' OR c.query_hash IS NOT NULL)
+                """
+            ).format(queries=sql.Identifier(self.tableprefix + "_queries"), cache_table=sql.Identifier(table_name))
+            self._statements[key] = statement
+        return statement
+
     def _check_cache_exists(self, key: str, partition_key: str) -> bool:
         """Helper method to check if a hash exists in the cache table."""
         table_name = f"{self.tableprefix}_cache_{partition_key}"
-        self.cursor.execute(
-            sql.SQL("""
-                SELECT 1 FROM {cache_table}
-                WHERE query_hash = %s
-            """).format(cache_table=sql.Identifier(table_name)),
-            (key,),
-        )
+        self.cursor.execute(self._statement("SELECT 1 FROM {0} WHERE query_hash = %s", table_name), (key,), prepare=True)
         result = self.cursor.fetchone()
         return result is not None
 
+    @pooled
     def filter_existing_keys(self, keys: set, partition_key: str = "partition_key", check_query: bool = False) -> set:
         """Return the set of keys that exist in the partition-specific cache."""
         try:
@@ -300,44 +575,24 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
                 # Fast mode: Check cache table existence only
                 table_name = f"{self.tableprefix}_cache_{partition_key}"
                 self.cursor.execute(
-                    sql.SQL("""
-                        SELECT query_hash FROM {cache_table}
-                        WHERE query_hash = ANY(%s) AND partition_keys IS NOT NULL
-                    """).format(cache_table=sql.Identifier(table_name)),
+                    self._statement("SELECT query_hash FROM {0} WHERE query_hash = ANY(%s) AND partition_keys IS NOT NULL", table_name),
                     (list(keys),),
+                    prepare=True,
                 )
                 keys_set = {x[0] for x in self.cursor.fetchall()}
                 logger.info(f"Found {len(keys_set)} existing hashkeys for partition {partition_key}")
                 return keys_set
             else:
-                # Query mode: Check each key's query status
-                existing_keys = set()
-                table_name = f"{self.tableprefix}_cache_{partition_key}"
-
-                for key in keys:
-                    query_status = self.get_query_status(key, partition_key)
-                    if query_status is None:
-                        continue  # No query -> exclude key
-                    elif query_status == "ok":
-                        # Query OK -> also check cache entry exists
-                        self.cursor.execute(
-                            sql.SQL("""
-                                SELECT 1 FROM {cache_table}
-                                WHERE query_hash = %s
-                            """).format(cache_table=sql.Identifier(table_name)),
-                            (key,),
-                        )
-                        if self.cursor.fetchone():
-                            existing_keys.add(key)
-                    else:  # timeout or failed
-                        existing_keys.add(key)  # Query has error status -> include key
-
+                # Query mode: Keys with an error status (timeout/failed), or status 'ok' and a cache entry
+                self.cursor.execute(self._check_query_sql(partition_key), (partition_key, list(keys)), prepare=True)
+                existing_keys = {x[0] for x in self.cursor.fetchall()}
                 logger.info(f"Found {len(existing_keys)} existing hashkeys for partition {partition_key}")
                 return existing_keys
         except Exception as e:
             logger.error(f"Failed to filter existing keys in partition {partition_key}: {e}")
             return set()
 
+    @pooled
     def get_all_keys(self, partition_key: str) -> list:
         """Get all keys for a specific partition key."""
         datatype = self._get_partition_datatype(partition_key)
@@ -348,6 +603,7 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
         self.cursor.execute(sql.SQL("SELECT query_hash FROM {}").format(sql.Identifier(table_name)))
         return [x[0] for x in self.cursor.fetchall()]
 
+    @pooled
     def delete(self, key: str, partition_key: str = "partition_key") -> bool:
         """Delete from partition-specific table."""
         try:
@@ -375,6 +631,7 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
                 logger.error(f"Failed to rollback transaction: {rollback_error}")
             return False
 
+    @pooled
     def delete_partition(self, partition_key: str) -> bool:
         """Delete an entire partition and all its data."""
         try:
@@ -395,7 +652,7 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
                 sql.SQL("DELETE FROM {0} WHERE partition_key = %s").format(sql.Identifier(self.tableprefix + "_partition_metadata")), (partition_key,)
             )
 
-            self._cached_datatype.pop(partition_key, None)  # Remove from cached datatypes
+            self._invalidate_partition_metadata(partition_key)
 
             self.db.commit()
             logger.info(f"Deleted partition {partition_key}")
@@ -409,6 +666,7 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
                 logger.error(f"Failed to rollback transaction: {rollback_error}")
             return False
 
+    @pooled
     def prune_old_queries(self, days_old: int = 30) -> int:
         """Remove queries that haven't been seen for specified days."""
         try:
@@ -448,6 +706,7 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
                 logger.error(f"Failed to rollback transaction: {rollback_error}")
             return 0
 
+    @pooled
     def get_partition_keys(self) -> list[tuple[str, str]]:
         """Get all partition keys and their datatypes."""
         try:
@@ -459,16 +718,19 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
             logger.error(f"Failed to get partition keys: {e}")
             return []
 
+    @pooled
     def get_datatype(self, partition_key: str) -> str | None:
         """Get the datatype of the cache handler. If the partition key is not set, return None."""
         return self._get_partition_datatype(partition_key)
 
+    @pooled
     def register_partition_key(self, partition_key: str, datatype: str, **kwargs) -> None:
         """Register a partition key with the cache handler."""
         if datatype not in self.get_supported_datatypes():
             raise ValueError(f"Handler supports only {self.get_supported_datatypes()} datatypes, got: {datatype}")
         self._ensure_partition_table(partition_key, datatype, **kwargs)
 
+    @pooled
     def set_query_status(self, key: str, partition_key: str = "partition_key", status: str = "ok") -> bool:
         """Set the status of a query in the queries table."""
         try:
@@ -500,12 +762,13 @@ class PostgreSQLAbstractCacheHandler(AbstractCacheHandler_Lazy):
                 logger.error(f"Failed to rollback transaction: {rollback_error}")
             return False
 
+    @pooled
     def get_query_status(self, key: str, partition_key: str = "partition_key") -> str | None:
         """Get the status of a query from the queries table."""
         try:
-            query_sql = sql.SQL("SELECT status FROM {0} WHERE query_hash = %s AND partition_key = %s").format(sql.Identifier(self.tableprefix + "_queries"))
+            query_sql = self._statement("SELECT status FROM {0} WHERE query_hash = %s AND partition_key = %s", self.tableprefix + "_queries")
 
-            self.cursor.execute(query_sql, (key, partition_key))
+            self.cursor.execute(query_sql, (key, partition_key), prepare=True)
             result = self.cursor.fetchone()
             return result[0] if result else None
         except Exception as e:
@@ -5,7 +5,7 @@ from logging import getLogger
 from psycopg import sql
 from psycopg.errors import IntegrityError
 
-from partitioncache.cache_handler.postgresql_abstract import PostgreSQLAbstractCacheHandler
+from partitioncache.cache_handler.postgresql_abstract import PostgreSQLAbstractCacheHandler, pooled
 
 logger = getLogger("PartitionCache")
 
@@ -21,23 +21,26 @@ class PostgreSQLArrayCacheHandler(PostgreSQLAbstractCacheHandler):
     def __repr__(self) -> str:
         return "postgresql_array"
 
-    def __init__(self, db_name, db_host, db_user, db_password, db_port, db_tableprefix, timeout: str = "0") -> None:
-        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix, timeout)
+    def __init__(
+        self, db_name, db_host, db_user, db_password, db_port, db_tableprefix, timeout: str = "0", pool_min_size: int = 1, pool_max_size: int = 10
+    ) -> None:
+        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix, timeout, pool_min_size, pool_max_size)
 
-        # Load SQL functions first
-        self._load_sql_functions()
+        with self._checkout():
+            # Load SQL functions first
+            self._load_sql_functions()
 
-        # Setup array-specific extensions and aggregates
-        try:
-            self.cursor.execute("SELECT partitioncache_setup_array_extensions()")
-            result = self.cursor.fetchone()
-            self.array_intersect_agg_available = result[0] if result else False
-            self.db.commit()
-        except Exception as e:
-            logger.warning(f"Failed to setup array extensions. Performance might be suboptimal. Error: {e}")
-            self.array_intersect_agg_available = False
-            if self.db.closed is False:
-                self.db.rollback()
+            # Setup array-specific extensions and aggregates
+            try:
+                self.cursor.execute("SELECT partitioncache_setup_array_extensions()")
+                result = self.cursor.fetchone()
+                self.array_intersect_agg_available = result[0] if result else False
+                self.db.commit()
+            except Exception as e:
+                logger.warning(f"Failed to setup array extensions. Performance might be suboptimal. Error: {e}")
+                self.array_intersect_agg_available = False
+                if self.db.closed is False:
+                    self.db.rollback()
 
     def _load_sql_functions(self) -> None:
         """Load SQL functions from the cache handlers SQL file."""
@@ -114,6 +117,7 @@ class PostgreSQLArrayCacheHandler(PostgreSQLAbstractCacheHandler):
                 raise
             return True
 
+    @pooled
     def set_cache(self, key: str, partition_key_identifiers: set[int] | set[str] | set[float] | set[datetime], partition_key: str = "partition_key") -> bool:
         """Store partition key identifiers in the cache for a specific partition key (column)."""
         if not partition_key_identifiers:
@@ -180,6 +184,7 @@ class PostgreSQLArrayCacheHandler(PostgreSQLAbstractCacheHandler):
                 logger.error(f"Failed to rollback transaction: {rollback_error}")
             return False
 
+    @pooled
     def get(self, key: str, partition_key: str = "partition_key") -> set[int] | set[str] | set[float] | set[datetime] | None:
         """Get value from partition-specific cache table."""
 
@@ -188,13 +193,14 @@ class PostgreSQLArrayCacheHandler(PostgreSQLAbstractCacheHandler):
             return None
 
         table_name = f"{self.tableprefix}_cache_{partition_key}"
-        self.cursor.execute(sql.SQL("SELECT partition_keys FROM {0} WHERE query_hash = %s").format(sql.Identifier(table_name)), (key,))
+        self.cursor.execute(self._statement("SELECT partition_keys FROM {0} WHERE query_hash = %s", table_name), (key,), prepare=True)
         result = self.cursor.fetchone()
         if result is None or result[0] is None:
             return None
 
         return set(result[0])
 
+    @pooled
     def get_intersected(self, keys: set[str], partition_key: str = "partition_key") -> tuple[set[int] | set[str] | set[float] | set[datetime] | None, int]:
         """Get intersection from partition-specific table."""
         try:
@@ -222,6 +228,7 @@ class PostgreSQLArrayCacheHandler(PostgreSQLAbstractCacheHandler):
             logger.error(f"Failed to get intersection in partition {partition_key}: {e}")
             return None, 0
 
+    @pooled
     def get_intersected_lazy(self, keys: set[str], partition_key: str = "partition_key") -> tuple[str | None, int]:
         """Get lazy intersection for partition-specific table."""
         try:
@@ -233,14 +240,19 @@ class PostgreSQLArrayCacheHandler(PostgreSQLAbstractCacheHandler):
             if not filtered_keys:
                 return None, 0
 
-            query = sql.SQL("SELECT unnest(({intersectsql})) as {partition_col}").format(
-                intersectsql=self.get_intersected_sql(filtered_keys, partition_key, datatype), partition_col=sql.Identifier(partition_key)
-            )
-            return query.as_string(), len(filtered_keys)
+            return self.get_intersected_lazy_sql(filtered_keys, partition_key, datatype), len(filtered_keys)
         except Exception as e:
             logger.error(f"Failed to get lazy intersection in partition {partition_key}: {e}")
             return None, 0
 
+    def get_intersected_lazy_sql(self, keys: set[str], partition_key: str, datatype: str) -> str:
+        """Get the lazy intersection subquery for the given (existing) keys without touching the database."""
+        query = sql.SQL("SELECT unnest(({intersectsql})) as {partition_col}").format(
+            intersectsql=self.get_intersected_sql(keys, partition_key, datatype), partition_col=sql.Identifier(partition_key)
+        )
+        return query.as_string()
+
+    @pooled
     def set_cache_lazy(self, key: str, query: str, partition_key: str = "partition_key") -> bool:
         """
         Store partition key identifiers in cache by executing the provided query directly.
@@ -1,22 +1,38 @@
 import time
+from array import array
 from datetime import datetime
 from logging import getLogger
+from typing import cast
 
 from bitarray import bitarray
 from psycopg import sql
 from psycopg.errors import IntegrityError
 
-from partitioncache.cache_handler.postgresql_abstract import PostgreSQLAbstractCacheHandler
+from partitioncache.cache_handler.datatype_utils import is_integer_array, to_uint32_array
+from partitioncache.cache_handler.postgresql_abstract import PostgreSQLAbstractCacheHandler, pooled
 
 logger = getLogger("PartitionCache")
 
 
 class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
+    accepts_integer_arrays = True
+    _metadata_columns = ("datatype", "bitsize")
+
     def __repr__(self) -> str:
         return "postgresql_bit"
 
     def __init__(
-        self, db_name: str, db_host: str, db_user: str, db_password: str, db_port: str | int, db_tableprefix: str, bitsize: int, timeout: str = "0"
+        self,
+        db_name: str,
+        db_host: str,
+        db_user: str,
+        db_password: str,
+        db_port: str | int,
+        db_tableprefix: str,
+        bitsize: int,
+        timeout: str = "0",
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
     ) -> None:
         """
         Initialize the cache handler with the given db name.
@@ -24,9 +40,11 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
 
         Args:
             timeout: Statement timeout in seconds (default: "0" for no timeout)
+            pool_min_size: Minimum number of pooled connections
+            pool_max_size: Maximum number of pooled connections
         """
         self.default_bitsize = bitsize
-        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix, timeout)
+        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix, timeout, pool_min_size, pool_max_size)
 
     def _recreate_metadata_table(self, supported_datatypes: set[str]) -> None:
         """
@@ -86,14 +104,13 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
                 logger.error(f"Failed to rollback after metadata table creation error: {rollback_error}")
             raise
 
+    @pooled
     def _get_partition_bitsize(self, partition_key: str) -> int | None:
         """Get the bitsize for a partition key from metadata."""
-        self.cursor.execute(
-            sql.SQL("SELECT bitsize FROM {0} WHERE partition_key = %s").format(sql.Identifier(self.tableprefix + "_partition_metadata")), (partition_key,)
-        )
-        result = self.cursor.fetchone()
-        return result[0] if result else None
+        row = self._partition_metadata(partition_key)
+        return cast(int | None, row[1]) if row else None
 
+    @pooled
     def _set_partition_bitsize(self, partition_key: str, bitsize: int) -> None:
         """Update the bitsize for a partition key in metadata."""
         self.cursor.execute(
@@ -101,6 +118,7 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
             (bitsize, partition_key),
         )
         self.db.commit()
+        self._invalidate_partition_metadata(partition_key)
 
     def _load_sql_functions(self) -> None:
         """Load SQL functions from the cache handlers SQL file."""
@@ -175,6 +193,11 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
             if existing_bitsize is not None and existing_bitsize >= bitsize:
                 return True, existing_bitsize
 
+            def current_bitsize() -> int | None:
+                # The partition is created or expanded concurrently from here on, bypass the metadata cache
+                self._invalidate_partition_metadata(partition_key)
+                return self._get_partition_bitsize(partition_key)
+
             # Use advisory lock to prevent race conditions in schema creation
             # Generate consistent lock ID from partition key
             lock_id = hash(f"{self.tableprefix}_{partition_key}") % (2**31 - 1)
@@ -191,7 +214,7 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
 
                 for _ in range(10):  # Wait up to 10 seconds
                     time.sleep(1)
-                    existing_bitsize = self._get_partition_bitsize(partition_key)
+                    existing_bitsize = current_bitsize()
                     if existing_bitsize is not None and existing_bitsize >= bitsize:
                         logger.info(f"PARTITION CREATED BY OTHER THREAD: {partition_key} with bitsize {existing_bitsize}")
                         return True, existing_bitsize
@@ -204,7 +227,7 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
                 self.cursor.execute("SELECT pg_advisory_xact_lock(%s)", (lock_id,))
 
             # Double-check if partition was created while waiting for lock
-            existing_bitsize = self._get_partition_bitsize(partition_key)
+            existing_bitsize = current_bitsize()
             if existing_bitsize is not None and existing_bitsize >= bitsize:
                 return True, existing_bitsize
 
@@ -225,7 +248,7 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
             )
 
             # Get the actual bitsize that was set (for validation)
-            actual_bitsize = self._get_partition_bitsize(partition_key)
+            actual_bitsize = current_bitsize()
             if actual_bitsize is None:
                 raise ValueError(f"No bitsize found for partition {partition_key} after bootstrap")
 
@@ -234,70 +257,94 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
             return True, actual_bitsize
         except Exception as e:
             logger.error(f"Failed to ensure partition table for {partition_key}: {e}")
+            self._invalidate_partition_metadata(partition_key)
             self.db.rollback()
             raise
 
+    @pooled
     def set_cache(self, key: str, partition_key_identifiers: set[int] | set[str] | set[float] | set[datetime], partition_key: str = "partition_key") -> bool:
         """
         Set the partition key identifiers of the given hash in the cache for a specific partition key.
         Only integer values are supported for bit arrays.
         """
-        if not partition_key_identifiers:
+        if len(partition_key_identifiers) == 0:
             return True
 
         try:
             # Convert all keys to integers first
-            int_keys = []
-            for k in partition_key_identifiers:
-                if isinstance(k, int):
-                    int_keys.append(k)
-                elif isinstance(k, str):
-                    int_keys.append(int(k))
-                else:
-                    raise ValueError(f"Only integer values are supported for bit arrays: {k} : {partition_key_identifiers}")
+            int_keys: list[int] | array
+            if is_integer_array(partition_key_identifiers):
+                int_keys = to_uint32_array(partition_key_identifiers)
+            else:
+                int_keys = []
+                for k in partition_key_identifiers:
+                    if isinstance(k, int):
+                        int_keys.append(k)
+                    elif isinstance(k, str):
+                        int_keys.append(int(k))
+                    else:
+                        raise ValueError(f"Only integer values are supported for bit arrays: {k} : {partition_key_identifiers}")
 
             # Determine required bitsize based on data
             max_value = max(int_keys)
             required_bitsize = max(max_value + 1, self.default_bitsize)  # Ensure at least default size
+        except Exception as e:
+            logger.error(f"Failed to set partition key identifiers for hash {key} in partition {partition_key}: {e}")
+            return False
 
-            # Atomically ensure partition table exists and get actual bitsize
-            _, actual_bitsize = self._ensure_partition_table(partition_key, "integer", bitsize=required_bitsize)
-
-            # Validate all keys fit within the actual bitsize
-            if max_value >= actual_bitsize:
-                raise ValueError(f"Partition key {max_value} exceeds bitsize {actual_bitsize} for partition {partition_key}")
-
-            # Create fixed-length bitarray using actual bitsize
-            val = bitarray(actual_bitsize)
-            val.setall(0)
+        for attempt in range(2):
+            try:
+                self._write_bits(key, int_keys, max_value, required_bitsize, partition_key)
+                return True
+            except Exception as e:
+                try:
+                    self.db.rollback()
+                except Exception:
+                    pass  # Ignore rollback errors
+                if attempt == 0:
+                    # The partition may have been expanded or dropped by another process since its metadata was cached
+                    logger.warning(f"Failed to set partition key identifiers for hash {key} in partition {partition_key}, retrying: {e}")
+                    self._invalidate_partition_metadata(partition_key)
+                else:
+                    logger.error(f"Failed to set partition key identifiers for hash {key} in partition {partition_key}: {e}")
+        return False
+
+    def _write_bits(self, key: str, int_keys: list[int] | array, max_value: int, required_bitsize: int, partition_key: str) -> None:
+        """Write the bit array of a query hash and its queries table entry, creating or expanding the partition if needed."""
+        # Atomically ensure partition table exists and get actual bitsize
+        _, actual_bitsize = self._ensure_partition_table(partition_key, "integer", bitsize=required_bitsize)
+
+        # Validate all keys fit within the actual bitsize
+        if max_value >= actual_bitsize:
+            raise ValueError(f"Partition key {max_value} exceeds bitsize {actual_bitsize} for partition {partition_key}")
+
+        # Create fixed-length bitarray using actual bitsize
+        val = bitarray(actual_bitsize)
+        val.setall(0)
+        if isinstance(int_keys, array):
+            val[int_keys] = 1
+        else:
             for k in int_keys:
                 val[k] = 1
-            table_name = f"{self.tableprefix}_cache_{partition_key}"
-            self.cursor.execute(
-                sql.SQL(
-                    "INSERT INTO {0} (query_hash, partition_keys) VALUES (%s, %s) ON CONFLICT (query_hash) DO UPDATE SET partition_keys = EXCLUDED.partition_keys"
-                ).format(sql.Identifier(table_name)),
-                (key, val.to01()),
-            )
+        table_name = f"{self.tableprefix}_cache_{partition_key}"
+        self.cursor.execute(
+            sql.SQL(
+                "INSERT INTO {0} (query_hash, partition_keys) VALUES (%s, %s) ON CONFLICT (query_hash) DO UPDATE SET partition_keys = EXCLUDED.partition_keys"
+            ).format(sql.Identifier(table_name)),
+            (key, val.to01()),
+        )
 
-            # Also create entry in queries table for exists() method to work properly
-            self.cursor.execute(
-                sql.SQL(
-                    "INSERT INTO {0} (query_hash, partition_key, query) VALUES (%s, %s, %s) ON CONFLICT (query_hash, partition_key) DO UPDATE SET last_seen = now()"
-                ).format(sql.Identifier(self.tableprefix + "_queries")),
-                (key, partition_key, ""),  # Empty query text for cache entries
-            )
+        # Also create entry in queries table for exists() method to work properly
+        self.cursor.execute(
+            sql.SQL(
+                "INSERT INTO {0} (query_hash, partition_key, query) VALUES (%s, %s, %s) ON CONFLICT (query_hash, partition_key) DO UPDATE SET last_seen = now()"
+            ).format(sql.Identifier(self.tableprefix + "_queries")),
+            (key, partition_key, ""),  # Empty query text for cache entries
+        )
 
-            self.db.commit()
-            return True
-        except Exception as e:
-            logger.error(f"Failed to set partition key identifiers for hash {key} in partition {partition_key}: {e}")
-            try:
-                self.db.rollback()
-            except Exception:
-                pass  # Ignore rollback errors
-            return False
+        self.db.commit()
 
+    @pooled
     def get(self, key: str, partition_key: str = "partition_key") -> set[int] | None:
         """Get value from partition-specific cache table."""
 
@@ -307,10 +354,8 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
 
         table_name = f"{self.tableprefix}_cache_{partition_key}"
         try:
-            self.cursor.execute(
-                sql.SQL("SELECT partition_keys FROM {0} WHERE query_hash = %s").format(sql.Identifier(table_name)),
-                (key,),
-            )
+            # Selected as varbit, a prepared statement must not change its result type when the bitsize of the table grows
+            self.cursor.execute(self._statement("SELECT partition_keys::varbit FROM {0} WHERE query_hash = %s", table_name), (key,), prepare=True)
             result = self.cursor.fetchone()
             if result is None:
                 return None
@@ -337,6 +382,7 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
                     pass
                 return None
 
+    @pooled
     def get_intersected(self, keys: set[str], partition_key: str = "partition_key") -> tuple[set[int] | set[str] | None, int]:
         """Get intersection from partition-specific table."""
         datatype = self._get_partition_datatype(partition_key)
@@ -346,15 +392,15 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
         # Check which exist
         table_name = f"{self.tableprefix}_cache_{partition_key}"
         try:
-            query = sql.SQL("SELECT query_hash FROM {0} WHERE query_hash = ANY(%s) AND partition_keys IS NOT NULL").format(sql.Identifier(table_name))
-            self.cursor.execute(query, (list(keys),))
+            query = self._statement("SELECT query_hash FROM {0} WHERE query_hash = ANY(%s) AND partition_keys IS NOT NULL", table_name)
+            self.cursor.execute(query, (list(keys),), prepare=True)
             keys_set = {x[0] for x in self.cursor.fetchall()}
 
             if not keys_set:
                 return None, 0
 
             q = self.get_intersected_sql(partition_key)
-            self.cursor.execute(q, (list(keys_set),))
+            self.cursor.execute(q, (list(keys_set),), prepare=True)
 
             result = self.cursor.fetchone()
             if result is None:
@@ -380,9 +426,7 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
     def get_intersected_sql(self, partition_key: str = "partition_key") -> sql.Composed:
         """Get intersection SQL for partition-specific table."""
         table_name = f"{self.tableprefix}_cache_{partition_key}"
-        return sql.SQL("SELECT BIT_AND(partition_keys) FROM (SELECT partition_keys FROM {0} WHERE query_hash = ANY(%s)) AS selected").format(
-            sql.Identifier(table_name)
-        )
+        return self._statement("SELECT BIT_AND(partition_keys)::varbit FROM (SELECT partition_keys FROM {0} WHERE query_hash = ANY(%s)) AS selected", table_name)
 
     def get_intersected_sql_wk(self, keys, partition_key: str = "partition_key") -> str:
         """Get intersection SQL with keys for partition-specific table. Using ANY with properly escaped literals."""
@@ -406,7 +450,11 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
         if not filtered_keys:
             return None, 0
 
-        intersect_sql_str = self.get_intersected_sql_wk(filtered_keys, partition_key)
+        return self.get_intersected_lazy_sql(filtered_keys, partition_key), len(filtered_keys)
+
+    def get_intersected_lazy_sql(self, keys: set[str], partition_key: str = "partition_key", datatype: str | None = None) -> str:
+        """Get the lazy intersection subquery for the given (existing) keys without touching the database."""
+        intersect_sql_str = self.get_intersected_sql_wk(keys, partition_key)
 
         r = (
             sql.SQL("""(
@@ -430,8 +478,9 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
             .as_string()
         )
 
-        return r, len(filtered_keys)
+        return r
 
+    @pooled
     def set_cache_lazy(self, key: str, query: str, partition_key: str = "partition_key") -> bool:
         """
         Store partition key identifiers in cache by executing the provided query directly.
@@ -526,6 +575,8 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
 
         except Exception as e:
             logger.error(f"Failed to set cache lazily for key {key}: {e}")
+            # The bitsize may have been expanded by another process
+            self._invalidate_partition_metadata(partition_key)
             if not self.db.closed:
                 self.db.rollback()
             return False
@@ -535,6 +586,7 @@ class PostgreSQLBitCacheHandler(PostgreSQLAbstractCacheHandler):
         """PostgreSQL bit handler supports only integer datatype."""
         return {"integer"}
 
+    @pooled
     def register_partition_key(self, partition_key: str, datatype: str, **kwargs) -> None:
         """Register a partition key with the cache handler."""
         if datatype != "integer":
@@ -6,29 +6,47 @@ from psycopg import sql
 from psycopg.errors import IntegrityError
 from pyroaring import BitMap
 
-from partitioncache.cache_handler.postgresql_abstract import PostgreSQLAbstractCacheHandler
+from partitioncache.cache_handler.datatype_utils import is_integer_array, to_uint32_array
+from partitioncache.cache_handler.postgresql_abstract import PostgreSQLAbstractCacheHandler, pooled
 
 logger = getLogger("PartitionCache")
 
 
 class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
+    accepts_integer_arrays = True
+
     def __repr__(self) -> str:
         return "postgresql_roaringbit"
 
-    def __init__(self, db_name: str, db_host: str, db_user: str, db_password: str, db_port: str | int, db_tableprefix: str) -> None:
+    def __init__(
+        self,
+        db_name: str,
+        db_host: str,
+        db_user: str,
+        db_password: str,
+        db_port: str | int,
+        db_tableprefix: str,
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
+    ) -> None:
         """
         Initialize the cache handler with the given db name.
         This handler supports multiple partition keys but only integer datatypes (for roaring bitmaps).
+
+        Args:
+            pool_min_size: Minimum number of pooled connections
+            pool_max_size: Maximum number of pooled connections
         """
-        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix)
+        super().__init__(db_name, db_host, db_user, db_password, db_port, db_tableprefix, pool_min_size=pool_min_size, pool_max_size=pool_max_size)
 
         # Enable roaringbitmap extension if not already enabled
-        try:
-            self.cursor.execute("CREATE EXTENSION IF NOT EXISTS roaringbitmap;")
-            self.db.commit()
-        except Exception as e:
-            logger.warning(f"Failed to create roaringbitmap extension: {e}")
-            # Continue anyway - extension might already exist
+        with self._checkout():
+            try:
+                self.cursor.execute("CREATE EXTENSION IF NOT EXISTS roaringbitmap;")
+                self.db.commit()
+            except Exception as e:
+                logger.warning(f"Failed to create roaringbitmap extension: {e}")
+                # Continue anyway - extension might already exist
 
     def _create_partition_table(self, partition_key: str) -> None:
         """Create a cache table for a specific partition key."""
@@ -137,6 +155,10 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
     def _ensure_partition_table(self, partition_key: str, datatype: str, **kwargs) -> bool:
         """Ensure a partition table exists using SQL bootstrap function."""
         try:
+            # Registered partition keys (cached, see _partition_metadata) already have their table
+            if self._get_partition_datatype(partition_key) is not None:
+                return True
+
             # Load SQL functions first to ensure they're available
             self._load_sql_functions()
 
@@ -156,9 +178,11 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
             return True
         except Exception as e:
             logger.error(f"Failed to ensure roaringbit partition table for {partition_key}: {e}")
+            self._invalidate_partition_metadata(partition_key)
             self.db.rollback()
             return False
 
+    @pooled
     def set_cache(
         self,
         key: str,
@@ -171,18 +195,21 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
 
         Args:
             key: The cache key
-            partition_key_identifiers: Can be a set of integers, a BitMap, a bitarray, or a list of integers
+            partition_key_identifiers: Can be a set of integers, a BitMap, a bitarray, a list of integers, or an integer array
             partition_key: The partition key (column) identifier
         """
-        if not partition_key_identifiers:
+        if len(partition_key_identifiers) == 0:
             return True
 
         try:
-            # Ensure partition table exists
-            self._ensure_partition_table(partition_key, "integer")
-
             # Convert input to a list of integers for rb_build
-            if isinstance(partition_key_identifiers, BitMap):
+            build_expression = "rb_build(%s)"
+            value_list: list[int] | bytes
+            if is_integer_array(partition_key_identifiers):
+                # Integer arrays are sent as a serialized bitmap instead of a list of Python integers
+                value_list = BitMap(to_uint32_array(partition_key_identifiers)).serialize()
+                build_expression = "%s::bytea::roaringbitmap"
+            elif isinstance(partition_key_identifiers, BitMap):
                 value_list = list(partition_key_identifiers)
             elif isinstance(partition_key_identifiers, bitarray):
                 value_list = [i for i, bit in enumerate(partition_key_identifiers) if bit]
@@ -195,36 +222,48 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
                     value_list.append(int(item))  # type: ignore
             else:
                 raise ValueError(f"Unsupported partition key identifier type for roaring bitmap: {type(partition_key_identifiers)}")
-
-            table_name = f"{self.tableprefix}_cache_{partition_key}"
-            self.cursor.execute(
-                sql.SQL(
-                    "INSERT INTO {0} (query_hash, partition_keys) VALUES (%s, rb_build(%s)) ON CONFLICT (query_hash) DO UPDATE SET partition_keys = EXCLUDED.partition_keys"
-                ).format(sql.Identifier(table_name)),
-                (key, value_list),
-            )
-
-            # Also create entry in queries table for exists() method to work properly
-            self.cursor.execute(
-                sql.SQL(
-                    "INSERT INTO {0} (query_hash, partition_key, query) VALUES (%s, %s, %s) ON CONFLICT (query_hash, partition_key) DO UPDATE SET last_seen = now()"
-                ).format(sql.Identifier(self.tableprefix + "_queries")),
-                (key, partition_key, ""),  # Empty query text for cache entries
-            )
-
-            self.db.commit()
-            return True
         except ValueError as e:
             logger.error(f"Invalid partition key identifiers for key {key} in partition {partition_key}: {e}")
             raise e
-        except Exception as e:
-            logger.error("Failed to set partition key identifiers for key %s in partition %s: %s", key, partition_key, e)
+
+        for attempt in range(2):
             try:
-                self.db.rollback()
-            except Exception as rollback_error:
-                logger.error("Failed to rollback transaction: %s", rollback_error)
-            return False
+                # Ensure partition table exists
+                self._ensure_partition_table(partition_key, "integer")
+
+                table_name = f"{self.tableprefix}_cache_{partition_key}"
+                self.cursor.execute(
+                    sql.SQL(
+                        "INSERT INTO {0} (query_hash, partition_keys) VALUES (%s, " + build_expression + ") "
+                        "ON CONFLICT (query_hash) DO UPDATE SET partition_keys = EXCLUDED.partition_keys"
+                    ).format(sql.Identifier(table_name)),
+                    (key, value_list),
+                )
 
+                # Also create entry in queries table for exists() method to work properly
+                self.cursor.execute(
+                    sql.SQL(
+                        "INSERT INTO {0} (query_hash, partition_key, query) VALUES (%s, %s, %s) ON CONFLICT (query_hash, partition_key) DO UPDATE SET last_seen = now()"
+                    ).format(sql.Identifier(self.tableprefix + "_queries")),
+                    (key, partition_key, ""),  # Empty query text for cache entries
+                )
+
+                self.db.commit()
+                return True
+            except Exception as e:
+                try:
+                    self.db.rollback()
+                except Exception as rollback_error:
+                    logger.error("Failed to rollback transaction: %s", rollback_error)
+                if attempt == 0:
+                    # The partition table may have been dropped by another process since its metadata was cached
+                    logger.warning("Failed to set partition key identifiers for key %s in partition %s, retrying: %s", key, partition_key, e)
+                    self._invalidate_partition_metadata(partition_key)
+                else:
+                    logger.error("Failed to set partition key identifiers for key %s in partition %s: %s", key, partition_key, e)
+        return False
+
+    @pooled
     def get(self, key: str, partition_key: str = "partition_key") -> BitMap | None:  # type: ignore
         """Get value from partition-specific cache table."""
 
@@ -234,10 +273,7 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
 
         table_name = f"{self.tableprefix}_cache_{partition_key}"
         try:
-            self.cursor.execute(
-                sql.SQL("SELECT partition_keys::bytea FROM {0} WHERE query_hash = %s").format(sql.Identifier(table_name)),
-                (key,),
-            )
+            self.cursor.execute(self._statement("SELECT partition_keys::bytea FROM {0} WHERE query_hash = %s", table_name), (key,), prepare=True)
             result = self.cursor.fetchone()
             if result is None or result[0] is None:
                 return None
@@ -261,6 +297,7 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
                     pass
                 return None
 
+    @pooled
     def get_intersected(self, keys: set[str], partition_key: str = "partition_key") -> tuple[BitMap | None, int]:  # type: ignore
         """Get intersection from partition-specific table."""
         datatype = self._get_partition_datatype(partition_key)
@@ -270,15 +307,15 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
         # Check which exist
         table_name = f"{self.tableprefix}_cache_{partition_key}"
         try:
-            query = sql.SQL("SELECT query_hash FROM {0} WHERE query_hash = ANY(%s) AND partition_keys IS NOT NULL").format(sql.Identifier(table_name))
-            self.cursor.execute(query, (list(keys),))
+            query = self._statement("SELECT query_hash FROM {0} WHERE query_hash = ANY(%s) AND partition_keys IS NOT NULL", table_name)
+            self.cursor.execute(query, (list(keys),), prepare=True)
             keys_set = {x[0] for x in self.cursor.fetchall()}
 
             if not keys_set:
                 return None, 0
 
             q = self.get_intersected_sql(partition_key)
-            self.cursor.execute(q, (list(keys_set),))
+            self.cursor.execute(q, (list(keys_set),), prepare=True)
 
             result = self.cursor.fetchone()
             if result is None or result[0] is None:
@@ -306,9 +343,7 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
     def get_intersected_sql(self, partition_key: str = "partition_key") -> sql.Composed:
         """Get intersection SQL for partition-specific table."""
         table_name = f"{self.tableprefix}_cache_{partition_key}"
-        return sql.SQL("SELECT rb_and_agg(partition_keys)::bytea FROM (SELECT partition_keys FROM {0} WHERE query_hash = ANY(%s)) AS selected").format(
-            sql.Identifier(table_name)
-        )
+        return self._statement("SELECT rb_and_agg(partition_keys)::bytea FROM (SELECT partition_keys FROM {0} WHERE query_hash = ANY(%s)) AS selected", table_name)
 
     def get_intersected_sql_wk(self, keys, partition_key: str = "partition_key") -> str:
         """Get intersection SQL with keys for partition-specific table. Using ANY with properly escaped literals."""
@@ -332,7 +367,11 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
         if not filtered_keys:
             return None, 0
 
-        intersect_sql_str = self.get_intersected_sql_wk(filtered_keys, partition_key)
+        return self.get_intersected_lazy_sql(filtered_keys, partition_key), len(filtered_keys)
+
+    def get_intersected_lazy_sql(self, keys: set[str], partition_key: str = "partition_key", datatype: str | None = None) -> str:
+        """Get the lazy intersection subquery for the given (existing) keys without touching the database."""
+        intersect_sql_str = self.get_intersected_sql_wk(keys, partition_key)
 
         r = (
             sql.SQL("""(
@@ -350,8 +389,9 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
             .as_string()
         )
 
-        return r, len(filtered_keys)
+        return r
 
+    @pooled
     def set_cache_lazy(self, key: str, query: str, partition_key: str = "partition_key") -> bool:
         """
         Store partition key identifiers in cache by executing the provided query directly.
@@ -418,6 +458,8 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
 
         except Exception as e:
             logger.error(f"Failed to set cache lazily for key {key}: {e}")
+            # The partition may have been dropped by another process
+            self._invalidate_partition_metadata(partition_key)
             if not self.db.closed:
                 self.db.rollback()
             return False
@@ -427,6 +469,7 @@ class PostgreSQLRoaringBitCacheHandler(PostgreSQLAbstractCacheHandler):
         """PostgreSQL roaring bit handler supports only integer datatype."""
         return {"integer"}
 
+    @pooled
     def register_partition_key(self, partition_key: str, datatype: str, **kwargs) -> None:
         """Register a partition key with the cache handler."""
         if datatype != "integer":
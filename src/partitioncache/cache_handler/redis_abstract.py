@@ -390,19 +390,29 @@ class RedisAbstractCacheHandler(AbstractCacheHandler):
                     existing_keys.add(key)
             return existing_keys
         else:
-            # Query mode: Check each key's query status
+            # Query mode: Fetch the query status (termination bits and query metadata) of all keys in one pipeline
+            key_list = list(keys)
+            pipe = self.db.pipeline(transaction=False)
+            for key in key_list:
+                pipe.exists(self._get_cache_key(f"_LIMIT_{key}", partition_key))
+                pipe.exists(self._get_cache_key(f"_TIMEOUT_{key}", partition_key))
+                pipe.exists(f"query:{partition_key}:{key}")
+                pipe.hget(f"query:{partition_key}:{key}", "status")
+                pipe.exists(self._get_cache_key(key, partition_key))
+            results = pipe.execute()
+
             existing_keys = set()
-            for key in keys:
-                query_status = self.get_query_status(key, partition_key)
-                if query_status is None:
-                    continue  # No query -> exclude key
-                elif query_status == "ok":
-                    # Query OK -> also check cache entry exists
-                    cache_key = self._get_cache_key(key, partition_key)
-                    if self.db.exists(cache_key):
-                        existing_keys.add(key)
-                else:  # timeout or failed
+            for i, key in enumerate(key_list):
+                has_limit, has_timeout, has_query, status, has_cache = results[5 * i : 5 * i + 5]
+                if isinstance(status, bytes):
+                    status = status.decode()
+                if has_limit or has_timeout:
                     existing_keys.add(key)  # Query has error status -> include key
+                elif has_query and status and status != "ok":
+                    existing_keys.add(key)
+                elif has_cache:
+                    # Query OK (or no query but cache entry) -> cache entry exists
+                    existing_keys.add(key)
 
             return existing_keys
 
@@ -4,6 +4,7 @@ from logging import getLogger
 
 from bitarray import bitarray
 
+from partitioncache.cache_handler.datatype_utils import is_integer_array, to_uint32_array
 from partitioncache.cache_handler.redis_abstract import RedisAbstractCacheHandler
 
 logger = getLogger("PartitionCache")
@@ -20,6 +21,8 @@ class RedisBitCacheHandler(RedisAbstractCacheHandler):
         """Redis bit handler supports only integer datatype."""
         return {"integer"}
 
+    accepts_integer_arrays = True
+
     def __repr__(self) -> str:
         return "redis_bit"
 
@@ -117,7 +120,7 @@ class RedisBitCacheHandler(RedisAbstractCacheHandler):
 
     def set_cache(self, key: str, partition_key_identifiers: set[int] | set[str] | set[float] | set[datetime], partition_key: str = "partition_key") -> bool:
         """Store a set of partition key identifiers in the cache for a specific partition key. Only integer values are supported."""
-        if not partition_key_identifiers:
+        if len(partition_key_identifiers) == 0:
             return True
         # Ensure partition exists with correct datatype and bitsize
         self._ensure_partition_exists(partition_key)
@@ -128,13 +131,17 @@ class RedisBitCacheHandler(RedisAbstractCacheHandler):
             self._set_partition_metadata(partition_key, "integer", bitsize)
         val = bitarray(bitsize)
         try:
-            for k in partition_key_identifiers:
-                if isinstance(k, int):
-                    val[k] = 1
-                elif isinstance(k, str):
-                    val[int(k)] = 1
-                else:
-                    raise ValueError("Only integer values are supported")
+            if is_integer_array(partition_key_identifiers):
+                # Columnar results set all bits in one indexed assignment
+                val[to_uint32_array(partition_key_identifiers)] = 1
+            else:
+                for k in partition_key_identifiers:
+                    if isinstance(k, int):
+                        val[k] = 1
+                    elif isinstance(k, str):
+                        val[int(k)] = 1
+                    else:
+                        raise ValueError("Only integer values are supported")
         except (IndexError, ValueError):
             raise ValueError(f"Partition key identifiers {partition_key_identifiers} is out of range for bitarray of size {bitsize}") from None
         try:
@@ -2,6 +2,7 @@ from datetime import datetime
 
 from bitarray import bitarray
 
+from partitioncache.cache_handler.datatype_utils import is_integer_array, to_uint32_array
 from partitioncache.cache_handler.rocks_db_abstract import RocksDBAbstractCacheHandler
 
 
@@ -16,6 +17,8 @@ class RocksDBBitCacheHandler(RocksDBAbstractCacheHandler):
         """RocksDB bit handler supports only integer datatype."""
         return {"integer"}
 
+    accepts_integer_arrays = True
+
     def __repr__(self) -> str:
         return "rocksdb_bit"
 
@@ -102,7 +105,7 @@ class RocksDBBitCacheHandler(RocksDBAbstractCacheHandler):
 
     def set_cache(self, key: str, partition_key_identifiers: set[int] | set[str] | set[float] | set[datetime], partition_key: str = "partition_key") -> bool:
         """Store a set of partition key identifiers in the cache for a specific partition key. Only integer values are supported."""
-        if not partition_key_identifiers:
+        if len(partition_key_identifiers) == 0:
             return True
         # Ensure partition exists with correct datatype and bitsize
         self._ensure_partition_exists(partition_key)
@@ -114,16 +117,20 @@ class RocksDBBitCacheHandler(RocksDBAbstractCacheHandler):
 
         bitval = bitarray(bitsize)
         try:
-            for k in partition_key_identifiers:
-                if isinstance(k, int):
-                    bitval[k] = 1
-                elif isinstance(k, str):
-                    try:
-                        bitval[int(k)] = 1
-                    except ValueError:
-                        raise ValueError(f"RocksDB bit handler only supports integer values or numeric strings. Got non-numeric string: '{k}'") from None
-                else:
-                    raise ValueError(f"RocksDB bit handler only supports integer values. Got {type(k)}: {k}")
+            if is_integer_array(partition_key_identifiers):
+                # Columnar results set all bits in one indexed assignment
+                bitval[to_uint32_array(partition_key_identifiers)] = 1
+            else:
+                for k in partition_key_identifiers:
+                    if isinstance(k, int):
+                        bitval[k] = 1
+                    elif isinstance(k, str):
+                        try:
+                            bitval[int(k)] = 1
+                        except ValueError:
+                            raise ValueError(f"RocksDB bit handler only supports integer values or numeric strings. Got non-numeric string: '{k}'") from None
+                    else:
+                        raise ValueError(f"RocksDB bit handler only supports integer values. Got {type(k)}: {k}")
         except IndexError:
             raise ValueError(f"Partition key identifiers {partition_key_identifiers} is out of range for bitarray of size {bitsize}") from None
         try:
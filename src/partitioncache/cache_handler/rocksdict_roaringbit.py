@@ -4,6 +4,7 @@ from logging import getLogger
 from bitarray import bitarray
 from pyroaring import BitMap
 
+from partitioncache.cache_handler.datatype_utils import is_integer_array, to_uint32_array
 from partitioncache.cache_handler.rocksdict_abstract import RocksDictAbstractCacheHandler
 
 logger = getLogger("PartitionCache")
@@ -21,6 +22,8 @@ class RocksDictRoaringBitCacheHandler(RocksDictAbstractCacheHandler):
         """RocksDict roaring bit handler supports only integer datatype."""
         return {"integer"}
 
+    accepts_integer_arrays = True
+
     def __repr__(self) -> str:
         return "rocksdict_roaringbit"
 
@@ -65,9 +68,9 @@ class RocksDictRoaringBitCacheHandler(RocksDictAbstractCacheHandler):
     ) -> bool:
         """
         Store partition key identifiers as a serialized roaring bitmap.
-        Accepts set[int], BitMap, bitarray, or list of integers.
+        Accepts set[int], BitMap, bitarray, list of integers, or an integer array.
         """
-        if not partition_key_identifiers:
+        if len(partition_key_identifiers) == 0:
             return True
 
         # Ensure partition exists with integer datatype
@@ -80,6 +83,8 @@ class RocksDictRoaringBitCacheHandler(RocksDictAbstractCacheHandler):
         # Convert input to BitMap
         if isinstance(partition_key_identifiers, BitMap):
             bm = partition_key_identifiers
+        elif is_integer_array(partition_key_identifiers):
+            bm = BitMap(to_uint32_array(partition_key_identifiers))
         elif isinstance(partition_key_identifiers, bitarray):
             bm = BitMap(i for i, bit in enumerate(partition_key_identifiers) if bit)
         elif isinstance(partition_key_identifiers, list | set):
@@ -49,7 +49,7 @@ def main():
 
     # Add common argument groups
     add_cache_args(parser, require_partition_key=True)
-    add_database_args(parser)
+    add_database_args(parser, include_fetch_size=True)
     add_queue_args(parser)
     add_spatial_args(parser, include_buffer_distance=False)
     add_variant_generation_args(parser)
@@ -223,7 +223,7 @@ def main():
                 db_connection_params = get_database_connection_params(args)
 
                 if args.db_backend == "postgresql":
-                    db_handler = get_db_handler("postgres", **db_connection_params)
+                    db_handler = get_db_handler("postgres", itersize=args.fetch_size, **db_connection_params)
                 elif args.db_backend == "mysql":
                     db_handler = get_db_handler("mysql", **db_connection_params)
                 elif args.db_backend == "sqlite":
@@ -238,9 +238,12 @@ def main():
                         cache.set_query(hash_value, query)
                         continue
 
-                    # Execute query and store results
-                    result = set(db_handler.execute(query))
-                    if result:
+                    # Execute query and store results, integer columns are transferred as arrays where the cache handler accepts them
+                    if args.partition_datatype == "integer" and cache_handler.accepts_integer_arrays and db_handler.supports_execute_array:
+                        result = db_handler.execute_array(query, "integer", unique=True)
+                    else:
+                        result = set(db_handler.execute_iter(query))
+                    if len(result) > 0:
                         cache.set_cache(hash_value, result)
                         cache.set_query(hash_value, query)
                         logger.debug(f"Stored query {hash_value} with {len(result)} results")
@@ -15,16 +15,19 @@ from typing import Any
 
 import dotenv
 
+from partitioncache.db_handler.abstract import DEFAULT_FETCH_SIZE
+
 logger = getLogger("PartitionCache")
 
 
-def add_database_args(parser: argparse.ArgumentParser, include_sqlite: bool = True) -> None:
+def add_database_args(parser: argparse.ArgumentParser, include_sqlite: bool = True, include_fetch_size: bool = False) -> None:
     """
     Add common database connection arguments to an ArgumentParser.
 
     Args:
         parser: The ArgumentParser to add arguments to
         include_sqlite: Whether to include SQLite in backend choices
+        include_fetch_size: Whether to include the fetch size for tools that stream query results
     """
     db_group = parser.add_argument_group("database connection")
 
@@ -41,6 +44,14 @@ def add_database_args(parser: argparse.ArgumentParser, include_sqlite: bool = Tr
     if include_sqlite:
         db_group.add_argument("--db-dir", type=str, default="data/test_db.sqlite", help="Database directory/path for SQLite (default: data/test_db.sqlite)")
 
+    if include_fetch_size:
+        db_group.add_argument(
+            "--fetch-size",
+            type=int,
+            default=DEFAULT_FETCH_SIZE,
+            help=f"Rows fetched per round trip when streaming query results from PostgreSQL (default: {DEFAULT_FETCH_SIZE})",
+        )
+
 
 def add_cache_args(parser: argparse.ArgumentParser, require_partition_key: bool = False) -> None:
     """
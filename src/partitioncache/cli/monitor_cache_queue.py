@@ -6,10 +6,15 @@ import argparse
 import concurrent.futures
 import datetime
 import os
+import socket
 import threading
 import time
+import uuid
+from collections.abc import Iterable
+from itertools import islice
 
 import psycopg
+from pyroaring import BitMap
 
 from partitioncache.apply_cache import (
     extend_query_with_partition_keys,
@@ -30,16 +35,21 @@ from partitioncache.cli.common_args import (
     resolve_cache_backend,
 )
 from partitioncache.db_handler import get_db_handler
+from partitioncache.db_handler.abstract import DEFAULT_FETCH_SIZE, AbstractDBHandler
 from partitioncache.logging_utils import configure_enhanced_logging, get_thread_aware_logger
-from partitioncache.query_accelerator import create_query_accelerator
-from partitioncache.query_processor import generate_all_query_hash_pairs
+from partitioncache.query_accelerator import create_query_accelerator, parse_refresh_tables
+from partitioncache.query_processor import extract_table_columns, generate_all_query_hash_pairs, hash_query, query_shape
 from partitioncache.queue import (
+    acquire_fragment_lease,
     get_queue_lengths,
+    heartbeat_worker,
     pop_from_original_query_queue,
     pop_from_original_query_queue_blocking,
-    pop_from_query_fragment_queue,
     pop_from_query_fragment_queue_blocking,
+    pop_many_from_query_fragment_queue,
     push_to_query_fragment_queue,
+    release_fragment_lease,
+    unregister_worker,
 )
 
 logger = get_thread_aware_logger("PartitionCache")
@@ -52,6 +62,7 @@ query_accelerator = None
 # Initialize threading components
 status_lock = threading.Lock()
 active_futures: dict[concurrent.futures.Future, str] = {}  # Map of Future to query_hash
+in_flight_fragments: dict[concurrent.futures.Future, tuple[str, str]] = {}  # Map of Future to (query_hash, partition_key)
 pool: concurrent.futures.ThreadPoolExecutor | None = None  # Initialize pool as None
 
 # Query time logging lock and file handle
@@ -61,6 +72,121 @@ query_time_file = None
 # Phase 1 Optimization: Remove semaphore bottleneck to enable true 12-thread parallelism
 # Note: Database connection pooling should be used instead of artificial threading limits
 
+# Database handlers reused across run_and_store_query executions, cached per worker thread and connection settings
+db_handler_local = threading.local()
+db_handler_registry_lock = threading.Lock()
+db_handler_registry: list[dict] = []  # Per-thread handler caches, closed on shutdown
+db_handler_health_check_interval = 30.0  # Probe cached handlers idle for longer than this (seconds) before reuse
+
+
+def _db_handler_healthy(db_handler, idle_time: float) -> bool:
+    """
+    Check whether a cached database handler can be reused, resetting a leftover transaction if needed.
+
+    Args:
+        db_handler: The cached database handler
+        idle_time: Seconds since the handler was last used
+
+    Returns:
+        bool: True if the handler can be reused, False if it has to be reconnected
+    """
+    conn = getattr(db_handler, "conn", None)
+    if conn is None:
+        return False
+    try:
+        if isinstance(conn, psycopg.Connection):
+            if conn.closed:
+                return False
+            if conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+                conn.rollback()
+            if idle_time > db_handler_health_check_interval:
+                conn.execute("SELECT 1")
+                conn.rollback()
+        elif hasattr(conn, "is_connected") and idle_time > db_handler_health_check_interval:
+            return bool(conn.is_connected())
+        return True
+    except Exception as e:
+        logger.warning(f"Cached database connection failed health check: {e}")
+        return False
+
+
+def _close_db_handler(db_handler) -> None:
+    try:
+        db_handler.close()
+    except Exception as e:
+        logger.debug(f"Error closing database handler: {e}")
+
+
+def get_worker_db_handler(db_type: str, db_connection_params: dict):
+    """
+    Get the database handler of the current worker thread for the given connection settings.
+
+    The handler is created on first use and reused by later executions in the same thread.
+    A handler that fails its health check is closed and replaced by a new connection.
+
+    Args:
+        db_type: Database type passed to get_db_handler
+        db_connection_params: Connection parameters, including the statement timeout
+
+    Returns:
+        The database handler
+    """
+    handlers = getattr(db_handler_local, "handlers", None)
+    if handlers is None:
+        handlers = db_handler_local.handlers = {}
+        with db_handler_registry_lock:
+            db_handler_registry.append(handlers)
+
+    key = (db_type, tuple(sorted(db_connection_params.items())))
+    entry = handlers.pop(key, None)
+    if entry is not None:
+        db_handler, last_used = entry
+        if _db_handler_healthy(db_handler, time.monotonic() - last_used):
+            handlers[key] = (db_handler, last_used)
+            return db_handler
+        logger.info(f"Reconnecting {db_type} database handler")
+        _close_db_handler(db_handler)
+
+    db_handler = get_db_handler(db_type, **db_connection_params)
+    handlers[key] = (db_handler, time.monotonic())
+    return db_handler
+
+
+def release_worker_db_handler(db_handler, reusable: bool = True) -> None:
+    """
+    Return a database handler obtained from get_worker_db_handler after a query execution.
+
+    Args:
+        db_handler: The database handler
+        reusable: False if the connection is in an unknown state; it is closed and reconnected on next use
+    """
+    handlers = getattr(db_handler_local, "handlers", {})
+    key = next((k for k, (h, _) in handlers.items() if h is db_handler), None)
+
+    if reusable and key is not None:
+        conn = getattr(db_handler, "conn", None)
+        try:
+            # Do not keep the connection idle in transaction between fragments
+            if isinstance(conn, psycopg.Connection) and not conn.closed and conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+                conn.rollback()
+            handlers[key] = (db_handler, time.monotonic())
+            return
+        except Exception as e:
+            logger.warning(f"Failed to reset database connection, reconnecting on next use: {e}")
+
+    if key is not None:
+        del handlers[key]
+    _close_db_handler(db_handler)
+
+
+def close_worker_db_handlers() -> None:
+    """Close the database handlers cached by all worker threads."""
+    with db_handler_registry_lock:
+        for handlers in db_handler_registry:
+            for db_handler, _ in list(handlers.values()):
+                _close_db_handler(db_handler)
+            handlers.clear()
+
 
 def initialize_query_time_logging():
     """Initialize query time logging file handle."""
@@ -124,6 +250,484 @@ fragment_processor_exit = threading.Event()  # Exit signal for fragment processo
 last_status_log_time = 0.0
 status_log_interval = 10  # Log status every 10 seconds when idle
 
+# Number of generated fragments skipped at enqueue time because they were already cached
+skipped_cached_fragments = 0
+# Number of popped fragments skipped because they were already being executed (here or by another monitor)
+skipped_in_flight_fragments = 0
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    AIMD limit on the number of fragments executed concurrently, driven by fragment latency.
+
+    Completed fragments are collected in windows of `limit` samples. Each latency is normalized by the
+    baseline of its fragment shape (the lowest latency seen recently for fragments of that shape), so a
+    change in the mix of cheap and expensive fragments is not mistaken for overload. After each window
+    the limit is decreased multiplicatively if fragments failed or the median normalized latency exceeded
+    `latency_tolerance`, and increased by one if the limit was saturated. Baselines slowly follow the
+    observed latency, so permanently slower fragments do not keep the limit at its minimum.
+    """
+
+    def __init__(self, min_limit: int, max_limit: int, initial_limit: int | None = None, latency_tolerance: float = 2.0, backoff_ratio: float = 0.75):
+        """
+        Args:
+            min_limit: Lowest number of concurrent fragments.
+            max_limit: Highest number of concurrent fragments (the thread pool size).
+            initial_limit: Starting limit, defaults to halfway between min_limit and max_limit.
+            latency_tolerance: Ratio of window median to baseline latency considered as overload.
+            backoff_ratio: Factor applied to the limit on overload.
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        if initial_limit is None:
+            initial_limit = (self.min_limit + self.max_limit) // 2
+        self.limit = min(self.max_limit, max(self.min_limit, initial_limit))
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.shape_baselines: dict[str, float] = {}
+        self.last_decision = f"initial limit {self.limit}"
+        self._samples: list[tuple[str, float]] = []
+        self._failures = 0
+        self._saturated = False
+        self._lock = threading.Lock()
+
+    def track(self, saturated: bool, shape: str = ""):
+        """
+        Create a done callback for a submitted fragment future that records its latency.
+
+        Args:
+            saturated: Whether the submission filled all slots allowed by the current limit.
+            shape: Shape of the fragment (see FragmentCostModel.fragment_shape), latencies are compared per shape.
+
+        Returns:
+            Callable[[concurrent.futures.Future], None]: Callback for Future.add_done_callback.
+        """
+        start = time.perf_counter()
+
+        def done(future: concurrent.futures.Future) -> None:
+            try:
+                success = bool(future.result())
+            except Exception:
+                success = False
+            self.record(time.perf_counter() - start, success, saturated, shape)
+
+        return done
+
+    def record(self, latency: float, success: bool, saturated: bool, shape: str = "") -> None:
+        """
+        Record a completed fragment and adjust the limit once a window is complete.
+
+        Args:
+            latency: Execution time of the fragment in seconds.
+            success: Whether the fragment was executed successfully.
+            saturated: Whether the fragment was submitted while the limit was saturated.
+            shape: Shape of the fragment, latencies are normalized by the baseline of their shape.
+        """
+        with self._lock:
+            self._samples.append((shape, latency))
+            self._failures += 0 if success else 1
+            self._saturated = self._saturated or saturated
+            if len(self._samples) < self.limit:
+                return
+
+            samples, failures, saturated_window = self._samples, self._failures, self._saturated
+            self._samples, self._failures, self._saturated = [], 0, False
+
+            # Fragments of shapes without a baseline yet only establish their baseline
+            ratios = sorted(sample_latency / self.shape_baselines[sample_shape] for sample_shape, sample_latency in samples if self.shape_baselines.get(sample_shape))
+            median = ratios[len(ratios) // 2] if ratios else None
+
+            latencies_by_shape: dict[str, list[float]] = {}
+            for sample_shape, sample_latency in samples:
+                latencies_by_shape.setdefault(sample_shape, []).append(sample_latency)
+            for sample_shape, latencies in latencies_by_shape.items():
+                shape_median = sorted(latencies)[len(latencies) // 2]
+                baseline = self.shape_baselines.get(sample_shape)
+                self.shape_baselines[sample_shape] = shape_median if baseline is None else min(shape_median, 0.9 * baseline + 0.1 * shape_median)
+
+            old_limit = self.limit
+            if failures:
+                self.limit = max(self.min_limit, int(self.limit * self.backoff_ratio))
+                reason = f"{failures} failed fragments"
+            elif median is not None and median > self.latency_tolerance:
+                self.limit = max(self.min_limit, int(self.limit * self.backoff_ratio))
+                reason = f"median latency {median:.2f} x shape baseline > {self.latency_tolerance}"
+            elif saturated_window:
+                self.limit = min(self.max_limit, self.limit + 1)
+                reason = "latency within tolerance and limit saturated"
+            else:
+                return
+
+            if self.limit != old_limit:
+                self.last_decision = f"{old_limit} -> {self.limit} ({reason})"
+                logger.info(f"Adaptive concurrency: limit {self.last_decision}")
+
+
+# Adaptive concurrency limit of the fragment executor (None if the pool size is fixed)
+concurrency_limit: AdaptiveConcurrencyLimit | None = None
+
+
+def get_concurrency_limit() -> int:
+    """Return the current maximum number of concurrently executed fragments."""
+    return concurrency_limit.limit if concurrency_limit is not None else args.max_processes
+
+
+class FragmentCostModel:
+    """
+    Predicts fragment execution times from earlier executions of fragments with the same shape.
+
+    The shape of a fragment is its query with all literals replaced by placeholders. Execution times are
+    smoothed per shape. Fragments of unknown shape are predicted from their EXPLAIN total cost, scaled by
+    the observed seconds per cost unit. Fragments recorded as timed out in the query time log are known
+    to time out again.
+    """
+
+    def __init__(self, smoothing: float = 0.3):
+        """
+        Args:
+            smoothing: Weight of a new observation in the exponentially smoothed execution times.
+        """
+        self.smoothing = smoothing
+        self.shape_times: dict[str, float] = {}
+        self.seconds_per_cost: float | None = None
+        self.timed_out_hashes: set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fragment_shape(query: str) -> str:
+        """Return the hash of the query with literals replaced by placeholders."""
+        return hash_query(query_shape(query))
+
+    def load_query_time_log(self, path: str) -> int:
+        """
+        Load timed out fragments from a query time log written by log_query_time.
+
+        Args:
+            path: Path of the CSV log file (query_hash,execution_time).
+
+        Returns:
+            int: Number of known timed out fragments.
+        """
+        if not os.path.exists(path):
+            return len(self.timed_out_hashes)
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    query_hash = line.split(",", 1)[0]
+                    if query_hash.endswith("_timeout"):
+                        self.timed_out_hashes.add(query_hash.removesuffix("_timeout"))
+        except Exception as e:
+            logger.warning(f"Failed to load query time log {path} for cost model: {e}")
+        return len(self.timed_out_hashes)
+
+    def record(self, query: str, execution_time: float, explain_cost: float | None = None) -> None:
+        """
+        Record the execution time of a fragment.
+
+        Args:
+            query: The fragment query.
+            execution_time: Execution time in seconds.
+            explain_cost: EXPLAIN total cost of the fragment, if it was estimated.
+        """
+        shape = self.fragment_shape(query)
+        with self._lock:
+            previous = self.shape_times.get(shape)
+            self.shape_times[shape] = execution_time if previous is None else (1 - self.smoothing) * previous + self.smoothing * execution_time
+            if explain_cost:
+                ratio = execution_time / explain_cost
+                self.seconds_per_cost = ratio if self.seconds_per_cost is None else (1 - self.smoothing) * self.seconds_per_cost + self.smoothing * ratio
+
+    def predict(self, query: str, explain_cost: float | None = None) -> float | None:
+        """
+        Predict the execution time of a fragment.
+
+        Args:
+            query: The fragment query.
+            explain_cost: EXPLAIN total cost of the fragment, if it was estimated.
+
+        Returns:
+            float | None: Predicted execution time in seconds, None if nothing is known about the fragment.
+        """
+        predicted = self.shape_times.get(self.fragment_shape(query))
+        if predicted is None and explain_cost is not None and self.seconds_per_cost is not None:
+            predicted = explain_cost * self.seconds_per_cost
+        return predicted
+
+
+class CostAwareFragmentScheduler:
+    """
+    Buffers popped fragments and hands out the cheapest ones first.
+
+    Fragments are ordered by predicted execution time minus the time they have been waiting in the buffer,
+    so expensive fragments are delayed but not starved. Fragments of unknown cost are run first to learn
+    their cost. EXPLAIN cost estimates are computed in a background thread and used once available.
+    """
+
+    def __init__(
+        self,
+        cost_model: FragmentCostModel,
+        lookahead: int = 4,
+        timeout: float = 0.0,
+        explain_cost=None,
+        probe_after: int = 10,
+        probe_interval: float = 300.0,
+    ):
+        """
+        Args:
+            cost_model: The cost model used for predictions.
+            lookahead: Number of buffered fragments per free worker slot.
+            timeout: Statement timeout in seconds (0 = no timeout), fragments predicted to exceed it are deferred.
+            explain_cost: Optional callable returning the EXPLAIN total cost of a query (or None).
+            probe_after: Number of deferrals of a shape after which one of its fragments is executed again.
+            probe_interval: Seconds after which a deferred shape is executed again regardless of its deferrals.
+        """
+        self.cost_model = cost_model
+        self.lookahead = max(1, lookahead)
+        self.timeout = timeout
+        self.explain_cost = explain_cost
+        self.probe_after = max(1, probe_after)
+        self.probe_interval = probe_interval
+        self.pending: list[tuple[tuple[str, str, str, str], float | concurrent.futures.Future | None, float]] = []
+        self._deferrals: dict[str, tuple[int, float]] = {}
+        self._explain_executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    def pop_count(self, free_slots: int) -> int:
+        """Return how many fragments to pop from the queue to fill the buffer for free_slots slots."""
+        return max(0, free_slots * self.lookahead - len(self.pending))
+
+    def add(self, fragments: list[tuple[str, str, str, str]]) -> None:
+        """Add popped fragments (query, hash, partition_key, partition_datatype) to the buffer."""
+        now = time.monotonic()
+        for fragment in fragments:
+            query = fragment[0]
+            cost = None
+            if self.explain_cost is not None and self.cost_model.predict(query) is None:
+                if self._explain_executor is None:
+                    self._explain_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain_cost")
+                cost = self._explain_executor.submit(self.explain_cost, query)
+            self.pending.append((fragment, cost, now))
+
+    @staticmethod
+    def _estimated_cost(cost: float | concurrent.futures.Future | None) -> float | None:
+        """Return the EXPLAIN cost of a buffered fragment, None while it is still being estimated."""
+        if isinstance(cost, concurrent.futures.Future):
+            if not cost.done() or cost.cancelled() or cost.exception() is not None:
+                return None
+            estimated: float | None = cost.result()
+            return estimated
+        return cost
+
+    def take(self, n: int) -> list[tuple[tuple[str, str, str, str], float | None]]:
+        """
+        Take the n fragments to run next.
+
+        Returns:
+            list[tuple[tuple[str, str, str, str], float | None]]: Fragments with their EXPLAIN cost (if estimated).
+        """
+        now = time.monotonic()
+        entries = [(fragment, self._estimated_cost(cost), enqueued_at) for fragment, cost, enqueued_at in self.pending]
+        order = sorted(range(len(entries)), key=lambda i: (self.cost_model.predict(entries[i][0][0], entries[i][1]) or 0.0) - (now - entries[i][2]))
+        taken = set(order[:n])
+        self.pending = [entry for i, entry in enumerate(self.pending) if i not in taken]
+        return [(entries[i][0], entries[i][1]) for i in order[:n]]
+
+    def known_timeout(self, query_hash: str) -> bool:
+        """Return True if the fragment itself is known to exceed the statement timeout."""
+        return bool(self.timeout) and query_hash in self.cost_model.timed_out_hashes
+
+    def defers(self, query: str) -> bool:
+        """
+        Return True if the fragment should be deferred because its shape is predicted to exceed the statement timeout.
+
+        Shape predictions can be wrong for individual fragments, so a deferred shape is executed again
+        (probed) after probe_after deferrals or probe_interval seconds, which also refreshes its prediction.
+        EXPLAIN based predictions only reorder fragments, they are too inaccurate to defer execution.
+        """
+        if not self.timeout:
+            return False
+        shape = self.cost_model.fragment_shape(query)
+        predicted = self.cost_model.shape_times.get(shape)
+        if predicted is None or predicted < self.timeout:
+            self._deferrals.pop(shape, None)
+            return False
+        now = time.monotonic()
+        count, since = self._deferrals.get(shape, (0, now))
+        if count >= self.probe_after or now - since >= self.probe_interval:
+            self._deferrals.pop(shape, None)
+            return False
+        self._deferrals[shape] = (count + 1, since)
+        return True
+
+    def track(self, query: str, explain_cost: float | None = None):
+        """Create a done callback for a submitted fragment future that records its execution time."""
+        start = time.perf_counter()
+
+        def done(future: concurrent.futures.Future) -> None:
+            self.cost_model.record(query, time.perf_counter() - start, explain_cost)
+
+        return done
+
+    def drain(self) -> list[tuple[str, str, str, str]]:
+        """Remove and return all buffered fragments and stop pending cost estimations."""
+        fragments = [fragment for fragment, _, _ in self.pending]
+        self.pending = []
+        if self._explain_executor is not None:
+            self._explain_executor.shutdown(wait=False, cancel_futures=True)
+            self._explain_executor = None
+        return fragments
+
+
+# Id of this monitor in the worker registry shared by all monitors of a queue, and the active workers
+worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+active_workers: list[str] = []
+
+
+def worker_heartbeat_loop(interval: float) -> None:
+    """
+    Send worker heartbeats to the queue backend until exit and track the monitors sharing the queue.
+
+    A monitor that misses heartbeats for three intervals is considered dead, and its partition keys are
+    reassigned to the remaining monitors. On exit the monitor unregisters itself, so that its partition
+    keys are reassigned immediately.
+
+    Args:
+        interval: Seconds between heartbeats
+    """
+    global active_workers
+
+    while True:
+        workers = heartbeat_worker(worker_id, ttl=3 * interval)
+        # Keep the last known workers if the heartbeat failed
+        if workers and workers != active_workers:
+            joined = sorted(set(workers) - set(active_workers))
+            left = sorted(set(active_workers) - set(workers))
+            logger.info(f"Worker registry: {len(workers)} active monitors (joined: {joined or '-'}, left: {left or '-'}), partition keys rebalanced")
+            active_workers = workers
+        if exit_event.wait(interval):
+            break
+
+    unregister_worker(worker_id)
+    logger.info(f"Unregistered monitor {worker_id} from worker registry")
+
+
+def get_affinity_workers() -> list[str] | None:
+    """Return the active workers to assign partition keys to, None if partition key affinity is not in effect."""
+    if args.partition_key_affinity and len(active_workers) > 1:
+        return active_workers
+    return None
+
+
+# Cost-aware scheduler of the fragment executor (None if fragments run in queue order)
+fragment_scheduler: CostAwareFragmentScheduler | None = None
+# Number of fragments deferred to the end of the queue because their shape is predicted to time out
+deferred_predicted_timeouts = 0
+
+
+def get_explain_cost(query: str) -> float | None:
+    """
+    Get the EXPLAIN total cost of a query from the PostgreSQL database.
+
+    Args:
+        query: The fragment query.
+
+    Returns:
+        float | None: The total cost of the plan, None if it could not be estimated.
+    """
+    db_connection_params = get_database_connection_params(args)
+    db_connection_params["timeout"] = args.long_running_query_timeout
+    db_connection_params["itersize"] = args.fetch_size
+    db_handler = get_worker_db_handler("postgres", db_connection_params)
+    try:
+        plan = db_handler.execute(f"EXPLAIN (FORMAT JSON) {query}")
+        release_worker_db_handler(db_handler)
+        return float(plan[0][0]["Plan"]["Total Cost"])
+    except Exception as e:
+        logger.debug(f"Failed to estimate cost of fragment: {e}")
+        release_worker_db_handler(db_handler, reusable=False)
+        return None
+
+
+def analyze_preload_columns(cache_handler, tables: list[str]) -> tuple[dict[str, set[str]], list[str]]:
+    """
+    Collect the columns of the preload tables referenced by the fragments recorded in the cache.
+
+    Args:
+        cache_handler: The cache handler whose stored fragment queries are analyzed.
+        tables: The tables to preload.
+
+    Returns:
+        tuple: Columns per table (tables without recorded fragments are omitted and preloaded completely),
+            and the partition keys as candidate sort columns.
+    """
+    table_columns: dict[str, set[str]] = {}
+    partition_keys = []
+    try:
+        partition_keys = [partition_key for partition_key, _ in cache_handler.get_partition_keys()]
+        for partition_key in partition_keys:
+            for _, query in cache_handler.get_all_queries(partition_key):
+                try:
+                    columns_by_table = extract_table_columns(query)
+                except Exception as e:
+                    logger.debug(f"Failed to parse fragment for column analysis: {e}")
+                    continue
+                for table_name, columns in columns_by_table.items():
+                    if table_name in tables:
+                        table_columns.setdefault(table_name, set()).update(columns)
+    except Exception as e:
+        logger.warning(f"Failed to analyze fragment columns, preloading all columns: {e}")
+        return {}, partition_keys
+
+    for table_name in tables:
+        if table_name in table_columns:
+            logger.info(f"Fragments reference {len(table_columns[table_name])} columns of {table_name}: {sorted(table_columns[table_name])}")
+        else:
+            logger.info(f"No recorded fragments reference {table_name}, preloading all columns")
+    return table_columns, partition_keys
+
+
+def requeue_pending_fragments(fragments: list[tuple[str, str, str, str]]) -> None:
+    """Push buffered fragments that were not executed back to the fragment queue."""
+    grouped: dict[tuple[str, str], list[tuple[str, str]]] = {}
+    for query, hash_value, partition_key, partition_datatype in fragments:
+        grouped.setdefault((partition_key, partition_datatype), []).append((query, hash_value))
+    for (partition_key, partition_datatype), query_hash_pairs in grouped.items():
+        if not push_to_query_fragment_queue(query_hash_pairs, partition_key, partition_datatype or None):
+            logger.error(f"Failed to requeue {len(query_hash_pairs)} buffered fragments for partition key {partition_key}")
+
+
+def filter_cached_fragments(query_hash_pairs: list[tuple[str, str]], partition_key: str, cache_handler) -> list[tuple[str, str]]:
+    """
+    Remove fragments that do not need to be executed from a generated batch, using a single bulk lookup.
+
+    Fragments are skipped if they are cached or their query is recorded with a terminal status (timeout/failed),
+    as determined by filter_existing_keys(..., check_query=True). If the lookup fails, all fragments are kept.
+
+    Args:
+        query_hash_pairs: Generated (query, hash) pairs.
+        partition_key: The partition key of the fragments.
+        cache_handler: The cache handler to check against.
+
+    Returns:
+        list[tuple[str, str]]: The (query, hash) pairs that still need to be enqueued.
+    """
+    global skipped_cached_fragments
+
+    if not query_hash_pairs:
+        return query_hash_pairs
+    try:
+        existing = cache_handler.filter_existing_keys({hash_value for _, hash_value in query_hash_pairs}, partition_key, check_query=True)
+    except Exception as e:
+        logger.warning(f"Failed to check generated fragments against the cache, enqueuing all: {e}")
+        return query_hash_pairs
+    if not existing:
+        return query_hash_pairs
+
+    missing = [(query, hash_value) for query, hash_value in query_hash_pairs if hash_value not in existing]
+    skipped = len(query_hash_pairs) - len(missing)
+    skipped_cached_fragments += skipped
+    logger.debug(f"Skipped {skipped} of {len(query_hash_pairs)} generated fragments already in cache (total skipped: {skipped_cached_fragments})")
+    return missing
+
 
 def query_fragment_processor(args, constraint_args):
     """Thread function that processes original queries into fragments and pushes to query fragment queue.
@@ -182,6 +786,13 @@ def query_fragment_processor(args, constraint_args):
             )
             logger.debug(f"Generated {len(query_hash_pairs)} fragments from original query")
 
+            # Only enqueue fragments that are not cached yet (unless force-recalculate)
+            if not args.force_recalculate and not args.disable_enqueue_cache_filter:
+                query_hash_pairs = filter_cached_fragments(query_hash_pairs, partition_key, get_cache_handler(resolve_cache_backend(args), singleton=True))
+                if not query_hash_pairs:
+                    logger.debug("All generated fragments are already cached, nothing to enqueue")
+                    continue
+
             # Push fragments to query fragment queue using the partition_key and datatype from queue
             success = push_to_query_fragment_queue(query_hash_pairs, partition_key, partition_datatype)
             if success:
@@ -296,6 +907,53 @@ def apply_cache_optimization(query: str, query_hash: str, partition_key: str, pa
     return query, False, stats
 
 
+def size_cache_connection_pool(max_processes: int) -> None:
+    """
+    Raise the connection pool size of the PostgreSQL cache handlers (PG_CACHE_POOL_MAX_SIZE) to the monitor's concurrency.
+
+    The worker threads, the fragment executor and the fragment processor share one cache handler. Each of them
+    may hold a connection at the same time (set_cache_lazy holds one for the whole query), so a smaller pool
+    would make threads wait for connections until the pool timeout.
+
+    Args:
+        max_processes: Maximum number of concurrently executed fragments
+    """
+    required_pool_size = max_processes + 2
+    if int(os.getenv("PG_CACHE_POOL_MAX_SIZE", "10")) < required_pool_size:
+        logger.info(f"Raising PG_CACHE_POOL_MAX_SIZE to {required_pool_size} for {max_processes} worker threads")
+        os.environ["PG_CACHE_POOL_MAX_SIZE"] = str(required_pool_size)
+
+
+def collect_partition_keys(values: Iterable, limit: int | None, use_bitmap: bool = False, chunk_size: int = DEFAULT_FETCH_SIZE) -> tuple[set | BitMap, bool]:
+    """
+    Collect streamed partition keys, stopping as soon as the limit is reached.
+
+    Keys are added chunk by chunk, so at most the distinct keys below the limit and one chunk are held in memory.
+    The iterator is closed once collection stops, which releases the server-side cursor of a streamed query.
+
+    Args:
+        values: Iterable of partition keys, e.g. from a database handler's execute_iter
+        limit: Number of distinct partition keys at which collection stops (None for no limit)
+        use_bitmap: Collect integer partition keys in a roaring bitmap instead of a set
+        chunk_size: Number of keys consumed between limit checks
+
+    Returns:
+        tuple: (collected partition keys, whether the limit was reached)
+    """
+    result: set | BitMap = BitMap() if use_bitmap else set()
+    iterator = iter(values)
+    try:
+        while chunk := list(islice(iterator, chunk_size)):
+            result.update(chunk)
+            if limit is not None and len(result) >= limit:
+                return result, True
+        return result, False
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
 def run_and_store_query(query: str, query_hash: str, partition_key: str, partition_datatype: str | None = None):
     """Worker function to execute and store a query."""
     logger.info(f"WORKER THREAD START: Processing query {query_hash}")
@@ -303,7 +961,8 @@ def run_and_store_query(query: str, query_hash: str, partition_key: str, partiti
     original_query = query
     original_hash = query_hash
     cache_handler = None
-    db_handler = None
+    db_handler: AbstractDBHandler | None = None
+    db_handler_reusable = False
     success = False
 
     try:
@@ -339,9 +998,19 @@ def run_and_store_query(query: str, query_hash: str, partition_key: str, partiti
             cache_handler.register_partition_key(partition_key, partition_datatype, **kwargs)
             logger.info(f"PARTITION KEY REGISTERED: Successfully registered for {query_hash}")
 
+        # With DuckDB acceleration the partition keys are computed from the preloaded tables and bulk inserted with set_cache,
+        # also where lazy insertion would run the fragment in the cache database. Spatial results still require lazy insertion.
+        use_acceleration = (
+            query_accelerator is not None and args.enable_duckdb_acceleration and args.db_backend == "postgresql" and partition_datatype != "geometry"
+        )
+
         lazy_insertion_available = hasattr(cache_handler, "set_cache_lazy") and hasattr(cache_handler, "set_entry_lazy")
         use_lazy_insertion = (
-            lazy_insertion_available and not args.force_recalculate and args.long_running_query_timeout == "0" and not args.disable_lazy_insertion
+            lazy_insertion_available
+            and not args.force_recalculate
+            and args.long_running_query_timeout == "0"
+            and not args.disable_lazy_insertion
+            and not use_acceleration
         )
 
         if use_lazy_insertion:
@@ -383,32 +1052,47 @@ def run_and_store_query(query: str, query_hash: str, partition_key: str, partiti
                 return False
 
             logger.info(f"Beginning calculation for cache population for query {query_hash}")
+            # With acceleration, the database handler of the worker thread runs the PostgreSQL fallback of the accelerator
             db_connection_params = get_database_connection_params(args)
             if args.db_backend == "postgresql":
                 db_connection_params["timeout"] = args.long_running_query_timeout
-                db_handler = get_db_handler("postgres", **db_connection_params)
-                # TODO query_accelerator duckdb
+                db_connection_params["itersize"] = args.fetch_size
+                db_handler = get_worker_db_handler("postgres", db_connection_params)
             elif args.db_backend == "mysql":
-                db_handler = get_db_handler("mysql", **db_connection_params)
+                db_handler = get_worker_db_handler("mysql", db_connection_params)
             elif args.db_backend == "sqlite":
-                db_handler = get_db_handler("sqlite", **db_connection_params)
+                db_handler = get_worker_db_handler("sqlite", db_connection_params)
             else:
                 raise AssertionError("No db backend specified, querying not possible")
+            assert db_handler is not None
 
             execution_start = time.perf_counter()
             try:
                 # Use DuckDB acceleration when available and enabled
-                global query_accelerator
-                if query_accelerator and args.enable_duckdb_acceleration and args.db_backend == "postgresql":
+                if use_acceleration and query_accelerator is not None:
                     logger.info(f"Executing query via DuckDB acceleration with timeout={args.long_running_query_timeout}s")
-                    result = query_accelerator.execute_query(query_to_execute)
+                    # Integer partition keys are transferred as an array if the cache handler can store one directly
+                    columnar = partition_datatype == "integer" and cache_handler.accepts_integer_arrays
+                    # With a limit, DuckDB stops fetching once the limit of distinct partition keys is reached
+                    result = query_accelerator.execute_query(query_to_execute, columnar=columnar, limit=args.limit, fallback_handler=db_handler)
                     execution_time = time.perf_counter() - execution_start
                     logger.info(f"DuckDB acceleration result: {len(result)} rows in {execution_time:.3f}s")
                 else:
                     logger.info(f"Executing query via standard database handler with timeout={args.long_running_query_timeout}s")
-                    result = set(db_handler.execute(query_to_execute))
+                    use_bitmap = partition_datatype == "integer" and cache_handler.accepts_integer_arrays
+                    if use_bitmap and args.limit is None and db_handler.supports_execute_array:
+                        # Without a limit the integer column is transferred in binary as a single array
+                        result = db_handler.execute_array(query_to_execute, "integer", unique=True)
+                        limit_reached = False
+                    else:
+                        # Stream the result so that a fragment exceeding the limit is aborted before it is fully fetched,
+                        # integer partition keys are collected in a roaring bitmap if the cache handler accepts one
+                        result, limit_reached = collect_partition_keys(db_handler.execute_iter(query_to_execute), args.limit, use_bitmap)
                     execution_time = time.perf_counter() - execution_start
-                    logger.info(f"Query {query_hash} returned {len(result)} results in {execution_time:.3f}s")
+                    if limit_reached:
+                        logger.info(f"Query {query_hash} aborted after {execution_time:.3f}s, it returns at least {args.limit} results")
+                    else:
+                        logger.info(f"Query {query_hash} returned {len(result)} results in {execution_time:.3f}s")
 
                 log_query_time(query_hash, execution_time)
 
@@ -424,6 +1108,7 @@ def run_and_store_query(query: str, query_hash: str, partition_key: str, partiti
                         logger.error(f"Failed to store {original_hash} in cache (cache_success={success_cache}, query_success={success_query})")
                         cache_handler.set_query_status(original_hash, partition_key, "failed")
                 success = True
+                db_handler_reusable = True
 
             except psycopg.OperationalError as e:
                 execution_time = time.perf_counter() - execution_start if "execution_start" in locals() else 0
@@ -433,13 +1118,14 @@ def run_and_store_query(query: str, query_hash: str, partition_key: str, partiti
                     log_query_time(f"{query_hash}_timeout", execution_time)
                     cache_handler.set_query_status(query_hash, partition_key, "timeout")
                     success = True
+                    db_handler_reusable = True
                 else:
                     logger.error(f"QUERY EXECUTION ERROR: Failed to execute query for {query_hash} after {execution_time:.2f}s: {type(e).__name__}: {e}")
                     log_query_time(f"{query_hash}_error", execution_time)
                     cache_handler.set_query_status(query_hash, partition_key, "failed")
             finally:
                 if db_handler:
-                    db_handler.close()
+                    release_worker_db_handler(db_handler, reusable=db_handler_reusable)
                     db_handler = None
 
     except Exception as e:
@@ -465,6 +1151,18 @@ def print_enhanced_status(active, queue_lengths, waiting_reason=None):
     fragment_queue = queue_lengths.get("query_fragment_queue", 0)
 
     status_msg = f"Active: {active}, Fragment Queue: {fragment_queue}, Original Queue: {original_queue}"
+    if skipped_cached_fragments:
+        status_msg += f", Skipped cached fragments: {skipped_cached_fragments}"
+    if skipped_in_flight_fragments:
+        status_msg += f", Skipped in-flight fragments: {skipped_in_flight_fragments}"
+    if deferred_predicted_timeouts:
+        status_msg += f", Deferred predicted timeouts: {deferred_predicted_timeouts}"
+    if fragment_scheduler is not None:
+        status_msg += f", Buffered fragments: {len(fragment_scheduler.pending)}"
+    if active_workers:
+        status_msg += f", Monitors: {len(active_workers)}"
+    if concurrency_limit is not None:
+        status_msg += f", Concurrency limit: {concurrency_limit.limit}/{concurrency_limit.max_limit} (last change: {concurrency_limit.last_decision})"
 
     if waiting_reason:
         status_msg += f" - {waiting_reason}"
@@ -486,7 +1184,7 @@ def get_timeout_for_state(can_consume, exit_event_set, error_count=0):
 
 def fragment_executor():
     """Thread pool function that processes fragments from the fragment queue."""
-    global pool, last_status_log_time
+    global pool, last_status_log_time, skipped_in_flight_fragments, concurrency_limit, fragment_scheduler, deferred_predicted_timeouts
 
     # Initialize cache handler for the main process
     main_cache_handler = get_cache_handler(args.cache_backend, singleton=True)
@@ -498,6 +1196,23 @@ def fragment_executor():
     # Track previous fragment count to detect when queue becomes empty
     previous_fragment_count = None
 
+    concurrency_limit = None
+    if args.adaptive_concurrency:
+        concurrency_limit = AdaptiveConcurrencyLimit(args.min_processes, args.max_processes, latency_tolerance=args.adaptive_latency_tolerance)
+        logger.info(f"Adaptive concurrency enabled: limit between {concurrency_limit.min_limit} and {concurrency_limit.max_limit}, starting at {concurrency_limit.limit}")
+
+    fragment_scheduler = None
+    if args.cost_aware_scheduling:
+        cost_model = FragmentCostModel()
+        if args.log_query_times:
+            loaded = cost_model.load_query_time_log(args.log_query_times)
+            logger.info(f"Cost model loaded {loaded} timed out fragments from {args.log_query_times}")
+        explain_cost = get_explain_cost if args.explain_cost_estimates and args.db_backend == "postgresql" else None
+        fragment_scheduler = CostAwareFragmentScheduler(
+            cost_model, lookahead=args.scheduling_lookahead, timeout=float(args.long_running_query_timeout), explain_cost=explain_cost
+        )
+        logger.info(f"Cost-aware scheduling enabled: lookahead {fragment_scheduler.lookahead} fragments per free slot")
+
     logger.info(f"Starting fragment executor threadpool -- Configuration: max_processes={args.max_processes}")
 
     with concurrent.futures.ThreadPoolExecutor(max_workers=args.max_processes) as pool:
@@ -525,6 +1240,9 @@ def fragment_executor():
 
                         # Remove from active futures
                         del active_futures[future]
+                        fragment_key = in_flight_fragments.pop(future, None)
+                        if fragment_key is not None and args.enable_fragment_leases:
+                            release_fragment_lease(*fragment_key)
                         logger.info(f"Removed {query_hash} from active futures (remaining: {len(active_futures)})")
 
                     active = len(active_futures)
@@ -557,14 +1275,14 @@ def fragment_executor():
                     should_log_status = True
 
                 # Check if we should close
-                if args.close and active == 0 and fragment_count == 0:
+                if args.close and active == 0 and fragment_count == 0 and not (fragment_scheduler is not None and fragment_scheduler.pending):
                     logger.info(f"Closing cache at {datetime.datetime.now()}")
                     exit_event.set()
                     continue
 
                 # Determine waiting reason for logging
                 waiting_reason = None
-                if active >= args.max_processes:
+                if active >= get_concurrency_limit():
                     waiting_reason = "Waiting for thread capacity"
                 elif fragment_count == 0:
                     waiting_reason = "Waiting for work"
@@ -575,62 +1293,108 @@ def fragment_executor():
                     print_enhanced_status(active, lengths, waiting_reason)
 
                 # Submit new jobs if we have capacity
-                while len(active_futures) < args.max_processes:
-                    logger.debug(f"Attempting to submit job (active: {len(active_futures)}/{args.max_processes})")
+                while len(active_futures) < get_concurrency_limit():
+                    free_slots = get_concurrency_limit() - len(active_futures)
+                    logger.debug(f"Attempting to submit jobs (active: {len(active_futures)}/{get_concurrency_limit()})")
 
                     # Get dynamic timeout based on state
-                    can_consume = len(active_futures) < args.max_processes
+                    can_consume = free_slots > 0
                     timeout = get_timeout_for_state(can_consume, exit_event.is_set(), consecutive_errors)
 
-                    # Try to get a job from the queue
-                    fragment_result = None
-                    if not args.disable_optimized_polling and can_consume:
-                        # Check if we should use blocking vs non-blocking pop
-                        # Use blocking pop only when we have active jobs (efficient while processing)
-                        # Use non-blocking pop when idle to ensure responsive status logging
-                        if len(active_futures) > 0:
-                            # Use efficient blocking pop with shorter timeout
-                            timeout = min(timeout, 2.0)
-                            logger.debug(f"Attempting blocking pop with timeout={timeout:.1f}s (active: {len(active_futures)}/{args.max_processes})")
-                            fragment_result = pop_from_query_fragment_queue_blocking(timeout=int(timeout))
-                        else:
-                            # When idle (no active jobs), use non-blocking pop to avoid blocking status logs
-                            logger.debug("Attempting non-blocking pop (idle state for responsive logging)")
-                            fragment_result = pop_from_query_fragment_queue()
-                    elif can_consume:
-                        # Use regular pop
-                        fragment_result = pop_from_query_fragment_queue()
+                    # Refill all free slots in a single round trip
+                    pop_count = free_slots if fragment_scheduler is None else fragment_scheduler.pop_count(free_slots)
+                    affinity_workers = get_affinity_workers()
+                    if pop_count <= 0:
+                        fragment_results = []
+                    elif affinity_workers is not None:
+                        # Only pop fragments of partition keys assigned to this monitor
+                        fragment_results = pop_many_from_query_fragment_queue(pop_count, worker_id=worker_id, active_workers=affinity_workers)
                     else:
-                        # Can't consume right now
-                        # Break from inner loop to check for completed futures
-                        break
+                        fragment_results = pop_many_from_query_fragment_queue(pop_count)
+                    has_pending = fragment_scheduler is not None and len(fragment_scheduler.pending) > 0
+                    if not fragment_results and not has_pending and affinity_workers is not None and len(active_futures) > 0:
+                        # The blocking pop cannot filter by partition key, wait before polling again instead
+                        exit_event.wait(min(timeout, 1.0))
+                    elif not fragment_results and not has_pending and not args.disable_optimized_polling and len(active_futures) > 0:
+                        # Queue is empty: wait for new work with an efficient blocking pop while jobs are active.
+                        # When idle (no active jobs), do not block to ensure responsive status logging.
+                        timeout = min(timeout, 2.0)
+                        logger.debug(f"Attempting blocking pop with timeout={timeout:.1f}s (active: {len(active_futures)}/{get_concurrency_limit()})")
+                        fragment_result = pop_from_query_fragment_queue_blocking(timeout=int(timeout))
+                        fragment_results = [fragment_result] if fragment_result is not None else []
+
+                    scheduled_fragments: list[tuple[tuple[str, str, str, str], float | None]]
+                    if fragment_scheduler is None:
+                        scheduled_fragments = [(fragment, None) for fragment in fragment_results]
+                    else:
+                        # Buffer popped fragments and run the cheapest ones first
+                        fragment_scheduler.add(fragment_results)
+                        scheduled_fragments = fragment_scheduler.take(free_slots)
 
-                    if fragment_result is None:
+                    if not scheduled_fragments:
                         # No more jobs available or timeout
                         break
 
-                    query, hash_value, partition_key, partition_datatype = fragment_result
-                    logger.debug(f"Found fragment in fragment queue: {hash_value}")
-
-                    # Check if already in cache (unless force-recalculate)
-                    if not args.force_recalculate and main_cache_handler.exists(hash_value, partition_key, check_query=False):
-                        logger.debug(f"Query {hash_value} already in cache")
-                        main_cache_handler.set_query(hash_value, query, partition_key)
-                        log_query_time(f"{hash_value}_cache_hit", 0.0)
-                        continue
-                    elif args.force_recalculate and main_cache_handler.exists(hash_value, partition_key, check_query=False):
-                        logger.info(f"Query {hash_value} exists in cache but force-recalculate is enabled")
-
-                    # Check if not already being processed
-                    if any(h == hash_value for h in active_futures.values()):
-                        logger.debug(f"Query {hash_value} already in process")
-                        continue
-
-                    # Submit the job
-                    with status_lock:
-                        future = pool.submit(run_and_store_query, query, hash_value, partition_key, partition_datatype)
-                        active_futures[future] = hash_value
-                        logger.info(f"Submitted to threadpool: {hash_value} (active: {len(active_futures)})")
+                    deferred_fragments = []
+                    submitted_fragments = 0
+                    for (query, hash_value, partition_key, partition_datatype), fragment_cost in scheduled_fragments:
+                        logger.debug(f"Found fragment in fragment queue: {hash_value}")
+
+                        # Check if already in cache (unless force-recalculate)
+                        if not args.force_recalculate and main_cache_handler.exists(hash_value, partition_key, check_query=False):
+                            logger.debug(f"Query {hash_value} already in cache")
+                            main_cache_handler.set_query(hash_value, query, partition_key)
+                            log_query_time(f"{hash_value}_cache_hit", 0.0)
+                            continue
+                        elif args.force_recalculate and main_cache_handler.exists(hash_value, partition_key, check_query=False):
+                            logger.info(f"Query {hash_value} exists in cache but force-recalculate is enabled")
+
+                        # Mark fragments that are known to time out without executing them
+                        if fragment_scheduler is not None and fragment_scheduler.known_timeout(hash_value):
+                            logger.info(f"Query {hash_value} is known to exceed the timeout, marking as timeout without execution")
+                            main_cache_handler.set_query_status(hash_value, partition_key, "timeout")
+                            log_query_time(f"{hash_value}_known_timeout", 0.0)
+                            continue
+
+                        # Defer fragments whose shape is predicted to time out to the end of the queue
+                        if fragment_scheduler is not None and fragment_scheduler.defers(query):
+                            deferred_predicted_timeouts += 1
+                            logger.debug(f"Query {hash_value} is predicted to exceed the timeout, deferring")
+                            deferred_fragments.append((query, hash_value, partition_key, partition_datatype))
+                            continue
+
+                        # Check if not already being processed
+                        if (hash_value, partition_key) in in_flight_fragments.values():
+                            skipped_in_flight_fragments += 1
+                            logger.debug(f"Query {hash_value} already in process")
+                            continue
+
+                        # Check if not already being processed by another monitor sharing the queue
+                        if args.enable_fragment_leases and not acquire_fragment_lease(hash_value, partition_key):
+                            skipped_in_flight_fragments += 1
+                            logger.debug(f"Query {hash_value} already in process by another monitor")
+                            continue
+
+                        # Submit the job
+                        with status_lock:
+                            future = pool.submit(run_and_store_query, query, hash_value, partition_key, partition_datatype)
+                            active_futures[future] = hash_value
+                            in_flight_fragments[future] = (hash_value, partition_key)
+                            if concurrency_limit is not None:
+                                future.add_done_callback(
+                                    concurrency_limit.track(saturated=len(active_futures) >= concurrency_limit.limit, shape=FragmentCostModel.fragment_shape(query))
+                                )
+                            if fragment_scheduler is not None:
+                                future.add_done_callback(fragment_scheduler.track(query, fragment_cost))
+                            logger.info(f"Submitted to threadpool: {hash_value} (active: {len(active_futures)})")
+                        submitted_fragments += 1
+
+                    if deferred_fragments:
+                        requeue_pending_fragments(deferred_fragments)
+                        if submitted_fragments == 0:
+                            # Only deferred fragments are queued, popping them again right away would spin on the queue
+                            exit_event.wait(min(timeout, 1.0))
+                            break
 
                 # Reset error counter on successful iteration
                 consecutive_errors = 0
@@ -666,6 +1430,12 @@ def fragment_executor():
                 logger.info(f"Retrying in {error_sleep}s...")
                 time.sleep(error_sleep)
 
+    if fragment_scheduler is not None:
+        pending_fragments = fragment_scheduler.drain()
+        if pending_fragments:
+            logger.info(f"Returning {len(pending_fragments)} buffered fragments to the fragment queue")
+            requeue_pending_fragments(pending_fragments)
+
     logger.info("Fragment executor exiting")
 
 
@@ -683,6 +1453,19 @@ def main():
     processing_group = parser.add_argument_group("processing options")
     processing_group.add_argument("--close", action="store_true", default=False, help="Close the cache after operation")
     processing_group.add_argument("--max-processes", type=int, default=12, help="Max number of processes to use")
+    processing_group.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        default=False,
+        help="Adapt the number of concurrently executed fragments between --min-processes and --max-processes based on fragment latency (AIMD)",
+    )
+    processing_group.add_argument("--min-processes", type=int, default=1, help="Lowest number of concurrent fragments with --adaptive-concurrency (default: 1)")
+    processing_group.add_argument(
+        "--adaptive-latency-tolerance",
+        type=float,
+        default=2.0,
+        help="Reduce the concurrency limit when the median fragment latency exceeds this multiple of the baseline latency of its fragment shape (default: 2.0)",
+    )
     processing_group.add_argument("--long-running-query-timeout", type=str, default="0", help="Timeout for long running queries")
     processing_group.add_argument("--limit", type=int, default=None, help="Limit the number of returned partition keys")
     processing_group.add_argument(
@@ -692,6 +1475,49 @@ def main():
     processing_group.add_argument(
         "--force-recalculate", action="store_true", default=False, help="Force recalculation of queries even if they already exist in cache"
     )
+    processing_group.add_argument(
+        "--cost-aware-scheduling",
+        action="store_true",
+        default=False,
+        help="Buffer popped fragments and run the cheapest first, based on a cost model per fragment shape; "
+        "fragments whose shape is predicted to exceed --long-running-query-timeout are deferred to the end of the queue",
+    )
+    processing_group.add_argument(
+        "--scheduling-lookahead", type=int, default=4, help="Number of buffered fragments per free worker slot with --cost-aware-scheduling (default: 4)"
+    )
+    processing_group.add_argument(
+        "--explain-cost-estimates",
+        action="store_true",
+        default=False,
+        help="Estimate the cost of fragments with unknown shape using EXPLAIN (PostgreSQL only, requires --cost-aware-scheduling)",
+    )
+    processing_group.add_argument(
+        "--worker-registry",
+        action="store_true",
+        default=False,
+        help="Register this monitor with heartbeats in the queue backend, to coordinate monitors on several hosts sharing the queue",
+    )
+    processing_group.add_argument(
+        "--partition-key-affinity",
+        action="store_true",
+        default=False,
+        help="Assign each partition key to one registered monitor (rendezvous hashing) and only execute fragments of assigned keys; implies --worker-registry",
+    )
+    processing_group.add_argument(
+        "--heartbeat-interval", type=float, default=10.0, help="Seconds between worker heartbeats; monitors missing three heartbeats are considered dead (default: 10)"
+    )
+    processing_group.add_argument(
+        "--enable-fragment-leases",
+        action="store_true",
+        default=False,
+        help="Lease fragments in the queue backend while executing them, so that monitors on other hosts skip them (advisory locks / SET NX)",
+    )
+    processing_group.add_argument(
+        "--disable-enqueue-cache-filter",
+        action="store_true",
+        default=False,
+        help="Enqueue all generated fragments instead of skipping fragments that are already cached",
+    )
     processing_group.add_argument("--log-query-times", type=str, help="Log query hash and execution time to specified file in CSV format: <hash>,<seconds>")
     processing_group.add_argument(
         "--disable-lazy-insertion", action="store_true", default=False, help="Disable lazy insertion and always use traditional query execution"
@@ -719,7 +1545,7 @@ def main():
     )
 
     # Add common argument groups
-    add_database_args(parser)
+    add_database_args(parser, include_fetch_size=True)
     add_environment_args(parser)
     add_variant_generation_args(parser)
     add_verbosity_args(parser)
@@ -749,6 +1575,34 @@ def main():
     acceleration_group.add_argument(
         "--force-reload-tables", action="store_true", default=False, help="Force reload tables from PostgreSQL even if they exist in DuckDB"
     )
+    acceleration_group.add_argument(
+        "--disable-acceleration-transpilation",
+        action="store_true",
+        default=False,
+        help="Do not retry queries rejected by DuckDB after translating them from the PostgreSQL dialect",
+    )
+    acceleration_group.add_argument(
+        "--snapshot-directory",
+        type=str,
+        help="Directory for Parquet snapshots of preloaded tables, restored on startup if their source tables are unchanged "
+        "(file-based DuckDB databases use their stored tables as snapshots)",
+    )
+    acceleration_group.add_argument(
+        "--preload-analyze-columns",
+        action="store_true",
+        default=False,
+        help="Preload only the columns referenced by fragments recorded in the cache and order rows by the partition key",
+    )
+    acceleration_group.add_argument("--preload-parallelism", type=int, default=1, help="Number of tables to preload concurrently (default: 1)")
+    acceleration_group.add_argument(
+        "--refresh-tables",
+        type=str,
+        help="Comma-separated table:watermark_column[:key_column] entries of preloaded tables to refresh incrementally "
+        "(rows with a key column are replaced, otherwise appended)",
+    )
+    acceleration_group.add_argument(
+        "--refresh-interval", type=float, default=300.0, help="Seconds between incremental refreshes of --refresh-tables (default: 300)"
+    )
 
     global args
     args = parser.parse_args()
@@ -762,6 +1616,7 @@ def main():
 
     # Load environment variables
     load_environment_with_validation(args.env_file)
+    size_cache_connection_pool(args.max_processes)
 
     # Parse JSON arguments for constraint modifications
     add_constraints, remove_constraints_all, remove_constraints_add = parse_variant_generation_json_args(args)
@@ -800,10 +1655,24 @@ def main():
                 preload_tables = [table.strip() for table in args.preload_tables.split(",") if table.strip()]
                 logger.info(f"Will preload {len(preload_tables)} tables: {preload_tables}")
 
+            # Parse incremental refresh configuration
+            refresh_tables = parse_refresh_tables(args.refresh_tables) if args.refresh_tables else {}
+            for table_name in refresh_tables:
+                if table_name not in preload_tables:
+                    logger.warning(f"Refresh table {table_name} is not in --preload-tables and will not be refreshed")
+            refresh_tables = {table_name: columns for table_name, columns in refresh_tables.items() if table_name in preload_tables}
+
             # Get database connection parameters for accelerator
             db_connection_params = get_database_connection_params(args)
 
             try:
+                # Analyze the fragments recorded in the cache to prune the preloaded columns
+                preload_columns: dict[str, set[str]] = {}
+                preload_sort_columns: list[str] = []
+                if args.preload_analyze_columns and preload_tables:
+                    cache_handler = get_cache_handler(resolve_cache_backend(args), singleton=True)
+                    preload_columns, preload_sort_columns = analyze_preload_columns(cache_handler, preload_tables)
+
                 query_accelerator = create_query_accelerator(
                     postgresql_connection_params=db_connection_params,
                     preload_tables=preload_tables,
@@ -813,6 +1682,14 @@ def main():
                     duckdb_database_path=args.duckdb_database_path,
                     force_reload_tables=args.force_reload_tables,
                     query_timeout=float(args.long_running_query_timeout),
+                    refresh_tables=refresh_tables,
+                    refresh_interval=args.refresh_interval,
+                    preload_columns=preload_columns,
+                    preload_sort_columns=preload_sort_columns,
+                    preload_parallelism=args.preload_parallelism,
+                    snapshot_directory=args.snapshot_directory,
+                    max_concurrent_queries=args.max_processes,
+                    enable_transpilation=not args.disable_acceleration_transpilation,
                 )
 
                 if query_accelerator:
@@ -822,6 +1699,12 @@ def main():
                         if not success:
                             logger.warning("Failed to preload some tables, acceleration may be suboptimal")
 
+                    # Catch up tables reused from a persistent DuckDB database, then keep them current
+                    if refresh_tables:
+                        if not query_accelerator.refresh_tables():
+                            logger.warning("Failed to refresh some tables, accelerated queries may see stale data")
+                        query_accelerator.start_refresh()
+
                     logger.info("DuckDB query accelerator initialized successfully")
                 else:
                     logger.warning("Failed to initialize DuckDB query accelerator, disabling acceleration")
@@ -838,6 +1721,8 @@ def main():
     logger.info("- Thread 2: Execute fragments from query fragment queue with enhanced consumption control")
     logger.info("- Partition keys are read from the queue instead of command line arguments")
     logger.info(f"- Configuration: max_processes={args.max_processes}")
+    if args.adaptive_concurrency:
+        logger.info(f"- Adaptive concurrency between {args.min_processes} and {args.max_processes} concurrent fragments")
     logger.info(f"- Queue provider: {provider}, Cache backend: {args.cache_backend}")
     logger.info(f"- Status logging interval: {args.status_log_interval}s")
     if args.disable_optimized_polling:
@@ -876,6 +1761,15 @@ def main():
     fragment_processor_thread = threading.Thread(target=query_fragment_processor, args=(args, constraint_args), daemon=True)
     fragment_processor_thread.start()
 
+    # Register this monitor in the worker registry shared by all monitors of the queue
+    heartbeat_thread = None
+    if args.worker_registry or args.partition_key_affinity:
+        logger.info(f"- Worker registry: monitor {worker_id}, heartbeat every {args.heartbeat_interval}s")
+        if args.partition_key_affinity:
+            logger.info("- Partition key affinity: fragments of each partition key are executed by one monitor")
+        heartbeat_thread = threading.Thread(target=worker_heartbeat_loop, args=(args.heartbeat_interval,), daemon=True)
+        heartbeat_thread.start()
+
     # Start the fragment executor in the main thread
     try:
         fragment_executor()
@@ -892,11 +1786,18 @@ def main():
             # Wait for fragment processor thread to finish
             fragment_processor_thread.join(timeout=5)
 
+            # Wait for the heartbeat thread to unregister this monitor
+            if heartbeat_thread is not None:
+                heartbeat_thread.join(timeout=5)
+
             # Clean up query accelerator
             if query_accelerator:
                 logger.info("Shutting down DuckDB query accelerator...")
                 query_accelerator.close()
 
+            # Close database connections of the worker threads
+            close_worker_db_handlers()
+
             # Close query time logging
             close_query_time_logging()
         except Exception as cleanup_error:
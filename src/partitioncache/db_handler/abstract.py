@@ -1,7 +1,14 @@
 import abc
+from collections.abc import Iterator
+from typing import Any
+
+# Number of rows fetched per round trip when streaming query results
+DEFAULT_FETCH_SIZE = 10000
 
 
 class AbstractDBHandler(abc.ABC):
+    # Whether execute_array can return results as NumPy arrays
+    supports_execute_array = False
 
     @abc.abstractmethod
     def __init__(self):
@@ -12,6 +19,31 @@ class AbstractDBHandler(abc.ABC):
         """Execute a query and return the results."""
         raise NotImplementedError
 
+    def execute_iter(self, query, batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Any]:
+        """
+        Execute a query and yield the non-NULL values of the first column without materializing the result.
+
+        Handlers that can stream results fetch batch_size rows at a time, the default implementation
+        yields from execute.
+        """
+        for value in self.execute(query):
+            if value is not None:
+                yield value
+
+    def execute_array(self, query, datatype: str = "integer", unique: bool = False) -> Any:
+        """
+        Execute a query and return the non-NULL values of the first column as a NumPy array.
+
+        Args:
+            query: SELECT query to execute
+            datatype: Partition key datatype the column is converted to
+            unique: Return the sorted distinct values
+
+        Raises:
+            NotImplementedError: If the handler does not support columnar results (see supports_execute_array)
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support execute_array")
+
     @abc.abstractmethod
     def close(self):
         pass
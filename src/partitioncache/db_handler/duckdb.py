@@ -2,9 +2,12 @@
 Handles the connection to a DuckDB database
 """
 
+from collections.abc import Iterator
+from typing import Any
+
 import duckdb
 
-from partitioncache.db_handler.abstract import AbstractDBHandler
+from partitioncache.db_handler.abstract import DEFAULT_FETCH_SIZE, AbstractDBHandler
 
 
 class DuckDBHandler(AbstractDBHandler):
@@ -32,6 +35,18 @@ class DuckDBHandler(AbstractDBHandler):
             return []
         return [row[0] for row in rows if row[0] is not None]
 
+    def execute_iter(self, query, batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Any]:
+        """Execute a query and yield the non-NULL values of the first column, fetching batch_size rows at a time."""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query)
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    if row[0] is not None:
+                        yield row[0]
+        finally:
+            cursor.close()
+
     def close(self) -> None:
         """Close the database connection."""
         if self.conn:
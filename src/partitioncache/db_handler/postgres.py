@@ -2,23 +2,46 @@
 Handles the connection to a PostgreSQL database
 """
 
+import uuid
+from collections.abc import Iterator
 from logging import getLogger
+from typing import Any
 
 import psycopg
+from psycopg import sql
 
-from partitioncache.db_handler.abstract import AbstractDBHandler
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from partitioncache.db_handler.abstract import DEFAULT_FETCH_SIZE, AbstractDBHandler
 
 logger = getLogger("PartitionCache")
 
+# PostgreSQL type the first column is cast to and NumPy type of its binary COPY representation, per partition key datatype
+BINARY_COPY_TYPES: dict[str, tuple[str, str]] = {
+    "integer": ("bigint", ">i8"),
+    "float": ("double precision", ">f8"),
+    "timestamp": ("timestamp", ">i8"),
+}
+
+# Binary COPY header: 11 byte signature, 4 byte flags, and the length of the header extension
+_COPY_HEADER_SIZE = 19
+
 
 class PostgresDBHandler(AbstractDBHandler):
-    def __init__(self, host: str, port: int, user: str, password: str, dbname: str, timeout: str = "0") -> None:
+    supports_execute_array = np is not None
+
+    def __init__(self, host: str, port: int, user: str, password: str, dbname: str, timeout: str = "0", itersize: int = DEFAULT_FETCH_SIZE) -> None:
         # PostgreSQL statement_timeout expects milliseconds when specified as a number without unit
         # Convert seconds to milliseconds
         timeout_ms = int(timeout) * 1000 if timeout != "0" else 0
         conn = psycopg.connect(host=host, port=port, user=user, password=password, dbname=dbname, options=f"-c statement_timeout={timeout_ms}")
         self.conn = conn
         self.cur = conn.cursor()
+        # Number of rows fetched per round trip by execute_iter
+        self.itersize = itersize
 
     def execute(self, query) -> list:
         logger.info(f"POSTGRES EXECUTE: Starting query execution (first 100 chars): {query[:100]}...")
@@ -34,6 +57,83 @@ class PostgresDBHandler(AbstractDBHandler):
             return []
         return [row[0] for row in self.cur.fetchall() if row[0]]
 
+    def execute_iter(self, query, batch_size: int | None = None) -> Iterator[Any]:
+        """
+        Execute a query with a server-side cursor and yield the non-NULL values of the first column.
+
+        Rows are fetched batch_size at a time, so the client never holds more than one batch of the result.
+        The cursor is closed when the iteration ends or the generator is closed early. Each call uses its own
+        cursor name, so several iterations can be open on the connection at once.
+
+        Args:
+            query: SELECT query to execute
+            batch_size: Number of rows fetched per round trip (default: the handler's itersize)
+
+        Yields:
+            The first column value of each row
+        """
+        logger.info(f"POSTGRES EXECUTE_ITER: Starting streamed query execution (first 100 chars): {query[:100]}...")
+        batch_size = batch_size or self.itersize
+        with self.conn.cursor(name=f"partitioncache_stream_{uuid.uuid4().hex}") as cursor:
+            try:
+                cursor.execute(query)
+            except Exception as e:
+                logger.error(f"POSTGRES EXECUTE_ITER ERROR: {type(e).__name__}: {e}")
+                raise
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    if row[0] is not None:
+                        yield row[0]
+
+    def execute_array(self, query, datatype: str = "integer", unique: bool = False) -> Any:
+        """
+        Execute a query and return the non-NULL values of the first column as a NumPy array.
+
+        The column is cast to the PostgreSQL type of the partition key datatype and transferred with a binary
+        COPY, which is parsed into the array without creating a Python object per row. Timestamps are
+        returned as datetime64[us].
+
+        Args:
+            query: SELECT query to execute
+            datatype: Partition key datatype, one of "integer", "float", or "timestamp"
+            unique: Return the sorted distinct values
+
+        Returns:
+            numpy.ndarray: The values of the first column
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the datatype has no fixed-width binary representation
+        """
+        if np is None:
+            raise ImportError("execute_array requires NumPy")
+        if datatype not in BINARY_COPY_TYPES:
+            raise ValueError(f"Unsupported datatype for execute_array: {datatype}")
+        pg_type, value_type = BINARY_COPY_TYPES[datatype]
+
+        logger.info(f"POSTGRES EXECUTE_ARRAY: Starting binary copy of query (first 100 chars): {query[:100]}...")
+        copy_query = sql.SQL("COPY (SELECT v::{} FROM ({}) AS q(v) WHERE v IS NOT NULL) TO STDOUT (FORMAT BINARY)").format(
+            sql.SQL(pg_type), sql.SQL(query.strip().rstrip(";"))
+        )
+        data = bytearray()
+        try:
+            with self.cur.copy(copy_query) as copy:
+                for block in copy:
+                    data += block
+        except Exception as e:
+            logger.error(f"POSTGRES EXECUTE_ARRAY ERROR: {type(e).__name__}: {e}")
+            raise
+
+        # Each tuple holds a 2 byte field count, a 4 byte field length and the value; the data ends with a 2 byte trailer
+        offset = _COPY_HEADER_SIZE + int.from_bytes(data[_COPY_HEADER_SIZE - 4 : _COPY_HEADER_SIZE], "big")
+        tuple_type = np.dtype([("fields", ">i2"), ("length", ">i4"), ("value", value_type)])
+        tuples = np.frombuffer(data, dtype=tuple_type, offset=offset, count=(len(data) - offset - 2) // tuple_type.itemsize)
+        values = tuples["value"].astype(value_type[1:])
+        if datatype == "timestamp":
+            # Binary timestamps are microseconds since 2000-01-01
+            values = np.datetime64("2000-01-01T00:00:00", "us") + values.astype("timedelta64[us]")
+        return np.unique(values) if unique else values
+
     def close(self) -> None:
         self.conn.close()
         self.cur.close()
@@ -1,7 +1,9 @@
 import sqlite3
+from collections.abc import Iterator
 from logging import getLogger
+from typing import Any
 
-from partitioncache.db_handler.abstract import AbstractDBHandler
+from partitioncache.db_handler.abstract import DEFAULT_FETCH_SIZE, AbstractDBHandler
 
 logger = getLogger("PartitionCache")
 
@@ -27,10 +29,22 @@ class SQLiteDBHandler(AbstractDBHandler):
             logger.error(e)
             return []
 
+    def execute_iter(self, query: str, batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Any]:
+        """Execute a query and yield the non-NULL values of the first column, fetching batch_size rows at a time."""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query)
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    if row[0] is not None:
+                        yield row[0]
+        finally:
+            cursor.close()
+
     def close(self) -> None:
         try:
-            self.conn.close()
             self.cur.close()
+            self.conn.close()
         except sqlite3.Error as e:
             logger.error(f"Error closing SQLite connection: {e}")
             raise
@@ -11,18 +11,33 @@ Features:
 - Transparent query acceleration with fallback support
 - Compatible with all existing cache handlers
 - Configurable table preloading and connection management
+- Column-pruned, sorted, and parallel table preloading
+- Incremental refresh of preloaded tables using watermark columns
+- Persistent table snapshots validated against a source fingerprint
+- PostgreSQL to DuckDB dialect translation of rejected queries
+- Columnar transfer of integer results as NumPy arrays (if NumPy is installed)
 """
 
 import concurrent.futures
+import os
 import re
 import threading
 import time
+from collections import OrderedDict
 from typing import Any
 
 import duckdb
 import psycopg
+import sqlglot
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from partitioncache.db_handler.abstract import AbstractDBHandler
 from partitioncache.logging_utils import get_thread_aware_logger
+from partitioncache.query_processor import LITERAL_PATTERN, query_shape
 
 logger = get_thread_aware_logger("PartitionCache")
 
@@ -48,6 +63,48 @@ def validate_table_name(table_name: str) -> None:
         raise ValueError(msg)
 
 
+def parse_refresh_tables(spec: str) -> dict[str, tuple[str, str | None]]:
+    """
+    Parse an incremental refresh specification.
+
+    Args:
+        spec: Comma-separated list of table:watermark_column[:key_column] entries,
+            e.g. "orders:updated_at:order_id,events:event_id"
+
+    Returns:
+        Dict mapping table names to (watermark_column, key_column) tuples
+
+    Raises:
+        ValueError: If an entry is malformed or contains invalid identifiers
+    """
+    refresh_tables: dict[str, tuple[str, str | None]] = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        parts = [part.strip() for part in entry.split(":")]
+        if len(parts) not in (2, 3) or not all(parts):
+            msg = f"Invalid refresh table entry: '{entry}'. Expected table:watermark_column[:key_column]."
+            raise ValueError(msg)
+        for identifier in parts:
+            validate_table_name(identifier)
+        refresh_tables[parts[0]] = (parts[1], parts[2] if len(parts) == 3 else None)
+    return refresh_tables
+
+
+# Placeholders standing in for the literals of a query in translated query templates
+_PLACEHOLDER_PATTERN = re.compile(r"\$(\d+)")
+
+# Number of rows fetched between limit checks
+_FETCH_CHUNK_SIZE = 10000
+
+# DuckDB column types fetched as NumPy integer arrays for columnar results
+_INTEGER_TYPES = {"TINYINT", "SMALLINT", "INTEGER", "BIGINT", "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT"}
+
+# Table of a file-based DuckDB database recording the snapshot tag of each preloaded table
+SNAPSHOT_TABLE = "_pcache_snapshots"
+
+
 class DuckDBQueryAccelerator:
     """
     DuckDB-based query accelerator for PostgreSQL database queries.
@@ -74,6 +131,16 @@ class DuckDBQueryAccelerator:
         duckdb_database_path: str = "/tmp/partitioncache_accel.duckdb",
         force_reload_tables: bool = False,
         query_timeout: float = 0,
+        refresh_tables: dict[str, tuple[str, str | None]] | None = None,
+        refresh_interval: float = 0,
+        preload_columns: dict[str, set[str]] | None = None,
+        preload_sort_columns: list[str] | None = None,
+        preload_parallelism: int = 1,
+        snapshot_directory: str | None = None,
+        max_concurrent_queries: int = 8,
+        enable_transpilation: bool = True,
+        transpile_cache_size: int = 1024,
+        fallback_retry_interval: float = 600.0,
     ):
         """
         Initialize DuckDB query accelerator.
@@ -87,6 +154,20 @@ class DuckDBQueryAccelerator:
             duckdb_database_path: Path to DuckDB database file (':memory:' for in-memory)
             force_reload_tables: Force reload tables from PostgreSQL even if they exist in DuckDB
             query_timeout: Query timeout in seconds (0 = no timeout)
+            refresh_tables: Preloaded tables to refresh incrementally, mapping table names to
+                (watermark_column, key_column). Rows with a key are replaced, otherwise appended.
+            refresh_interval: Seconds between incremental refreshes in the background (0 = no background refresh)
+            preload_columns: Columns to preload per table, tables not listed (or listed with "*") are preloaded completely
+            preload_sort_columns: Candidate columns to order preloaded rows by, the first one present in a table is used
+            preload_parallelism: Number of tables to preload concurrently
+            snapshot_directory: Directory for Parquet snapshots of preloaded tables. Without it, tables of a
+                file-based DuckDB database serve as snapshots.
+            max_concurrent_queries: Number of queries with a timeout executed concurrently, further queries wait
+                for a free executor thread and their waiting time counts towards the timeout
+            enable_transpilation: Retry queries DuckDB rejects after translating them from the PostgreSQL dialect
+            transpile_cache_size: Number of query shapes whose translation and outcome are kept
+            fallback_retry_interval: Seconds after which a query shape that failed in DuckDB is tried in DuckDB again,
+                as the failure may have been transient (e.g. out of memory)
         """
         self.postgresql_params = postgresql_connection_params
         self.tables_to_preload = preload_tables or []
@@ -96,17 +177,33 @@ class DuckDBQueryAccelerator:
         self.duckdb_database_path = duckdb_database_path
         self.force_reload_tables = force_reload_tables
         self.query_timeout = query_timeout
+        self.refresh_tables_config = refresh_tables or {}
+        self.refresh_interval = refresh_interval
+        self.preload_columns = preload_columns or {}
+        self.preload_sort_columns = preload_sort_columns or []
+        self.preload_parallelism = preload_parallelism
+        self.snapshot_directory = snapshot_directory
+        self.max_concurrent_queries = max_concurrent_queries
+        self.enable_transpilation = enable_transpilation
+        self.transpile_cache_size = transpile_cache_size
+        self.fallback_retry_interval = fallback_retry_interval
 
         # Performance statistics
         self.stats = {
             "queries_accelerated": 0,
             "queries_fallback": 0,
             "queries_timeout": 0,
+            "queries_transpiled": 0,
+            "shapes_skipped": 0,
             "total_acceleration_time": 0.0,
             "total_fallback_time": 0.0,
             "tables_preloaded": 0,
             "preload_time": 0.0,
+            "snapshots_restored": 0,
             "connection_errors": 0,
+            "refreshes": 0,
+            "rows_refreshed": 0,
+            "refresh_time": 0.0,
         }
 
         # DuckDB thread safety: Each thread uses its own cursor from the connection
@@ -121,6 +218,20 @@ class DuckDBQueryAccelerator:
         self._preload_completed = False
         self._last_query_time = 0.0
 
+        # LRU caches of translated query templates and of how each query shape runs (with the time it was recorded)
+        self._transpiled_shapes: OrderedDict[str, str | None] = OrderedDict()
+        self._shape_modes: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._shape_lock = threading.Lock()
+
+        # Executor for queries with a timeout, created on first use
+        self._query_executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._query_executor_lock = threading.Lock()
+
+        # Background incremental refresh
+        self._refresh_lock = threading.Lock()
+        self._refresh_stop = threading.Event()
+        self._refresh_thread: threading.Thread | None = None
+
     def __repr__(self) -> str:
         """Return string representation."""
         return f"DuckDBQueryAccelerator(preloaded_tables={len(self.tables_to_preload)}, initialized={self._initialized})"
@@ -210,12 +321,6 @@ class DuckDBQueryAccelerator:
             logger.debug("Tables already preloaded")
             return True
 
-        # Check if using persistent database and tables already exist (unless forced to reload)
-        if self.duckdb_database_path != ":memory:" and not self.force_reload_tables and self._tables_exist_in_duckdb():
-            logger.info("Tables already exist in DuckDB, skipping PostgreSQL reload")
-            self._preload_completed = True
-            return True
-
         logger.info(f"Preloading {len(self.tables_to_preload)} tables into DuckDB...")
         preload_start = time.perf_counter()
 
@@ -224,81 +329,22 @@ class DuckDBQueryAccelerator:
             self.duckdb_conn.execute("INSTALL postgres")
             self.duckdb_conn.execute("LOAD postgres")
 
-            # Build connection string for DuckDB PostgreSQL extension
-            pg_conn_str = self._build_duckdb_postgres_connection_string()
-
-            # Check if postgres_db is already attached (for persistent databases)
-            try:
-                # Try to query if the database exists
-                result = self.duckdb_conn.execute("SELECT 1 FROM duckdb_databases() WHERE database_name = 'postgres_db'").fetchone()
-                if result is None:
-                    # Not attached, attach it now
-                    self.duckdb_conn.execute(f"ATTACH '{pg_conn_str}' AS postgres_db (TYPE POSTGRES)")
-                else:
-                    logger.debug("PostgreSQL database already attached as postgres_db")
-            except Exception:
-                # If the check fails, try to attach (for older DuckDB versions)
-                try:
-                    self.duckdb_conn.execute(f"ATTACH '{pg_conn_str}' AS postgres_db (TYPE POSTGRES)")
-                except Exception as attach_error:
-                    # If attach fails with "already exists", that's OK
-                    if "already exists" in str(attach_error):
-                        logger.debug("PostgreSQL database already attached as postgres_db")
-                    else:
-                        raise
-
-            tables_loaded = 0
+            self._attach_postgresql()
 
-            for table_name in self.tables_to_preload:
-                try:
-                    # Validate table name to prevent SQL injection
-                    validate_table_name(table_name)
-
-                    logger.debug(f"Preloading table: {table_name}")
-
-                    # Validate table exists in PostgreSQL
-                    if not self._table_exists_in_postgresql(table_name):
-                        logger.warning(f"Table {table_name} does not exist in PostgreSQL, skipping")
-                        continue
-
-                    # Drop existing table if force reload is enabled or in memory mode
-                    if self.force_reload_tables or self.duckdb_database_path == ":memory:":
-                        try:
-                            # Table name is safe after validation
-                            self.duckdb_conn.execute(f"DROP TABLE IF EXISTS {table_name}")
-                            logger.debug(f"Dropped existing table {table_name} for reload")
-                        except Exception:
-                            pass  # Table might not exist
-
-                    # Create table in DuckDB by copying from PostgreSQL
-                    # Use CREATE OR REPLACE for better handling
-                    try:
-                        # Table names are safe after validation
-                        self.duckdb_conn.execute(f"""
-                            CREATE OR REPLACE TABLE {table_name} AS
-                            SELECT * FROM postgres_db.{table_name}
-                        """)
-                    except Exception as create_error:
-                        # If CREATE OR REPLACE is not supported, try regular CREATE
-                        if "CREATE OR REPLACE" in str(create_error):
-                            self.duckdb_conn.execute(f"""
-                                CREATE TABLE {table_name} AS
-                                SELECT * FROM postgres_db.{table_name}
-                            """)
-                        else:
-                            raise
-
-                    # Get row count for logging
-                    # Table name is safe after validation
-                    result = self.duckdb_conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()
-                    row_count = result[0] if result else 0
-
-                    logger.debug(f"Preloaded table {table_name} with {row_count:,} rows")
-                    tables_loaded += 1
+            if self.snapshot_directory:
+                os.makedirs(self.snapshot_directory, exist_ok=True)
+            elif self.duckdb_database_path != ":memory:":
+                self.duckdb_conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {SNAPSHOT_TABLE} (table_name VARCHAR PRIMARY KEY, snapshot_tag VARCHAR, created_at TIMESTAMP)"
+                )
 
-                except Exception as table_error:
-                    logger.warning(f"Failed to preload table {table_name}: {table_error}")
-                    continue
+            if self.preload_parallelism > 1 and len(self.tables_to_preload) > 1:
+                # Each worker loads through its own DuckDB cursor, PostgreSQL is scanned by several connections at once
+                with concurrent.futures.ThreadPoolExecutor(max_workers=self.preload_parallelism, thread_name_prefix="duckdb-preload") as executor:
+                    results = list(executor.map(self._preload_table, self.tables_to_preload))
+            else:
+                results = [self._preload_table(table_name) for table_name in self.tables_to_preload]
+            tables_loaded = sum(results)
 
             preload_duration = time.perf_counter() - preload_start
             with self._stats_lock:
@@ -314,6 +360,361 @@ class DuckDBQueryAccelerator:
             self._update_stats(connection_errors=1)
             return False
 
+    def _preload_table(self, table_name: str) -> bool:
+        """
+        Copy a single table from PostgreSQL into DuckDB.
+
+        With preload_columns configured for the table only the listed columns are copied, and rows are
+        ordered by the first of preload_sort_columns present in the table so that DuckDB's min/max zone maps
+        prune row groups on partition key filters.
+
+        Args:
+            table_name: Name of the table to preload
+
+        Returns:
+            bool: True if the table was loaded, False otherwise
+        """
+        # Sequential preloading uses the main connection, parallel workers use their own cursor
+        conn = self.duckdb_conn if self.preload_parallelism <= 1 else self.duckdb_conn.cursor()
+        try:
+            # Validate table name to prevent SQL injection
+            validate_table_name(table_name)
+
+            logger.debug(f"Preloading table: {table_name}")
+
+            # Validate table exists in PostgreSQL
+            if not self._table_exists_in_postgresql(table_name):
+                logger.warning(f"Table {table_name} does not exist in PostgreSQL, skipping")
+                return False
+
+            select_list = "*"
+            order_by = ""
+            if table_name in self.preload_columns or self.preload_sort_columns:
+                table_columns = self._postgresql_table_columns(table_name)
+                columns = table_columns
+                wanted_columns = self.preload_columns.get(table_name)
+                if wanted_columns is not None and "*" not in wanted_columns:
+                    # Watermark and key columns are needed by the incremental refresh
+                    wanted_columns = set(wanted_columns) | {column for column in self.refresh_tables_config.get(table_name, ()) if column}
+                    columns = [column for column in table_columns if column in wanted_columns]
+                    if columns:
+                        select_list = ", ".join(f'"{column}"' for column in columns)
+                        logger.debug(f"Preloading {len(columns)}/{len(table_columns)} columns of {table_name}: {columns}")
+                    else:
+                        logger.warning(f"None of the analyzed columns exist in {table_name}, preloading all columns")
+                        columns = table_columns
+                sort_column = next((column for column in self.preload_sort_columns if column in columns), None)
+                if sort_column:
+                    order_by = f' ORDER BY "{sort_column}"'
+
+            # A snapshot is reused if it was loaded with the same statement from an unchanged source table
+            snapshot_tag = None
+            if self.snapshot_directory or self.duckdb_database_path != ":memory:":
+                snapshot_tag = f"{self._source_fingerprint(table_name)}|SELECT {select_list}{order_by}"
+                if not self.force_reload_tables and self._restore_snapshot(conn, table_name, snapshot_tag):
+                    self._update_stats(snapshots_restored=1)
+                    return True
+
+            # Drop existing table if force reload is enabled or in memory mode
+            if self.force_reload_tables or self.duckdb_database_path == ":memory:":
+                try:
+                    # Table name is safe after validation
+                    conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+                    logger.debug(f"Dropped existing table {table_name} for reload")
+                except Exception:
+                    pass  # Table might not exist
+
+            # Create table in DuckDB by copying from PostgreSQL
+            # Use CREATE OR REPLACE for better handling
+            try:
+                # Table names are safe after validation
+                conn.execute(f"""
+                    CREATE OR REPLACE TABLE {table_name} AS
+                    SELECT {select_list} FROM postgres_db.{table_name}{order_by}
+                """)
+            except Exception as create_error:
+                # If CREATE OR REPLACE is not supported, try regular CREATE
+                if "CREATE OR REPLACE" in str(create_error):
+                    conn.execute(f"""
+                        CREATE TABLE {table_name} AS
+                        SELECT {select_list} FROM postgres_db.{table_name}{order_by}
+                    """)
+                else:
+                    raise
+
+            # Get row count for logging
+            # Table name is safe after validation
+            result = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()
+            row_count = result[0] if result else 0
+
+            logger.debug(f"Preloaded table {table_name} with {row_count:,} rows")
+
+            if snapshot_tag is not None:
+                self._save_snapshot(conn, table_name, snapshot_tag)
+            return True
+
+        except Exception as table_error:
+            logger.warning(f"Failed to preload table {table_name}: {table_error}")
+            return False
+        finally:
+            if conn is not self.duckdb_conn:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _source_fingerprint(self, table_name: str) -> str | None:
+        """
+        Fingerprint the contents of a PostgreSQL table from its storage file node and row change counters.
+
+        The file node changes on TRUNCATE and table rewrites, the counters on every committed or aborted
+        row change. Views have no fingerprint.
+
+        Returns:
+            str | None: The fingerprint, None if it cannot be determined
+        """
+        try:
+            with self.postgresql_conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT c.relfilenode, s.n_tup_ins, s.n_tup_upd, s.n_tup_del FROM pg_class c "
+                    "JOIN pg_stat_all_tables s ON s.relid = c.oid WHERE c.oid = to_regclass(%s)",
+                    (table_name,),
+                )
+                row = cursor.fetchone()
+            return ":".join(str(value) for value in row) if row else None
+        except Exception as e:
+            logger.debug(f"Failed to fingerprint table {table_name}: {e}")
+            return None
+
+    def _snapshot_valid(self, table_name: str, stored_tag: str | None, snapshot_tag: str) -> bool:
+        """Check a stored snapshot tag against the tag of the current source table and load statement."""
+        if stored_tag is None:
+            return False
+        stored_fingerprint, _, stored_statement = stored_tag.partition("|")
+        fingerprint, _, statement = snapshot_tag.partition("|")
+        if stored_statement != statement:
+            return False
+        if fingerprint != "None" and stored_fingerprint == fingerprint:
+            return True
+        # Stale snapshots of incrementally refreshed tables are caught up by refresh_tables instead of reloaded
+        return table_name in self.refresh_tables_config
+
+    def _snapshot_path(self, table_name: str) -> str:
+        return os.path.join(self.snapshot_directory, f"{table_name}.parquet")
+
+    def _restore_snapshot(self, conn: Any, table_name: str, snapshot_tag: str) -> bool:
+        """
+        Restore a table from its snapshot if the snapshot is valid.
+
+        Returns:
+            bool: True if the table was restored, False if it needs to be loaded from PostgreSQL
+        """
+        try:
+            if self.snapshot_directory:
+                path = self._snapshot_path(table_name)
+                if not os.path.exists(path):
+                    return False
+                result = conn.execute("SELECT value FROM parquet_kv_metadata(?) WHERE key = 'pcache_snapshot'", [path]).fetchone()
+                if not self._snapshot_valid(table_name, result[0].decode() if result else None, snapshot_tag):
+                    logger.debug(f"Snapshot of table {table_name} is stale")
+                    return False
+                conn.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM read_parquet(?)", [path])
+            else:
+                result = conn.execute(f"SELECT snapshot_tag FROM {SNAPSHOT_TABLE} WHERE table_name = ?", [table_name]).fetchone()
+                if not self._snapshot_valid(table_name, result[0] if result else None, snapshot_tag):
+                    logger.debug(f"Snapshot of table {table_name} is stale")
+                    return False
+                if conn.execute("SELECT 1 FROM information_schema.tables WHERE table_name = ?", [table_name]).fetchone() is None:
+                    return False
+
+            logger.debug(f"Restored table {table_name} from snapshot")
+            return True
+        except Exception as e:
+            logger.debug(f"Failed to restore snapshot of table {table_name}: {e}")
+            return False
+
+    def _save_snapshot(self, conn: Any, table_name: str, snapshot_tag: str) -> None:
+        """Record a loaded table as snapshot, failures only cost a reload on the next start."""
+        try:
+            if self.snapshot_directory:
+                path = self._snapshot_path(table_name)
+                # Write to a temporary file so that a crash never leaves a truncated snapshot behind
+                temporary_path = f"{path}.tmp"
+                escaped_path = temporary_path.replace("'", "''")
+                escaped_tag = snapshot_tag.replace("'", "''")
+                conn.execute(f"COPY {table_name} TO '{escaped_path}' (FORMAT PARQUET, KV_METADATA {{pcache_snapshot: '{escaped_tag}'}})")
+                os.replace(temporary_path, path)
+            else:
+                conn.execute(f"INSERT OR REPLACE INTO {SNAPSHOT_TABLE} VALUES (?, ?, now())", [table_name, snapshot_tag])
+        except Exception as e:
+            logger.warning(f"Failed to save snapshot of table {table_name}: {e}")
+
+    def _postgresql_table_columns(self, table_name: str) -> list[str]:
+        """Return the column names of a PostgreSQL table, view, or materialized view in definition order."""
+        with self.postgresql_conn.cursor() as cursor:
+            # pg_attribute also covers materialized views, which are missing from information_schema.columns
+            cursor.execute(
+                "SELECT attname FROM pg_attribute WHERE attrelid = to_regclass(%s) AND attnum > 0 AND NOT attisdropped ORDER BY attnum",
+                (table_name,),
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def refresh_table(self, table_name: str) -> int:
+        """
+        Pull rows changed since the last refresh of a preloaded table from PostgreSQL.
+
+        The watermark is the maximum of the watermark column in the DuckDB copy. Newer rows are
+        staged in a temporary table and applied in a single DuckDB transaction, so queries running
+        concurrently see either the old or the new table contents.
+
+        Args:
+            table_name: Name of a table configured in refresh_tables
+
+        Returns:
+            int: Number of rows pulled from PostgreSQL, -1 on failure
+        """
+        watermark_column, key_column = self.refresh_tables_config[table_name]
+        staging_table = f"_pcache_refresh_{table_name.replace('.', '_').replace('-', '_')}"
+        cursor = None
+        try:
+            # Identifiers are validated by parse_refresh_tables, validate again for direct configuration
+            for identifier in (table_name, watermark_column, key_column or "_"):
+                validate_table_name(identifier)
+
+            cursor = self.duckdb_conn.cursor()
+            result = cursor.execute(f"SELECT max({watermark_column}) FROM {table_name}").fetchone()
+            watermark = result[0] if result else None
+
+            # Pull only the columns of the DuckDB copy, which may have been preloaded with a subset of the columns
+            select_list = ", ".join(f'"{row[0]}"' for row in cursor.execute(f"DESCRIBE {table_name}").fetchall())
+
+            if watermark is None:
+                cursor.execute(f"CREATE OR REPLACE TEMP TABLE {staging_table} AS SELECT {select_list} FROM postgres_db.{table_name}")
+            else:
+                # Keyed rows are replaced, so rows sharing the watermark value are pulled again instead of being missed
+                operator = ">=" if key_column else ">"
+                cursor.execute(
+                    f"CREATE OR REPLACE TEMP TABLE {staging_table} AS SELECT {select_list} FROM postgres_db.{table_name} "
+                    f"WHERE {watermark_column} {operator} ?",
+                    [watermark],
+                )
+
+            result = cursor.execute(f"SELECT COUNT(*) FROM {staging_table}").fetchone()
+            row_count = result[0] if result else 0
+
+            if row_count:
+                cursor.execute("BEGIN TRANSACTION")
+                try:
+                    if key_column:
+                        cursor.execute(f"DELETE FROM {table_name} WHERE {key_column} IN (SELECT {key_column} FROM {staging_table})")
+                    cursor.execute(f"INSERT INTO {table_name} SELECT * FROM {staging_table}")
+                    cursor.execute("COMMIT")
+                except Exception:
+                    cursor.execute("ROLLBACK")
+                    raise
+
+            cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
+            logger.debug(f"Refreshed table {table_name} with {row_count:,} rows newer than {watermark}")
+            return row_count
+
+        except Exception as e:
+            logger.warning(f"Failed to refresh table {table_name}: {e}")
+            return -1
+        finally:
+            if cursor:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    def refresh_tables(self) -> bool:
+        """
+        Incrementally refresh all tables configured in refresh_tables.
+
+        Returns:
+            bool: True if all tables were refreshed, False otherwise
+        """
+        if not self._initialized or not self.refresh_tables_config:
+            return True
+
+        with self._refresh_lock:
+            refresh_start = time.perf_counter()
+            try:
+                # ATTACH is not persisted, a reused DuckDB database file may not have postgres_db attached yet
+                self._attach_postgresql()
+            except Exception as e:
+                logger.error(f"Failed to attach PostgreSQL for table refresh: {e}")
+                self._update_stats(connection_errors=1)
+                return False
+
+            rows_refreshed = 0
+            success = True
+            for table_name in self.refresh_tables_config:
+                row_count = self.refresh_table(table_name)
+                if row_count < 0:
+                    success = False
+                else:
+                    rows_refreshed += row_count
+
+            refresh_duration = time.perf_counter() - refresh_start
+            self._update_stats(refreshes=1, rows_refreshed=rows_refreshed, refresh_time=refresh_duration)
+            logger.debug(f"Refreshed {len(self.refresh_tables_config)} tables with {rows_refreshed:,} rows in {refresh_duration:.2f}s")
+            return success
+
+    def start_refresh(self) -> bool:
+        """
+        Start refreshing the configured tables every refresh_interval seconds in a background thread.
+
+        Returns:
+            bool: True if the refresh thread is running, False otherwise
+        """
+        if not self._initialized or not self.refresh_tables_config or self.refresh_interval <= 0:
+            return False
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return True
+
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, name="duckdb-refresh", daemon=True)
+        self._refresh_thread.start()
+        logger.info(f"Refreshing {len(self.refresh_tables_config)} DuckDB tables every {self.refresh_interval}s")
+        return True
+
+    def _refresh_loop(self) -> None:
+        while not self._refresh_stop.wait(self.refresh_interval):
+            self.refresh_tables()
+
+    def stop_refresh(self) -> None:
+        """Stop the background refresh thread."""
+        self._refresh_stop.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+
+    def _attach_postgresql(self) -> None:
+        """Attach the PostgreSQL database to DuckDB as postgres_db unless it is already attached."""
+        # Build connection string for DuckDB PostgreSQL extension
+        pg_conn_str = self._build_duckdb_postgres_connection_string()
+
+        # Check if postgres_db is already attached (for persistent databases)
+        try:
+            # Try to query if the database exists
+            result = self.duckdb_conn.execute("SELECT 1 FROM duckdb_databases() WHERE database_name = 'postgres_db'").fetchone()
+            if result is None:
+                # Not attached, attach it now
+                self.duckdb_conn.execute(f"ATTACH '{pg_conn_str}' AS postgres_db (TYPE POSTGRES)")
+            else:
+                logger.debug("PostgreSQL database already attached as postgres_db")
+        except Exception:
+            # If the check fails, try to attach (for older DuckDB versions)
+            try:
+                self.duckdb_conn.execute(f"ATTACH '{pg_conn_str}' AS postgres_db (TYPE POSTGRES)")
+            except Exception as attach_error:
+                # If attach fails with "already exists", that's OK
+                if "already exists" in str(attach_error):
+                    logger.debug("PostgreSQL database already attached as postgres_db")
+                else:
+                    raise
+
     def _build_duckdb_postgres_connection_string(self) -> str:
         """Build PostgreSQL connection string for DuckDB postgres extension."""
         params = self.postgresql_params
@@ -351,35 +752,47 @@ class DuckDBQueryAccelerator:
             logger.debug(f"Failed to check table/view existence for {table_name}: {e}")
             return False
 
-    def _tables_exist_in_duckdb(self) -> bool:
-        """Check if all preload tables exist in DuckDB."""
-        try:
-            for table_name in self.tables_to_preload:
-                # Query DuckDB's information schema to check if table exists
-                result = self.duckdb_conn.execute("SELECT 1 FROM information_schema.tables WHERE table_name = ?", (table_name,)).fetchone()
-                if result is None:
-                    logger.debug(f"Table {table_name} not found in DuckDB")
-                    return False
-            logger.debug(f"All {len(self.tables_to_preload)} tables exist in DuckDB")
-            return True
-        except Exception as e:
-            logger.debug(f"Failed to check table existence in DuckDB: {e}")
-            return False
-
-    def execute_query(self, query: str) -> set[Any]:
+    def execute_query(self, query: str, columnar: bool = False, limit: int | None = None, fallback_handler: AbstractDBHandler | None = None) -> Any:
         """
         Execute query using DuckDB acceleration with PostgreSQL fallback.
 
+        Queries DuckDB rejects are retried once translated from the PostgreSQL to the DuckDB dialect. The
+        outcome is recorded per query shape (the query with literals replaced), so later queries of the same
+        shape run the working variant directly, or go straight to PostgreSQL if neither variant worked.
+
         Args:
             query: SQL query to execute
+            columnar: Return a single integer column computed in DuckDB as a sorted, deduplicated NumPy array
+                instead of a set of Python integers. Requires NumPy, other results are returned as a set.
+            limit: Stop fetching once this many distinct results are collected (None for no limit). Limited
+                results are always fetched as a set.
+            fallback_handler: Database handler running the PostgreSQL fallback, e.g. one per calling thread.
+                Without it, the fallback runs on the accelerator's connection shared by all threads.
 
         Returns:
-            Set of query results
+            Set of query results, or a NumPy integer array for columnar integer results
         """
+        if limit is not None:
+            columnar = False
         if not self._initialized:
             logger.debug("Accelerator not initialized, using fallback")
             self._update_stats(queries_fallback=1)
-            return self._execute_fallback(query)
+            return self._execute_fallback(query, limit, fallback_handler)
+
+        shape = query_shape(query)
+        mode = self._get_shape_mode(shape)
+        if mode == "fallback":
+            logger.debug("Query shape is known to fail in DuckDB, using fallback")
+            self._update_stats(queries_fallback=1, shapes_skipped=1)
+            return self._execute_fallback(query, limit, fallback_handler)
+
+        transpiled_query = None
+        if mode == "transpiled":
+            transpiled_query = self._transpile(query, shape)
+            if transpiled_query is None:
+                logger.debug("Query could not be transpiled for its known shape, using fallback")
+                self._update_stats(queries_fallback=1)
+                return self._execute_fallback(query, limit, fallback_handler)
 
         try:
             # Try DuckDB acceleration first with timeout support
@@ -387,15 +800,34 @@ class DuckDBQueryAccelerator:
 
             logger.debug(f"Executing query with DuckDB acceleration:(timeout = {self.query_timeout}s) {query[:100]}...")
 
-            if self.query_timeout > 0:
-                # Use thread-in-thread approach for timeout
-                result_set = self._execute_with_timeout(query)
+            if transpiled_query is not None:
+                result_set = self._execute_duckdb(transpiled_query, columnar, limit)
+                self._update_stats(queries_transpiled=1)
             else:
-                # Execute query with thread-local cursor
-                cursor = self.duckdb_conn.cursor()
-                result = cursor.execute(query).fetchall()
-                result_set = {row[0] if len(row) == 1 else row for row in result}
-                cursor.close()
+                try:
+                    result_set = self._execute_duckdb(query, columnar, limit)
+                    mode = "native"
+                except concurrent.futures.TimeoutError:
+                    raise
+                except Exception as native_error:
+                    # A shape that ran before keeps its record, the failure may be specific to this query
+                    if mode is not None:
+                        raise
+                    transpiled_query = self._transpile(query, shape) if self.enable_transpilation else None
+                    if transpiled_query is None or transpiled_query == query:
+                        self._set_shape_mode(shape, "fallback")
+                        raise
+                    logger.debug(f"DuckDB rejected query, retrying in DuckDB dialect: {native_error}")
+                    try:
+                        result_set = self._execute_duckdb(transpiled_query, columnar, limit)
+                    except concurrent.futures.TimeoutError:
+                        raise
+                    except Exception:
+                        self._set_shape_mode(shape, "fallback")
+                        raise
+                    mode = "transpiled"
+                    self._update_stats(queries_transpiled=1)
+                self._set_shape_mode(shape, mode)
 
             duration = time.perf_counter() - start_time
             self._update_stats(queries_accelerated=1, total_acceleration_time=duration)
@@ -407,98 +839,243 @@ class DuckDBQueryAccelerator:
         except concurrent.futures.TimeoutError:
             logger.warning(f"DuckDB query timed out after {self.query_timeout}s, falling back to PostgreSQL")
             self._update_stats(queries_timeout=1, queries_fallback=1)
-            return self._execute_fallback(query)
+            return self._execute_fallback(query, limit, fallback_handler)
         except Exception as e:
             logger.warning(f"DuckDB query failed, falling back to PostgreSQL: {e}")
             # Increment fallback counter since we're attempting fallback
             self._update_stats(queries_fallback=1)
-            return self._execute_fallback(query)
+            return self._execute_fallback(query, limit, fallback_handler)
+
+    def _execute_duckdb(self, query: str, columnar: bool = False, limit: int | None = None) -> Any:
+        """Execute a query in DuckDB, with the configured timeout."""
+        if self.query_timeout > 0:
+            return self._execute_with_timeout(query, columnar, limit)
 
-    def _execute_with_timeout(self, query: str) -> set[Any]:
+        # Execute query with thread-local cursor
+        cursor = self.duckdb_conn.cursor()
+        try:
+            return self._fetch_result(cursor.execute(query), columnar, limit)
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _fetch_result(cursor: Any, columnar: bool, limit: int | None = None) -> Any:
         """
-        Execute DuckDB query with timeout using simple threading approach.
+        Fetch the result of an executed query.
+
+        Args:
+            cursor: DuckDB cursor the query was executed on
+            columnar: Fetch a single integer column as a NumPy array without creating Python objects per row
+            limit: Stop fetching once this many distinct results are collected (None to fetch all rows)
+
+        Returns:
+            Set of query results, or a sorted array of the distinct non-NULL values for columnar integer results
+        """
+        if limit is not None:
+            result: set[Any] = set()
+            while rows := cursor.fetchmany(_FETCH_CHUNK_SIZE):
+                result.update(row[0] if len(row) == 1 else row for row in rows)
+                if len(result) >= limit:
+                    break
+            return result
+        if columnar and np is not None and len(cursor.description) == 1 and str(cursor.description[0][1]) in _INTEGER_TYPES:
+            column = next(iter(cursor.fetchnumpy().values()))
+            if isinstance(column, np.ma.MaskedArray):
+                column = column.compressed()
+            return np.unique(column)
+        return {row[0] if len(row) == 1 else row for row in cursor.fetchall()}
+
+    def _get_shape_mode(self, shape: str) -> str | None:
+        """
+        Return how queries of a shape run: "native", "transpiled", "fallback", or None if unknown.
+
+        A "fallback" record expires after fallback_retry_interval seconds, so the shape is tried in DuckDB again.
+        """
+        with self._shape_lock:
+            record = self._shape_modes.get(shape)
+            if record is None:
+                return None
+            self._shape_modes.move_to_end(shape)
+            mode, recorded_at = record
+            if mode == "fallback" and time.monotonic() - recorded_at >= self.fallback_retry_interval:
+                return None
+            return mode
+
+    def _set_shape_mode(self, shape: str, mode: str) -> None:
+        with self._shape_lock:
+            self._shape_modes[shape] = (mode, time.monotonic())
+            self._shape_modes.move_to_end(shape)
+            while len(self._shape_modes) > self.transpile_cache_size:
+                self._shape_modes.popitem(last=False)
+
+    def _transpile(self, query: str, shape: str | None = None) -> str | None:
+        """
+        Translate a query from the PostgreSQL to the DuckDB dialect.
+
+        The translation of the first query of a shape is also done with its literals replaced by numbered
+        placeholders. If filling the literals into this template reproduces the translation, the template is
+        kept for the shape and later queries of the shape are translated by filling in their literals. Shapes
+        whose translation depends on the literals (e.g. format strings) are translated query by query.
+
+        Args:
+            query: SQL query in the PostgreSQL dialect
+            shape: Shape of the query (see query_shape), computed if not given
+
+        Returns:
+            str | None: The translated query, None if sqlglot cannot translate it
+        """
+        if shape is None:
+            shape = query_shape(query)
+        literals = LITERAL_PATTERN.findall(query)
+
+        with self._shape_lock:
+            known = shape in self._transpiled_shapes
+            template = self._transpiled_shapes.get(shape)
+            if known:
+                self._transpiled_shapes.move_to_end(shape)
+        if template is not None:
+            return self._fill_template(template, literals)
+
+        transpiled_query = self._transpile_sql(query)
+        if known:
+            return transpiled_query
+
+        # Only queries without placeholders of their own can be turned into a template
+        if transpiled_query is not None and not _PLACEHOLDER_PATTERN.search(query):
+            numbered = iter(range(1, len(literals) + 1))
+            template = self._transpile_sql(LITERAL_PATTERN.sub(lambda _: f"${next(numbered)}", query))
+            if template is not None and self._fill_template(template, literals) != transpiled_query:
+                template = None
+
+        with self._shape_lock:
+            self._transpiled_shapes[shape] = template
+            while len(self._transpiled_shapes) > self.transpile_cache_size:
+                self._transpiled_shapes.popitem(last=False)
+        return transpiled_query
+
+    @staticmethod
+    def _transpile_sql(query: str) -> str | None:
+        """Translate a query with sqlglot, returning None if it cannot be translated."""
+        try:
+            return sqlglot.transpile(query, read="postgres", write="duckdb")[0]
+        except Exception as e:
+            logger.debug(f"Failed to transpile query to DuckDB dialect: {e}")
+            return None
+
+    @staticmethod
+    def _fill_template(template: str, literals: list[str]) -> str:
+        """Replace the numbered placeholders of a translated query template by the literals of a query."""
+        return _PLACEHOLDER_PATTERN.sub(lambda match: literals[int(match.group(1)) - 1], template)
+
+    def _execute_with_timeout(self, query: str, columnar: bool = False, limit: int | None = None) -> Any:
+        """
+        Execute DuckDB query with timeout on the shared query executor.
+
+        Each query runs on its own cursor, so a timeout interrupts only that cursor and leaves the queries of
+        other monitor workers running on the same DuckDB database untouched.
 
         Args:
             query: SQL query to execute
+            columnar: Fetch a single integer column as a NumPy array
+            limit: Stop fetching once this many distinct results are collected
 
         Returns:
-            Set of query results
+            Set of query results, or a NumPy integer array for columnar integer results
 
         Raises:
             concurrent.futures.TimeoutError: If query times out
         """
-        result_container = {"result": None, "exception": None, "completed": False}
+        handle: dict[str, Any] = {"cursor": None, "cancelled": False}
+        handle_lock = threading.Lock()
 
-        def _duckdb_query_worker():
+        def _duckdb_query_worker() -> Any:
             """Worker function that executes the DuckDB query."""
-            cursor = None
-            try:
-                # Create thread-local cursor for thread safety
+            with handle_lock:
+                if handle["cancelled"]:
+                    raise concurrent.futures.CancelledError()
+                # Create a per-query cursor so that it can be interrupted in isolation
                 cursor = self.duckdb_conn.cursor()
-                result = cursor.execute(query).fetchall()
-                result_container["result"] = {row[0] if len(row) == 1 else row for row in result}
-                result_container["completed"] = True
+                handle["cursor"] = cursor
+            try:
+                result = self._fetch_result(cursor.execute(query), columnar, limit)
                 logger.debug(f"DuckDB query worker completed successfully with {len(result)} rows")
-            except Exception as e:
-                logger.debug(f"DuckDB query worker failed: {e}")
-                result_container["exception"] = e
-                result_container["completed"] = True
+                return result
             finally:
-                if cursor:
-                    try:
-                        cursor.close()
-                    except Exception:
-                        pass
-
-        # Start the worker thread as daemon to avoid blocking main thread
-        worker_thread = threading.Thread(target=_duckdb_query_worker, daemon=True)
-        worker_thread.start()
-        logger.debug(f"Started DuckDB query worker thread with {self.query_timeout}s timeout")
-
-        # Wait for completion with timeout
-        worker_thread.join(timeout=self.query_timeout)
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
 
-        if worker_thread.is_alive():
-            # Query timed out - attempt to interrupt connection
+        future = self._get_query_executor().submit(_duckdb_query_worker)
+        try:
+            return future.result(timeout=self.query_timeout)
+        except concurrent.futures.TimeoutError:
+            # Query timed out - interrupt only the cursor of this query
             logger.warning(f"DuckDB query timed out after {self.query_timeout}s, attempting to interrupt")
-            try:
-                if self.duckdb_conn:
-                    self.duckdb_conn.interrupt()
-                    logger.debug("DuckDB connection interrupted successfully")
-            except Exception as interrupt_error:
-                logger.debug(f"Failed to interrupt DuckDB connection: {interrupt_error}")
-
-            # Wait a bit more for graceful cleanup
-            worker_thread.join(timeout=1.0)
+            with handle_lock:
+                handle["cancelled"] = True
+                cursor = handle["cursor"]
+            if cursor is None:
+                future.cancel()
+            else:
+                try:
+                    cursor.interrupt()
+                    logger.debug("DuckDB query interrupted successfully")
+                except Exception as interrupt_error:
+                    logger.debug(f"Failed to interrupt DuckDB query: {interrupt_error}")
 
             # Raise timeout error to trigger fallback
             timeout_msg = f"Query timed out after {self.query_timeout} seconds"
-            raise concurrent.futures.TimeoutError(timeout_msg)
-
-        # Check if worker thread completed successfully
-        if not result_container["completed"]:
-            error_msg = "Query execution failed - worker thread did not complete"
-            raise Exception(error_msg)
+            raise concurrent.futures.TimeoutError(timeout_msg) from None
 
-        # Check for exceptions in worker thread
-        if result_container["exception"]:
-            raise result_container["exception"]
+    def _get_query_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Return the executor running queries with a timeout, creating it on first use."""
+        with self._query_executor_lock:
+            if self._query_executor is None:
+                self._query_executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrent_queries, thread_name_prefix="duckdb-query")
+            return self._query_executor
 
-        return result_container["result"]
+    def _execute_fallback(self, query: str, limit: int | None = None, fallback_handler: AbstractDBHandler | None = None) -> set[Any]:
+        """
+        Execute query using PostgreSQL fallback, fetching until the limit of distinct results is reached.
 
-    def _execute_fallback(self, query: str) -> set[Any]:
-        """Execute query using PostgreSQL fallback."""
+        The query runs on fallback_handler if given (streaming the first column), otherwise on the shared
+        connection of the accelerator, which is rolled back if the query fails.
+        """
         try:
             start_time = time.perf_counter()
 
             logger.debug(f"Executing query with PostgreSQL fallback: {query[:100]}...")
 
-            with self.postgresql_conn.cursor() as cursor:
-                cursor.execute(query)
-                result = cursor.fetchall()
-
-            # Convert to set for compatibility
-            result_set = {row[0] if len(row) == 1 else row for row in result}
+            result_set: set[Any] = set()
+            if fallback_handler is not None:
+                values = fallback_handler.execute_iter(query)
+                try:
+                    for value in values:
+                        result_set.add(value)
+                        if limit is not None and len(result_set) >= limit:
+                            break
+                finally:
+                    # Close the stream, and with it its cursor, also when the limit ends the iteration early
+                    close = getattr(values, "close", None)
+                    if close is not None:
+                        close()
+            else:
+                conn = self.postgresql_conn
+                if conn is None:
+                    raise RuntimeError("No PostgreSQL connection for the fallback, the accelerator is not initialized")
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute(query)
+                        # Convert to set for compatibility
+                        result_set = self._fetch_result(cursor, False, limit)
+                except Exception:
+                    # Do not leave the shared connection in an aborted transaction for later fallbacks
+                    try:
+                        conn.rollback()
+                    except Exception as rollback_error:
+                        logger.debug(f"Failed to roll back PostgreSQL fallback connection: {rollback_error}")
+                    raise
 
             duration = time.perf_counter() - start_time
             self._update_stats(total_fallback_time=duration)
@@ -562,7 +1139,13 @@ class DuckDBQueryAccelerator:
         logger.info(f"Total queries executed: {stats['total_queries']}")
         logger.info(f"Queries accelerated: {stats['queries_accelerated']} ({stats.get('acceleration_rate', 0):.1%})")
         logger.info(f"Queries fallback: {stats['queries_fallback']}")
+        if stats["queries_transpiled"] or stats["shapes_skipped"]:
+            logger.info(f"Queries transpiled: {stats['queries_transpiled']}, sent to PostgreSQL by known shape: {stats['shapes_skipped']}")
         logger.info(f"Tables preloaded: {stats['tables_preloaded']} (took {stats['preload_time']:.2f}s)")
+        if stats["snapshots_restored"]:
+            logger.info(f"Tables restored from snapshots: {stats['snapshots_restored']}")
+        if stats["refreshes"]:
+            logger.info(f"Incremental refreshes: {stats['refreshes']} ({stats['rows_refreshed']:,} rows, took {stats['refresh_time']:.2f}s)")
 
         if stats.get("avg_acceleration_time"):
             logger.info(f"Average acceleration time: {stats['avg_acceleration_time']:.3f}s")
@@ -592,6 +1175,14 @@ class DuckDBQueryAccelerator:
         """Close accelerator and clean up resources."""
         logger.debug("Closing DuckDB query accelerator...")
 
+        self.stop_refresh()
+
+        with self._query_executor_lock:
+            if self._query_executor is not None:
+                # Interrupted queries finish promptly, queued queries are dropped
+                self._query_executor.shutdown(wait=False, cancel_futures=True)
+                self._query_executor = None
+
         if self.enable_statistics:
             self.log_statistics()
 
@@ -198,6 +198,34 @@ def extract_conjunctive_conditions(sql: str) -> list[str]:
     return conditions
 
 
+def extract_table_columns(sql: str) -> dict[str, set[str]]:
+    """
+    Returns the columns referenced per table of a query.
+
+    Table aliases are resolved to table names. Unqualified columns are attributed to every table
+    of the query, and a star selection (* or alias.*) is recorded as "*".
+    """
+    parsed = sqlglot.parse_one(sql)
+    alias_to_table = {table.alias_or_name: table.name for table in parsed.find_all(exp.Table)}
+    table_columns: dict[str, set[str]] = {table_name: set() for table_name in alias_to_table.values()}
+
+    for column in parsed.find_all(exp.Column):
+        column_name = "*" if isinstance(column.this, exp.Star) else column.name
+        if column.table:
+            if column.table in alias_to_table:
+                table_columns[alias_to_table[column.table]].add(column_name)
+        else:
+            for columns in table_columns.values():
+                columns.add(column_name)
+
+    for star in parsed.find_all(exp.Star):
+        if isinstance(star.parent, exp.Select):
+            for columns in table_columns.values():
+                columns.add("*")
+
+    return table_columns
+
+
 def extract_and_group_query_conditions(
     query, partition_key
 ) -> tuple[
@@ -1484,6 +1512,23 @@ def hash_query(query: str) -> str:
     return hashlib.sha1(query.encode()).hexdigest()
 
 
+# String and numeric literals, replaced by placeholders to group queries by shape
+LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def query_shape(query: str) -> str:
+    """
+    Normalize a query to its shape, so that queries differing only in literals share a shape.
+
+    Args:
+        query (str): SQL query
+
+    Returns:
+        str: The lowercased query with literals replaced by "?" and whitespace collapsed
+    """
+    return " ".join(LITERAL_PATTERN.sub("?", query).lower().split())
+
+
 
 def extract_distance_constraints(query: str) -> list[tuple[str, str, float]]:
     """Extract (alias1, alias2, distance) from all distance constraints in the query.
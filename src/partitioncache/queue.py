@@ -5,16 +5,22 @@ This module provides a clean interface for queue operations while delegating the
 implementation to specific queue handlers via the factory pattern.
 """
 
+import asyncio
 import os
 from logging import getLogger
 
 from partitioncache.queue_handler import get_queue_handler
+from partitioncache.queue_handler.async_producer import AsyncQueueProducer
 
 logger = getLogger("PartitionCache")
 
 # Global queue handler instance
 _queue_handler = None
 
+# Async producer, bound to the event loop it was created in
+_async_producer: AsyncQueueProducer | None = None
+_async_producer_loop: asyncio.AbstractEventLoop | None = None
+
 
 def _get_queue_handler(queue_provider: str | None = None):
     """Get or create the queue handler instance."""
@@ -63,7 +69,7 @@ def push_to_original_query_queue(
 
 
 def push_to_query_fragment_queue(
-    query_hash_pairs: list[tuple[str, str]], partition_key: str = "partition_key", partition_datatype: str = "integer", queue_provider: str | None = None
+    query_hash_pairs: list[tuple[str, str]], partition_key: str = "partition_key", partition_datatype: str | None = "integer", queue_provider: str | None = None
 ) -> bool:
     """
     Push query fragments (as query-hash pairs) directly to the query fragment queue.
@@ -71,7 +77,7 @@ def push_to_query_fragment_queue(
     Args:
         query_hash_pairs (list[tuple[str, str]]): List of (query, hash) tuples to push to query fragment queue.
         partition_key (str): The partition key for these query fragments (default: "partition_key").
-        partition_datatype (str): The datatype of the partition key (default: "integer").
+        partition_datatype (str): The datatype of the partition key (default: "integer", None if unknown).
         queue_provider (str): The queue provider to use (default: None, which uses the environment variable QUERY_QUEUE_PROVIDER).
     Returns:
         bool: True if all fragments were pushed successfully, False otherwise.
@@ -84,6 +90,99 @@ def push_to_query_fragment_queue(
         return False
 
 
+async def _get_async_producer(queue_provider: str | None = None) -> AsyncQueueProducer:
+    """Get or create the async producer for the running event loop."""
+    global _async_producer, _async_producer_loop
+    loop = asyncio.get_running_loop()
+    if _async_producer is None or _async_producer_loop is not loop:
+        # Handler creation may initialize queue tables, keep it off the event loop
+        handler = await asyncio.to_thread(_get_queue_handler, queue_provider)
+        _async_producer = AsyncQueueProducer(handler)
+        _async_producer_loop = loop
+    return _async_producer
+
+
+async def push_to_original_query_queue_async(
+    query: str, partition_key: str = "partition_key", partition_datatype: str | None = None, queue_provider: str | None = None, buffered: bool = False
+) -> bool:
+    """
+    Asyncio variant of push_to_original_query_queue that does not block the event loop.
+
+    Args:
+        query (str): The original query to be pushed to the original query queue.
+        partition_key (str): The partition key for this query (default: "partition_key").
+        partition_datatype (str): The datatype of the partition key (default: None).
+        queue_provider (str): The queue provider to use (default: None, which uses the environment variable QUERY_QUEUE_PROVIDER).
+        buffered (bool): If True, buffer the push and return immediately; a background task writes it to the queue.
+            Use flush_queue_async() to wait for buffered pushes (default: False).
+
+    Returns:
+        bool: True if the query was pushed (or buffered), False otherwise.
+    """
+    try:
+        producer = await _get_async_producer(queue_provider)
+        if buffered:
+            return producer.enqueue_original_query(query, partition_key, partition_datatype)
+        return await producer.push_to_original_query_queue(query, partition_key, partition_datatype)
+    except Exception as e:
+        logger.error(f"Failed to push query to original query queue: {e}")
+        return False
+
+
+async def push_to_query_fragment_queue_async(
+    query_hash_pairs: list[tuple[str, str]],
+    partition_key: str = "partition_key",
+    partition_datatype: str = "integer",
+    queue_provider: str | None = None,
+    buffered: bool = False,
+) -> bool:
+    """
+    Asyncio variant of push_to_query_fragment_queue that does not block the event loop.
+
+    Args:
+        query_hash_pairs (list[tuple[str, str]]): List of (query, hash) tuples to push to query fragment queue.
+        partition_key (str): The partition key for these query fragments (default: "partition_key").
+        partition_datatype (str): The datatype of the partition key (default: "integer").
+        queue_provider (str): The queue provider to use (default: None, which uses the environment variable QUERY_QUEUE_PROVIDER).
+        buffered (bool): If True, buffer the push and return immediately; buffered fragments of the same
+            partition key are written as one batch by a background task (default: False).
+
+    Returns:
+        bool: True if all fragments were pushed (or buffered), False otherwise.
+    """
+    try:
+        producer = await _get_async_producer(queue_provider)
+        if buffered:
+            return producer.enqueue_query_fragments(query_hash_pairs, partition_key, partition_datatype)
+        return await producer.push_to_query_fragment_queue(query_hash_pairs, partition_key, partition_datatype)
+    except Exception as e:
+        logger.error(f"Failed to push fragments to query fragment queue: {e}")
+        return False
+
+
+async def flush_queue_async() -> None:
+    """
+    Wait until all buffered async pushes have been written to the queue.
+    """
+    if _async_producer is not None and _async_producer_loop is asyncio.get_running_loop():
+        await _async_producer.flush()
+
+
+async def close_queue_producer_async() -> None:
+    """
+    Flush buffered async pushes and stop the background flush task.
+    Call before the event loop shuts down, otherwise buffered pushes are lost.
+    """
+    global _async_producer, _async_producer_loop
+    if _async_producer is not None and _async_producer_loop is asyncio.get_running_loop():
+        try:
+            await _async_producer.close()
+        except Exception as e:
+            logger.error(f"Error closing async queue producer: {e}")
+    _async_producer = None
+    _async_producer_loop = None
+
+
 def pop_from_original_query_queue(queue_provider: str | None = None) -> tuple[str, str, str] | None:
     """
     Pop an original query from the original query queue.
@@ -164,6 +263,115 @@ def pop_from_query_fragment_queue_blocking(timeout: int = 60, queue_provider: st
         return None
 
 
+def pop_many_from_original_query_queue(n: int, queue_provider: str | None = None) -> list[tuple[str, str, str]]:
+    """
+    Pop up to n original queries from the original query queue in a single round trip.
+
+    Args:
+        n (int): Maximum number of queries to pop.
+
+    Returns:
+        List[Tuple[str, str, str]]: (query, partition_key, partition_datatype) tuples, empty if queue is empty or error occurred.
+    """
+    try:
+        handler = _get_queue_handler(queue_provider)
+        return handler.pop_many_from_original_query_queue(n)  # type: ignore[no-any-return]
+    except Exception as e:
+        logger.error(f"Failed to pop from original query queue: {e}")
+        return []
+
+
+def pop_many_from_query_fragment_queue(
+    n: int, queue_provider: str | None = None, worker_id: str | None = None, active_workers: list[str] | None = None
+) -> list[tuple[str, str, str, str]]:
+    """
+    Pop up to n query fragments from the query fragment queue in a single round trip.
+
+    Args:
+        n (int): Maximum number of fragments to pop.
+        worker_id (str): Id of the popping worker, to only pop fragments of partition keys assigned to it (default: None).
+        active_workers (List[str]): Ids of all active workers sharing the queue (default: None).
+
+    Returns:
+        List[Tuple[str, str, str, str]]: (query, hash, partition_key, partition_datatype) tuples, empty if queue is empty or error occurred.
+    """
+    try:
+        handler = _get_queue_handler(queue_provider)
+        if worker_id is not None and active_workers:
+            return handler.pop_many_from_query_fragment_queue(n, worker_id=worker_id, active_workers=active_workers)  # type: ignore[no-any-return]
+        return handler.pop_many_from_query_fragment_queue(n)  # type: ignore[no-any-return]
+    except Exception as e:
+        logger.error(f"Failed to pop from query fragment queue: {e}")
+        return []
+
+
+def acquire_fragment_lease(hash_value: str, partition_key: str, queue_provider: str | None = None) -> bool:
+    """
+    Acquire an exclusive lease on a query fragment, so that other monitors sharing the queue skip it while it is executed.
+
+    Args:
+        hash_value (str): The hash of the query fragment.
+        partition_key (str): The partition key of the query fragment.
+
+    Returns:
+        bool: True if the lease was acquired (or could not be checked), False if another worker holds it.
+    """
+    try:
+        handler = _get_queue_handler(queue_provider)
+        return handler.acquire_fragment_lease(hash_value, partition_key)  # type: ignore[no-any-return]
+    except Exception as e:
+        logger.error(f"Failed to acquire fragment lease: {e}")
+        return True
+
+
+def release_fragment_lease(hash_value: str, partition_key: str, queue_provider: str | None = None) -> None:
+    """
+    Release a lease acquired with acquire_fragment_lease.
+
+    Args:
+        hash_value (str): The hash of the query fragment.
+        partition_key (str): The partition key of the query fragment.
+    """
+    try:
+        handler = _get_queue_handler(queue_provider)
+        handler.release_fragment_lease(hash_value, partition_key)
+    except Exception as e:
+        logger.error(f"Failed to release fragment lease: {e}")
+
+
+def heartbeat_worker(worker_id: str, ttl: float, queue_provider: str | None = None) -> list[str]:
+    """
+    Register a worker sharing the queues or refresh its registration, and return all active workers.
+
+    Args:
+        worker_id (str): Unique id of the worker.
+        ttl (float): Seconds after which the worker is considered dead without a further heartbeat.
+
+    Returns:
+        List[str]: Sorted ids of the active workers, empty if an error occurred.
+    """
+    try:
+        handler = _get_queue_handler(queue_provider)
+        return handler.heartbeat_worker(worker_id, ttl)  # type: ignore[no-any-return]
+    except Exception as e:
+        logger.error(f"Failed to send worker heartbeat: {e}")
+        return []
+
+
+def unregister_worker(worker_id: str, queue_provider: str | None = None) -> None:
+    """
+    Remove a worker from the registry, so that its partition keys are reassigned immediately.
+
+    Args:
+        worker_id (str): Unique id of the worker.
+    """
+    try:
+        handler = _get_queue_handler(queue_provider)
+        handler.unregister_worker(worker_id)
+    except Exception as e:
+        logger.error(f"Failed to unregister worker: {e}")
+
+
 def get_queue_lengths(queue_provider: str | None = None) -> dict:
     """
     Get the current lengths of both original query and query fragment queues.
@@ -246,13 +454,15 @@ def reset_queue_handler() -> None:
     Reset the queue handler singleton for testing.
     Forces creation of a new handler on next access.
     """
-    global _queue_handler
+    global _queue_handler, _async_producer, _async_producer_loop
     if _queue_handler is not None:
         try:
             _queue_handler.close()
         except Exception:
             pass  # Ignore errors during cleanup
         _queue_handler = None
+    _async_producer = None
+    _async_producer_loop = None
 
 
 def get_queue_provider_name() -> str:
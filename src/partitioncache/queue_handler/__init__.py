@@ -46,6 +46,8 @@ def get_queue_handler(provider: str | None = None) -> AbstractQueueHandler:
             password=str(os.getenv("PG_QUEUE_PASSWORD")),
             dbname=str(os.getenv("PG_QUEUE_DB")),
             table_prefix=str(os.getenv("PG_QUEUE_TABLE_PREFIX", "partitioncache_queue")),
+            pool_min_size=int(os.getenv("PG_QUEUE_POOL_MIN_SIZE", 1)),
+            pool_max_size=int(os.getenv("PG_QUEUE_POOL_MAX_SIZE", 10)),
         )
 
     elif provider == "redis":
@@ -72,6 +72,101 @@ class AbstractQueueHandler(ABC):
         """
         pass
 
+    def pop_many_from_original_query_queue(self, n: int) -> list[tuple[str, str, str]]:
+        """
+        Pop up to n original queries from the original query queue.
+        The default implementation pops one query at a time; handlers override it to pop all in a single round trip.
+
+        Args:
+            n (int): Maximum number of queries to pop.
+
+        Returns:
+            List[Tuple[str, str, str]]: (query, partition_key, partition_datatype) tuples, empty if the queue is empty or error occurred.
+        """
+        results: list[tuple[str, str, str]] = []
+        while len(results) < n:
+            result = self.pop_from_original_query_queue()
+            if result is None:
+                break
+            results.append(result)
+        return results
+
+    def pop_many_from_query_fragment_queue(
+        self, n: int, worker_id: str | None = None, active_workers: list[str] | None = None
+    ) -> list[tuple[str, str, str, str]]:
+        """
+        Pop up to n query fragments from the query fragment queue.
+        The default implementation pops one fragment at a time; handlers override it to pop all in a single round trip.
+
+        With worker_id and active_workers, only fragments whose partition key is assigned to worker_id are popped.
+        Partition keys are assigned to the active workers by rendezvous hashing, so a key only moves to another
+        worker when its worker leaves. The default implementation does not support affinity and pops any fragment.
+
+        Args:
+            n (int): Maximum number of fragments to pop.
+            worker_id (str): Id of the popping worker for partition key affinity (default: None).
+            active_workers (List[str]): Ids of all active workers sharing the queue (default: None).
+
+        Returns:
+            List[Tuple[str, str, str, str]]: (query, hash, partition_key, partition_datatype) tuples, empty if the queue is empty or error occurred.
+        """
+        results: list[tuple[str, str, str, str]] = []
+        while len(results) < n:
+            result = self.pop_from_query_fragment_queue()
+            if result is None:
+                break
+            results.append(result)
+        return results
+
+    def acquire_fragment_lease(self, hash_value: str, partition_key: str) -> bool:
+        """
+        Acquire an exclusive lease on a query fragment before executing it, so that monitors on
+        other hosts sharing the queue skip the fragment while it is in flight.
+        The default implementation does not coordinate across hosts and always grants the lease.
+
+        Args:
+            hash_value (str): The hash of the query fragment.
+            partition_key (str): The partition key of the query fragment.
+
+        Returns:
+            bool: True if the lease was acquired (or could not be checked), False if another worker holds it.
+        """
+        return True
+
+    def release_fragment_lease(self, hash_value: str, partition_key: str) -> None:  # noqa: B027
+        """
+        Release a lease acquired with acquire_fragment_lease.
+
+        Args:
+            hash_value (str): The hash of the query fragment.
+            partition_key (str): The partition key of the query fragment.
+        """
+        pass
+
+    def heartbeat_worker(self, worker_id: str, ttl: float) -> list[str]:
+        """
+        Register a worker sharing the queues or refresh its registration, and return all active workers.
+        Workers that did not send a heartbeat within their ttl are removed from the registry.
+        The default implementation does not coordinate across hosts and only knows the calling worker.
+
+        Args:
+            worker_id (str): Unique id of the worker.
+            ttl (float): Seconds after which the worker is considered dead without a further heartbeat.
+
+        Returns:
+            List[str]: Sorted ids of the active workers, including worker_id. Empty if an error occurred.
+        """
+        return [worker_id]
+
+    def unregister_worker(self, worker_id: str) -> None:  # noqa: B027
+        """
+        Remove a worker from the registry, so that its partition keys are reassigned immediately.
+
+        Args:
+            worker_id (str): Unique id of the worker.
+        """
+        pass
+
     @abstractmethod
     def get_queue_lengths(self) -> dict:
         """
@@ -0,0 +1,136 @@
+"""
+Asyncio producer for the query queues.
+"""
+
+import asyncio
+from collections import defaultdict
+from logging import getLogger
+
+from partitioncache.queue_handler.abstract import AbstractQueueHandler
+
+logger = getLogger("PartitionCache")
+
+
+class AsyncQueueProducer:
+    """
+    Asyncio producer that pushes queries to a queue handler without blocking the event loop.
+
+    Pushes either run the queue handler in a worker thread and are awaited, or are buffered in memory
+    and written by a background flush task (fire-and-forget). The flush task collects buffered items for
+    up to flush_interval seconds and writes fragments of the same partition key as a single batch upsert.
+    """
+
+    def __init__(self, handler: AbstractQueueHandler, max_buffer_size: int = 10000, batch_size: int = 500, flush_interval: float = 0.05):
+        """
+        Args:
+            handler: The queue handler to write to.
+            max_buffer_size: Maximum number of buffered pushes; further buffered pushes are dropped.
+            batch_size: Maximum number of buffered pushes written per flush.
+            flush_interval: Time in seconds to collect buffered pushes before writing them.
+        """
+        self.handler = handler
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: asyncio.Queue[tuple[str, tuple]] = asyncio.Queue(max_buffer_size)
+        self._flush_task: asyncio.Task | None = None
+        self.dropped = 0
+        self.failed = 0
+
+    async def push_to_original_query_queue(self, query: str, partition_key: str, partition_datatype: str | None = None) -> bool:
+        """Push an original query and wait for the write to complete."""
+        return await asyncio.to_thread(self.handler.push_to_original_query_queue, query, partition_key, partition_datatype)
+
+    async def push_to_query_fragment_queue(self, query_hash_pairs: list[tuple[str, str]], partition_key: str, partition_datatype: str | None = None) -> bool:
+        """Push query fragments and wait for the write to complete."""
+        return await asyncio.to_thread(self.handler.push_to_query_fragment_queue, query_hash_pairs, partition_key, partition_datatype)
+
+    def enqueue_original_query(self, query: str, partition_key: str, partition_datatype: str | None = None) -> bool:
+        """
+        Buffer an original query for the background flush task. Must be called from the event loop.
+
+        Returns:
+            bool: True if the query was buffered, False if the buffer is full.
+        """
+        return self._enqueue("original", (query, partition_key, partition_datatype))
+
+    def enqueue_query_fragments(self, query_hash_pairs: list[tuple[str, str]], partition_key: str, partition_datatype: str | None = None) -> bool:
+        """
+        Buffer query fragments for the background flush task. Must be called from the event loop.
+
+        Returns:
+            bool: True if the fragments were buffered, False if the buffer is full.
+        """
+        if not query_hash_pairs:
+            return True
+        return self._enqueue("fragment", (list(query_hash_pairs), partition_key, partition_datatype))
+
+    def _enqueue(self, kind: str, item: tuple) -> bool:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+        try:
+            self._buffer.put_nowait((kind, item))
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Async queue buffer full, dropped {kind} push ({self.dropped} dropped in total)")
+            return False
+
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._buffer.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._buffer.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._buffer.get(), remaining))
+                # asyncio.TimeoutError is not the builtin TimeoutError before Python 3.11
+                except asyncio.TimeoutError:  # noqa: UP041
+                    break
+
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.error(f"Failed to flush {len(batch)} buffered queue pushes: {e}")
+            finally:
+                for _ in batch:
+                    self._buffer.task_done()
+
+    def _write_batch(self, batch: list[tuple[str, tuple]]) -> None:
+        """Write a batch of buffered pushes, merging fragments per (partition_key, partition_datatype)."""
+        fragments: dict[tuple[str, str | None], list[tuple[str, str]]] = defaultdict(list)
+        for kind, item in batch:
+            if kind == "original":
+                if not self.handler.push_to_original_query_queue(*item):
+                    self.failed += 1
+            else:
+                query_hash_pairs, partition_key, partition_datatype = item
+                fragments[(partition_key, partition_datatype)].extend(query_hash_pairs)
+
+        for (partition_key, partition_datatype), query_hash_pairs in fragments.items():
+            if not self.handler.push_to_query_fragment_queue(query_hash_pairs, partition_key, partition_datatype):
+                self.failed += 1
+
+    async def flush(self) -> None:
+        """Wait until all buffered pushes have been written."""
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._buffer.join()
+
+    async def close(self) -> None:
+        """Flush buffered pushes and stop the background flush task. The queue handler is not closed."""
+        await self.flush()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
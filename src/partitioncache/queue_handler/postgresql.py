@@ -2,20 +2,125 @@
 PostgreSQL queue handler implementation.
 """
 
-import select
+import threading
 import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from logging import getLogger
+from typing import TypeVar
 
 import psycopg
 from psycopg import sql
+from psycopg.conninfo import make_conninfo
 
 from partitioncache.queue_handler.abstract import AbstractPriorityQueueHandler
 
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    ConnectionPool = None  # type: ignore[assignment, misc]
+
 logger = getLogger("PartitionCache")
 
+T = TypeVar("T")
+
+NOTIFY_CHANNELS = ("original_query_available", "query_fragment_available")
+
+
+class _NotificationListener:
+    """
+    Process-wide LISTEN connection shared by all blocking poppers for the same database.
+
+    A daemon thread listens on the queue notification channels and increments a per-channel
+    sequence number for every notification. Blocking poppers wait for the sequence to change
+    instead of holding a LISTEN connection each.
+    """
+
+    _listeners: dict[str, "_NotificationListener"] = {}
+    _listeners_lock = threading.Lock()
+
+    @classmethod
+    def acquire(cls, conninfo: str) -> "_NotificationListener":
+        with cls._listeners_lock:
+            listener = cls._listeners.get(conninfo)
+            if listener is None:
+                listener = cls(conninfo)
+                cls._listeners[conninfo] = listener
+            listener._refcount += 1
+            return listener
+
+    @classmethod
+    def release(cls, listener: "_NotificationListener") -> None:
+        with cls._listeners_lock:
+            listener._refcount -= 1
+            if listener._refcount > 0:
+                return
+            cls._listeners.pop(listener.conninfo, None)
+        listener._stop()
+
+    def __init__(self, conninfo: str) -> None:
+        self.conninfo = conninfo
+        self.connected = False
+        self._refcount = 0
+        self._stopped = threading.Event()
+        self._cond = threading.Condition()
+        self._seq = dict.fromkeys(NOTIFY_CHANNELS, 0)
+        self._thread = threading.Thread(target=self._run, name="partitioncache-queue-listener", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                with psycopg.connect(self.conninfo, autocommit=True) as conn:
+                    for channel in NOTIFY_CHANNELS:
+                        conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+                    self.connected = True
+                    # Notifications may have been missed while (re)connecting
+                    self._wake(NOTIFY_CHANNELS)
+                    while not self._stopped.is_set():
+                        for notify in conn.notifies(timeout=1.0):
+                            self._wake((notify.channel,))
+            except Exception as e:
+                logger.debug(f"Queue LISTEN connection failed, reconnecting: {e}")
+            self.connected = False
+            self._wake(NOTIFY_CHANNELS)
+            self._stopped.wait(1.0)
+
+    def _wake(self, channels: tuple[str, ...]) -> None:
+        with self._cond:
+            for channel in channels:
+                if channel in self._seq:
+                    self._seq[channel] += 1
+            self._cond.notify_all()
+
+    def sequence(self, channel: str) -> int:
+        with self._cond:
+            return self._seq[channel]
+
+    def wait(self, channel: str, last_seq: int, timeout: float) -> int:
+        """Wait until a notification arrives on the channel after last_seq was observed, or the timeout expires."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq[channel] != last_seq, timeout)
+            return self._seq[channel]
+
+    def _stop(self) -> None:
+        self._stopped.set()
+        self._thread.join(timeout=5)
+
 
 class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
-    def __init__(self, host: str, port: int, user: str, password: str, dbname: str, table_prefix: str):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        dbname: str,
+        table_prefix: str,
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
+        affinity_scan_limit: int = 1000,
+    ):
         """
         Initialize the PostgreSQL queue handler.
 
@@ -25,6 +130,10 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
             user (str): PostgreSQL username
             password (str): PostgreSQL password
             dbname (str): PostgreSQL database name
+            table_prefix (str): Prefix of the queue tables
+            pool_min_size (int): Minimum number of pooled connections (requires psycopg_pool)
+            pool_max_size (int): Maximum number of pooled connections (requires psycopg_pool)
+            affinity_scan_limit (int): Number of highest priority fragments scanned for a pop with partition key affinity
         """
         self.host = host
         self.port = port
@@ -32,10 +141,21 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
         self.password = password
         self.dbname = dbname
         self._connection = None
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.affinity_scan_limit = affinity_scan_limit
+        self._pool: ConnectionPool | None = None
+        self._pool_lock = threading.Lock()
+        self._listener: _NotificationListener | None = None
+        self._leases: set[tuple[str, str]] = set()
+        self._lease_connection: psycopg.Connection | None = None
+        self._leases_lock = threading.Lock()
 
         self.table_prefix = table_prefix
         self.original_queue_table = f"{self.table_prefix}_original_query_queue"
         self.fragment_queue_table = f"{self.table_prefix}_query_fragment_queue"
+        self.worker_table = f"{self.table_prefix}_queue_workers"
+        self._worker_table_created = False
 
         # Initialize tables and functions on first connection
         self._initialize_tables()
@@ -44,11 +164,55 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
         logger.info(f"PostgreSQLQueueHandler initialized for tables {self.original_queue_table} and {self.fragment_queue_table}")
 
     def _get_connection(self):
-        """Get PostgreSQL connection with proper configuration."""
-        # Always create fresh connections to avoid transaction state pollution
-        # that can cause hanging in concurrent scenarios
+        """Get a new, unpooled PostgreSQL connection. The caller is responsible for closing it."""
         return psycopg.connect(host=self.host, port=self.port, user=self.user, password=self.password, dbname=self.dbname)
 
+    def _conninfo(self) -> str:
+        return make_conninfo(host=self.host, port=self.port, user=self.user, password=self.password, dbname=self.dbname)
+
+    def _get_pool(self) -> ConnectionPool | None:
+        """
+        Get the connection pool, creating it on first use. Returns None if psycopg_pool is not installed.
+
+        Connections are not checked on checkout, which would add a round trip to every queue operation. The pool
+        discards connections returned in a broken state, and a failed pop or push is logged and reported as such.
+        """
+        if ConnectionPool is None:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ConnectionPool(
+                    self._conninfo(),
+                    min_size=self.pool_min_size,
+                    max_size=self.pool_max_size,
+                    name=f"{self.table_prefix}_pool",
+                    open=True,
+                )
+        return self._pool
+
+    @contextmanager
+    def _pooled_connection(self) -> Iterator[psycopg.Connection]:
+        """
+        Borrow a connection for a single queue operation.
+        Uses the connection pool if psycopg_pool is installed, otherwise a fresh connection that is closed afterwards.
+        Pooled connections are rolled back on error and returned to the pool.
+        """
+        pool = self._get_pool()
+        if pool is not None:
+            with pool.connection() as conn:
+                yield conn
+            return
+
+        conn = self._get_connection()
+        try:
+            yield conn
+        finally:
+            if not conn.closed:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
     def _get_persistent_connection(self):
         """Get a persistent connection for initialization tasks only."""
         if self._connection is None or self._connection.closed:
@@ -246,48 +410,42 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
         Returns:
             bool: True if the query was pushed successfully, False otherwise.
         """
-        conn = None
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._pooled_connection() as conn:
+                cursor = conn.cursor()
 
-            # Use non-blocking upsert function for proper concurrency handling
-            try:
-                cursor.execute(
-                    "SELECT non_blocking_original_queue_upsert(%s, %s, %s, %s, %s)", (query, partition_key, partition_datatype, 1, self.original_queue_table)
-                )
-                result = cursor.fetchone()[0]  # type: ignore
-                conn.commit()
-                logger.debug(f"Non-blocking original queue upsert result: {result}")
-                return True
-            except Exception as func_error:
-                # Fallback to traditional approach if function doesn't exist
-                logger.debug(f"Non-blocking function not available, using fallback: {func_error}")
-                cursor.execute(
-                    sql.SQL("""
-                    INSERT INTO {} (query, partition_key, partition_datatype, priority, updated_at, created_at)
-                    VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                    ON CONFLICT (query, partition_key)
-                    DO UPDATE SET
-                        priority = {}.priority + 1,
-                        updated_at = CURRENT_TIMESTAMP
-                """).format(sql.Identifier(self.original_queue_table), sql.Identifier(self.original_queue_table)),
-                    (query, partition_key, partition_datatype, 1),
-                )
-                conn.commit()
-                logger.debug("Used fallback original queue upsert")
-                return True
+                # Use non-blocking upsert function for proper concurrency handling
+                try:
+                    cursor.execute(
+                        "SELECT non_blocking_original_queue_upsert(%s, %s, %s, %s, %s)",
+                        (query, partition_key, partition_datatype, 1, self.original_queue_table),
+                    )
+                    result = cursor.fetchone()[0]  # type: ignore
+                    conn.commit()
+                    logger.debug(f"Non-blocking original queue upsert result: {result}")
+                    return True
+                except Exception as func_error:
+                    # Fallback to traditional approach if function doesn't exist
+                    logger.debug(f"Non-blocking function not available, using fallback: {func_error}")
+                    conn.rollback()
+                    cursor.execute(
+                        sql.SQL("""
+                        INSERT INTO {} (query, partition_key, partition_datatype, priority, updated_at, created_at)
+                        VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                        ON CONFLICT (query, partition_key)
+                        DO UPDATE SET
+                            priority = {}.priority + 1,
+                            updated_at = CURRENT_TIMESTAMP
+                    """).format(sql.Identifier(self.original_queue_table), sql.Identifier(self.original_queue_table)),
+                        (query, partition_key, partition_datatype, 1),
+                    )
+                    conn.commit()
+                    logger.debug("Used fallback original queue upsert")
+                    return True
 
         except Exception as e:
             logger.error(f"Failed to push query to PostgreSQL original query queue: {e}")
             return False
-        finally:
-            # Ensure fresh connection is properly closed
-            if conn and not conn.closed:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
 
     def push_to_query_fragment_queue(self, query_hash_pairs: list[tuple[str, str]], partition_key: str, partition_datatype: str | None = None) -> bool:
         """
@@ -305,61 +463,54 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
         if not query_hash_pairs:
             return True
 
-        conn = None
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # Use batch non-blocking upsert for optimal performance
-            try:
-                # Prepare arrays for batch upsert
-                hashes = [hash_value for _, hash_value in query_hash_pairs]
-                queries = [query for query, _ in query_hash_pairs]
-                partition_keys = [partition_key] * len(query_hash_pairs)
-                partition_datatypes = [partition_datatype] * len(query_hash_pairs)
-                priorities = [1] * len(query_hash_pairs)  # Default priority
-
-                # Use base batch function directly with table parameter
-                cursor.execute(
-                    "SELECT * FROM non_blocking_fragment_queue_batch_upsert(%s, %s, %s, %s, %s, %s)",
-                    (hashes, partition_keys, partition_datatypes, queries, priorities, self.fragment_queue_table),
-                )
-                results = cursor.fetchall()
-                conn.commit()
-
-                success_count = len([r for r in results if r[3] in ("inserted", "updated")])
-                logger.debug(f"Batch upsert results: {success_count}/{len(query_hash_pairs)} successful")
-                return True
+            with self._pooled_connection() as conn:
+                cursor = conn.cursor()
 
-            except Exception as func_error:
-                # Fallback to individual inserts if batch function doesn't exist
-                logger.debug(f"Batch function not available, using individual fallback: {func_error}")
-                for query, hash_value in query_hash_pairs:
+                # Use batch non-blocking upsert for optimal performance
+                try:
+                    # Prepare arrays for batch upsert
+                    hashes = [hash_value for _, hash_value in query_hash_pairs]
+                    queries = [query for query, _ in query_hash_pairs]
+                    partition_keys = [partition_key] * len(query_hash_pairs)
+                    partition_datatypes = [partition_datatype] * len(query_hash_pairs)
+                    priorities = [1] * len(query_hash_pairs)  # Default priority
+
+                    # Use base batch function directly with table parameter
                     cursor.execute(
-                        sql.SQL("""
-                        INSERT INTO {} (query, hash, partition_key, partition_datatype, priority, updated_at, created_at)
-                        VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                        ON CONFLICT (hash, partition_key) DO UPDATE SET
-                            priority = {}.priority + 1,
-                            updated_at = CURRENT_TIMESTAMP
-                    """).format(sql.Identifier(self.fragment_queue_table), sql.Identifier(self.fragment_queue_table)),
-                        (query, hash_value, partition_key, partition_datatype, 1),
+                        "SELECT * FROM non_blocking_fragment_queue_batch_upsert(%s, %s, %s, %s, %s, %s)",
+                        (hashes, partition_keys, partition_datatypes, queries, priorities, self.fragment_queue_table),
                     )
-
-                conn.commit()
-                logger.debug(f"Pushed {len(query_hash_pairs)} query fragments using fallback method")
-                return True
+                    results = cursor.fetchall()
+                    conn.commit()
+
+                    success_count = len([r for r in results if r[3] in ("inserted", "updated")])
+                    logger.debug(f"Batch upsert results: {success_count}/{len(query_hash_pairs)} successful")
+                    return True
+
+                except Exception as func_error:
+                    # Fallback to individual inserts if batch function doesn't exist
+                    logger.debug(f"Batch function not available, using individual fallback: {func_error}")
+                    conn.rollback()
+                    for query, hash_value in query_hash_pairs:
+                        cursor.execute(
+                            sql.SQL("""
+                            INSERT INTO {} (query, hash, partition_key, partition_datatype, priority, updated_at, created_at)
+                            VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                            ON CONFLICT (hash, partition_key) DO UPDATE SET
+                                priority = {}.priority + 1,
+                                updated_at = CURRENT_TIMESTAMP
+                        """).format(sql.Identifier(self.fragment_queue_table), sql.Identifier(self.fragment_queue_table)),
+                            (query, hash_value, partition_key, partition_datatype, 1),
+                        )
+
+                    conn.commit()
+                    logger.debug(f"Pushed {len(query_hash_pairs)} query fragments using fallback method")
+                    return True
 
         except Exception as e:
             logger.error(f"Failed to push query fragments to PostgreSQL queue handler: {e}")
             return False
-        finally:
-            # Ensure fresh connection is properly closed
-            if conn and not conn.closed:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
 
     def push_to_original_query_queue_with_priority(self, query: str, partition_key: str, priority: int = 1, partition_datatype: str | None = None) -> bool:
         """
@@ -375,49 +526,42 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
         Returns:
             bool: True if the query was pushed/updated successfully, False otherwise.
         """
-        conn = None
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._pooled_connection() as conn:
+                cursor = conn.cursor()
 
-            # Try non-blocking upsert function first
-            try:
-                cursor.execute(
-                    "SELECT non_blocking_original_queue_upsert(%s, %s, %s, %s, %s)",
-                    (query, partition_key, partition_datatype, priority, self.original_queue_table),
-                )
-                result = cursor.fetchone()[0]  # type: ignore
-                conn.commit()
-                logger.debug(f"Non-blocking original queue upsert result: {result}")
-                return True
-            except Exception as func_error:
-                # Fallback to traditional approach if function doesn't exist
-                logger.debug(f"Non-blocking function not available, using fallback: {func_error}")
-                cursor.execute(
-                    sql.SQL("""
-                    INSERT INTO {} (query, partition_key, partition_datatype, priority, updated_at)
-                    VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
-                    ON CONFLICT (query, partition_key)
-                    DO UPDATE SET
-                        priority = {}.priority + 1,
-                        updated_at = CURRENT_TIMESTAMP
-                """).format(sql.Identifier(self.original_queue_table), sql.Identifier(self.original_queue_table)),
-                    (query, partition_key, partition_datatype, priority),
-                )
-                conn.commit()
-                logger.debug("Used fallback original queue upsert")
-                return True
+                # Try non-blocking upsert function first
+                try:
+                    cursor.execute(
+                        "SELECT non_blocking_original_queue_upsert(%s, %s, %s, %s, %s)",
+                        (query, partition_key, partition_datatype, priority, self.original_queue_table),
+                    )
+                    result = cursor.fetchone()[0]  # type: ignore
+                    conn.commit()
+                    logger.debug(f"Non-blocking original queue upsert result: {result}")
+                    return True
+                except Exception as func_error:
+                    # Fallback to traditional approach if function doesn't exist
+                    logger.debug(f"Non-blocking function not available, using fallback: {func_error}")
+                    conn.rollback()
+                    cursor.execute(
+                        sql.SQL("""
+                        INSERT INTO {} (query, partition_key, partition_datatype, priority, updated_at)
+                        VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
+                        ON CONFLICT (query, partition_key)
+                        DO UPDATE SET
+                            priority = {}.priority + 1,
+                            updated_at = CURRENT_TIMESTAMP
+                    """).format(sql.Identifier(self.original_queue_table), sql.Identifier(self.original_queue_table)),
+                        (query, partition_key, partition_datatype, priority),
+                    )
+                    conn.commit()
+                    logger.debug("Used fallback original queue upsert")
+                    return True
 
         except Exception as e:
             logger.error(f"Failed to push query to PostgreSQL original query queue: {e}")
             return False
-        finally:
-            # Ensure fresh connection is properly closed
-            if conn and not conn.closed:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
 
     def push_to_query_fragment_queue_with_priority(
         self, query_hash_pairs: list[tuple[str, str]], partition_key: str, priority: int = 1, partition_datatype: str | None = None
@@ -439,114 +583,173 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
         if not query_hash_pairs:
             return True
 
-        conn = None
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._pooled_connection() as conn:
+                cursor = conn.cursor()
 
-            # Try batch non-blocking upsert first
-            try:
-                # Prepare arrays for batch upsert
-                hashes = [hash_value for query, hash_value in query_hash_pairs]
-                queries = [query for query, hash_value in query_hash_pairs]
-                partition_keys = [partition_key] * len(query_hash_pairs)
-                partition_datatypes = [partition_datatype] * len(query_hash_pairs)
-                priorities = [priority] * len(query_hash_pairs)
-
-                # Use base batch function directly with table parameter
-                cursor.execute(
-                    "SELECT * FROM non_blocking_fragment_queue_batch_upsert(%s, %s, %s, %s, %s, %s)",
-                    (hashes, partition_keys, partition_datatypes, queries, priorities, self.fragment_queue_table),
-                )
-                results = cursor.fetchall()
-                conn.commit()
-
-                success_count = len([r for r in results if r[3] in ("inserted", "updated")])
-                logger.debug(f"Batch upsert with priority results: {success_count}/{len(query_hash_pairs)} successful")
-                return True
-            except Exception as func_error:
-                # Fallback to traditional approach if function doesn't exist
-                logger.debug(f"Non-blocking function not available, using fallback: {func_error}")
-                for query, hash_value in query_hash_pairs:
+                # Try batch non-blocking upsert first
+                try:
+                    # Prepare arrays for batch upsert
+                    hashes = [hash_value for query, hash_value in query_hash_pairs]
+                    queries = [query for query, hash_value in query_hash_pairs]
+                    partition_keys = [partition_key] * len(query_hash_pairs)
+                    partition_datatypes = [partition_datatype] * len(query_hash_pairs)
+                    priorities = [priority] * len(query_hash_pairs)
+
+                    # Use base batch function directly with table parameter
                     cursor.execute(
-                        sql.SQL("""
-                        INSERT INTO {} (query, hash, partition_key, partition_datatype, priority, updated_at, created_at)
-                        VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                        ON CONFLICT (hash, partition_key)
-                        DO UPDATE SET
-                            priority = {}.priority + %s,
-                            updated_at = CURRENT_TIMESTAMP
-                    """).format(sql.Identifier(self.fragment_queue_table), sql.Identifier(self.fragment_queue_table)),
-                        (query, hash_value, partition_key, partition_datatype, priority, priority),
+                        "SELECT * FROM non_blocking_fragment_queue_batch_upsert(%s, %s, %s, %s, %s, %s)",
+                        (hashes, partition_keys, partition_datatypes, queries, priorities, self.fragment_queue_table),
                     )
-
-                conn.commit()
-                logger.debug(f"Used fallback fragment queue upsert for {len(query_hash_pairs)} items")
-                return True
+                    results = cursor.fetchall()
+                    conn.commit()
+
+                    success_count = len([r for r in results if r[3] in ("inserted", "updated")])
+                    logger.debug(f"Batch upsert with priority results: {success_count}/{len(query_hash_pairs)} successful")
+                    return True
+                except Exception as func_error:
+                    # Fallback to traditional approach if function doesn't exist
+                    logger.debug(f"Non-blocking function not available, using fallback: {func_error}")
+                    conn.rollback()
+                    for query, hash_value in query_hash_pairs:
+                        cursor.execute(
+                            sql.SQL("""
+                            INSERT INTO {} (query, hash, partition_key, partition_datatype, priority, updated_at, created_at)
+                            VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                            ON CONFLICT (hash, partition_key)
+                            DO UPDATE SET
+                                priority = {}.priority + %s,
+                                updated_at = CURRENT_TIMESTAMP
+                        """).format(sql.Identifier(self.fragment_queue_table), sql.Identifier(self.fragment_queue_table)),
+                            (query, hash_value, partition_key, partition_datatype, priority, priority),
+                        )
+
+                    conn.commit()
+                    logger.debug(f"Used fallback fragment queue upsert for {len(query_hash_pairs)} items")
+                    return True
 
         except Exception as e:
             logger.error(f"Failed to push query fragments to PostgreSQL queue handler: {e}")
             return False
-        finally:
-            # Ensure fresh connection is properly closed
-            if conn and not conn.closed:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
 
-    def pop_from_original_query_queue(self) -> tuple[str, str, str] | None:
+    def _pop_many(self, table: str, columns: list[str], n: int, affinity: tuple[str, list[str]] | None = None) -> list[tuple]:
         """
-        Pop an original query from the original query queue.
-        Uses PostgreSQL's SELECT FOR UPDATE SKIP LOCKED for atomic operations.
+        Atomically remove up to n entries (highest priority first, then oldest) in a single statement.
+        Entries locked by concurrent consumers are skipped (FOR UPDATE SKIP LOCKED).
+
+        Args:
+            affinity: Optional (worker_id, active_workers), only entries whose partition key is assigned to
+                worker_id by rendezvous hashing over active_workers are removed. Only the affinity_scan_limit
+                highest priority entries are considered, so the hash is not computed for the whole queue.
 
         Returns:
-            Tuple[str, str, str] or None: (query, partition_key, partition_datatype) tuple if available, None if queue is empty.
+            List of tuples with the requested columns, ordered by priority and age.
         """
-        cursor = None
-        try:
-            conn = self._get_connection()
+        where: sql.Composable = sql.SQL("")
+        params: tuple = (n,)
+        if affinity is not None:
+            worker_id, active_workers = affinity
+            where = sql.SQL("""WHERE id IN (
+                        SELECT id FROM (SELECT id, partition_key FROM {table} ORDER BY priority DESC, created_at ASC LIMIT %s) AS candidates
+                        WHERE (SELECT w FROM unnest(%s::text[]) AS w ORDER BY hashtextextended(w || ':' || partition_key, 0) DESC, w LIMIT 1) = %s
+                    )""").format(table=sql.Identifier(table))
+            params = (max(n, self.affinity_scan_limit), active_workers, worker_id, n)
+
+        with self._pooled_connection() as conn:
             cursor = conn.cursor()
-
-            # Begin transaction for atomic pop operation
-            cursor.execute("BEGIN")
-
-            # Get the highest priority entry (highest priority first, then oldest)
             cursor.execute(
                 sql.SQL("""
-                SELECT id, query, partition_key, partition_datatype FROM {}
-                ORDER BY priority DESC, created_at ASC
-                LIMIT 1 FOR UPDATE SKIP LOCKED
-            """).format(sql.Identifier(self.original_queue_table))
+                WITH next_entries AS (
+                    SELECT id FROM {table}
+                    {where}
+                    ORDER BY priority DESC, created_at ASC
+                    LIMIT %s FOR UPDATE SKIP LOCKED
+                )
+                DELETE FROM {table} q USING next_entries
+                WHERE q.id = next_entries.id
+                RETURNING {columns}, q.priority, q.created_at
+            """).format(
+                    table=sql.Identifier(table), where=where, columns=sql.SQL(", ").join(sql.Identifier("q", column) for column in columns)
+                ),
+                params,
             )
+            rows = cursor.fetchall()
+            conn.commit()
 
-            entry = cursor.fetchone()
-            if not entry:
-                cursor.execute("ROLLBACK")
-                return None
+        # RETURNING does not preserve the order of the CTE
+        rows.sort(key=lambda row: (-row[-2], row[-1]))
+        return [row[:-2] for row in rows]
 
-            entry_id, query, partition_key, partition_datatype = entry
+    def pop_from_original_query_queue(self) -> tuple[str, str, str] | None:
+        """
+        Pop an original query from the original query queue.
+        Uses PostgreSQL's SELECT FOR UPDATE SKIP LOCKED for atomic operations.
 
-            # Delete the entry
-            cursor.execute(sql.SQL("DELETE FROM {} WHERE id = %s").format(sql.Identifier(self.original_queue_table)), (entry_id,))
-            cursor.execute("COMMIT")
+        Returns:
+            Tuple[str, str, str] or None: (query, partition_key, partition_datatype) tuple if available, None if queue is empty.
+        """
+        results = self.pop_many_from_original_query_queue(1)
+        return results[0] if results else None
 
-            logger.debug("Popped query from PostgreSQL original query queue")
-            return (query, partition_key, partition_datatype or "")
+    def pop_many_from_original_query_queue(self, n: int) -> list[tuple[str, str, str]]:
+        """
+        Pop up to n original queries from the original query queue in a single round trip.
+        Uses DELETE ... RETURNING over a SELECT FOR UPDATE SKIP LOCKED for atomic operations.
 
+        Args:
+            n (int): Maximum number of queries to pop.
+
+        Returns:
+            List[Tuple[str, str, str]]: (query, partition_key, partition_datatype) tuples, empty if the queue is empty or error occurred.
+        """
+        if n <= 0:
+            return []
+        try:
+            rows = self._pop_many(self.original_queue_table, ["query", "partition_key", "partition_datatype"], n)
+            if rows:
+                logger.debug(f"Popped {len(rows)} queries from PostgreSQL original query queue")
+            return [(query, partition_key, partition_datatype or "") for query, partition_key, partition_datatype in rows]
         except Exception as e:
             logger.error(f"Failed to pop from PostgreSQL original query queue: {e}")
-            try:
-                if cursor:
-                    cursor.execute("ROLLBACK")
-            except Exception:
-                pass
-            return None
+            return []
+
+    def _pop_blocking(self, pop: Callable[[], T | None], channel: str, timeout: float) -> T | None:
+        """
+        Retry pop until it returns an item or the timeout expires, waking up on notifications of the given channel.
+
+        Notifications are received by the process-wide listener, so waiting does not hold a connection per caller.
+        While the listener is disconnected, the queue is polled every second.
+        """
+        start_time = time.time()
+        try:
+            if self._listener is None:
+                self._listener = _NotificationListener.acquire(self._conninfo())
+            listener = self._listener
+            # Observe the sequence before popping so a notification between pop and wait is not lost
+            seq = listener.sequence(channel)
+        except Exception as e:
+            logger.error(f"Failed to start queue notification listener: {e}")
+            listener = None
+            seq = 0
+
+        result = pop()
+        while result is None:
+            remaining_time = timeout - (time.time() - start_time)
+            if remaining_time <= 0:
+                logger.debug(f"Blocking pop on channel {channel} timed out after {timeout} seconds")
+                return None
+            if listener is not None:
+                # Wait for notification with timeout (max 5 seconds per iteration as safety net)
+                seq = listener.wait(channel, seq, min(5.0 if listener.connected else 1.0, remaining_time))
+            else:
+                time.sleep(min(1.0, remaining_time))
+            result = pop()
+        return result
 
     def pop_from_original_query_queue_blocking(self, timeout: int = 60) -> tuple[str, str, str] | None:
         """
         Pop an original query from the original query queue with blocking wait.
-        Uses PostgreSQL LISTEN/NOTIFY for efficient blocking with timeout fallback.
+        Uses PostgreSQL LISTEN/NOTIFY (via a shared listener connection) for efficient blocking with timeout fallback.
 
         Args:
             timeout (int): Maximum time to wait in seconds (default: 60)
@@ -554,82 +757,7 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
         Returns:
             Tuple[str, str, str] or None: (query, partition_key, partition_datatype) tuple if available, None if timeout or error occurred.
         """
-
-        # First try to get an item immediately
-        result = self.pop_from_original_query_queue()
-        if result is not None:
-            return result
-
-        # If no item available, set up LISTEN for notifications
-        listen_conn = None
-        start_time = time.time()
-
-        try:
-            # Create a separate connection for LISTEN/NOTIFY
-            listen_conn = psycopg.connect(host=self.host, port=self.port, user=self.user, password=self.password, dbname=self.dbname)
-            listen_conn.autocommit = True
-
-            # Start listening for notifications
-            cursor = listen_conn.cursor()
-            cursor.execute("LISTEN original_query_available")
-
-            # Main blocking loop with LISTEN/NOTIFY
-            while time.time() - start_time < timeout:
-                remaining_time = max(0, timeout - (time.time() - start_time))
-                if remaining_time <= 0:
-                    break
-
-                # Wait for notification with timeout (max 5 seconds per iteration)
-                wait_time = min(5.0, remaining_time)
-
-                try:
-                    # Use select to wait for notifications with timeout
-                    if select.select([listen_conn.fileno()], [], [], wait_time):
-                        # Check for notifications
-                        for notify in listen_conn.notifies():
-                            if notify.channel == "original_query_available":
-                                # Try to pop an item after notification
-                                result = self.pop_from_original_query_queue()
-                                if result is not None:
-                                    return result
-                                break
-                    else:
-                        # Timeout on select, check for items anyway (safety net)
-                        result = self.pop_from_original_query_queue()
-                        if result is not None:
-                            return result
-
-                except (OSError, psycopg.Error, psycopg.OperationalError) as e:
-                    logger.debug(f"LISTEN/NOTIFY error, falling back to polling: {e}")
-                    # Fall back to polling for remainder of timeout
-                    break
-
-            # Final check or fallback polling
-            remaining_time = max(0, timeout - (time.time() - start_time))
-            if remaining_time > 0:
-                result = self.pop_from_original_query_queue()
-                if result is not None:
-                    return result
-
-            logger.debug(f"Blocking pop from original query queue timed out after {timeout} seconds")
-            return None
-
-        except Exception as e:
-            logger.error(f"Error during blocking pop from original query queue: {e}")
-            # Fallback to simple polling for remaining time
-            remaining_time = max(0, timeout - (time.time() - start_time))
-            if remaining_time > 1.0:
-                time.sleep(min(1.0, remaining_time))
-                return self.pop_from_original_query_queue()
-            return None
-        finally:
-            if listen_conn:
-                try:
-                    cursor = listen_conn.cursor()
-                    cursor.execute("UNLISTEN original_query_available")
-                    listen_conn.close()
-                except Exception:
-                    pass
+        return self._pop_blocking(self.pop_from_original_query_queue, "original_query_available", timeout)
 
     def pop_from_query_fragment_queue(self) -> tuple[str, str, str, str] | None:
         """
@@ -639,50 +767,40 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
         Returns:
             Tuple[str, str, str, str] or None: (query, hash, partition_key, partition_datatype) tuple if available, None if queue is empty.
         """
-        cursor = None
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # Begin transaction for atomic pop operation
-            cursor.execute("BEGIN")
-
-            # Get the highest priority entry (highest priority first, then oldest)
-            cursor.execute(
-                sql.SQL("""
-                SELECT id, query, hash, partition_key, partition_datatype FROM {}
-                ORDER BY priority DESC, created_at ASC
-                LIMIT 1 FOR UPDATE SKIP LOCKED
-            """).format(sql.Identifier(self.fragment_queue_table))
-            )
-
-            entry = cursor.fetchone()
-            if not entry:
-                cursor.execute("ROLLBACK")
-                return None
+        results = self.pop_many_from_query_fragment_queue(1)
+        return results[0] if results else None
 
-            entry_id, query, hash_value, partition_key, partition_datatype = entry
-
-            # Delete the entry
-            cursor.execute(sql.SQL("DELETE FROM {} WHERE id = %s").format(sql.Identifier(self.fragment_queue_table)), (entry_id,))
-            cursor.execute("COMMIT")
+    def pop_many_from_query_fragment_queue(
+        self, n: int, worker_id: str | None = None, active_workers: list[str] | None = None
+    ) -> list[tuple[str, str, str, str]]:
+        """
+        Pop up to n query fragments from the query fragment queue in a single round trip.
+        Uses DELETE ... RETURNING over a SELECT FOR UPDATE SKIP LOCKED for atomic operations.
 
-            logger.debug("Popped query fragment from PostgreSQL query fragment queue")
-            return (query, hash_value, partition_key, partition_datatype or "")
+        Args:
+            n (int): Maximum number of fragments to pop.
+            worker_id (str): Id of the popping worker for partition key affinity (default: None).
+            active_workers (List[str]): Ids of all active workers sharing the queue (default: None).
 
+        Returns:
+            List[Tuple[str, str, str, str]]: (query, hash, partition_key, partition_datatype) tuples, empty if the queue is empty or error occurred.
+        """
+        if n <= 0:
+            return []
+        affinity = (worker_id, active_workers) if worker_id is not None and active_workers and len(active_workers) > 1 else None
+        try:
+            rows = self._pop_many(self.fragment_queue_table, ["query", "hash", "partition_key", "partition_datatype"], n, affinity)
+            if rows:
+                logger.debug(f"Popped {len(rows)} query fragments from PostgreSQL query fragment queue")
+            return [(query, hash_value, partition_key, partition_datatype or "") for query, hash_value, partition_key, partition_datatype in rows]
         except Exception as e:
             logger.error(f"Failed to pop from PostgreSQL query fragment queue: {e}")
-            try:
-                if cursor:
-                    cursor.execute("ROLLBACK")
-            except Exception:
-                pass
-            return None
+            return []
 
     def pop_from_query_fragment_queue_blocking(self, timeout: int = 60) -> tuple[str, str, str, str] | None:
         """
         Pop a query fragment from the query fragment queue with blocking wait.
-        Uses PostgreSQL LISTEN/NOTIFY for efficient blocking with timeout fallback.
+        Uses PostgreSQL LISTEN/NOTIFY (via a shared listener connection) for efficient blocking with timeout fallback.
 
         Args:
             timeout (int): Maximum time to wait in seconds (default: 60)
@@ -690,82 +808,7 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
         Returns:
             Tuple[str, str, str, str] or None: (query, hash, partition_key, partition_datatype) tuple if available, None if timeout or error occurred.
         """
-
-        # First try to get an item immediately
-        result = self.pop_from_query_fragment_queue()
-        if result is not None:
-            return result
-
-        # If no item available, set up LISTEN for notifications
-        listen_conn = None
-        start_time = time.time()
-
-        try:
-            # Create a separate connection for LISTEN/NOTIFY
-            listen_conn = psycopg.connect(host=self.host, port=self.port, user=self.user, password=self.password, dbname=self.dbname)
-            listen_conn.autocommit = True
-
-            # Start listening for notifications
-            cursor = listen_conn.cursor()
-            cursor.execute("LISTEN query_fragment_available")
-
-            # Main blocking loop with LISTEN/NOTIFY
-            while time.time() - start_time < timeout:
-                remaining_time = max(0, timeout - (time.time() - start_time))
-                if remaining_time <= 0:
-                    break
-
-                # Wait for notification with timeout (max 5 seconds per iteration)
-                wait_time = min(5.0, remaining_time)
-
-                try:
-                    # Use select to wait for notifications with timeout
-                    if select.select([listen_conn.fileno()], [], [], wait_time):
-                        # Check for notifications
-                        for notify in listen_conn.notifies():
-                            if notify.channel == "query_fragment_available":
-                                # Try to pop an item after notification
-                                result = self.pop_from_query_fragment_queue()
-                                if result is not None:
-                                    return result
-                                break
-                    else:
-                        # Timeout on select, check for items anyway (safety net)
-                        result = self.pop_from_query_fragment_queue()
-                        if result is not None:
-                            return result
-
-                except (OSError, psycopg.Error, psycopg.OperationalError) as e:
-                    logger.debug(f"LISTEN/NOTIFY error, falling back to polling: {e}")
-                    # Fall back to polling for remainder of timeout
-                    break
-
-            # Final check or fallback polling
-            remaining_time = max(0, timeout - (time.time() - start_time))
-            if remaining_time > 0:
-                result = self.pop_from_query_fragment_queue()
-                if result is not None:
-                    return result
-
-            logger.debug(f"Blocking pop from query fragment queue timed out after {timeout} seconds")
-            return None
-
-        except Exception as e:
-            logger.error(f"Error during blocking pop from query fragment queue: {e}")
-            # Fallback to simple polling for remaining time
-            remaining_time = max(0, timeout - (time.time() - start_time))
-            if remaining_time > 1.0:
-                time.sleep(min(1.0, remaining_time))
-                return self.pop_from_query_fragment_queue()
-            return None
-        finally:
-            if listen_conn:
-                try:
-                    cursor = listen_conn.cursor()
-                    cursor.execute("UNLISTEN query_fragment_available")
-                    listen_conn.close()
-                except Exception:
-                    pass
+        return self._pop_blocking(self.pop_from_query_fragment_queue, "query_fragment_available", timeout)
 
     def get_queue_lengths(self) -> dict:
         """
@@ -774,33 +817,25 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
         Returns:
             dict: Dictionary with 'original_query_queue' and 'query_fragment_queue' queue lengths.
         """
-        conn = None
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._pooled_connection() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.original_queue_table)))
-            original_query_result = cursor.fetchone()
-            original_query_count = original_query_result[0] if original_query_result else 0
+                cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.original_queue_table)))
+                original_query_result = cursor.fetchone()
+                original_query_count = original_query_result[0] if original_query_result else 0
 
-            cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.fragment_queue_table)))
-            query_fragment_result = cursor.fetchone()
-            query_fragment_count = query_fragment_result[0] if query_fragment_result else 0
+                cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.fragment_queue_table)))
+                query_fragment_result = cursor.fetchone()
+                query_fragment_count = query_fragment_result[0] if query_fragment_result else 0
 
-            return {"original_query_queue": original_query_count, "query_fragment_queue": query_fragment_count}
+                return {"original_query_queue": original_query_count, "query_fragment_queue": query_fragment_count}
         except (psycopg.OperationalError, psycopg.DatabaseError, OSError) as e:
             logger.warning(f"Failed to get PostgreSQL queue lengths (connection issue): {e}")
             return {"original_query_queue": 0, "query_fragment_queue": 0}
         except Exception as e:
             logger.error(f"Failed to get PostgreSQL queue lengths: {e}")
             return {"original_query_queue": 0, "query_fragment_queue": 0}
-        finally:
-            # Ensure connection is properly closed
-            if conn and not conn.closed:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
 
     def clear_original_query_queue(self) -> int:
         """
@@ -811,28 +846,29 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
             int: Number of entries cleared from the original query queue.
         """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._pooled_connection() as conn:
+                cursor = conn.cursor()
 
-            # First, get the count before clearing (for TRUNCATE which doesn't return rowcount)
-            cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.original_queue_table)))
-            count_result = cursor.fetchone()
-            deleted_count = count_result[0] if count_result else 0
+                # First, get the count before clearing (for TRUNCATE which doesn't return rowcount)
+                cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.original_queue_table)))
+                count_result = cursor.fetchone()
+                deleted_count = count_result[0] if count_result else 0
 
-            # Try TRUNCATE first for optimal performance
-            try:
-                cursor.execute(sql.SQL("TRUNCATE TABLE {}").format(sql.Identifier(self.original_queue_table)))
-                conn.commit()
-                logger.debug(f"Cleared {deleted_count} entries from PostgreSQL original query queue using TRUNCATE")
-                return deleted_count
-            except Exception as truncate_error:
-                # TRUNCATE failed (likely permissions), fallback to DELETE
-                logger.debug(f"TRUNCATE failed ({truncate_error}), falling back to DELETE")
-                cursor.execute(sql.SQL("DELETE FROM {}").format(sql.Identifier(self.original_queue_table)))
-                deleted_count = cursor.rowcount or 0
-                conn.commit()
-                logger.debug(f"Cleared {deleted_count} entries from PostgreSQL original query queue using DELETE fallback")
-                return deleted_count
+                # Try TRUNCATE first for optimal performance
+                try:
+                    cursor.execute(sql.SQL("TRUNCATE TABLE {}").format(sql.Identifier(self.original_queue_table)))
+                    conn.commit()
+                    logger.debug(f"Cleared {deleted_count} entries from PostgreSQL original query queue using TRUNCATE")
+                    return deleted_count
+                except Exception as truncate_error:
+                    # TRUNCATE failed (likely permissions), fallback to DELETE
+                    logger.debug(f"TRUNCATE failed ({truncate_error}), falling back to DELETE")
+                    conn.rollback()
+                    cursor.execute(sql.SQL("DELETE FROM {}").format(sql.Identifier(self.original_queue_table)))
+                    deleted_count = cursor.rowcount or 0
+                    conn.commit()
+                    logger.debug(f"Cleared {deleted_count} entries from PostgreSQL original query queue using DELETE fallback")
+                    return deleted_count
 
         except Exception as e:
             logger.error(f"Failed to clear PostgreSQL original query queue: {e}")
@@ -847,28 +883,29 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
             int: Number of entries cleared from the query fragment queue.
         """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._pooled_connection() as conn:
+                cursor = conn.cursor()
 
-            # First, get the count before clearing (for TRUNCATE which doesn't return rowcount)
-            cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.fragment_queue_table)))
-            count_result = cursor.fetchone()
-            deleted_count = count_result[0] if count_result else 0
+                # First, get the count before clearing (for TRUNCATE which doesn't return rowcount)
+                cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.fragment_queue_table)))
+                count_result = cursor.fetchone()
+                deleted_count = count_result[0] if count_result else 0
 
-            # Try TRUNCATE first for optimal performance
-            try:
-                cursor.execute(sql.SQL("TRUNCATE TABLE {}").format(sql.Identifier(self.fragment_queue_table)))
-                conn.commit()
-                logger.debug(f"Cleared {deleted_count} entries from PostgreSQL query fragment queue using TRUNCATE")
-                return deleted_count
-            except Exception as truncate_error:
-                # TRUNCATE failed (likely permissions), fallback to DELETE
-                logger.debug(f"TRUNCATE failed ({truncate_error}), falling back to DELETE")
-                cursor.execute(sql.SQL("DELETE FROM {}").format(sql.Identifier(self.fragment_queue_table)))
-                deleted_count = cursor.rowcount or 0
-                conn.commit()
-                logger.debug(f"Cleared {deleted_count} entries from PostgreSQL query fragment queue using DELETE fallback")
-                return deleted_count
+                # Try TRUNCATE first for optimal performance
+                try:
+                    cursor.execute(sql.SQL("TRUNCATE TABLE {}").format(sql.Identifier(self.fragment_queue_table)))
+                    conn.commit()
+                    logger.debug(f"Cleared {deleted_count} entries from PostgreSQL query fragment queue using TRUNCATE")
+                    return deleted_count
+                except Exception as truncate_error:
+                    # TRUNCATE failed (likely permissions), fallback to DELETE
+                    logger.debug(f"TRUNCATE failed ({truncate_error}), falling back to DELETE")
+                    conn.rollback()
+                    cursor.execute(sql.SQL("DELETE FROM {}").format(sql.Identifier(self.fragment_queue_table)))
+                    deleted_count = cursor.rowcount or 0
+                    conn.commit()
+                    logger.debug(f"Cleared {deleted_count} entries from PostgreSQL query fragment queue using DELETE fallback")
+                    return deleted_count
 
         except Exception as e:
             logger.error(f"Failed to clear PostgreSQL query fragment queue: {e}")
@@ -883,45 +920,163 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
             Tuple[int, int]: (original_query_cleared, query_fragment_cleared) number of entries cleared.
         """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._pooled_connection() as conn:
+                cursor = conn.cursor()
 
-            # Get counts before clearing (for TRUNCATE which doesn't return rowcount)
-            cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.original_queue_table)))
-            original_result = cursor.fetchone()
-            original_query_count = original_result[0] if original_result else 0
+                # Get counts before clearing (for TRUNCATE which doesn't return rowcount)
+                cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.original_queue_table)))
+                original_result = cursor.fetchone()
+                original_query_count = original_result[0] if original_result else 0
 
-            cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.fragment_queue_table)))
-            fragment_result = cursor.fetchone()
-            query_fragment_count = fragment_result[0] if fragment_result else 0
+                cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(self.fragment_queue_table)))
+                fragment_result = cursor.fetchone()
+                query_fragment_count = fragment_result[0] if fragment_result else 0
 
-            # Try TRUNCATE first for optimal performance
-            try:
-                # TRUNCATE both tables in a single transaction for atomicity
-                cursor.execute(sql.SQL("TRUNCATE TABLE {}, {}").format(sql.Identifier(self.original_queue_table), sql.Identifier(self.fragment_queue_table)))
-                conn.commit()
-                logger.debug(f"Cleared all PostgreSQL queues using TRUNCATE: {original_query_count} original, {query_fragment_count} fragments")
-                return (original_query_count, query_fragment_count)
+                # Try TRUNCATE first for optimal performance
+                try:
+                    # TRUNCATE both tables in a single transaction for atomicity
+                    cursor.execute(
+                        sql.SQL("TRUNCATE TABLE {}, {}").format(sql.Identifier(self.original_queue_table), sql.Identifier(self.fragment_queue_table))
+                    )
+                    conn.commit()
+                    logger.debug(f"Cleared all PostgreSQL queues using TRUNCATE: {original_query_count} original, {query_fragment_count} fragments")
+                    return (original_query_count, query_fragment_count)
 
-            except Exception as truncate_error:
-                # TRUNCATE failed (likely permissions), fallback to DELETE
-                logger.debug(f"TRUNCATE failed ({truncate_error}), falling back to DELETE")
+                except Exception as truncate_error:
+                    # TRUNCATE failed (likely permissions), fallback to DELETE
+                    logger.debug(f"TRUNCATE failed ({truncate_error}), falling back to DELETE")
+                    conn.rollback()
 
-                # Clear both tables using DELETE
-                cursor.execute(sql.SQL("DELETE FROM {}").format(sql.Identifier(self.original_queue_table)))
-                original_query_deleted = cursor.rowcount or 0
+                    # Clear both tables using DELETE
+                    cursor.execute(sql.SQL("DELETE FROM {}").format(sql.Identifier(self.original_queue_table)))
+                    original_query_deleted = cursor.rowcount or 0
 
-                cursor.execute(sql.SQL("DELETE FROM {}").format(sql.Identifier(self.fragment_queue_table)))
-                query_fragment_deleted = cursor.rowcount or 0
+                    cursor.execute(sql.SQL("DELETE FROM {}").format(sql.Identifier(self.fragment_queue_table)))
+                    query_fragment_deleted = cursor.rowcount or 0
 
-                conn.commit()
-                logger.debug(f"Cleared all PostgreSQL queues using DELETE fallback: {original_query_deleted} original, {query_fragment_deleted} fragments")
-                return (original_query_deleted, query_fragment_deleted)
+                    conn.commit()
+                    logger.debug(f"Cleared all PostgreSQL queues using DELETE fallback: {original_query_deleted} original, {query_fragment_deleted} fragments")
+                    return (original_query_deleted, query_fragment_deleted)
 
         except Exception as e:
             logger.error(f"Failed to clear all PostgreSQL queues: {e}")
             return (0, 0)
 
+    def heartbeat_worker(self, worker_id: str, ttl: float) -> list[str]:
+        """
+        Register a worker in the worker table or refresh its expiry, remove expired workers and return all active workers.
+        Expiry times are taken from the database clock, so clock differences between hosts do not matter.
+
+        Args:
+            worker_id (str): Unique id of the worker.
+            ttl (float): Seconds after which the worker is considered dead without a further heartbeat.
+
+        Returns:
+            List[str]: Sorted ids of the active workers, including worker_id. Empty if an error occurred.
+        """
+        try:
+            with self._pooled_connection() as conn:
+                cursor = conn.cursor()
+                if not self._worker_table_created:
+                    cursor.execute(
+                        sql.SQL("""
+                        CREATE TABLE IF NOT EXISTS {} (
+                            worker_id TEXT PRIMARY KEY,
+                            started_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                            expires_at TIMESTAMPTZ NOT NULL
+                        )
+                    """).format(sql.Identifier(self.worker_table))
+                    )
+                    self._worker_table_created = True
+                cursor.execute(sql.SQL("DELETE FROM {} WHERE expires_at < now()").format(sql.Identifier(self.worker_table)))
+                cursor.execute(
+                    sql.SQL("""
+                    INSERT INTO {} (worker_id, expires_at) VALUES (%s, now() + make_interval(secs => %s))
+                    ON CONFLICT (worker_id) DO UPDATE SET expires_at = EXCLUDED.expires_at
+                """).format(sql.Identifier(self.worker_table)),
+                    (worker_id, ttl),
+                )
+                cursor.execute(sql.SQL("SELECT worker_id FROM {} ORDER BY worker_id").format(sql.Identifier(self.worker_table)))
+                workers = [row[0] for row in cursor.fetchall()]
+                conn.commit()
+            return workers
+        except Exception as e:
+            logger.error(f"Failed to send heartbeat for worker {worker_id}: {e}")
+            return []
+
+    def unregister_worker(self, worker_id: str) -> None:
+        """
+        Remove a worker from the worker table.
+
+        Args:
+            worker_id (str): Unique id of the worker.
+        """
+        try:
+            with self._pooled_connection() as conn:
+                conn.execute(sql.SQL("DELETE FROM {} WHERE worker_id = %s").format(sql.Identifier(self.worker_table)), (worker_id,))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to unregister worker {worker_id}: {e}")
+
+    def _lease_key(self, hash_value: str, partition_key: str) -> str:
+        return f"{self.table_prefix}:{partition_key}:{hash_value}"
+
+    def acquire_fragment_lease(self, hash_value: str, partition_key: str) -> bool:
+        """
+        Acquire an exclusive lease on a query fragment using a session-level advisory lock.
+        All leases of this handler are held by one dedicated connection until they are released,
+        and are released by PostgreSQL if the holding process dies.
+
+        Args:
+            hash_value (str): The hash of the query fragment.
+            partition_key (str): The partition key of the query fragment.
+
+        Returns:
+            bool: True if the lease was acquired (or could not be checked), False if another worker holds it.
+        """
+        key = (hash_value, partition_key)
+        with self._leases_lock:
+            if self._leases and (self._lease_connection is None or self._lease_connection.closed):
+                # The advisory locks were released with the lost session
+                logger.warning(f"Lease connection lost, {len(self._leases)} fragment leases were released")
+                self._leases.clear()
+            if key in self._leases:
+                return False
+            try:
+                if self._lease_connection is None or self._lease_connection.closed:
+                    self._lease_connection = self._get_connection()
+                    self._lease_connection.autocommit = True
+                row = self._lease_connection.execute(
+                    "SELECT pg_try_advisory_lock(hashtextextended(%s, 0))", (self._lease_key(hash_value, partition_key),)
+                ).fetchone()
+                if not row or not row[0]:
+                    return False
+                self._leases.add(key)
+                return True
+            except Exception as e:
+                logger.warning(f"Failed to acquire lease for fragment {hash_value}, executing without lease: {e}")
+                return True
+
+    def release_fragment_lease(self, hash_value: str, partition_key: str) -> None:
+        """
+        Release a lease acquired with acquire_fragment_lease by unlocking its advisory lock.
+
+        Args:
+            hash_value (str): The hash of the query fragment.
+            partition_key (str): The partition key of the query fragment.
+        """
+        key = (hash_value, partition_key)
+        with self._leases_lock:
+            if key not in self._leases:
+                return
+            self._leases.discard(key)
+            if self._lease_connection is None or self._lease_connection.closed:
+                return
+            try:
+                self._lease_connection.execute("SELECT pg_advisory_unlock(hashtextextended(%s, 0))", (self._lease_key(hash_value, partition_key),))
+            except Exception as e:
+                logger.warning(f"Error releasing lease for fragment {hash_value}: {e}")
+
     def close(self) -> None:
         """
         Close the queue handler and release any resources.
@@ -933,3 +1088,23 @@ class PostgreSQLQueueHandler(AbstractPriorityQueueHandler):
                 logger.error(f"Error closing PostgreSQL connection: {e}")
             finally:
                 self._connection = None
+        if self._listener is not None:
+            _NotificationListener.release(self._listener)
+            self._listener = None
+        with self._leases_lock:
+            self._leases.clear()
+            if self._lease_connection is not None:
+                try:
+                    self._lease_connection.close()
+                except Exception as e:
+                    logger.error(f"Error closing PostgreSQL lease connection: {e}")
+                finally:
+                    self._lease_connection = None
+        with self._pool_lock:
+            if self._pool is not None:
+                try:
+                    self._pool.close()
+                except Exception as e:
+                    logger.error(f"Error closing PostgreSQL connection pool: {e}")
+                finally:
+                    self._pool = None
@@ -2,22 +2,122 @@
 Redis queue handler implementation.
 """
 
+import hashlib
 import json
+import os
+import socket
 import typing
+import uuid
 from logging import getLogger
 
-from partitioncache.queue_handler.abstract import AbstractQueueHandler
+from partitioncache.queue_handler.abstract import AbstractPriorityQueueHandler
 
 logger = getLogger("PartitionCache")
 
+# Add members with ZINCRBY (priority increment for duplicates) and store the payload once per member.
+# KEYS: queue sorted set, payload hash. ARGV: priority, then member/payload pairs.
+PUSH_SCRIPT = """
+local priority = tonumber(ARGV[1])
+for i = 2, #ARGV, 2 do
+    redis.call('ZINCRBY', KEYS[1], priority, ARGV[i])
+    redis.call('HSETNX', KEYS[2], ARGV[i], ARGV[i + 1])
+end
+return (#ARGV - 1) / 2
+"""
+
+# Pop up to ARGV[1] members with the highest priority and return (and remove) their payloads.
+# KEYS: queue sorted set, payload hash.
+POP_SCRIPT = """
+local popped = redis.call('ZPOPMAX', KEYS[1], ARGV[1])
+local payloads = {}
+for i = 1, #popped, 2 do
+    local payload = redis.call('HGET', KEYS[2], popped[i])
+    if payload then
+        redis.call('HDEL', KEYS[2], popped[i])
+        table.insert(payloads, payload)
+    end
+end
+return payloads
+"""
+
+# Pop up to ARGV[1] members with the highest priority among the ARGV[2] highest, whose partition key is
+# assigned to worker ARGV[3] by rendezvous hashing over the active workers ARGV[4..].
+# Members are "<partition_key>:<hash>". KEYS: queue sorted set, payload hash.
+POP_AFFINITY_SCRIPT = """
+local n = tonumber(ARGV[1])
+local members = redis.call('ZREVRANGE', KEYS[1], 0, tonumber(ARGV[2]) - 1)
+local owners = {}
+local payloads = {}
+for _, member in ipairs(members) do
+    if #payloads >= n then
+        break
+    end
+    local partition_key = string.match(member, '^(.*):[^:]*$') or member
+    local owner = owners[partition_key]
+    if owner == nil then
+        local best_score = nil
+        for i = 4, #ARGV do
+            local score = redis.sha1hex(ARGV[i] .. ':' .. partition_key)
+            if best_score == nil or score > best_score then
+                owner, best_score = ARGV[i], score
+            end
+        end
+        owners[partition_key] = owner
+    end
+    if owner == ARGV[3] then
+        redis.call('ZREM', KEYS[1], member)
+        local payload = redis.call('HGET', KEYS[2], member)
+        if payload then
+            redis.call('HDEL', KEYS[2], member)
+            table.insert(payloads, payload)
+        end
+    end
+end
+return payloads
+"""
+
+# Refresh the expiry of worker ARGV[1] to now + ARGV[2] seconds (Redis server clock), remove expired
+# workers and return the active ones. KEYS: worker sorted set scored by expiry.
+HEARTBEAT_SCRIPT = """
+local now = tonumber(redis.call('TIME')[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+return redis.call('ZRANGE', KEYS[1], 0, -1)
+"""
 
-class RedisQueueHandler(AbstractQueueHandler):
+# Delete a lease only if it is still held by the given owner. KEYS: lease key. ARGV: owner.
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Return the payload of a member popped with BZPOPMAX. The payload is kept if the member
+# was pushed again in the meantime. KEYS: queue sorted set, payload hash. ARGV: member.
+CLAIM_SCRIPT = """
+local payload = redis.call('HGET', KEYS[2], ARGV[1])
+if redis.call('ZSCORE', KEYS[1], ARGV[1]) == false then
+    redis.call('HDEL', KEYS[2], ARGV[1])
+end
+return payload
+"""
+
+
+class RedisQueueHandler(AbstractPriorityQueueHandler):
     """
     Redis implementation of the queue handler.
-    Uses Redis lists for original query and query fragment queues with partition_key support.
+    Uses Redis sorted sets as deduplicating priority queues with partition_key support.
+
+    Each queue entry is a sorted set member keyed by partition_key and query hash, scored by its priority.
+    Pushing an entry that is already queued increments its priority instead of adding a duplicate,
+    and pops return the entry with the highest priority (ZPOPMAX/BZPOPMAX).
+    The entry payloads are stored in a hash next to the sorted set.
     """
 
-    def __init__(self, host: str, port: int, db: int, password: str | None = None, queue_key: str = "query_queue"):
+    def __init__(
+        self, host: str, port: int, db: int, password: str | None = None, queue_key: str = "query_queue", lease_ttl: int = 3600, affinity_scan_limit: int = 1000
+    ):
         """
         Initialize the Redis queue handler.
 
@@ -27,6 +127,8 @@ class RedisQueueHandler(AbstractQueueHandler):
             db (int): Redis database number
             password (Optional[str]): Redis password
             queue_key (str): Base key for queue naming
+            lease_ttl (int): Expiry in seconds of fragment leases, bounds how long a crashed worker blocks a fragment
+            affinity_scan_limit (int): Number of highest priority fragments scanned for a pop with partition key affinity
         """
         self.host = host
         self.port = port
@@ -34,6 +136,10 @@ class RedisQueueHandler(AbstractQueueHandler):
         self.password = password
         self.queue_key = queue_key
         self._redis_client = None
+        self._scripts: dict[str, typing.Any] = {}
+        self.lease_ttl = lease_ttl
+        self._lease_owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self.affinity_scan_limit = affinity_scan_limit
 
     def _get_redis_connection(self):
         """Get Redis connection with proper configuration."""
@@ -59,55 +165,100 @@ class RedisQueueHandler(AbstractQueueHandler):
         """Get queue key with appropriate suffix."""
         return f"{self.queue_key}_{suffix}"
 
-    def push_to_original_query_queue(self, query: str, partition_key: str, partition_datatype: str | None = None) -> bool:
+    def _get_payload_key(self, suffix: str) -> str:
+        """Get the key of the hash storing the payloads of a queue."""
+        return f"{self.queue_key}_{suffix}_data"
+
+    def _get_script(self, script: str):
+        """Get a registered Lua script (executed via EVALSHA) for the current connection."""
+        if script not in self._scripts:
+            self._scripts[script] = self._get_redis_connection().register_script(script)
+        return self._scripts[script]
+
+    def _push(self, suffix: str, entries: list[tuple[str, str]], priority: int) -> None:
+        """Push (member, payload) entries to a queue, incrementing the priority of already queued members."""
+        keys = [self._get_queue_key(suffix), self._get_payload_key(suffix)]
+        args: list[typing.Any] = [priority]
+        for member, payload in entries:
+            args.extend((member, payload))
+        self._get_script(PUSH_SCRIPT)(keys=keys, args=args)
+
+    def _pop_many(self, suffix: str, n: int) -> list[dict]:
+        """Pop up to n entries with the highest priority from a queue, without waiting."""
+        payloads = self._get_script(POP_SCRIPT)(keys=[self._get_queue_key(suffix), self._get_payload_key(suffix)], args=[n])
+        return [json.loads(payload) for payload in payloads or []]
+
+    def _pop_blocking(self, suffix: str, timeout: int) -> dict | None:
+        """Pop the entry with the highest priority from a queue, waiting up to timeout seconds."""
+        r = self._get_redis_connection()
+        queue_key = self._get_queue_key(suffix)
+        result = r.bzpopmax([queue_key], timeout=timeout)
+        if result is None:
+            return None
+        payload = self._get_script(CLAIM_SCRIPT)(keys=[queue_key, self._get_payload_key(suffix)], args=[result[1]])
+        if payload is None:
+            logger.warning(f"Missing payload for popped entry {result[1]!r} in Redis queue {queue_key}")
+            return None
+        return typing.cast(dict, json.loads(payload))
+
+    @staticmethod
+    def _original_query_tuple(query_data: dict) -> tuple[str, str, str]:
+        return query_data["query"], query_data["partition_key"], query_data.get("partition_datatype", "integer")
+
+    @staticmethod
+    def _query_fragment_tuple(fragment_data: dict) -> tuple[str, str, str, str]:
+        return fragment_data["query"], fragment_data["hash"], fragment_data["partition_key"], fragment_data.get("partition_datatype", "integer")
+
+    def push_to_original_query_queue_with_priority(self, query: str, partition_key: str, priority: int = 1, partition_datatype: str | None = None) -> bool:
         """
-        Push an original query to the original query queue to be processed into fragments.
+        Push an original query to the original query queue with specified priority.
+        If the query is already queued for the partition key, its priority is incremented.
 
         Args:
             query (str): The original query to be pushed to the original query queue.
             partition_key (str): The partition key for this query.
-            partition_datatype (str): The datatype of the partition key (default: "integer").
+            priority (int): Initial priority for the query (default: 1).
+            partition_datatype (str): The datatype of the partition key (default: None).
 
         Returns:
-            bool: True if the query was pushed successfully, False otherwise.
+            bool: True if the query was pushed/updated successfully, False otherwise.
         """
         try:
-            r = self._get_redis_connection()
-            queue_key = self._get_queue_key("original_query")
-
             # Store query with partition_key and partition_datatype as JSON
             query_data = json.dumps({"query": query, "partition_key": partition_key, "partition_datatype": partition_datatype})
-            r.rpush(queue_key, query_data)
-            logger.debug(f"Pushed query to Redis original query queue: {queue_key}")
+            member = f"{partition_key}:{hashlib.sha1(query.encode()).hexdigest()}"
+            self._push("original_query", [(member, query_data)], priority)
+            logger.debug(f"Pushed query to Redis original query queue: {self._get_queue_key('original_query')}")
             return True
         except Exception as e:
             logger.error(f"Failed to push query to Redis original query queue: {e}")
             return False
 
-    def push_to_query_fragment_queue(self, query_hash_pairs: list[tuple[str, str]], partition_key: str, partition_datatype: str | None = None) -> bool:
+    def push_to_query_fragment_queue_with_priority(
+        self, query_hash_pairs: list[tuple[str, str]], partition_key: str, priority: int = 1, partition_datatype: str | None = None
+    ) -> bool:
         """
-        Push query fragments (as query-hash pairs) directly to the query fragment queue.
+        Push query fragments with specified priority in a single round trip.
+        Fragments already queued for the partition key get their priority incremented instead of being queued again.
 
         Args:
             query_hash_pairs (List[Tuple[str, str]]): List of (query, hash) tuples to push to fragment queue.
             partition_key (str): The partition key for these query fragments.
+            priority (int): Initial priority for the fragments (default: 1).
             partition_datatype (str): The datatype of the partition key (default: None).
 
         Returns:
-            bool: True if all fragments were pushed successfully, False otherwise.
+            bool: True if all fragments were pushed/updated successfully, False otherwise.
         """
+        if not query_hash_pairs:
+            return True
         try:
-            r = self._get_redis_connection()
-            queue_key = self._get_queue_key("query_fragment")
-
-            # Use a Redis pipeline to batch the rpush commands
-            pipeline = r.pipeline()
+            entries = []
             for query, hash_value in query_hash_pairs:
                 fragment_data = json.dumps({"query": query, "hash": hash_value, "partition_key": partition_key, "partition_datatype": partition_datatype})
-                pipeline.rpush(queue_key, fragment_data)
-
-            pipeline.execute()
-            logger.debug(f"Pushed {len(query_hash_pairs)} fragments to Redis query fragment queue using pipeline: {queue_key}")
+                entries.append((f"{partition_key}:{hash_value}", fragment_data))
+            self._push("query_fragment", entries, priority)
+            logger.debug(f"Pushed {len(query_hash_pairs)} fragments to Redis query fragment queue: {self._get_queue_key('query_fragment')}")
             return True
         except Exception as e:
             logger.error(f"Failed to push fragments to Redis query fragment queue: {e}")
@@ -115,62 +266,95 @@ class RedisQueueHandler(AbstractQueueHandler):
 
     def pop_from_original_query_queue(self) -> tuple[str, str, str] | None:
         """
-        Pop an original query from the original query queue.
+        Pop the original query with the highest priority from the original query queue.
         Uses a short timeout for non-blocking behavior.
 
         Returns:
             Tuple[str, str, str] or None: (query, partition_key, partition_datatype) tuple if available, None if queue is empty or error occurred.
         """
         try:
-            r = self._get_redis_connection()
-            queue_key = self._get_queue_key("original_query")
-            result = r.blpop([queue_key], timeout=1)  # 1 second timeout for non-blocking behavior
-            if result is not None and isinstance(result, list | tuple) and len(result) >= 2:
-                query_data = json.loads(result[1].decode("utf-8"))
-                return query_data["query"], query_data["partition_key"], query_data.get("partition_datatype", "integer")
-            return None
+            query_data = self._pop_blocking("original_query", timeout=1)  # 1 second timeout for non-blocking behavior
+            return self._original_query_tuple(query_data) if query_data is not None else None
         except Exception as e:
             logger.error(f"Failed to pop from Redis original query queue: {e}")
             return None
 
     def pop_from_query_fragment_queue(self) -> tuple[str, str, str, str] | None:
         """
-        Pop a query fragment from the query fragment queue.
+        Pop the query fragment with the highest priority from the query fragment queue.
         Uses a short timeout for non-blocking behavior.
 
         Returns:
             Tuple[str, str, str, str] or None: (query, hash, partition_key, partition_datatype) tuple if available, None if queue is empty or error occurred.
         """
         try:
-            r = self._get_redis_connection()
-            queue_key = self._get_queue_key("query_fragment")
-            result = r.blpop([queue_key], timeout=1)  # 1 second timeout for non-blocking behavior
-            if result is not None and isinstance(result, list | tuple) and len(result) >= 2:
-                fragment_data = json.loads(result[1].decode("utf-8"))
-                return fragment_data["query"], fragment_data["hash"], fragment_data["partition_key"], fragment_data.get("partition_datatype", "integer")
-            return None
+            fragment_data = self._pop_blocking("query_fragment", timeout=1)  # 1 second timeout for non-blocking behavior
+            return self._query_fragment_tuple(fragment_data) if fragment_data is not None else None
         except Exception as e:
             logger.error(f"Failed to pop from Redis query fragment queue: {e}")
             return None
 
+    def pop_many_from_original_query_queue(self, n: int) -> list[tuple[str, str, str]]:
+        """
+        Pop up to n original queries (highest priority first) from the original query queue in a single round trip.
+        Does not wait if the queue is empty.
+
+        Args:
+            n (int): Maximum number of queries to pop.
+
+        Returns:
+            List[Tuple[str, str, str]]: (query, partition_key, partition_datatype) tuples, empty if the queue is empty or error occurred.
+        """
+        if n <= 0:
+            return []
+        try:
+            return [self._original_query_tuple(query_data) for query_data in self._pop_many("original_query", n)]
+        except Exception as e:
+            logger.error(f"Failed to pop from Redis original query queue: {e}")
+            return []
+
+    def pop_many_from_query_fragment_queue(
+        self, n: int, worker_id: str | None = None, active_workers: list[str] | None = None
+    ) -> list[tuple[str, str, str, str]]:
+        """
+        Pop up to n query fragments (highest priority first) from the query fragment queue in a single round trip.
+        Does not wait if the queue is empty.
+
+        With partition key affinity, only the affinity_scan_limit highest priority fragments are considered.
+
+        Args:
+            n (int): Maximum number of fragments to pop.
+            worker_id (str): Id of the popping worker for partition key affinity (default: None).
+            active_workers (List[str]): Ids of all active workers sharing the queue (default: None).
+
+        Returns:
+            List[Tuple[str, str, str, str]]: (query, hash, partition_key, partition_datatype) tuples, empty if the queue is empty or error occurred.
+        """
+        if n <= 0:
+            return []
+        try:
+            if worker_id is not None and active_workers and len(active_workers) > 1:
+                keys = [self._get_queue_key("query_fragment"), self._get_payload_key("query_fragment")]
+                payloads = self._get_script(POP_AFFINITY_SCRIPT)(keys=keys, args=[n, max(n, self.affinity_scan_limit), worker_id, *active_workers])
+                return [self._query_fragment_tuple(json.loads(payload)) for payload in payloads or []]
+            return [self._query_fragment_tuple(fragment_data) for fragment_data in self._pop_many("query_fragment", n)]
+        except Exception as e:
+            logger.error(f"Failed to pop from Redis query fragment queue: {e}")
+            return []
+
     def pop_from_original_query_queue_blocking(self, timeout: int = 60) -> tuple[str, str, str] | None:
         """
         Pop an original query from the original query queue with configurable blocking timeout.
 
         Args:
-            timeout (int): Maximum time to wait in seconds (default: 30)
+            timeout (int): Maximum time to wait in seconds (default: 60)
 
         Returns:
             Tuple[str, str, str] or None: (query, partition_key, partition_datatype) tuple if available, None if timeout or error occurred.
         """
         try:
-            r = self._get_redis_connection()
-            queue_key = self._get_queue_key("original_query")
-            result = r.blpop([queue_key], timeout=timeout)
-            if result is not None and isinstance(result, list | tuple) and len(result) >= 2:
-                query_data = json.loads(result[1].decode("utf-8"))
-                return query_data["query"], query_data["partition_key"], query_data.get("partition_datatype", "integer")
-            return None
+            query_data = self._pop_blocking("original_query", timeout=timeout)
+            return self._original_query_tuple(query_data) if query_data is not None else None
         except Exception as e:
             logger.error(f"Failed to pop from Redis original query queue with blocking: {e}")
             return None
@@ -180,23 +364,83 @@ class RedisQueueHandler(AbstractQueueHandler):
         Pop a query fragment from the query fragment queue with configurable blocking timeout.
 
         Args:
-            timeout (int): Maximum time to wait in seconds (default: 30)
+            timeout (int): Maximum time to wait in seconds (default: 60)
 
         Returns:
             Tuple[str, str, str, str] or None: (query, hash, partition_key, partition_datatype) tuple if available, None if timeout or error occurred.
         """
         try:
-            r = self._get_redis_connection()
-            queue_key = self._get_queue_key("query_fragment")
-            result = r.blpop([queue_key], timeout=timeout)
-            if result is not None and isinstance(result, list | tuple) and len(result) >= 2:
-                fragment_data = json.loads(result[1].decode("utf-8"))
-                return fragment_data["query"], fragment_data["hash"], fragment_data["partition_key"], fragment_data.get("partition_datatype", "integer")
-            return None
+            fragment_data = self._pop_blocking("query_fragment", timeout=timeout)
+            return self._query_fragment_tuple(fragment_data) if fragment_data is not None else None
         except Exception as e:
             logger.error(f"Failed to pop from Redis query fragment queue with blocking: {e}")
             return None
 
+    def _get_lease_key(self, hash_value: str, partition_key: str) -> str:
+        return f"{self.queue_key}_lease:{partition_key}:{hash_value}"
+
+    def acquire_fragment_lease(self, hash_value: str, partition_key: str) -> bool:
+        """
+        Acquire an exclusive lease on a query fragment (SET NX with expiry lease_ttl).
+
+        Args:
+            hash_value (str): The hash of the query fragment.
+            partition_key (str): The partition key of the query fragment.
+
+        Returns:
+            bool: True if the lease was acquired (or could not be checked), False if another worker holds it.
+        """
+        try:
+            r = self._get_redis_connection()
+            return bool(r.set(self._get_lease_key(hash_value, partition_key), self._lease_owner, nx=True, ex=self.lease_ttl))
+        except Exception as e:
+            logger.warning(f"Failed to acquire lease for fragment {hash_value}, executing without lease: {e}")
+            return True
+
+    def release_fragment_lease(self, hash_value: str, partition_key: str) -> None:
+        """
+        Release a lease acquired with acquire_fragment_lease, unless it expired and was taken over by another worker.
+
+        Args:
+            hash_value (str): The hash of the query fragment.
+            partition_key (str): The partition key of the query fragment.
+        """
+        try:
+            self._get_script(RELEASE_LEASE_SCRIPT)(keys=[self._get_lease_key(hash_value, partition_key)], args=[self._lease_owner])
+        except Exception as e:
+            logger.warning(f"Failed to release lease for fragment {hash_value}: {e}")
+
+    def heartbeat_worker(self, worker_id: str, ttl: float) -> list[str]:
+        """
+        Register a worker in the worker sorted set or refresh its expiry, remove expired workers and return all active workers.
+        Expiry times are taken from the Redis server clock, so clock differences between hosts do not matter.
+
+        Args:
+            worker_id (str): Unique id of the worker.
+            ttl (float): Seconds after which the worker is considered dead without a further heartbeat.
+
+        Returns:
+            List[str]: Sorted ids of the active workers, including worker_id. Empty if an error occurred.
+        """
+        try:
+            workers = self._get_script(HEARTBEAT_SCRIPT)(keys=[self._get_queue_key("workers")], args=[worker_id, ttl])
+            return sorted(worker.decode() if isinstance(worker, bytes) else worker for worker in workers or [])
+        except Exception as e:
+            logger.error(f"Failed to send heartbeat for worker {worker_id}: {e}")
+            return []
+
+    def unregister_worker(self, worker_id: str) -> None:
+        """
+        Remove a worker from the worker sorted set.
+
+        Args:
+            worker_id (str): Unique id of the worker.
+        """
+        try:
+            self._get_redis_connection().zrem(self._get_queue_key("workers"), worker_id)
+        except Exception as e:
+            logger.error(f"Failed to unregister worker {worker_id}: {e}")
+
     def get_queue_lengths(self) -> dict:
         """
         Get the current lengths of both original query and query fragment queues.
@@ -209,8 +453,8 @@ class RedisQueueHandler(AbstractQueueHandler):
             original_query_key = self._get_queue_key("original_query")
             query_fragment_key = self._get_queue_key("query_fragment")
 
-            original_query_len = r.llen(original_query_key)
-            query_fragment_len = r.llen(query_fragment_key)
+            original_query_len = r.zcard(original_query_key)
+            query_fragment_len = r.zcard(query_fragment_key)
 
             # Cast to int since we know this is sync Redis
             original_query_count = int(typing.cast(int, original_query_len)) if original_query_len is not None else 0
@@ -221,6 +465,15 @@ class RedisQueueHandler(AbstractQueueHandler):
             logger.error(f"Failed to get Redis queue lengths: {e}")
             return {"original_query_queue": 0, "query_fragment_queue": 0}
 
+    def _clear_queue(self, suffix: str) -> int:
+        """Delete a queue and its payloads in one transaction and return the number of entries cleared."""
+        r = self._get_redis_connection()
+        pipeline = r.pipeline(transaction=True)
+        pipeline.zcard(self._get_queue_key(suffix))
+        pipeline.delete(self._get_queue_key(suffix), self._get_payload_key(suffix))
+        length_result, _ = pipeline.execute()
+        return int(length_result or 0)
+
     def clear_original_query_queue(self) -> int:
         """
         Clear the original query queue and return the number of entries cleared.
@@ -229,12 +482,7 @@ class RedisQueueHandler(AbstractQueueHandler):
             int: Number of entries cleared from the original query queue.
         """
         try:
-            r = self._get_redis_connection()
-            original_query_key = self._get_queue_key("original_query")
-            length_result = r.llen(original_query_key)
-            length = int(typing.cast(int, length_result)) if length_result is not None else 0
-            deleted = r.delete(original_query_key)
-            return length if deleted else 0
+            return self._clear_queue("original_query")
         except Exception as e:
             logger.error(f"Failed to clear Redis original query queue: {e}")
             return 0
@@ -247,12 +495,7 @@ class RedisQueueHandler(AbstractQueueHandler):
             int: Number of entries cleared from the query fragment queue.
         """
         try:
-            r = self._get_redis_connection()
-            query_fragment_key = self._get_queue_key("query_fragment")
-            length_result = r.llen(query_fragment_key)
-            length = int(typing.cast(int, length_result)) if length_result is not None else 0
-            deleted = r.delete(query_fragment_key)
-            return length if deleted else 0
+            return self._clear_queue("query_fragment")
         except Exception as e:
             logger.error(f"Failed to clear Redis query fragment queue: {e}")
             return 0
@@ -265,25 +508,7 @@ class RedisQueueHandler(AbstractQueueHandler):
             Tuple[int, int]: (original_query_cleared, query_fragment_cleared) number of entries cleared.
         """
         try:
-            r = self._get_redis_connection()
-
-            # Clear both queues
-            original_query_key = self._get_queue_key("original_query")
-            query_fragment_key = self._get_queue_key("query_fragment")
-
-            original_query_len_result = r.llen(original_query_key)
-            query_fragment_len_result = r.llen(query_fragment_key)
-
-            original_query_length = int(typing.cast(int, original_query_len_result)) if original_query_len_result is not None else 0
-            query_fragment_length = int(typing.cast(int, query_fragment_len_result)) if query_fragment_len_result is not None else 0
-
-            original_query_deleted = r.delete(original_query_key)
-            query_fragment_deleted = r.delete(query_fragment_key)
-
-            original_query_cleared = original_query_length if original_query_deleted else 0
-            query_fragment_cleared = query_fragment_length if query_fragment_deleted else 0
-
-            return (original_query_cleared, query_fragment_cleared)
+            return (self._clear_queue("original_query"), self._clear_queue("query_fragment"))
         except Exception as e:
             logger.error(f"Failed to clear Redis queues: {e}")
             return (0, 0)
@@ -299,3 +524,4 @@ class RedisQueueHandler(AbstractQueueHandler):
                 logger.error(f"Error closing Redis connection: {e}")
             finally:
                 self._redis_client = None
+                self._scripts = {}
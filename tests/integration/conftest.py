@@ -535,13 +535,13 @@ def cache_client(request, db_session):
             else:
                 # For PostgreSQL backends, maintain consistency by dropping tables instead of just deleting data
                 # This prevents the issue where metadata exists but cache tables don't
-                if hasattr(cache_handler, "cursor") and hasattr(cache_handler, "db"):
+                if hasattr(cache_handler, "_checkout"):
                     try:
                         # Get table prefix for this handler
                         table_prefix = getattr(cache_handler, "tableprefix", "")
 
                         # Drop all cache tables and metadata tables together to maintain consistency
-                        with cache_handler.cursor:
+                        with cache_handler._checkout():
                             # Drop cache tables for each partition
                             for partition_key, _ in TEST_PARTITION_KEYS:
                                 cache_table = f"{table_prefix}_cache_{partition_key}"
@@ -301,3 +301,43 @@ class TestDuckDBBitIntegration:
         assert ("zipcode", "integer") in partitions
 
         handler2.close()
+
+    def test_concurrent_reads_and_writes(self, cache_handler):
+        """Test that threads can read and write through one shared handler."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        cache_handler.register_partition_key("zipcode", "integer", bitsize=1000)
+        cache_handler.set_cache("base_a", set(range(0, 50)), "zipcode")
+        cache_handler.set_cache("base_b", set(range(25, 75)), "zipcode")
+
+        def worker(i: int) -> tuple[set[int] | None, int]:
+            cache_handler.set_cache(f"worker_{i}", {i}, "zipcode")
+            assert cache_handler.get(f"worker_{i}", "zipcode") == {i}
+            return cache_handler.get_intersected({"base_a", "base_b"}, "zipcode")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(worker, range(32)))
+
+        for result, count in results:
+            assert result == set(range(25, 50))
+            assert count == 2
+        assert len(cache_handler.filter_existing_keys({f"worker_{i}" for i in range(32)}, "zipcode")) == 32
+
+    def test_read_only_mode(self, temp_db_path):
+        """Test sharing an existing cache file in read-only mode."""
+        writer = DuckDBBitCacheHandler(database=temp_db_path, table_prefix="ro_test", bitsize=1000)
+        writer.register_partition_key("zipcode", "integer")
+        writer.set_cache("ro_hash", {1, 2, 3}, "zipcode")
+        writer.close()
+
+        reader = DuckDBBitCacheHandler(database=temp_db_path, table_prefix="ro_test", bitsize=1000, read_only=True)
+        try:
+            assert reader.get("ro_hash", "zipcode") == {1, 2, 3}
+            assert reader.set_cache("other_hash", {4}, "zipcode") is False
+        finally:
+            reader.close()
+
+    def test_read_only_requires_file(self):
+        """Test that read-only mode is rejected for in-memory databases."""
+        with pytest.raises(ValueError):
+            DuckDBBitCacheHandler(database=":memory:", read_only=True)
@@ -238,19 +238,17 @@ def _populate_cache(handler, partition_key: str, geometry_column: str):
 
 def _cleanup_cache_tables(handler, partition_key: str):
     """Drop cache tables created during tests."""
+    table_name = f"{handler.tableprefix}_cache_{partition_key}"
+    queries_table = f"{handler.tableprefix}_queries"
+    metadata_table = f"{handler.tableprefix}_partition_metadata"
     try:
-        table_name = f"{handler.tableprefix}_cache_{partition_key}"
-        queries_table = f"{handler.tableprefix}_queries"
-        metadata_table = f"{handler.tableprefix}_partition_metadata"
-        handler.cursor.execute(f"DROP TABLE IF EXISTS {table_name} CASCADE")  # noqa: S608
-        handler.cursor.execute(f"DROP TABLE IF EXISTS {queries_table} CASCADE")  # noqa: S608
-        handler.cursor.execute(f"DROP TABLE IF EXISTS {metadata_table} CASCADE")  # noqa: S608
-        handler.db.commit()
+        with handler._checkout():
+            handler.cursor.execute(f"DROP TABLE IF EXISTS {table_name} CASCADE")  # noqa: S608
+            handler.cursor.execute(f"DROP TABLE IF EXISTS {queries_table} CASCADE")  # noqa: S608
+            handler.cursor.execute(f"DROP TABLE IF EXISTS {metadata_table} CASCADE")  # noqa: S608
+            handler.db.commit()
     except Exception:
-        try:
-            handler.db.rollback()
-        except Exception:
-            pass
+        pass
 
 
 def _run_query(conn, sql_query: str) -> list:
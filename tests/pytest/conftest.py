@@ -0,0 +1,14 @@
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def postgresql_cache_handler_without_pool():
+    """
+    PostgreSQL cache handlers connect through psycopg.connect (patched by the tests) instead of a connection pool.
+
+    Tests of the pooled path patch ConnectionPool again, see the real_pool fixture in test_postgresql_array_cache_handler.py.
+    """
+    with patch("partitioncache.cache_handler.postgresql_abstract.ConnectionPool", None):
+        yield
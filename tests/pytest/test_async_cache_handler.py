@@ -0,0 +1,268 @@
+"""
+Tests for the asyncio cache handler API (async adapters, native async handlers and async apply_cache).
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+
+from partitioncache.apply_cache import apply_cache_async, apply_cache_lazy_async
+from partitioncache.cache_handler.abstract import AbstractCacheHandler, AbstractCacheHandler_Lazy
+from partitioncache.cache_handler.async_abstract import AsyncAbstractCacheHandler, AsyncAbstractCacheHandler_Lazy
+from partitioncache.cache_handler.async_threaded import AsyncThreadedCacheHandler, AsyncThreadedCacheHandler_Lazy, wrap_async_cache_handler
+
+
+class TestAsyncThreadedCacheHandler:
+    def test_wrap_selects_lazy_adapter(self):
+        lazy_handler = Mock(spec=AbstractCacheHandler_Lazy)
+        handler = Mock(spec=AbstractCacheHandler)
+
+        assert isinstance(wrap_async_cache_handler(lazy_handler), AsyncThreadedCacheHandler_Lazy)
+        assert isinstance(wrap_async_cache_handler(lazy_handler), AsyncAbstractCacheHandler_Lazy)
+        wrapped = wrap_async_cache_handler(handler)
+        assert type(wrapped) is AsyncThreadedCacheHandler
+        assert isinstance(wrapped, AsyncAbstractCacheHandler)
+
+    def test_methods_delegate_to_sync_handler(self):
+        handler = Mock(spec=AbstractCacheHandler_Lazy)
+        handler.get.return_value = {1, 2}
+        handler.get_intersected.return_value = ({2}, 2)
+        handler.get_intersected_lazy.return_value = ("SELECT 1", 2)
+        handler.filter_existing_keys.return_value = {"a"}
+        handler.exists.return_value = True
+        handler.set_entry.return_value = True
+        wrapped = wrap_async_cache_handler(handler)
+
+        async def run():
+            assert await wrapped.get("a", "pk") == {1, 2}
+            assert await wrapped.get_intersected({"a", "b"}, "pk") == ({2}, 2)
+            assert await wrapped.get_intersected_lazy({"a", "b"}, "pk") == ("SELECT 1", 2)
+            assert await wrapped.filter_existing_keys({"a", "b"}, "pk", True) == {"a"}
+            assert await wrapped.exists("a", "pk")
+            assert await wrapped.set_entry("a", {1}, "SELECT 1", "pk")
+            await wrapped.close()
+
+        asyncio.run(run())
+        handler.filter_existing_keys.assert_called_once_with({"a", "b"}, "pk", True)
+        handler.set_entry.assert_called_once_with("a", {1}, "SELECT 1", "pk", False)
+        handler.close.assert_called_once()
+
+    def test_calls_are_serialized_unless_thread_safe(self):
+        active = 0
+        max_active = 0
+        counter_lock = threading.Lock()
+
+        def slow_get(key, partition_key):
+            nonlocal active, max_active
+            with counter_lock:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(0.02)
+            with counter_lock:
+                active -= 1
+            return {1}
+
+        async def run(thread_safe):
+            handler = Mock(spec=AbstractCacheHandler)
+            handler.get.side_effect = slow_get
+            wrapped = wrap_async_cache_handler(handler, thread_safe=thread_safe)
+            await asyncio.gather(*(wrapped.get(str(i), "pk") for i in range(4)))
+
+        asyncio.run(run(thread_safe=False))
+        assert max_active == 1
+
+        max_active = 0
+        asyncio.run(run(thread_safe=True))
+        assert max_active > 1
+
+
+class TestAsyncPostgreSQLCacheHandler:
+    def _make(self, handler_type, datatype="integer"):
+        from partitioncache.cache_handler.async_postgresql import AsyncPostgreSQLCacheHandler
+
+        handler = MagicMock()
+        handler.__repr__ = Mock(return_value=handler_type)
+        handler.tableprefix = "test"
+        conn = Mock()
+        cursor = Mock()
+        cursor.fetchone = AsyncMock()
+        cursor.fetchall = AsyncMock()
+        conn.execute = AsyncMock(return_value=cursor)
+        async_handler = AsyncPostgreSQLCacheHandler(handler, conn)
+        async_handler._cached_datatype["pk"] = datatype
+        return async_handler, handler, conn, cursor
+
+    def test_rejects_unsupported_handler(self):
+        from partitioncache.cache_handler.async_postgresql import AsyncPostgreSQLCacheHandler
+
+        handler = MagicMock()
+        handler.__repr__ = Mock(return_value="postgis_h3")
+        with pytest.raises(ValueError):
+            AsyncPostgreSQLCacheHandler(handler, Mock())
+
+    def test_get_bit_decodes_bitstring(self):
+        async_handler, _, _, cursor = self._make("postgresql_bit")
+        cursor.fetchone.return_value = ("0110",)
+
+        assert asyncio.run(async_handler.get("a", "pk")) == {1, 2}
+
+    def test_get_missing_partition_returns_none(self):
+        async_handler, _, conn, cursor = self._make("postgresql_array")
+        async_handler._cached_datatype.clear()
+        cursor.fetchone.return_value = None
+
+        assert asyncio.run(async_handler.get("a", "unknown")) is None
+        assert conn.execute.await_count == 1
+
+    def test_get_intersected_bit(self):
+        async_handler, handler, conn, cursor = self._make("postgresql_bit")
+        cursor.fetchall.return_value = [("a",), ("b",)]
+        cursor.fetchone.return_value = ("0011",)
+        handler.get_intersected_sql.return_value = "SELECT BIT_AND(...)"
+
+        result, count = asyncio.run(async_handler.get_intersected({"a", "b", "c"}, "pk"))
+
+        assert result == {2, 3}
+        assert count == 2
+        handler.get_intersected_sql.assert_called_once_with("pk")
+
+    def test_get_intersected_no_existing_keys(self):
+        async_handler, handler, _, cursor = self._make("postgresql_roaringbit")
+        cursor.fetchall.return_value = []
+
+        assert asyncio.run(async_handler.get_intersected({"a"}, "pk")) == (None, 0)
+        handler.get_intersected_sql.assert_not_called()
+
+    def test_get_intersected_lazy_uses_sync_sql_builder(self):
+        async_handler, handler, _, cursor = self._make("postgresql_array")
+        cursor.fetchall.return_value = [("a",)]
+        handler.get_intersected_lazy_sql.return_value = "SELECT unnest(...)"
+
+        assert asyncio.run(async_handler.get_intersected_lazy({"a", "b"}, "pk")) == ("SELECT unnest(...)", 1)
+        handler.get_intersected_lazy_sql.assert_called_once_with({"a"}, "pk", "integer")
+
+    def test_filter_existing_keys_check_query_single_statement(self):
+        async_handler, _, conn, cursor = self._make("postgresql_array")
+        cursor.fetchall.return_value = [("a",), ("b",)]
+
+        assert asyncio.run(async_handler.filter_existing_keys({"a", "b", "c"}, "pk", check_query=True)) == {"a", "b"}
+        assert conn.execute.await_count == 1
+        params = conn.execute.await_args.args[1]
+        assert params[0] == "pk"
+        assert set(params[1]) == {"a", "b", "c"}
+
+    def test_missing_table_returns_empty(self):
+        async_handler, _, conn, _ = self._make("postgresql_array")
+        conn.execute.side_effect = Exception('relation "test_cache_pk" does not exist')
+
+        assert asyncio.run(async_handler.filter_existing_keys({"a"}, "pk")) == set()
+        assert asyncio.run(async_handler.exists("a", "pk")) is False
+
+    def test_set_entry_delegates_to_sync_handler(self):
+        async_handler, handler, _, _ = self._make("postgresql_array")
+        handler.set_entry.return_value = True
+
+        assert asyncio.run(async_handler.set_entry("a", {1, 2}, "SELECT 1", "pk"))
+        handler.set_entry.assert_called_once_with("a", {1, 2}, "SELECT 1", "pk", False)
+
+
+class TestAsyncRedisCacheHandler:
+    def _make(self, handler_type, pipeline_results):
+        from partitioncache.cache_handler.async_redis import AsyncRedisCacheHandler
+
+        handler = MagicMock()
+        handler.__repr__ = Mock(return_value=handler_type)
+        db = Mock()
+        pipes = []
+        for results in pipeline_results:
+            pipe = MagicMock()
+            pipe.__aenter__ = AsyncMock(return_value=pipe)
+            pipe.__aexit__ = AsyncMock(return_value=False)
+            pipe.execute = AsyncMock(return_value=results)
+            pipes.append(pipe)
+        db.pipeline = Mock(side_effect=pipes)
+        async_handler = AsyncRedisCacheHandler(handler, db)
+        async_handler._cached_datatype["pk"] = "integer"
+        return async_handler, db, pipes
+
+    def test_filter_existing_keys_check_query(self):
+        # Per key: limit bit, timeout bit, query exists, query status, cache exists
+        states = {
+            "k_timeout": [0, 1, 1, b"timeout", 0],  # timeout bit -> included
+            "k_ok": [0, 0, 1, b"ok", 1],  # ok with cache entry -> included
+            "k_ok_missing": [0, 0, 1, b"ok", 0],  # ok without cache entry -> excluded
+            "k_failed": [0, 0, 1, b"failed", 0],  # failed status in query metadata -> included
+            "k_unknown": [0, 0, 0, None, 0],  # unknown -> excluded
+        }
+        keys = set(states)
+        results = [value for key in list(keys) for value in states[key]]
+        async_handler, _, pipes = self._make("redis_set", [results])
+
+        existing = asyncio.run(async_handler.filter_existing_keys(keys, "pk", check_query=True))
+
+        assert existing == {"k_timeout", "k_ok", "k_failed"}
+        assert pipes[0].execute.await_count == 1
+
+    def test_get_intersected_set_uses_sinter(self):
+        async_handler, db, _ = self._make("redis_set", [[b"set", b"none"]])
+        db.sinter = AsyncMock(return_value={b"1", b"3"})
+
+        result, count = asyncio.run(async_handler.get_intersected({"a", "b"}, "pk"))
+
+        assert result == {1, 3}
+        assert count == 1
+
+    def test_get_intersected_bit_single_round_trip(self):
+        async_handler, _, pipes = self._make("redis_bit", [[b"string", b"string"], [b"0", b"0"], [2, b"0110", 1]])
+
+        result, count = asyncio.run(async_handler.get_intersected({"a", "b"}, "pk"))
+
+        assert result == {1, 2}
+        assert count == 2
+        pipes[2].bitop.assert_called_once()
+        pipes[2].delete.assert_called_once()
+
+
+class TestApplyCacheAsync:
+    def test_apply_cache_async_enhances_query(self):
+        handler = Mock(spec=AsyncAbstractCacheHandler)
+        handler.get_intersected = AsyncMock(return_value=({1, 2, 3}, 2))
+        query = "SELECT * FROM users AS u WHERE u.active = true"
+
+        enhanced_query, stats = asyncio.run(apply_cache_async(query, handler, "zipcode", p0_alias="u", min_component_size=1))
+
+        assert "u.zipcode IN (1, 2, 3)" in enhanced_query
+        assert stats["enhanced"] == 1
+        assert stats["cache_hits"] == 2
+        assert stats["generated_variants"] > 0
+
+    def test_apply_cache_async_no_hits(self):
+        handler = Mock(spec=AsyncAbstractCacheHandler)
+        handler.get_intersected = AsyncMock(return_value=(None, 0))
+        query = "SELECT * FROM users AS u WHERE u.active = true"
+
+        enhanced_query, stats = asyncio.run(apply_cache_async(query, handler, "zipcode", use_p0_table=True, p0_alias="u"))
+
+        assert "zipcode_mv AS u" in enhanced_query
+        assert stats["enhanced"] == 0
+        assert stats["p0_rewritten"] == 1
+
+    def test_apply_cache_lazy_async_enhances_query(self):
+        handler = Mock(spec=AsyncAbstractCacheHandler_Lazy)
+        handler.get_intersected_lazy = AsyncMock(return_value=("SELECT zipcode FROM cache_data", 3))
+        query = "SELECT * FROM users AS u WHERE u.active = true"
+
+        enhanced_query, stats = asyncio.run(apply_cache_lazy_async(query, handler, "zipcode", p0_alias="u", min_component_size=1))
+
+        assert "u.zipcode IN (SELECT zipcode FROM cache_data" in enhanced_query
+        assert stats["enhanced"] == 1
+        assert stats["cache_hits"] == 3
+
+    def test_apply_cache_lazy_async_requires_lazy_handler(self):
+        handler = Mock(spec=AsyncAbstractCacheHandler)
+
+        with pytest.raises(ValueError):
+            asyncio.run(apply_cache_lazy_async("SELECT * FROM users AS u", handler, "zipcode"))
@@ -52,7 +52,7 @@ class TestBitsizeExpansionFix:
         cache_handler._get_partition_bitsize = Mock(return_value=None)
 
         # Mock the bootstrap process
-        with patch.object(cache_handler, "_load_sql_functions"), patch.object(cache_handler, "cursor") as mock_cursor:
+        with patch.object(cache_handler, "_load_sql_functions"), patch.object(cache_handler._local, "cursor") as mock_cursor:
             mock_cursor.execute.return_value = None
             mock_cursor.fetchone.return_value = [True]  # Advisory lock acquired
             cache_handler._get_partition_bitsize = Mock(side_effect=[None, None, 2000])  # Not found initially, then created with requested bitsize
@@ -84,7 +84,7 @@ class TestBitsizeExpansionFix:
         cache_handler._get_partition_bitsize = Mock(side_effect=bitsize_calls)
 
         # Mock the bootstrap process
-        with patch.object(cache_handler, "_load_sql_functions"), patch.object(cache_handler, "cursor") as mock_cursor:
+        with patch.object(cache_handler, "_load_sql_functions"), patch.object(cache_handler._local, "cursor") as mock_cursor:
             mock_cursor.execute.return_value = None
             mock_cursor.fetchone.return_value = [True]  # Advisory lock acquired
 
@@ -114,7 +114,7 @@ class TestBitsizeExpansionFix:
 
         with (
             patch.object(cache_handler, "_load_sql_functions"),
-            patch.object(cache_handler, "cursor") as mock_cursor,
+            patch.object(cache_handler._local, "cursor") as mock_cursor,
             patch("bitarray.bitarray") as mock_bitarray,
         ):
             # Mock database operations
@@ -143,7 +143,7 @@ class TestBitsizeExpansionFix:
         for existing_bitsize, required_bitsize, should_bootstrap in test_cases:
             cache_handler._get_partition_bitsize = Mock(return_value=existing_bitsize)
 
-            with patch.object(cache_handler, "_load_sql_functions"), patch.object(cache_handler, "cursor") as mock_cursor:
+            with patch.object(cache_handler, "_load_sql_functions"), patch.object(cache_handler._local, "cursor") as mock_cursor:
                 if should_bootstrap:
                     mock_cursor.execute.return_value = None
                     mock_cursor.fetchone.return_value = [True]
@@ -168,7 +168,7 @@ class TestBitsizeExpansionFix:
         # With the fix, this should NOT return early but should bootstrap
         cache_handler._get_partition_bitsize = Mock(side_effect=[existing_bitsize, existing_bitsize, required_bitsize])
 
-        with patch.object(cache_handler, "_load_sql_functions"), patch.object(cache_handler, "cursor") as mock_cursor:
+        with patch.object(cache_handler, "_load_sql_functions"), patch.object(cache_handler._local, "cursor") as mock_cursor:
             mock_cursor.execute.return_value = None
             mock_cursor.fetchone.return_value = [True]
 
@@ -201,7 +201,7 @@ class TestBitsizeExpansionFix:
 
         with (
             patch.object(cache_handler, "_load_sql_functions"),
-            patch.object(cache_handler, "cursor") as mock_cursor,
+            patch.object(cache_handler._local, "cursor") as mock_cursor,
             patch("time.sleep"),
         ):  # Mock sleep to speed up test
             # Mock advisory lock not acquired initially (another thread working)
@@ -0,0 +1,130 @@
+"""
+Tests for streaming query results from the database handlers.
+"""
+
+import struct
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from partitioncache.db_handler import get_db_handler
+
+
+@pytest.fixture
+def postgres_conn():
+    conn = MagicMock()
+    with patch("psycopg.connect", return_value=conn):
+        yield conn
+
+
+def binary_copy(values: list[int]) -> bytes:
+    """Binary COPY output of a single bigint column."""
+    data = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+    for value in values:
+        data += struct.pack(">hiq", 1, 8, value)
+    return data + struct.pack(">h", -1)
+
+
+@pytest.fixture
+def sqlite_handler(tmp_path):
+    handler = get_db_handler("sqlite", db_path=str(tmp_path / "test.db"))
+    handler.execute("CREATE TABLE trips (zone INTEGER)")
+    handler.execute("INSERT INTO trips VALUES (1), (2), (3), (NULL)")
+    yield handler
+    handler.close()
+
+
+class TestExecuteIter:
+    def test_sqlite_streams_first_column_skips_null(self, sqlite_handler):
+        assert list(sqlite_handler.execute_iter("SELECT zone FROM trips ORDER BY zone", batch_size=2)) == [1, 2, 3]
+
+    def test_duckdb_skips_null(self):
+        pytest.importorskip("duckdb")
+        handler = get_db_handler("duckdb")
+        try:
+            values = handler.execute_iter("SELECT CASE WHEN range = 2 THEN NULL ELSE range END FROM range(5)", batch_size=2)
+            assert list(values) == [0, 1, 3, 4]
+        finally:
+            handler.close()
+
+    def test_postgres_uses_server_side_cursor(self):
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchmany.side_effect = [[(0,), (None,)], [(7,)], []]
+
+        with patch("psycopg.connect", return_value=conn):
+            handler = get_db_handler("postgres", host="localhost", port=5432, user="user", password="password", dbname="db")
+
+        assert list(handler.execute_iter("SELECT zone FROM trips", batch_size=2)) == [0, 7]
+        assert conn.cursor.call_args.kwargs["name"]
+        cursor.fetchmany.assert_called_with(2)
+
+    def test_postgres_default_batch_size_is_itersize(self, postgres_conn):
+        cursor = postgres_conn.cursor.return_value.__enter__.return_value
+        cursor.fetchmany.return_value = []
+        handler = get_db_handler("postgres", host="localhost", port=5432, user="user", password="password", dbname="db", itersize=500)
+
+        assert list(handler.execute_iter("SELECT zone FROM trips")) == []
+        cursor.fetchmany.assert_called_with(500)
+
+    def test_postgres_early_close_closes_cursor(self):
+        conn = MagicMock()
+        cursor_context = conn.cursor.return_value
+        cursor_context.__enter__.return_value.fetchmany.return_value = [(1,), (2,)]
+
+        with patch("psycopg.connect", return_value=conn):
+            handler = get_db_handler("postgres", host="localhost", port=5432, user="user", password="password", dbname="db")
+
+        values = handler.execute_iter("SELECT zone FROM trips")
+        assert next(values) == 1
+        values.close()
+        cursor_context.__exit__.assert_called_once()
+
+    def test_postgres_cursor_name_unique_per_call(self, postgres_conn):
+        postgres_conn.cursor.return_value.__enter__.return_value.fetchmany.return_value = [(1,)]
+        handler = get_db_handler("postgres", host="localhost", port=5432, user="user", password="password", dbname="db")
+
+        first = handler.execute_iter("SELECT zone FROM trips")
+        second = handler.execute_iter("SELECT zone FROM trips")
+        assert next(first) == 1
+        assert next(second) == 1
+
+        names = [call.kwargs["name"] for call in postgres_conn.cursor.call_args_list if "name" in call.kwargs]
+        assert len(names) == 2
+        assert names[0] != names[1]
+        first.close()
+        second.close()
+
+
+class TestExecuteArray:
+    def test_binary_copy_parsed_into_array(self, postgres_conn):
+        pytest.importorskip("numpy")
+        handler = get_db_handler("postgres", host="localhost", port=5432, user="user", password="password", dbname="db")
+        copy = handler.cur.copy.return_value.__enter__.return_value
+        data = binary_copy([7, 3, 7, 1 << 40])
+        copy.__iter__.return_value = iter([data[:10], data[10:]])
+
+        assert handler.execute_array("SELECT zone FROM trips;").tolist() == [7, 3, 7, 1 << 40]
+        statement = handler.cur.copy.call_args.args[0].as_string(None)
+        assert statement == "COPY (SELECT v::bigint FROM (SELECT zone FROM trips) AS q(v) WHERE v IS NOT NULL) TO STDOUT (FORMAT BINARY)"
+
+        copy.__iter__.return_value = iter([data])
+        assert handler.execute_array("SELECT zone FROM trips", unique=True).tolist() == [3, 7, 1 << 40]
+
+    def test_unsupported_datatype(self, postgres_conn):
+        pytest.importorskip("numpy")
+        handler = get_db_handler("postgres", host="localhost", port=5432, user="user", password="password", dbname="db")
+
+        with pytest.raises(ValueError):
+            handler.execute_array("SELECT name FROM trips", "text")
+
+    def test_requires_numpy(self, postgres_conn):
+        handler = get_db_handler("postgres", host="localhost", port=5432, user="user", password="password", dbname="db")
+
+        with patch("partitioncache.db_handler.postgres.np", None), pytest.raises(ImportError):
+            handler.execute_array("SELECT zone FROM trips")
+
+    def test_not_supported_by_sqlite(self, sqlite_handler):
+        assert sqlite_handler.supports_execute_array is False
+        with pytest.raises(NotImplementedError):
+            sqlite_handler.execute_array("SELECT zone FROM trips")
@@ -25,6 +25,8 @@ class TestDuckDBBitCacheHandler:
         conn.commit = Mock()
         conn.rollback = Mock()
         conn.close = Mock()
+        # Per-thread read cursors share the mocked connection
+        conn.cursor = Mock(return_value=conn)
         return conn
 
     @pytest.fixture
@@ -113,24 +115,22 @@ class TestDuckDBBitCacheHandler:
 
     def test_get_cache(self, cache_handler):
         """Test retrieving cache values."""
-        # Mock DuckDB BITSTRING query results - return the bit positions
-        cache_handler.conn.execute.return_value.fetchall.return_value = [
-            (5,), (10,), (99,)  # Positions where bits are set
-        ]
+        # Mock DuckDB BITSTRING query result - bits 1, 3 and 6 are set
+        cache_handler.conn.execute.return_value.fetchone.return_value = ("0101001",)
 
         result = cache_handler.get("hash123", "zipcode")
-        assert result == {5, 10, 99}
+        assert result == {1, 3, 6}
 
     def test_get_cache_not_found(self, cache_handler):
         """Test retrieving non-existent cache entry."""
-        cache_handler.conn.execute.return_value.fetchall.return_value = []
+        cache_handler.conn.execute.return_value.fetchone.return_value = None
 
         result = cache_handler.get("nonexistent", "zipcode")
         assert result is None
 
     def test_get_cache_null_value(self, cache_handler):
         """Test retrieving null cache value."""
-        cache_handler.conn.execute.return_value.fetchall.return_value = []
+        cache_handler.conn.execute.return_value.fetchone.return_value = (None,)
 
         result = cache_handler.get("null_hash", "zipcode")
         assert result is None
@@ -189,9 +189,7 @@ class TestDuckDBBitCacheHandler:
 
     def test_get_intersected_single_key(self, cache_handler):
         """Test intersection with single key."""
-        # Mock the methods that get_intersected calls
-        cache_handler.filter_existing_keys = Mock(return_value={"hash123"})
-        cache_handler.get = Mock(return_value={5, 10})
+        cache_handler.conn.execute.return_value.fetchone.return_value = ("0000010000100", 1)
 
         result, count = cache_handler.get_intersected({"hash123"}, "zipcode")
         assert result == {5, 10}
@@ -199,21 +197,29 @@ class TestDuckDBBitCacheHandler:
 
     def test_get_intersected_multiple_keys(self, cache_handler):
         """Test intersection with multiple keys using DuckDB BIT_AND."""
-        # Mock filter_existing_keys to return all keys
-        cache_handler.filter_existing_keys = Mock(return_value={"hash1", "hash2", "hash3"})
-
-        # Mock DuckDB BIT_AND aggregate result - return intersection positions
-        cache_handler.conn.execute.return_value.fetchall.return_value = [
-            (5,)  # Only position 5 is in intersection
-        ]
+        # Mock DuckDB BIT_AND aggregate result - intersection bitstring and existing key count
+        cache_handler.conn.execute.return_value.fetchone.return_value = ("000001", 3)
 
         result, count = cache_handler.get_intersected({"hash1", "hash2", "hash3"}, "zipcode")
         assert result == {5}
         assert count == 3
 
+    def test_get_intersected_single_statement(self, cache_handler):
+        """Test that intersection and existence counting run in one statement."""
+        cache_handler.conn.execute.reset_mock()
+        cache_handler.conn.execute.return_value.fetchone.return_value = ("0110", 2)
+
+        cache_handler.get_intersected({"hash1", "hash2"}, "zipcode")
+
+        assert cache_handler.conn.execute.call_count == 1
+        sql_text = cache_handler.conn.execute.call_args[0][0].lower()
+        assert "bit_and" in sql_text
+        assert "count(" in sql_text
+        assert "unnest" not in sql_text
+
     def test_get_intersected_no_keys_exist(self, cache_handler):
         """Test intersection when no keys exist."""
-        cache_handler.filter_existing_keys = Mock(return_value=set())
+        cache_handler.conn.execute.return_value.fetchone.return_value = (None, 0)
 
         result, count = cache_handler.get_intersected({"hash1", "hash2"}, "zipcode")
         assert result is None
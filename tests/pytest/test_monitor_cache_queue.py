@@ -4,19 +4,37 @@ Unit tests for the monitor cache queue module.
 
 import logging
 import os
+import threading
 from unittest.mock import Mock, patch
 
 import pytest
+from pyroaring import BitMap
 
 from partitioncache.cli.monitor_cache_queue import (
+    AdaptiveConcurrencyLimit,
+    CostAwareFragmentScheduler,
+    FragmentCostModel,
+    analyze_preload_columns,
     apply_cache_optimization,
+    close_worker_db_handlers,
+    collect_partition_keys,
     fragment_executor,
+    get_worker_db_handler,
     print_status,
     query_fragment_processor,
+    release_worker_db_handler,
     run_and_store_query,
+    size_cache_connection_pool,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_worker_db_handlers():
+    """Do not reuse database handlers cached by the worker thread across tests."""
+    yield
+    close_worker_db_handlers()
+
+
 @pytest.fixture
 def mock_env():
     """Mock environment variables for testing."""
@@ -41,6 +59,7 @@ def mock_args():
     args.db_dir = "test.db"
     args.max_processes = 2
     args.limit = None
+    args.fetch_size = 10000
     args.long_running_query_timeout = "0"
     args.close = False
     # Add common variant generation args
@@ -68,6 +87,10 @@ def mock_args():
     args.status_log_interval = 10
     args.disable_optimized_polling = False
     args.force_recalculate = False
+    args.enable_fragment_leases = False
+    args.adaptive_concurrency = False
+    args.cost_aware_scheduling = False
+    args.partition_key_affinity = False
     args.log_query_times = None
     return args
 
@@ -243,10 +266,13 @@ class TestRunAndStoreQuery:
         # so it uses the traditional path
         del mock_cache.set_cache_lazy
         del mock_cache.set_entry_lazy
+        mock_cache.accepts_integer_arrays = False
         mock_get_cache.return_value = mock_cache
 
         mock_db = Mock()
-        mock_db.execute.return_value = [1, 2, 3]
+
+        mock_db.supports_execute_array = False
+        mock_db.execute_iter.return_value = [1, 2, 3]
         mock_get_db.return_value = mock_db
 
         # Monkey patch args into the module
@@ -266,7 +292,8 @@ class TestRunAndStoreQuery:
 
         assert result is True
         mock_cache.set_cache.assert_called_once_with("test_hash", {1, 2, 3}, "test_partition_key")
-        mock_db.close.assert_called_once()
+        # The connection is kept open for the next query executed by this worker thread
+        mock_db.close.assert_not_called()
 
     @patch("partitioncache.cli.monitor_cache_queue.get_cache_handler")
     @patch("partitioncache.cli.monitor_cache_queue.get_db_handler")
@@ -281,7 +308,9 @@ class TestRunAndStoreQuery:
         mock_get_cache.return_value = mock_cache
 
         mock_db = Mock()
-        mock_db.execute.return_value = [1, 2, 3]  # 3 results, limit is 2
+
+        mock_db.supports_execute_array = False
+        mock_db.execute_iter.return_value = [1, 2, 3]  # 3 results, limit is 2
         mock_get_db.return_value = mock_db
 
         # Monkey patch args into the module
@@ -316,7 +345,9 @@ class TestRunAndStoreQuery:
         mock_get_cache.return_value = mock_cache
 
         mock_db = Mock()
-        mock_db.execute.side_effect = psycopg.OperationalError("statement timeout")
+
+        mock_db.supports_execute_array = False
+        mock_db.execute_iter.side_effect = psycopg.OperationalError("statement timeout")
         mock_get_db.return_value = mock_db
 
         # Monkey patch args into the module
@@ -374,7 +405,9 @@ class TestRunAndStoreQuery:
         mock_get_cache.return_value = mock_cache
 
         mock_db = Mock()
-        mock_db.execute.return_value = [1, 2, 3]
+
+        mock_db.supports_execute_array = False
+        mock_db.execute_iter.return_value = [1, 2, 3]
         mock_get_db.return_value = mock_db
 
         # Set up log file path
@@ -450,7 +483,7 @@ class TestFragmentExecutorComponents:
         mock_args.cache_backend = "redis_set"
 
         with patch("partitioncache.cli.monitor_cache_queue.exit_event") as mock_exit_event:
-            with patch("partitioncache.cli.monitor_cache_queue.pop_from_query_fragment_queue") as mock_pop:
+            with patch("partitioncache.cli.monitor_cache_queue.pop_many_from_query_fragment_queue") as mock_pop:
                 with patch("partitioncache.cli.monitor_cache_queue.pop_from_query_fragment_queue_blocking") as mock_pop_blocking:
                     with patch("partitioncache.cli.monitor_cache_queue.get_cache_handler") as mock_get_cache:
                         with patch("partitioncache.cli.monitor_cache_queue.get_queue_lengths") as mock_get_lengths:
@@ -461,7 +494,7 @@ class TestFragmentExecutorComponents:
                                     call_count[0] += 1
                                     return call_count[0] > 3  # Exit after a few calls
                                 mock_exit_event.is_set.side_effect = mock_exit_side_effect
-                                mock_pop.return_value = None  # Empty queue
+                                mock_pop.return_value = []  # Empty queue
                                 mock_pop_blocking.return_value = None
                                 mock_get_lengths.return_value = {"original_query_queue": 0, "query_fragment_queue": 0}
                                 mock_time.return_value = 1000.0
@@ -496,7 +529,7 @@ class TestFragmentExecutorComponents:
         mock_args.cache_backend = "redis_set"
 
         with patch("partitioncache.cli.monitor_cache_queue.exit_event") as mock_exit_event:
-            with patch("partitioncache.cli.monitor_cache_queue.pop_from_query_fragment_queue") as mock_pop:
+            with patch("partitioncache.cli.monitor_cache_queue.pop_many_from_query_fragment_queue") as mock_pop:
                 with patch("partitioncache.cli.monitor_cache_queue.pop_from_query_fragment_queue_blocking") as mock_pop_blocking:
                     with patch("partitioncache.cli.monitor_cache_queue.get_cache_handler") as mock_get_cache:
                         with patch("partitioncache.cli.monitor_cache_queue.get_queue_lengths") as mock_get_lengths:
@@ -508,7 +541,7 @@ class TestFragmentExecutorComponents:
                                     return call_count[0] > 3  # Exit after a few calls
                                 mock_exit_event.is_set.side_effect = mock_exit_side_effect
                                 # Return cached query once, then None to prevent infinite loop
-                                mock_pop.side_effect = [("SELECT * FROM test", "cached_hash", "test_partition_key", "integer"), None]
+                                mock_pop.side_effect = [[("SELECT * FROM test", "cached_hash", "test_partition_key", "integer")], []]
                                 mock_pop_blocking.side_effect = [("SELECT * FROM test", "cached_hash", "test_partition_key", "integer"), None]
                                 mock_get_lengths.return_value = {"original_query_queue": 0, "query_fragment_queue": 0}
                                 mock_time.return_value = 1000.0
@@ -799,3 +832,735 @@ class TestCacheOptimization:
         assert stats["total_hashes"] == 0
         assert stats["cache_hits"] == 0
         assert stats["method_used"] is None
+
+
+class TestEnqueueCacheFilter:
+    """Test skipping of already cached fragments at enqueue time."""
+
+    def test_filter_cached_fragments(self):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+
+        mock_cache = Mock()
+        mock_cache.filter_existing_keys.return_value = {"hash1", "hash3"}
+        pairs = [("q1", "hash1"), ("q2", "hash2"), ("q3", "hash3")]
+
+        skipped_before = mcq_module.skipped_cached_fragments
+        assert mcq_module.filter_cached_fragments(pairs, "pk", mock_cache) == [("q2", "hash2")]
+        assert mcq_module.skipped_cached_fragments == skipped_before + 2
+        mock_cache.filter_existing_keys.assert_called_once_with({"hash1", "hash2", "hash3"}, "pk", check_query=True)
+
+    def test_filter_cached_fragments_lookup_error_keeps_all(self):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+
+        mock_cache = Mock()
+        mock_cache.filter_existing_keys.side_effect = Exception("connection lost")
+        pairs = [("q1", "hash1"), ("q2", "hash2")]
+
+        assert mcq_module.filter_cached_fragments(pairs, "pk", mock_cache) == pairs
+
+    @patch("partitioncache.cli.monitor_cache_queue.exit_event")
+    @patch("partitioncache.cli.monitor_cache_queue.pop_from_original_query_queue_blocking")
+    @patch("partitioncache.cli.monitor_cache_queue.get_cache_handler")
+    @patch("partitioncache.cli.monitor_cache_queue.generate_all_query_hash_pairs")
+    @patch("partitioncache.cli.monitor_cache_queue.push_to_query_fragment_queue")
+    def test_processor_enqueues_only_missing_fragments(self, mock_push, mock_generate, mock_get_cache, mock_pop_blocking, mock_exit_event, mock_args, mock_env):
+        mock_args.disable_enqueue_cache_filter = False
+        mock_args.cache_backend = "postgresql_array"
+        mock_exit_event.is_set.side_effect = [False, False, True]
+        mock_pop_blocking.side_effect = [("SELECT 1", "pk", "integer"), ("SELECT 2", "pk", "integer")]
+        mock_generate.side_effect = [[("q1", "hash1"), ("q2", "hash2")], [("q1", "hash1")]]
+        mock_get_cache.return_value.filter_existing_keys.return_value = {"hash1"}
+
+        query_fragment_processor(mock_args, (None, None, None))
+
+        # The second query only generated cached fragments, so nothing is pushed for it
+        mock_push.assert_called_once_with([("q2", "hash2")], "pk", "integer")
+
+
+class TestInFlightFragments:
+    """Test in-flight deduplication of fragments in the fragment executor."""
+
+    def _run_executor(self, mock_args, fragments, lease_granted):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+
+        mock_args.cache_backend = "redis_set"
+        call_count = [0]
+
+        def exit_after_first_batch():
+            call_count[0] += 1
+            return call_count[0] > 8
+
+        submitted = []
+        pool = Mock()
+        pool.submit.side_effect = lambda func, query, hash_value, *rest: submitted.append(hash_value) or Mock(done=Mock(return_value=False))
+        pool_cls = Mock()
+        pool_cls.return_value.__enter__ = Mock(return_value=pool)
+        pool_cls.return_value.__exit__ = Mock(return_value=False)
+
+        with (
+            patch.object(mcq_module, "exit_event") as mock_exit_event,
+            patch.object(mcq_module, "pop_many_from_query_fragment_queue", side_effect=[fragments, []]),
+            patch.object(mcq_module, "pop_from_query_fragment_queue_blocking", return_value=None),
+            patch.object(mcq_module, "get_cache_handler") as mock_get_cache,
+            patch.object(mcq_module, "get_queue_lengths", return_value={"original_query_queue": 0, "query_fragment_queue": 0}),
+            patch.object(mcq_module, "acquire_fragment_lease", side_effect=lambda hash_value, partition_key: lease_granted[hash_value]) as mock_acquire,
+            patch.object(mcq_module.concurrent.futures, "ThreadPoolExecutor", pool_cls),
+            patch.object(mcq_module.time, "sleep"),
+        ):
+            mock_exit_event.is_set.side_effect = exit_after_first_batch
+            mock_get_cache.return_value.exists.return_value = False
+            mcq_module.args = mock_args
+            try:
+                fragment_executor()
+            finally:
+                del mcq_module.args
+                mcq_module.active_futures.clear()
+                mcq_module.in_flight_fragments.clear()
+        return submitted, mock_acquire
+
+    def test_duplicate_fragment_in_batch_is_skipped(self, mock_args, mock_env):
+        fragments = [("SELECT 1", "hash1", "pk", "integer"), ("SELECT 1", "hash1", "pk", "integer"), ("SELECT 1", "hash1", "pk2", "integer")]
+
+        submitted, mock_acquire = self._run_executor(mock_args, fragments, {})
+
+        assert submitted == ["hash1", "hash1"]  # Same hash for another partition key is a different fragment
+        mock_acquire.assert_not_called()
+
+    def test_fragment_leased_by_other_monitor_is_skipped(self, mock_args, mock_env):
+        mock_args.enable_fragment_leases = True
+        fragments = [("SELECT 1", "hash1", "pk", "integer"), ("SELECT 2", "hash2", "pk", "integer")]
+
+        submitted, mock_acquire = self._run_executor(mock_args, fragments, {"hash1": False, "hash2": True})
+
+        assert submitted == ["hash2"]
+        assert mock_acquire.call_count == 2
+
+
+class TestWorkerDBHandlers:
+    """Test reuse of database handlers across query executions."""
+
+    def _run(self, mock_args, query_hash):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+
+        mcq_module.args = mock_args
+        try:
+            return run_and_store_query("SELECT * FROM test", query_hash, "test_partition_key", "integer")
+        finally:
+            del mcq_module.args
+
+    @patch("partitioncache.cli.monitor_cache_queue.get_cache_handler")
+    @patch("partitioncache.cli.monitor_cache_queue.get_db_handler")
+    def test_handler_reused_across_queries(self, mock_get_db, mock_get_cache, mock_args, mock_env):
+        mock_cache = Mock(spec=["set_cache", "set_query", "set_query_status", "register_partition_key", "accepts_integer_arrays"])
+        mock_get_cache.return_value = mock_cache
+        mock_db = Mock()
+        mock_db.supports_execute_array = False
+        mock_db.execute_iter.return_value = [1, 2]
+        mock_get_db.return_value = mock_db
+
+        assert self._run(mock_args, "hash1") is True
+        assert self._run(mock_args, "hash2") is True
+
+        mock_get_db.assert_called_once()
+        assert mock_db.execute_iter.call_count == 2
+        mock_db.close.assert_not_called()
+
+        close_worker_db_handlers()
+        mock_db.close.assert_called_once()
+
+    @patch("partitioncache.cli.monitor_cache_queue.get_cache_handler")
+    @patch("partitioncache.cli.monitor_cache_queue.get_db_handler")
+    def test_handler_reconnected_after_connection_error(self, mock_get_db, mock_get_cache, mock_args, mock_env):
+        import psycopg
+
+        mock_cache = Mock(spec=["set_cache", "set_query", "set_query_status", "register_partition_key", "accepts_integer_arrays"])
+        mock_get_cache.return_value = mock_cache
+        broken_db = Mock()
+        broken_db.supports_execute_array = False
+        broken_db.execute_iter.side_effect = psycopg.OperationalError("server closed the connection unexpectedly")
+        new_db = Mock()
+        new_db.supports_execute_array = False
+        new_db.execute_iter.return_value = [1]
+        mock_get_db.side_effect = [broken_db, new_db]
+
+        assert self._run(mock_args, "hash1") is False
+        broken_db.close.assert_called_once()
+
+        assert self._run(mock_args, "hash2") is True
+        assert mock_get_db.call_count == 2
+        new_db.close.assert_not_called()
+
+    @patch("partitioncache.cli.monitor_cache_queue.get_db_handler")
+    def test_handler_keyed_by_connection_settings(self, mock_get_db):
+        mock_get_db.side_effect = lambda db_type, **params: Mock(name=f"{db_type}-{params['timeout']}")
+
+        first = get_worker_db_handler("postgres", {"host": "localhost", "timeout": "0"})
+        release_worker_db_handler(first)
+        other_timeout = get_worker_db_handler("postgres", {"host": "localhost", "timeout": "30"})
+        release_worker_db_handler(other_timeout)
+
+        assert first is not other_timeout
+        assert get_worker_db_handler("postgres", {"timeout": "0", "host": "localhost"}) is first
+
+    @patch("partitioncache.cli.monitor_cache_queue.get_db_handler")
+    def test_closed_connection_is_replaced(self, mock_get_db):
+        import psycopg
+
+        closed_conn = Mock(spec=psycopg.Connection)
+        closed_conn.closed = True
+        stale = Mock(conn=closed_conn)
+        fresh = Mock()
+        mock_get_db.side_effect = [stale, fresh]
+
+        assert get_worker_db_handler("postgres", {"timeout": "0"}) is stale
+        release_worker_db_handler(stale)
+
+        assert get_worker_db_handler("postgres", {"timeout": "0"}) is fresh
+        stale.close.assert_called_once()
+
+
+class TestAdaptiveConcurrencyLimit:
+    """Test the AIMD concurrency limit of the fragment executor."""
+
+    def test_initial_limit_between_bounds(self):
+        assert AdaptiveConcurrencyLimit(2, 12).limit == 7
+        assert AdaptiveConcurrencyLimit(2, 12, initial_limit=20).limit == 12
+
+    def test_increase_when_saturated_and_latency_stable(self):
+        limiter = AdaptiveConcurrencyLimit(1, 10, initial_limit=2)
+
+        for _ in range(2):
+            limiter.record(0.1, True, saturated=True)
+        assert limiter.limit == 3
+        for _ in range(3):
+            limiter.record(0.1, True, saturated=True)
+        assert limiter.limit == 4
+        assert limiter.last_decision.startswith("3 -> 4")
+
+    def test_hold_when_not_saturated(self):
+        limiter = AdaptiveConcurrencyLimit(1, 10, initial_limit=2)
+
+        for _ in range(4):
+            limiter.record(0.1, True, saturated=False)
+        assert limiter.limit == 2
+
+    def test_decrease_on_latency_increase(self):
+        limiter = AdaptiveConcurrencyLimit(1, 10, initial_limit=8)
+
+        for _ in range(8):
+            limiter.record(0.1, True, saturated=True)
+        assert limiter.limit == 9
+        for _ in range(9):
+            limiter.record(0.5, True, saturated=True)
+        assert limiter.limit == 6
+        assert "baseline" in limiter.last_decision
+
+    def test_decrease_on_failures_respects_min(self):
+        limiter = AdaptiveConcurrencyLimit(2, 10, initial_limit=2)
+
+        for _ in range(2):
+            limiter.record(0.1, False, saturated=True)
+        assert limiter.limit == 2
+
+        limiter = AdaptiveConcurrencyLimit(2, 10, initial_limit=4)
+        for _ in range(4):
+            limiter.record(0.1, False, saturated=True)
+        assert limiter.limit == 3
+
+    def test_track_records_future_result(self):
+        from concurrent.futures import Future
+
+        limiter = AdaptiveConcurrencyLimit(1, 10, initial_limit=1)
+        future: Future = Future()
+        future.add_done_callback(limiter.track(saturated=True))
+        future.set_exception(RuntimeError("boom"))
+
+        # A failed fragment at the minimum limit keeps the limit at the minimum
+        assert limiter.limit == 1
+        assert "" in limiter.shape_baselines
+
+    def test_latency_normalized_per_shape(self):
+        limiter = AdaptiveConcurrencyLimit(1, 10, initial_limit=4)
+
+        for shape, latency in [("cheap", 0.1), ("cheap", 0.1), ("expensive", 5.0), ("expensive", 5.0)]:
+            limiter.record(latency, True, saturated=True, shape=shape)
+        assert limiter.limit == 5
+
+        # A window dominated by expensive fragments at their usual latency is not overload
+        for shape, latency in [("cheap", 0.1), ("expensive", 5.0), ("expensive", 5.0), ("expensive", 5.0), ("expensive", 5.0)]:
+            limiter.record(latency, True, saturated=True, shape=shape)
+        assert limiter.limit == 6
+
+        # Cheap fragments becoming slower is
+        for _ in range(6):
+            limiter.record(0.5, True, saturated=True, shape="cheap")
+        assert limiter.limit == 4
+
+    def test_status_shows_limit(self, caplog):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+        from partitioncache.cli.monitor_cache_queue import print_enhanced_status
+
+        with patch.object(mcq_module, "concurrency_limit", AdaptiveConcurrencyLimit(1, 8, initial_limit=3)):
+            with caplog.at_level(logging.INFO, logger="PartitionCache"):
+                print_enhanced_status(2, {"original_query_queue": 0, "query_fragment_queue": 5})
+
+        assert "Concurrency limit: 3/8" in caplog.text
+
+
+class TestCostAwareScheduling:
+    """Test the fragment cost model and cost-aware scheduling."""
+
+    def test_fragment_shape_ignores_literals(self):
+        shape = FragmentCostModel.fragment_shape
+        assert shape("SELECT t1.pk FROM t AS t1 WHERE t1.a = 5 AND t1.b = 'x'") == shape("SELECT t1.pk FROM t AS t1 WHERE t1.a = 17  AND t1.b = 'it''s'")
+        assert shape("SELECT t1.pk FROM t AS t1 WHERE t1.a = 5") != shape("SELECT t1.pk FROM t AS t1 WHERE t1.c = 5")
+
+    def test_predict_from_shape_and_explain_cost(self):
+        model = FragmentCostModel(smoothing=0.5)
+        model.record("SELECT pk FROM t WHERE a = 1", 2.0, explain_cost=100.0)
+        model.record("SELECT pk FROM t WHERE a = 2", 4.0)
+
+        assert model.predict("SELECT pk FROM t WHERE a = 3") == 3.0
+        assert model.predict("SELECT pk FROM u WHERE b = 1") is None
+        assert model.predict("SELECT pk FROM u WHERE b = 1", explain_cost=50.0) == 1.0
+
+    def test_load_timed_out_fragments_from_log(self, tmp_path):
+        log_file = tmp_path / "query_times.csv"
+        log_file.write_text("hash1,0.500000\nhash2_timeout,30.000000\nhash3_cache_hit,0.000000\n")
+
+        model = FragmentCostModel()
+        assert model.load_query_time_log(str(log_file)) == 1
+        assert model.timed_out_hashes == {"hash2"}
+        assert model.load_query_time_log(str(tmp_path / "missing.csv")) == 1
+
+    def test_take_cheapest_first(self):
+        model = FragmentCostModel()
+        model.record("SELECT pk FROM expensive WHERE a = 1", 20.0)
+        model.record("SELECT pk FROM cheap WHERE a = 1", 0.1)
+        scheduler = CostAwareFragmentScheduler(model, lookahead=3)
+
+        assert scheduler.pop_count(2) == 6
+        scheduler.add(
+            [
+                ("SELECT pk FROM expensive WHERE a = 2", "h1", "pk", "integer"),
+                ("SELECT pk FROM cheap WHERE a = 2", "h2", "pk", "integer"),
+                ("SELECT pk FROM unknown WHERE a = 2", "h3", "pk", "integer"),
+            ]
+        )
+        assert scheduler.pop_count(2) == 3
+
+        taken = [fragment[1] for fragment, _ in scheduler.take(2)]
+        assert taken == ["h3", "h2"]
+        assert scheduler.drain() == [("SELECT pk FROM expensive WHERE a = 2", "h1", "pk", "integer")]
+
+    def test_explain_cost_only_for_unknown_shapes(self):
+        model = FragmentCostModel()
+        model.record("SELECT pk FROM known WHERE a = 1", 1.0)
+        explain = Mock(return_value=10.0)
+        scheduler = CostAwareFragmentScheduler(model, explain_cost=explain)
+
+        scheduler.add([("SELECT pk FROM known WHERE a = 2", "h1", "pk", "integer"), ("SELECT pk FROM new WHERE a = 2", "h2", "pk", "integer")])
+
+        # Costs are estimated in the background and used once available
+        scheduler.pending[1][1].result(timeout=5)
+        explain.assert_called_once_with("SELECT pk FROM new WHERE a = 2")
+        assert {fragment[1]: cost for fragment, cost in scheduler.take(2)} == {"h1": None, "h2": 10.0}
+        scheduler.drain()
+
+    def test_pending_explain_cost_does_not_block_take(self):
+        model = FragmentCostModel()
+        estimated = threading.Event()
+        scheduler = CostAwareFragmentScheduler(model, explain_cost=lambda query: estimated.wait(5) and 10.0)
+
+        scheduler.add([("SELECT pk FROM new WHERE a = 2", "h1", "pk", "integer")])
+
+        assert scheduler.take(1) == [(("SELECT pk FROM new WHERE a = 2", "h1", "pk", "integer"), None)]
+        estimated.set()
+        scheduler.drain()
+
+    def test_known_timeout(self):
+        model = FragmentCostModel()
+        model.record("SELECT pk FROM slow WHERE a = 1", 45.0)
+        model.timed_out_hashes.add("timed_out_hash")
+
+        scheduler = CostAwareFragmentScheduler(model, timeout=30.0)
+        assert scheduler.known_timeout("timed_out_hash")
+        assert not scheduler.known_timeout("h1")
+        assert not CostAwareFragmentScheduler(model, timeout=0).known_timeout("timed_out_hash")
+
+    def test_defers_predicted_timeouts_and_probes(self):
+        model = FragmentCostModel()
+        model.record("SELECT pk FROM slow WHERE a = 1", 45.0)
+
+        scheduler = CostAwareFragmentScheduler(model, timeout=30.0, probe_after=3)
+        assert [scheduler.defers("SELECT pk FROM slow WHERE a = 2") for _ in range(4)] == [True, True, True, False]
+        assert scheduler.defers("SELECT pk FROM slow WHERE a = 3")
+        assert not scheduler.defers("SELECT pk FROM other WHERE a = 2")
+        assert not CostAwareFragmentScheduler(model, timeout=0).defers("SELECT pk FROM slow WHERE a = 2")
+
+    def test_defers_predicted_timeouts_until_probe_interval(self):
+        model = FragmentCostModel()
+        model.record("SELECT pk FROM slow WHERE a = 1", 45.0)
+
+        scheduler = CostAwareFragmentScheduler(model, timeout=30.0, probe_interval=60.0)
+        with patch("partitioncache.cli.monitor_cache_queue.time.monotonic", side_effect=[0.0, 30.0, 61.0]):
+            assert scheduler.defers("SELECT pk FROM slow WHERE a = 2")
+            assert scheduler.defers("SELECT pk FROM slow WHERE a = 2")
+            assert not scheduler.defers("SELECT pk FROM slow WHERE a = 2")
+
+        # A faster probe refreshes the prediction of the shape
+        model.record("SELECT pk FROM slow WHERE a = 2", 1.0)
+        model.record("SELECT pk FROM slow WHERE a = 2", 1.0)
+        assert not scheduler.defers("SELECT pk FROM slow WHERE a = 3")
+
+    def test_executor_marks_known_timeouts_and_defers_predicted(self, mock_args, mock_env):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+
+        mock_args.cost_aware_scheduling = True
+        mock_args.scheduling_lookahead = 3
+        mock_args.explain_cost_estimates = False
+        mock_args.long_running_query_timeout = "30"
+        mock_args.log_query_times = None
+        mock_args.max_processes = 1
+        mock_args.cache_backend = "redis_set"
+
+        fragments = [
+            ("SELECT 1", "timed_out_hash", "pk", "integer"),
+            ("SELECT 2", "hash2", "pk", "integer"),
+            ("SELECT pk FROM slow WHERE a = 2", "slow_hash", "pk", "integer"),
+        ]
+        call_count = [0]
+
+        def exit_after_first_batch():
+            call_count[0] += 1
+            return call_count[0] > 8
+
+        submitted = []
+        pool = Mock()
+        pool.submit.side_effect = lambda func, query, hash_value, *rest: submitted.append(hash_value) or Mock(done=Mock(return_value=True))
+        pool_cls = Mock()
+        pool_cls.return_value.__enter__ = Mock(return_value=pool)
+        pool_cls.return_value.__exit__ = Mock(return_value=False)
+
+        original_init = FragmentCostModel.__init__
+
+        def init_with_timeout(self, *a, **kw):
+            original_init(self, *a, **kw)
+            self.timed_out_hashes.add("timed_out_hash")
+            self.shape_times[self.fragment_shape("SELECT pk FROM slow WHERE a = 1")] = 45.0
+
+        with (
+            patch.object(mcq_module, "exit_event") as mock_exit_event,
+            patch.object(mcq_module, "pop_many_from_query_fragment_queue", side_effect=[fragments, [("SELECT 3", "hash3", "pk", "integer")]] + [[]] * 10),
+            patch.object(mcq_module, "pop_from_query_fragment_queue_blocking", return_value=None),
+            patch.object(mcq_module, "get_cache_handler") as mock_get_cache,
+            patch.object(mcq_module, "get_queue_lengths", return_value={"original_query_queue": 0, "query_fragment_queue": 0}),
+            patch.object(mcq_module, "push_to_query_fragment_queue", return_value=True) as mock_push,
+            patch.object(mcq_module.FragmentCostModel, "__init__", init_with_timeout),
+            patch.object(mcq_module.concurrent.futures, "ThreadPoolExecutor", pool_cls),
+            patch.object(mcq_module.time, "sleep"),
+        ):
+            mock_exit_event.is_set.side_effect = exit_after_first_batch
+            mock_cache = mock_get_cache.return_value
+            mock_cache.exists.return_value = False
+            mcq_module.args = mock_args
+            try:
+                fragment_executor()
+            finally:
+                del mcq_module.args
+                mcq_module.active_futures.clear()
+                mcq_module.in_flight_fragments.clear()
+                mcq_module.fragment_scheduler = None
+                deferred = mcq_module.deferred_predicted_timeouts
+                mcq_module.deferred_predicted_timeouts = 0
+
+        assert submitted == ["hash2", "hash3"]
+        # Only the known timed out fragment gets a status, the predicted one is pushed back to the queue
+        mock_cache.set_query_status.assert_called_once_with("timed_out_hash", "pk", "timeout")
+        assert deferred == 1
+        mock_push.assert_called_once_with([("SELECT pk FROM slow WHERE a = 2", "slow_hash")], "pk", "integer")
+
+    def test_executor_waits_when_only_deferred_fragments_are_queued(self, mock_args, mock_env):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+
+        mock_args.cost_aware_scheduling = True
+        mock_args.scheduling_lookahead = 1
+        mock_args.explain_cost_estimates = False
+        mock_args.long_running_query_timeout = "30"
+        mock_args.log_query_times = None
+        mock_args.max_processes = 2
+        mock_args.cache_backend = "redis_set"
+        call_count = [0]
+
+        def exit_after_iterations():
+            call_count[0] += 1
+            return call_count[0] > 4
+
+        pool = Mock()
+        pool_cls = Mock()
+        pool_cls.return_value.__enter__ = Mock(return_value=pool)
+        pool_cls.return_value.__exit__ = Mock(return_value=False)
+
+        original_init = FragmentCostModel.__init__
+
+        def init_with_slow_shape(self, *a, **kw):
+            original_init(self, *a, **kw)
+            self.shape_times[self.fragment_shape("SELECT pk FROM slow WHERE a = 1")] = 45.0
+
+        def pop_deferred_fragment(n):
+            # The deferred fragment pushed back to the queue is popped again on the next attempt
+            if mock_pop.call_count > 20:
+                return []
+            return [("SELECT pk FROM slow WHERE a = 2", "slow_hash", "pk", "integer")]
+
+        with (
+            patch.object(mcq_module, "exit_event") as mock_exit_event,
+            patch.object(mcq_module, "pop_many_from_query_fragment_queue", side_effect=pop_deferred_fragment) as mock_pop,
+            patch.object(mcq_module, "get_cache_handler") as mock_get_cache,
+            patch.object(mcq_module, "get_queue_lengths", return_value={"original_query_queue": 0, "query_fragment_queue": 1}),
+            patch.object(mcq_module, "push_to_query_fragment_queue", return_value=True) as mock_push,
+            patch.object(mcq_module.FragmentCostModel, "__init__", init_with_slow_shape),
+            patch.object(mcq_module.concurrent.futures, "ThreadPoolExecutor", pool_cls),
+            patch.object(mcq_module.time, "sleep"),
+        ):
+            mock_exit_event.is_set.side_effect = exit_after_iterations
+            mock_get_cache.return_value.exists.return_value = False
+            mcq_module.args = mock_args
+            try:
+                fragment_executor()
+            finally:
+                del mcq_module.args
+                mcq_module.active_futures.clear()
+                mcq_module.in_flight_fragments.clear()
+                mcq_module.fragment_scheduler = None
+                mcq_module.deferred_predicted_timeouts = 0
+
+        # Every pop of only deferred fragments is followed by a wait instead of popping them again right away
+        pool.submit.assert_not_called()
+        assert 0 < mock_pop.call_count <= 4
+        assert mock_push.call_count == mock_pop.call_count
+        assert mock_exit_event.wait.call_count == mock_pop.call_count
+        mock_exit_event.wait.assert_called_with(1.0)
+
+
+class TestWorkerRegistry:
+    """Test the worker registry and partition key affinity of the monitor."""
+
+    def test_heartbeat_loop_tracks_workers_and_unregisters(self):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+
+        with (
+            patch.object(mcq_module, "heartbeat_worker", side_effect=[["a", mcq_module.worker_id], [], ["a", "b", mcq_module.worker_id]]) as mock_heartbeat,
+            patch.object(mcq_module, "unregister_worker") as mock_unregister,
+            patch.object(mcq_module, "exit_event") as mock_exit_event,
+            patch.object(mcq_module, "active_workers", []),
+        ):
+            seen = []
+            mock_exit_event.wait.side_effect = lambda interval: seen.append(list(mcq_module.active_workers)) or len(seen) >= 3
+            mcq_module.worker_heartbeat_loop(5.0)
+
+            assert seen == [["a", mcq_module.worker_id], ["a", mcq_module.worker_id], ["a", "b", mcq_module.worker_id]]
+            mock_heartbeat.assert_called_with(mcq_module.worker_id, ttl=15.0)
+            mock_unregister.assert_called_once_with(mcq_module.worker_id)
+
+    def test_executor_pops_with_affinity(self, mock_args, mock_env):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+
+        mock_args.partition_key_affinity = True
+        mock_args.cache_backend = "redis_set"
+        mock_args.max_processes = 2
+        call_count = [0]
+
+        def exit_after_first_batch():
+            call_count[0] += 1
+            return call_count[0] > 2
+
+        workers = ["other:1", mcq_module.worker_id]
+        with (
+            patch.object(mcq_module, "exit_event") as mock_exit_event,
+            patch.object(mcq_module, "active_workers", workers),
+            patch.object(mcq_module, "pop_many_from_query_fragment_queue", return_value=[]) as mock_pop,
+            patch.object(mcq_module, "pop_from_query_fragment_queue_blocking") as mock_blocking_pop,
+            patch.object(mcq_module, "get_cache_handler"),
+            patch.object(mcq_module, "get_queue_lengths", return_value={"original_query_queue": 0, "query_fragment_queue": 3}),
+            patch.object(mcq_module.time, "sleep"),
+        ):
+            mock_exit_event.is_set.side_effect = exit_after_first_batch
+            mcq_module.args = mock_args
+            try:
+                fragment_executor()
+            finally:
+                del mcq_module.args
+
+        mock_pop.assert_called_once_with(2, worker_id=mcq_module.worker_id, active_workers=workers)
+        mock_blocking_pop.assert_not_called()
+
+
+class TestAcceleratedLazyPopulation:
+    """Test that DuckDB acceleration is used for fragments that would otherwise be lazily inserted."""
+
+    def _run(self, mock_args, partition_datatype):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+
+        mock_args.enable_duckdb_acceleration = True
+        mock_args.db_backend = "postgresql"
+        mock_args.long_running_query_timeout = "0"
+        mock_args.disable_lazy_insertion = False
+        accelerator = Mock()
+        accelerator.execute_query.return_value = {1, 2}
+        cache_handler = Mock(spec=mcq_module.AbstractCacheHandler_Lazy)
+        cache_handler.set_entry_lazy.return_value = True
+        cache_handler.set_cache.return_value = True
+        cache_handler.set_query.return_value = True
+        cache_handler.accepts_integer_arrays = True
+
+        with (
+            patch.object(mcq_module, "query_accelerator", accelerator),
+            patch.object(mcq_module, "get_cache_handler", return_value=cache_handler),
+            patch.object(mcq_module, "get_db_handler") as mock_get_db,
+        ):
+            mcq_module.args = mock_args
+            try:
+                result = run_and_store_query("SELECT t1.pk FROM t AS t1", "hash1", "pk", partition_datatype)
+            finally:
+                del mcq_module.args
+        return result, accelerator, cache_handler, mock_get_db
+
+    def test_accelerator_replaces_lazy_insertion(self, mock_args, mock_env):
+        result, accelerator, cache_handler, mock_get_db = self._run(mock_args, "integer")
+
+        assert result is True
+        # The PostgreSQL fallback runs on the database handler of the worker thread
+        mock_get_db.assert_called_once()
+        accelerator.execute_query.assert_called_once_with(
+            "SELECT t1.pk FROM t AS t1", columnar=True, limit=mock_args.limit, fallback_handler=mock_get_db.return_value
+        )
+        cache_handler.set_entry_lazy.assert_not_called()
+        cache_handler.set_cache.assert_called_once_with("hash1", {1, 2}, "pk")
+
+    def test_spatial_fragments_stay_lazy(self, mock_args, mock_env):
+        result, accelerator, cache_handler, _ = self._run(mock_args, "geometry")
+
+        assert result is True
+        accelerator.execute_query.assert_not_called()
+        cache_handler.set_entry_lazy.assert_called_once()
+
+
+class TestAnalyzePreloadColumns:
+    def test_collects_columns_of_recorded_fragments(self):
+        cache_handler = Mock()
+        cache_handler.get_partition_keys.return_value = [("trip_id", "integer"), ("zone", "text")]
+        cache_handler.get_all_queries.side_effect = lambda partition_key: {
+            "trip_id": [("h1", "SELECT t1.trip_id FROM trips AS t1 WHERE t1.duration > 10"), ("h2", "not sql (")],
+            "zone": [("h3", "SELECT t1.zone FROM trips AS t1, stops AS t2 WHERE t1.stop = t2.id")],
+        }[partition_key]
+
+        columns, sort_columns = analyze_preload_columns(cache_handler, ["trips", "other"])
+
+        assert columns == {"trips": {"trip_id", "duration", "zone", "stop"}}
+        assert sort_columns == ["trip_id", "zone"]
+
+    def test_error_preloads_all_columns(self):
+        cache_handler = Mock()
+        cache_handler.get_partition_keys.side_effect = Exception("connection lost")
+
+        assert analyze_preload_columns(cache_handler, ["trips"]) == ({}, [])
+
+
+class TestCacheConnectionPool:
+    def test_pool_raised_to_concurrency(self, monkeypatch):
+        monkeypatch.delenv("PG_CACHE_POOL_MAX_SIZE", raising=False)
+        size_cache_connection_pool(12)
+        assert os.environ["PG_CACHE_POOL_MAX_SIZE"] == "14"
+
+    def test_larger_pool_kept(self, monkeypatch):
+        monkeypatch.setenv("PG_CACHE_POOL_MAX_SIZE", "32")
+        size_cache_connection_pool(12)
+        assert os.environ["PG_CACHE_POOL_MAX_SIZE"] == "32"
+
+
+class TestStreamedResults:
+    def test_collection_stops_at_limit(self):
+        consumed = []
+
+        def values():
+            for value in range(1000):
+                consumed.append(value)
+                yield value
+
+        result, limit_reached = collect_partition_keys(values(), 25, chunk_size=10)
+
+        assert limit_reached is True
+        assert len(result) == 30
+        assert len(consumed) == 30
+
+    def test_iterator_closed_at_limit(self):
+        closed = []
+
+        def values():
+            try:
+                yield from range(1000)
+            finally:
+                closed.append(True)
+
+        result, limit_reached = collect_partition_keys(values(), 5, chunk_size=10)
+
+        assert limit_reached is True
+        assert closed == [True]
+
+    def test_collection_without_limit(self):
+        result, limit_reached = collect_partition_keys(iter([3, 1, 3, 2]), None, use_bitmap=True, chunk_size=2)
+
+        assert limit_reached is False
+        assert result == BitMap([1, 2, 3])
+
+    def test_duplicates_do_not_count_towards_limit(self):
+        result, limit_reached = collect_partition_keys([1, 1, 1, 2], 3)
+
+        assert limit_reached is False
+        assert result == {1, 2}
+
+    @patch("partitioncache.cli.monitor_cache_queue.get_cache_handler")
+    @patch("partitioncache.cli.monitor_cache_queue.get_db_handler")
+    def test_integer_keys_stored_as_bitmap(self, mock_get_db, mock_get_cache, mock_args, mock_env):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+
+        mock_cache = Mock(spec=["set_cache", "set_query", "set_query_status", "register_partition_key", "accepts_integer_arrays"])
+        mock_cache.accepts_integer_arrays = True
+        mock_get_cache.return_value = mock_cache
+        mock_get_db.return_value.supports_execute_array = False
+        mock_get_db.return_value.execute_iter.return_value = iter([5, 3, 5])
+
+        mcq_module.args = mock_args
+        try:
+            assert run_and_store_query("SELECT * FROM test", "hash1", "pk", "integer") is True
+        finally:
+            del mcq_module.args
+
+        stored = mock_cache.set_cache.call_args.args[1]
+        assert isinstance(stored, BitMap)
+        assert stored == BitMap([3, 5])
+
+    @patch("partitioncache.cli.monitor_cache_queue.get_cache_handler")
+    @patch("partitioncache.cli.monitor_cache_queue.get_db_handler")
+    def test_integer_keys_fetched_as_array_without_limit(self, mock_get_db, mock_get_cache, mock_args, mock_env):
+        import partitioncache.cli.monitor_cache_queue as mcq_module
+
+        mock_cache = Mock(spec=["set_cache", "set_query", "set_query_status", "register_partition_key", "accepts_integer_arrays"])
+        mock_cache.accepts_integer_arrays = True
+        mock_get_cache.return_value = mock_cache
+        mock_db = mock_get_db.return_value
+        mock_db.supports_execute_array = True
+        mock_db.execute_array.return_value = [3, 5]
+        mock_args.db_backend = "postgresql"
+
+        mcq_module.args = mock_args
+        try:
+            assert run_and_store_query("SELECT * FROM test", "hash1", "pk", "integer") is True
+        finally:
+            del mcq_module.args
+
+        mock_db.execute_array.assert_called_once_with("SELECT * FROM test", "integer", unique=True)
+        mock_db.execute_iter.assert_not_called()
+        assert mock_get_db.call_args.kwargs["itersize"] == 10000
+        mock_cache.set_cache.assert_called_once_with("hash1", [3, 5], "pk")
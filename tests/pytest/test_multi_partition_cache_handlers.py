@@ -96,7 +96,7 @@ class TestMultiPartitionFunctionality:
             handler.db = mock_db
 
             # Test bitsize management - now set the return value for actual test
-            mock_cursor.fetchone.return_value = (1000,)  # Mock existing bitsize
+            mock_cursor.fetchone.return_value = ("integer", 1000)  # Mock existing metadata row (datatype, bitsize)
             assert handler._get_partition_bitsize("partition1") == 1000
             handler._set_partition_bitsize("partition1", 2000)
 
@@ -1,8 +1,10 @@
-from unittest.mock import Mock, patch
+import threading
+from unittest.mock import MagicMock, Mock, patch
 
 import psycopg
 import pytest
 
+from partitioncache.cache_handler import postgresql_abstract
 from partitioncache.cache_handler.postgresql_array import PostgreSQLArrayCacheHandler
 
 
@@ -327,6 +329,21 @@ def test_get_very_large_set(cache_handler):
     assert result == large_set
 
 
+def test_filter_existing_keys_check_query_single_statement(cache_handler):
+    cache_handler.cursor.fetchone.side_effect = [("integer",)]
+    cache_handler.cursor.fetchall.return_value = [("key1",), ("key2",)]
+    cache_handler.cursor.execute.reset_mock()
+
+    assert cache_handler.filter_existing_keys({"key1", "key2", "key3"}, check_query=True) == {"key1", "key2"}
+
+    # One metadata lookup and one joined status/cache lookup for all keys
+    assert cache_handler.cursor.execute.call_count == 2
+    query, params = cache_handler.cursor.execute.call_args.args
+    assert "LEFT JOIN" in query.as_string(None)
+    assert params[0] == "partition_key"
+    assert set(params[1]) == {"key1", "key2", "key3"}
+
+
 def test_filter_existing_keys_all_exist(cache_handler):
     # Set up partition datatype and fetchall return value
     cache_handler.cursor.fetchone.side_effect = [("integer",)]
@@ -403,3 +420,257 @@ def test_unicode_key(cache_handler):
             found = True
             break
     assert found
+
+
+@pytest.fixture
+def pool_cls():
+    pool_cls = MagicMock()
+    with patch.object(postgresql_abstract, "ConnectionPool", pool_cls):
+        yield pool_cls
+    PostgreSQLArrayCacheHandler._instance = None
+    PostgreSQLArrayCacheHandler._instance_config = {}
+    PostgreSQLArrayCacheHandler._refcount = 0
+
+
+def test_operations_borrow_from_pool(pool_cls):
+    pool = pool_cls.return_value
+    cursor = pool.connection.return_value.__enter__.return_value.cursor.return_value
+    handler = PostgreSQLArrayCacheHandler("test_db", "localhost", "test_user", "test_password", 5432, "test_prefix", pool_min_size=2, pool_max_size=4)
+
+    assert pool_cls.call_args.kwargs["min_size"] == 2
+    assert pool_cls.call_args.kwargs["max_size"] == 4
+    # Connections are not checked with an extra round trip on every checkout
+    assert "check" not in pool_cls.call_args.kwargs
+    initial_checkouts = pool.connection.call_count
+
+    cursor.fetchone.return_value = ("SELECT 1",)
+    assert handler.get_query("hash1") == "SELECT 1"
+    # Nested lookups (datatype, cache table) run on the connection of the outer operation
+    cursor.fetchone.side_effect = [("integer",), (1,)]
+    assert handler.exists("hash1")
+    assert pool.connection.call_count == initial_checkouts + 2
+
+    # The connection is returned with the operation, so the handler holds none in between
+    with pytest.raises(RuntimeError):
+        handler.cursor.execute("SELECT 1")
+
+    handler.close()
+    pool.close.assert_called_once()
+
+
+class FakePoolConnection:
+    """
+    Connection following the psycopg protocol used by psycopg_pool: transaction status, commit and rollback,
+    and the connection context, which commits on success, rolls back on errors and closes unpooled connections.
+    """
+
+    instances: list["FakePoolConnection"] = []
+
+    def __init__(self):
+        self._pool = None
+        self.pgconn = Mock(transaction_status=psycopg.pq.TransactionStatus.IDLE)
+        self.closed = False
+        self.commits = 0
+        self.rollbacks = 0
+        self.threads: set[str] = set()
+        self.fetch_results: dict[str, tuple] = {}
+
+    @classmethod
+    def connect(cls, conninfo, **kwargs):
+        conn = cls()
+        cls.instances.append(conn)
+        return conn
+
+    def cursor(self):
+        cursor = Mock()
+
+        def execute(query, params=None, **kwargs):
+            self.threads.add(threading.current_thread().name)
+            self.pgconn.transaction_status = psycopg.pq.TransactionStatus.INTRANS
+            text = query.as_string(None) if hasattr(query, "as_string") else str(query)
+            cursor.fetchone.return_value = next((row for marker, row in self.fetch_results.items() if marker in text), None)
+
+        cursor.execute.side_effect = execute
+        cursor.fetchall.return_value = []
+        return cursor
+
+    def commit(self):
+        self.commits += 1
+        self.pgconn.transaction_status = psycopg.pq.TransactionStatus.IDLE
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.pgconn.transaction_status = psycopg.pq.TransactionStatus.IDLE
+
+    def close(self):
+        self.closed = True
+        self.pgconn.transaction_status = psycopg.pq.TransactionStatus.UNKNOWN
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        if self._pool is None:
+            self.close()
+
+
+@pytest.fixture
+def real_pool():
+    """Cache handlers use a real psycopg_pool.ConnectionPool of FakePoolConnection."""
+    import functools
+
+    from psycopg_pool import ConnectionPool
+
+    FakePoolConnection.instances = []
+    with patch.object(postgresql_abstract, "ConnectionPool", functools.partial(ConnectionPool, connection_class=FakePoolConnection)):
+        yield FakePoolConnection.instances
+
+
+def test_operations_on_real_pool(real_pool):
+    handler = PostgreSQLArrayCacheHandler("test_db", "localhost", "test_user", "test_password", 5432, "test_prefix", pool_min_size=1, pool_max_size=1)
+    conn = real_pool[0]
+    conn.fetch_results = {"SELECT query FROM": ("SELECT 1",), "SELECT datatype FROM": ("integer",), "SELECT 1 FROM": (1,)}
+    requests = handler._pool.get_stats()["requests_num"]
+
+    assert handler.get_query("hash1") == "SELECT 1"
+    # Nested lookups (datatype, cache table) run on the connection of the outer operation
+    assert handler.exists("hash1")
+    assert handler._pool.get_stats()["requests_num"] == requests + 2
+    # The pool ends the transaction of every returned connection
+    commits = conn.commits
+    assert handler.get_query("hash1") == "SELECT 1"
+    assert conn.commits == commits + 1
+    assert conn.pgconn.transaction_status == psycopg.pq.TransactionStatus.IDLE
+
+    # An operation raising rolls back its transaction and returns the connection
+    with pytest.raises(ValueError):
+        handler.register_partition_key("partition_key", "unsupported")
+    assert conn.rollbacks == 1
+    assert handler._pool.get_stats()["pool_available"] == 1
+
+    handler.close()
+    assert conn.closed
+
+
+def test_real_pool_shared_across_threads(real_pool):
+    handler = PostgreSQLArrayCacheHandler("test_db", "localhost", "test_user", "test_password", 5432, "test_prefix", pool_min_size=2, pool_max_size=2)
+    for conn in real_pool:
+        conn.fetch_results = {"SELECT query FROM": ("SELECT 1",)}
+    handler._pool.wait()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.extend(handler.get_query("hash1") for _ in range(20))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["SELECT 1"] * 120
+    assert len(real_pool) == 2
+    assert handler._pool.get_stats()["pool_available"] == 2
+    handler.close()
+
+
+def test_real_pool_timeout_returns_failure_value(real_pool):
+    handler = PostgreSQLArrayCacheHandler("test_db", "localhost", "test_user", "test_password", 5432, "test_prefix", pool_min_size=1, pool_max_size=1)
+    handler._pool.timeout = 0.1
+    results = []
+
+    # Another thread holds the only connection while the operation waits for one
+    with handler._checkout():
+        thread = threading.Thread(target=lambda: results.append(handler.set_query("hash1", "SELECT 1")))
+        thread.start()
+        thread.join()
+
+    assert results == [False]
+    assert handler.set_query("hash1", "SELECT 1") is True
+    handler.close()
+
+
+def test_pool_timeout_returns_failure_value(pool_cls):
+    from psycopg_pool import PoolTimeout
+
+    pool = pool_cls.return_value
+    handler = PostgreSQLArrayCacheHandler("test_db", "localhost", "test_user", "test_password", 5432, "test_prefix")
+    pool.connection.side_effect = PoolTimeout("couldn't get a connection after 30.00 sec")
+
+    assert handler.exists("hash1") is False
+    assert handler.set_query("hash1", "SELECT 1") is False
+    assert handler.get_query("hash1") is None
+    assert handler.filter_existing_keys({"hash1"}) == set()
+    assert handler.get_all_keys("partition_key") == []
+    assert handler.get_intersected({"hash1"}) == (None, 0)
+    assert handler.prune_old_queries() == 0
+    # Operations raising on failure keep raising
+    with pytest.raises(PoolTimeout):
+        handler.register_partition_key("partition_key", "integer")
+    handler.close()
+
+
+def test_instance_shared_across_threads(pool_cls):
+    pool = pool_cls.return_value
+    pool.connection.return_value.__enter__.return_value.cursor.return_value.fetchone.return_value = ("SELECT 1",)
+    config = {"db_name": "db", "db_host": "localhost", "db_user": "user", "db_password": "pw", "db_port": 5432, "db_tableprefix": "pc"}
+    handler = PostgreSQLArrayCacheHandler.get_instance(**config)
+
+    results = []
+
+    def worker():
+        instance = PostgreSQLArrayCacheHandler.get_instance(**config)
+        results.append((instance, instance.get_query("hash1")))
+        instance.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [(handler, "SELECT 1")] * 4
+    pool_cls.assert_called_once()
+    pool.close.assert_not_called()
+
+    handler.close()
+    pool.close.assert_called_once()
+
+
+def test_instance_requires_same_configuration(pool_cls):
+    config = {"db_name": "db", "db_host": "localhost", "db_user": "user", "db_password": "pw", "db_port": 5432, "db_tableprefix": "pc"}
+    handler = PostgreSQLArrayCacheHandler.get_instance(**config)
+
+    # The same configuration passed positionally or with explicit defaults shares the instance
+    assert PostgreSQLArrayCacheHandler.get_instance("db", "localhost", "user", "pw", 5432, "pc", timeout="0") is handler
+    with pytest.raises(ValueError, match="db_tableprefix"):
+        PostgreSQLArrayCacheHandler.get_instance(**{**config, "db_tableprefix": "other"})
+    assert PostgreSQLArrayCacheHandler._refcount == 2
+
+    handler.close()
+    handler.close()
+    # Once closed, the shared instance can be created with another configuration
+    other = PostgreSQLArrayCacheHandler.get_instance(**{**config, "db_tableprefix": "other"})
+    assert other is not handler
+    other.close()
+
+
+def test_connection_per_thread_without_pool():
+    main_db = Mock()
+    thread_db = Mock()
+    thread_db.cursor.return_value.fetchone.return_value = ("SELECT 1",)
+
+    with patch("psycopg.connect", side_effect=[main_db, thread_db]):
+        handler = PostgreSQLArrayCacheHandler("test_db", "localhost", "test_user", "test_password", 5432, "test_prefix")
+        results = []
+        thread = threading.Thread(target=lambda: results.append(handler.get_query("hash1")))
+        thread.start()
+        thread.join()
+
+    assert results == ["SELECT 1"]
+    main_db.cursor.return_value.execute.assert_called()
+
+    handler.close()
+    main_db.close.assert_called_once()
+    thread_db.close.assert_called_once()
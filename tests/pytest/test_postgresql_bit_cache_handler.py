@@ -1,3 +1,4 @@
+from array import array
 from unittest.mock import Mock, patch
 
 import pytest
@@ -82,7 +83,7 @@ def test_set_cache(cache_handler):
 
     with patch("partitioncache.cache_handler.postgresql_bit.bitarray", FakeBitArray):
         # Mock the new behavior: fetchone() should return a tuple with bitsize
-        cache_handler.cursor.fetchone.return_value = (100,)  # Return bitsize as tuple
+        cache_handler.cursor.fetchone.return_value = ("integer", 100)  # Return metadata row (datatype, bitsize)
         cache_handler.cursor.execute.reset_mock()
         cache_handler.db.commit.reset_mock()
         cache_handler.set_cache("key1", {1, 2, 3})
@@ -95,6 +96,15 @@ def test_set_cache(cache_handler):
         cache_handler.db.commit.assert_called()
 
 
+def test_set_cache_integer_array(cache_handler):
+    cache_handler.cursor.fetchone.return_value = ("integer", 100)
+    cache_handler.cursor.execute.reset_mock()
+    assert cache_handler.set_cache("key1", array("q", [1, 2, 3]))
+
+    insert_call = next(call for call in cache_handler.cursor.execute.call_args_list if "INSERT" in str(call) and "key1" in str(call))
+    assert insert_call.args[1] == ("key1", "0111" + "0" * 96)
+
+
 def test_set_query(cache_handler):
     test_query = "SELECT * FROM test_bit_cache_table_cache WHERE query_hash = %s"
     cache_handler.set_query("key1", test_query)
@@ -103,10 +113,26 @@ def test_set_query(cache_handler):
         "INSERT INTO {0} (query_hash, partition_key, query) VALUES (%s, %s, %s) ON CONFLICT (query_hash, partition_key) DO UPDATE SET query = EXCLUDED.query, last_seen = now()"
     ).format(sql.Identifier("test_bit_cache_table_queries"))
     expected_params = ("key1", "partition_key", test_query)
-    cache_handler.cursor.execute.assert_called_with(expected_sql, expected_params)
+    cache_handler.cursor.execute.assert_called_with(expected_sql, expected_params, prepare=True)
     cache_handler.db.commit.assert_called()
 
 
+def test_lookup_statements_composed_once(cache_handler):
+    cache_handler._get_partition_datatype = lambda pk: "integer"
+    cache_handler.cursor.fetchone.return_value = None
+    cache_handler.cursor.execute.reset_mock()
+
+    cache_handler.get("key1")
+    cache_handler.get("key2")
+    cache_handler.get("key3", "other_partition")
+
+    first, second, other = cache_handler.cursor.execute.call_args_list
+    assert first.args[0] is second.args[0]
+    assert other.args[0] is not first.args[0]
+    assert "test_bit_cache_table_cache_other_partition" in str(other.args[0])
+    assert all(call.kwargs == {"prepare": True} for call in (first, second, other))
+
+
 def test_set_cache_empty(cache_handler):
     cache_handler.cursor.execute.reset_mock()
     cache_handler.set_cache("empty_key", set())
@@ -240,3 +266,90 @@ def test_delete(cache_handler):
             break
     assert found
     cache_handler.db.commit.assert_called()
+
+
+def metadata_queries(cursor) -> int:
+    return sum("partition_metadata" in str(call.args[0]) and "SELECT" in str(call.args[0]) for call in cursor.execute.call_args_list)
+
+
+def test_partition_metadata_cached(cache_handler):
+    cache_handler.cursor.fetchone.return_value = ("integer", 100)
+    cache_handler.cursor.execute.reset_mock()
+
+    assert cache_handler.get_datatype("partition_key") == "integer"
+    assert cache_handler._get_partition_bitsize("partition_key") == 100
+    assert cache_handler._get_partition_datatype("partition_key") == "integer"
+    assert metadata_queries(cache_handler.cursor) == 1
+
+    # Changing the bitsize through the handler invalidates the cached row
+    cache_handler._set_partition_bitsize("partition_key", 200)
+    cache_handler.cursor.fetchone.return_value = ("integer", 200)
+    assert cache_handler._get_partition_bitsize("partition_key") == 200
+    assert metadata_queries(cache_handler.cursor) == 2
+
+
+def test_partition_metadata_expires(cache_handler):
+    cache_handler.cursor.fetchone.return_value = ("integer", 100)
+    cache_handler.cursor.execute.reset_mock()
+
+    with patch("partitioncache.cache_handler.postgresql_abstract.time.monotonic", side_effect=[0.0, 30.0, 61.0, 62.0]):
+        cache_handler._get_partition_bitsize("partition_key")
+        cache_handler._get_partition_bitsize("partition_key")
+        assert metadata_queries(cache_handler.cursor) == 1
+        cache_handler._get_partition_bitsize("partition_key")
+        assert metadata_queries(cache_handler.cursor) == 2
+
+
+def test_unknown_partition_not_cached(cache_handler):
+    cache_handler.cursor.fetchone.return_value = None
+    cache_handler.cursor.execute.reset_mock()
+
+    assert cache_handler.get("key1", "unknown") is None
+    assert cache_handler.get("key1", "unknown") is None
+    assert metadata_queries(cache_handler.cursor) == 2
+
+
+def test_partition_metadata_selects_bitsize(cache_handler):
+    cache_handler.cursor.fetchone.return_value = ("integer", 100)
+    cache_handler.cursor.execute.reset_mock()
+
+    assert cache_handler._get_partition_bitsize("partition_key") == 100
+    query = next(call.args[0] for call in cache_handler.cursor.execute.call_args_list if "partition_metadata" in str(call.args[0]))
+    assert "SELECT datatype, bitsize FROM" in str(query)
+
+
+def test_set_cache_retries_after_bitsize_changed_by_other_process(cache_handler):
+    cache_handler.cursor.fetchone.return_value = ("integer", 100)
+    assert cache_handler._get_partition_bitsize("partition_key") == 100
+
+    # Another process expands the partition to 200 bits, the cached metadata is stale
+    cache_handler.cursor.fetchone.return_value = ("integer", 200)
+    written = []
+
+    def execute(query, params=None, **kwargs):
+        if "INSERT" in str(query) and params is not None and len(params) == 2:
+            if len(params[1]) != 200:
+                raise Exception(f"bit string length {len(params[1])} does not match type bit(200)")
+            written.append(params)
+
+    cache_handler.cursor.execute.side_effect = execute
+    cache_handler.db.rollback.reset_mock()
+
+    assert cache_handler.set_cache("key1", {1, 2, 3}, "partition_key")
+    assert written == [("key1", "0111" + "0" * 196)]
+    cache_handler.db.rollback.assert_called_once()
+    assert cache_handler._get_partition_bitsize("partition_key") == 200
+
+
+def test_set_cache_gives_up_after_one_retry(cache_handler):
+    cache_handler.cursor.fetchone.return_value = ("integer", 100)
+
+    def execute(query, params=None, **kwargs):
+        if "INSERT" in str(query) and params is not None and len(params) == 2:
+            raise Exception("relation does not exist")
+
+    cache_handler.cursor.execute.side_effect = execute
+    cache_handler.db.rollback.reset_mock()
+
+    assert not cache_handler.set_cache("key1", {1, 2, 3}, "partition_key")
+    assert cache_handler.db.rollback.call_count == 2
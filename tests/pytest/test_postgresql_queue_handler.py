@@ -0,0 +1,273 @@
+"""
+Tests for connection handling of the PostgreSQL queue handler (connection pool and shared LISTEN connection).
+"""
+
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from partitioncache.queue_handler import postgresql as pg_queue
+from partitioncache.queue_handler.postgresql import PostgreSQLQueueHandler, _NotificationListener
+
+
+@pytest.fixture
+def handler():
+    with (
+        patch.object(PostgreSQLQueueHandler, "_initialize_tables"),
+        patch.object(PostgreSQLQueueHandler, "_deploy_non_blocking_functions"),
+    ):
+        queue_handler = PostgreSQLQueueHandler("localhost", 5432, "user", "password", "db", "test_queue", pool_min_size=2, pool_max_size=4)
+    yield queue_handler
+    queue_handler._listener = None
+    queue_handler.close()
+
+
+@pytest.fixture
+def idle_listener():
+    """Listener whose background thread does not connect to a database."""
+    with patch.object(_NotificationListener, "_run", lambda self: self._stopped.wait()):
+        listener = _NotificationListener.acquire("dbname=test_listener")
+        yield listener
+        while listener._refcount > 0:
+            _NotificationListener.release(listener)
+
+
+class TestConnectionPool:
+    def test_operations_borrow_from_pool(self, handler):
+        pool_cls = MagicMock()
+        pool = pool_cls.return_value
+        conn = pool.connection.return_value.__enter__.return_value
+        conn.cursor.return_value.fetchone.return_value = (3,)
+
+        with patch.object(pg_queue, "ConnectionPool", pool_cls):
+            assert handler.get_queue_lengths() == {"original_query_queue": 3, "query_fragment_queue": 3}
+            assert handler.get_queue_lengths() == {"original_query_queue": 3, "query_fragment_queue": 3}
+
+        pool_cls.assert_called_once()
+        assert pool_cls.call_args.kwargs["min_size"] == 2
+        assert pool_cls.call_args.kwargs["max_size"] == 4
+        assert pool.connection.call_count == 2
+
+        handler.close()
+        pool.close.assert_called_once()
+
+    def test_fresh_connection_without_pool(self, handler):
+        conn = MagicMock()
+        conn.closed = False
+        conn.cursor.return_value.fetchone.return_value = (1,)
+
+        with patch.object(pg_queue, "ConnectionPool", None), patch("psycopg.connect", return_value=conn) as connect:
+            assert handler.get_queue_lengths() == {"original_query_queue": 1, "query_fragment_queue": 1}
+
+        connect.assert_called_once()
+        conn.close.assert_called_once()
+
+
+class TestPopMany:
+    def test_pop_many_single_statement_ordered_by_priority(self, handler):
+        pool_cls = MagicMock()
+        conn = pool_cls.return_value.connection.return_value.__enter__.return_value
+        cursor = conn.cursor.return_value
+        cursor.fetchall.return_value = [
+            ("SELECT 2", "hash2", "pk", None, 1, datetime(2024, 1, 1, 12)),
+            ("SELECT 3", "hash3", "pk", "integer", 5, datetime(2024, 1, 1, 13)),
+            ("SELECT 1", "hash1", "pk", "integer", 1, datetime(2024, 1, 1, 11)),
+        ]
+
+        with patch.object(pg_queue, "ConnectionPool", pool_cls):
+            results = handler.pop_many_from_query_fragment_queue(3)
+
+        assert results == [
+            ("SELECT 3", "hash3", "pk", "integer"),
+            ("SELECT 1", "hash1", "pk", "integer"),
+            ("SELECT 2", "hash2", "pk", ""),
+        ]
+        cursor.execute.assert_called_once()
+        assert cursor.execute.call_args.args[1] == (3,)
+        conn.commit.assert_called_once()
+
+    def test_pop_single_uses_pop_many(self, handler):
+        with patch.object(handler, "_pop_many", return_value=[("SELECT 1", "pk", None)]) as pop_many:
+            assert handler.pop_from_original_query_queue() == ("SELECT 1", "pk", "")
+
+        assert pop_many.call_args.args[2] == 1
+
+    def test_pop_many_error_returns_empty(self, handler):
+        with patch.object(handler, "_pop_many", side_effect=Exception("connection lost")):
+            assert handler.pop_many_from_query_fragment_queue(5) == []
+            assert handler.pop_from_query_fragment_queue() is None
+
+    def test_pop_many_with_partition_key_affinity(self, handler):
+        pool_cls = MagicMock()
+        cursor = pool_cls.return_value.connection.return_value.__enter__.return_value.cursor.return_value
+        cursor.fetchall.return_value = []
+
+        with patch.object(pg_queue, "ConnectionPool", pool_cls):
+            handler.pop_many_from_query_fragment_queue(5, worker_id="host1:1", active_workers=["host1:1", "host2:1"])
+            assert cursor.execute.call_args.args[1] == (1000, ["host1:1", "host2:1"], "host1:1", 5)
+            assert "hashtextextended" in cursor.execute.call_args.args[0].as_string(None)
+
+            # The affinity filter is applied to the highest priority fragments only
+            handler.affinity_scan_limit = 2
+            handler.pop_many_from_query_fragment_queue(5, worker_id="host1:1", active_workers=["host1:1", "host2:1"])
+            assert cursor.execute.call_args.args[1] == (5, ["host1:1", "host2:1"], "host1:1", 5)
+            assert "AS candidates" in cursor.execute.call_args.args[0].as_string(None)
+
+            # A single active worker owns all partition keys
+            handler.pop_many_from_query_fragment_queue(5, worker_id="host1:1", active_workers=["host1:1"])
+            assert cursor.execute.call_args.args[1] == (5,)
+
+    def test_pop_many_zero(self, handler):
+        with patch.object(handler, "_pop_many") as pop_many:
+            assert handler.pop_many_from_original_query_queue(0) == []
+        pop_many.assert_not_called()
+
+
+class TestFragmentLeases:
+    def test_lease_holds_advisory_lock_until_released(self, handler):
+        conn = MagicMock()
+        conn.closed = False
+        conn.execute.return_value.fetchone.return_value = (True,)
+
+        with patch("psycopg.connect", return_value=conn):
+            assert handler.acquire_fragment_lease("hash1", "pk")
+            # A second lease on the same fragment from this handler is refused
+            assert handler.acquire_fragment_lease("hash1", "pk") is False
+
+        assert conn.execute.call_args.args[1] == ("test_queue:pk:hash1",)
+        handler.release_fragment_lease("hash1", "pk")
+        assert "pg_advisory_unlock" in conn.execute.call_args.args[0]
+        assert conn.execute.call_args.args[1] == ("test_queue:pk:hash1",)
+        # The lease connection stays open for further leases
+        conn.close.assert_not_called()
+
+    def test_leases_share_one_connection(self, handler):
+        conn = MagicMock()
+        conn.closed = False
+        conn.execute.return_value.fetchone.return_value = (True,)
+
+        with patch("psycopg.connect", return_value=conn) as connect:
+            assert handler.acquire_fragment_lease("hash1", "pk")
+            assert handler.acquire_fragment_lease("hash2", "pk")
+            handler.release_fragment_lease("hash1", "pk")
+            assert handler.acquire_fragment_lease("hash3", "pk")
+
+        connect.assert_called_once()
+        handler.close()
+        conn.close.assert_called_once()
+
+    def test_lease_held_by_other_session(self, handler):
+        conn = MagicMock()
+        conn.closed = False
+        conn.execute.return_value.fetchone.return_value = (False,)
+
+        with patch("psycopg.connect", return_value=conn):
+            assert handler.acquire_fragment_lease("hash1", "pk") is False
+        conn.close.assert_not_called()
+
+        # Releasing a lease that was not acquired does not unlock it
+        conn.execute.reset_mock()
+        handler.release_fragment_lease("hash1", "pk")
+        conn.execute.assert_not_called()
+
+    def test_lost_lease_connection_is_reopened(self, handler):
+        conn = MagicMock()
+        conn.closed = False
+        conn.execute.return_value.fetchone.return_value = (True,)
+        new_conn = MagicMock()
+        new_conn.closed = False
+        new_conn.execute.return_value.fetchone.return_value = (True,)
+
+        with patch("psycopg.connect", side_effect=[conn, new_conn]):
+            assert handler.acquire_fragment_lease("hash1", "pk")
+            conn.closed = True
+            # The advisory lock of hash1 was released with the lost session
+            assert handler.acquire_fragment_lease("hash1", "pk")
+
+        assert new_conn.execute.call_args.args[1] == ("test_queue:pk:hash1",)
+
+    def test_lease_connection_error_fails_open(self, handler):
+        with patch("psycopg.connect", side_effect=Exception("connection refused")):
+            assert handler.acquire_fragment_lease("hash1", "pk") is True
+
+
+class TestWorkerRegistry:
+    def test_heartbeat_registers_and_returns_workers(self, handler):
+        pool_cls = MagicMock()
+        conn = pool_cls.return_value.connection.return_value.__enter__.return_value
+        cursor = conn.cursor.return_value
+        cursor.fetchall.return_value = [("host1:1",), ("host2:1",)]
+
+        with patch.object(pg_queue, "ConnectionPool", pool_cls):
+            assert handler.heartbeat_worker("host1:1", 30) == ["host1:1", "host2:1"]
+            statements = [call.args[0].as_string(None) for call in cursor.execute.call_args_list]
+            assert "CREATE TABLE IF NOT EXISTS" in statements[0]
+            assert "expires_at < now()" in statements[1]
+            assert cursor.execute.call_args_list[2].args[1] == ("host1:1", 30)
+
+            # The worker table is only created once
+            handler.heartbeat_worker("host1:1", 30)
+            assert cursor.execute.call_count == 7
+        conn.commit.assert_called()
+
+    def test_heartbeat_error_returns_empty(self, handler):
+        with patch.object(handler, "_pooled_connection", side_effect=Exception("connection refused")):
+            assert handler.heartbeat_worker("host1:1", 30) == []
+
+    def test_unregister_worker(self, handler):
+        pool_cls = MagicMock()
+        conn = pool_cls.return_value.connection.return_value.__enter__.return_value
+
+        with patch.object(pg_queue, "ConnectionPool", pool_cls):
+            handler.unregister_worker("host1:1")
+
+        assert conn.execute.call_args.args[1] == ("host1:1",)
+        conn.commit.assert_called_once()
+
+
+class TestNotificationListener:
+    def test_acquire_shares_listener_per_conninfo(self, idle_listener):
+        with patch.object(_NotificationListener, "_run", lambda self: self._stopped.wait()):
+            assert _NotificationListener.acquire("dbname=test_listener") is idle_listener
+            assert idle_listener._refcount == 2
+            _NotificationListener.release(idle_listener)
+
+        assert idle_listener._refcount == 1
+        assert not idle_listener._stopped.is_set()
+
+    def test_wait_wakes_on_notification(self, idle_listener):
+        seq = idle_listener.sequence("query_fragment_available")
+        threading.Timer(0.05, idle_listener._wake, args=(("query_fragment_available",),)).start()
+
+        start = time.time()
+        assert idle_listener.wait("query_fragment_available", seq, 5.0) == seq + 1
+        assert time.time() - start < 2.0
+
+    def test_wait_ignores_other_channel(self, idle_listener):
+        seq = idle_listener.sequence("original_query_available")
+        idle_listener._wake(("query_fragment_available",))
+
+        assert idle_listener.wait("original_query_available", seq, 0.05) == seq
+
+
+class TestBlockingPop:
+    def test_blocking_pop_retries_after_notification(self, handler, idle_listener):
+        handler._listener = idle_listener
+        pop = Mock(side_effect=[None, ("SELECT 1", "pk", "integer")])
+        threading.Timer(0.05, idle_listener._wake, args=(("original_query_available",),)).start()
+
+        with patch.object(handler, "pop_from_original_query_queue", pop):
+            assert handler.pop_from_original_query_queue_blocking(timeout=5) == ("SELECT 1", "pk", "integer")
+
+        assert pop.call_count == 2
+
+    def test_blocking_pop_times_out(self, handler, idle_listener):
+        handler._listener = idle_listener
+
+        with patch.object(handler, "pop_from_query_fragment_queue", Mock(return_value=None)):
+            start = time.time()
+            assert handler.pop_from_query_fragment_queue_blocking(timeout=0.2) is None  # type: ignore[arg-type]
+            assert time.time() - start < 2.0
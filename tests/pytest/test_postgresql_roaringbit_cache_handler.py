@@ -1,3 +1,4 @@
+from array import array
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -124,6 +125,16 @@ class TestPostgreSQLRoaringBitCacheHandler:
 
         assert result is True
 
+    def test_set_cache_with_integer_array(self, cache_handler, mock_cursor):
+        """Test that integer arrays are sent as a serialized bitmap."""
+        mock_cursor.fetchone.return_value = ("integer",)
+
+        result = cache_handler.set_cache("test_key", array("q", [1, 2, 3, 10, 100]), "test_partition")
+
+        assert result is True
+        insert_call = next(call for call in mock_cursor.execute.call_args_list if "::bytea::roaringbitmap" in str(call[0][0]))
+        assert BitMap.deserialize(insert_call[0][1][1]) == BitMap([1, 2, 3, 10, 100])
+
     def test_set_cache_invalid_datatype(self, cache_handler, mock_cursor):
         """Test setting with invalid datatype raises error."""
         # Mock partition datatype exists
@@ -292,17 +303,29 @@ class TestPostgreSQLRoaringBitCacheHandler:
         # Reset call count to ignore __init__ calls
         mock_cursor.reset_mock()
 
-        cache_handler._ensure_partition_table("existing_partition", "integer")
+        assert cache_handler._ensure_partition_table("existing_partition", "integer")
 
-        # Should call SQL bootstrap functions
-        assert mock_cursor.execute.call_count >= 1
+        # A registered partition already has its table, only the metadata is read
+        assert mock_cursor.execute.call_count == 1
+        assert "partition_metadata" in mock_cursor.execute.call_args[0][0].as_string(None)
 
-        # Find the bootstrap function call
-        bootstrap_call_found = False
-        for call in mock_cursor.execute.call_args_list:
-            call_sql = str(call[0][0])
-            if "partitioncache_bootstrap_partition" in call_sql:
-                bootstrap_call_found = True
-                break
+    def test_set_cache_recreates_partition_dropped_by_other_process(self, cache_handler, mock_cursor):
+        """Test that a write to a partition dropped elsewhere bootstraps it again instead of trusting cached metadata."""
+        mock_cursor.fetchone.return_value = ("integer",)
+        assert cache_handler._get_partition_datatype("test_partition") == "integer"
+
+        # Another process deletes the partition, the cached metadata is stale
+        mock_cursor.fetchone.return_value = None
+        bootstrapped = []
+
+        def execute(query, params=None, **kwargs):
+            statement = query if isinstance(query, str) else query.as_string(None)
+            if "partitioncache_bootstrap_partition" in statement:
+                bootstrapped.append(params[1])
+            elif "test_roaringbit_cache_cache_test_partition" in statement and not bootstrapped:
+                raise Exception('relation "test_roaringbit_cache_cache_test_partition" does not exist')
+
+        mock_cursor.execute.side_effect = execute
 
-        assert bootstrap_call_found, "Should have called bootstrap function"
+        assert cache_handler.set_cache("test_key", {1, 2, 3}, "test_partition") is True
+        assert bootstrapped == ["test_partition"]
@@ -5,7 +5,7 @@ This test suite validates the DuckDB query acceleration functionality
 with mocked dependencies to avoid requiring actual database connections.
 """
 
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
@@ -397,16 +397,27 @@ class TestDuckDBQueryAccelerator:
         assert "queries_timeout" in stats
         assert stats["queries_timeout"] == 0
 
-    @patch("partitioncache.query_accelerator.threading.Thread")
     @patch("partitioncache.query_accelerator.duckdb")
     @patch("partitioncache.query_accelerator.psycopg")
-    def test_query_timeout_fallback(self, mock_psycopg, mock_duckdb, mock_thread_class):
+    def test_query_timeout_fallback(self, mock_psycopg, mock_duckdb):
         """Test query timeout triggers fallback to PostgreSQL."""
+        import threading
+
         from partitioncache.query_accelerator import DuckDBQueryAccelerator
 
-        # Mock DuckDB connection
+        # Mock DuckDB connection whose query cursor blocks until it is interrupted
         mock_duckdb_conn = Mock()
         mock_duckdb.connect.return_value = mock_duckdb_conn
+        interrupted = threading.Event()
+        mock_duckdb_cursor = Mock()
+        mock_duckdb_cursor.interrupt.side_effect = interrupted.set
+
+        def blocking_execute(query):
+            interrupted.wait(5)
+            raise RuntimeError("INTERRUPT Error: Interrupted!")
+
+        mock_duckdb_cursor.execute.side_effect = blocking_execute
+        mock_duckdb_conn.cursor.return_value = mock_duckdb_cursor
 
         # Mock PostgreSQL connection with successful result
         mock_pg_conn = Mock()
@@ -418,16 +429,11 @@ class TestDuckDBQueryAccelerator:
         mock_pg_conn.cursor.return_value = mock_cursor_context
         mock_pg_cursor.fetchall.return_value = [(7,), (8,), (9,)]
 
-        # Mock Thread to simulate timeout
-        mock_thread = Mock()
-        mock_thread.is_alive.return_value = True  # Simulate thread still running (timeout)
-        mock_thread_class.return_value = mock_thread
-
         postgresql_params = {"host": "localhost", "port": 5432, "user": "test", "password": "test", "dbname": "test"}
 
         accelerator = DuckDBQueryAccelerator(
             postgresql_connection_params=postgresql_params,
-            query_timeout=1.0,  # Short timeout
+            query_timeout=0.1,  # Short timeout
             enable_statistics=True,
         )
 
@@ -445,13 +451,46 @@ class TestDuckDBQueryAccelerator:
         assert stats["queries_fallback"] == 1
         assert stats["queries_accelerated"] == 0
 
-        # Verify DuckDB connection interrupt was attempted
-        mock_duckdb_conn.interrupt.assert_called_once()
+        # Only the cursor of the timed out query is interrupted, not the shared connection
+        mock_duckdb_cursor.interrupt.assert_called_once()
+        mock_duckdb_conn.interrupt.assert_not_called()
+        accelerator.close()
+
+    def test_timeout_does_not_interrupt_concurrent_queries(self):
+        """A timed out query is interrupted without cancelling queries of other workers."""
+        import concurrent.futures
+
+        import duckdb
 
-        # Verify thread was created and managed properly
-        mock_thread_class.assert_called_once()
-        mock_thread.start.assert_called_once()
-        mock_thread.join.assert_called()
+        from partitioncache.query_accelerator import DuckDBQueryAccelerator
+
+        accelerator = DuckDBQueryAccelerator(postgresql_connection_params={"host": "localhost"}, duckdb_database_path=":memory:", query_timeout=0.3)
+        accelerator.duckdb_conn = duckdb.connect(":memory:")
+        accelerator.duckdb_conn.execute("CREATE TABLE numbers AS SELECT range AS n FROM range(2000000)")
+        accelerator._initialized = True
+
+        slow_query = "SELECT SUM(a.range * b.range) FROM range(1000000) AS a, range(1000000) AS b"
+        fast_query = "SELECT COUNT(*) FROM numbers WHERE n % 7 = 0"
+        with concurrent.futures.ThreadPoolExecutor(2) as pool:
+            slow = pool.submit(accelerator._execute_with_timeout, slow_query)
+
+            def run_fast_queries():
+                # Keep fast queries running while the slow query times out and is interrupted
+                results = []
+                while not slow.done() or len(results) < 5:
+                    results.append(accelerator._execute_with_timeout(fast_query))
+                return results
+
+            fast = pool.submit(run_fast_queries)
+            with pytest.raises(concurrent.futures.TimeoutError):
+                slow.result()
+            results = fast.result()
+
+        assert results and all(result == {285715} for result in results)
+        # The executor threads are reused across queries
+        assert len(accelerator._query_executor._threads) <= accelerator.max_concurrent_queries
+        assert accelerator._execute_with_timeout("SELECT 1") == {1}
+        accelerator.close()
 
     @patch("partitioncache.query_accelerator.duckdb")
     @patch("partitioncache.query_accelerator.psycopg")
@@ -524,6 +563,424 @@ class TestDuckDBIntegrationHelpers:
         assert result is None
 
 
+@pytest.fixture
+def refresh_accelerator():
+    """Accelerator on a real DuckDB database with an in-memory DuckDB database attached in place of PostgreSQL."""
+    import duckdb
+
+    from partitioncache.query_accelerator import DuckDBQueryAccelerator
+
+    accelerator = DuckDBQueryAccelerator(
+        postgresql_connection_params={"host": "localhost"},
+        preload_tables=["orders", "events"],
+        duckdb_database_path=":memory:",
+        refresh_tables={"orders": ("updated_at", "order_id"), "events": ("event_id", None)},
+        refresh_interval=0.05,
+    )
+    accelerator.duckdb_conn = duckdb.connect(":memory:")
+    accelerator.duckdb_conn.execute("ATTACH ':memory:' AS postgres_db")
+    accelerator.duckdb_conn.execute("CREATE TABLE postgres_db.orders AS SELECT * FROM (VALUES (1, 10, 1), (2, 20, 1)) AS t(order_id, amount, updated_at)")
+    accelerator.duckdb_conn.execute("CREATE TABLE postgres_db.events AS SELECT * FROM (VALUES (1, 'a'), (2, 'b')) AS t(event_id, payload)")
+    accelerator.duckdb_conn.execute("CREATE TABLE orders AS SELECT * FROM postgres_db.orders")
+    accelerator.duckdb_conn.execute("CREATE TABLE events AS SELECT * FROM postgres_db.events")
+    accelerator._initialized = True
+    yield accelerator
+    accelerator.stop_refresh()
+    accelerator.duckdb_conn.close()
+
+
+class TestIncrementalRefresh:
+    """Test incremental refresh of preloaded tables."""
+
+    def test_parse_refresh_tables(self):
+        from partitioncache.query_accelerator import parse_refresh_tables
+
+        assert parse_refresh_tables("orders:updated_at:order_id, events:event_id") == {
+            "orders": ("updated_at", "order_id"),
+            "events": ("event_id", None),
+        }
+        with pytest.raises(ValueError):
+            parse_refresh_tables("orders")
+        with pytest.raises(ValueError):
+            parse_refresh_tables("orders:updated_at; DROP TABLE orders")
+
+    def test_refresh_replaces_keyed_rows_and_appends_new_rows(self, refresh_accelerator):
+        conn = refresh_accelerator.duckdb_conn
+        conn.execute("UPDATE postgres_db.orders SET amount = 25, updated_at = 2 WHERE order_id = 2")
+        conn.execute("INSERT INTO postgres_db.orders VALUES (3, 30, 2)")
+        conn.execute("INSERT INTO postgres_db.events VALUES (3, 'c')")
+
+        assert refresh_accelerator.refresh_tables() is True
+
+        assert conn.execute("SELECT * FROM orders ORDER BY order_id").fetchall() == [(1, 10, 1), (2, 25, 2), (3, 30, 2)]
+        assert conn.execute("SELECT * FROM events ORDER BY event_id").fetchall() == [(1, "a"), (2, "b"), (3, "c")]
+        stats = refresh_accelerator.get_statistics()
+        assert stats["refreshes"] == 1
+        assert stats["rows_refreshed"] == 4
+
+        # Rows at the watermark are pulled again for keyed tables but never duplicated
+        assert refresh_accelerator.refresh_table("orders") == 2
+        assert refresh_accelerator.refresh_table("events") == 0
+        assert conn.execute("SELECT COUNT(*) FROM orders").fetchone() == (3,)
+
+    def test_refresh_failure_keeps_table(self, refresh_accelerator):
+        refresh_accelerator.refresh_tables_config["orders"] = ("missing_column", "order_id")
+
+        assert refresh_accelerator.refresh_tables() is False
+        assert refresh_accelerator.duckdb_conn.execute("SELECT COUNT(*) FROM orders").fetchone() == (2,)
+
+    def test_background_refresh(self, refresh_accelerator):
+        import time
+
+        refresh_accelerator.duckdb_conn.execute("INSERT INTO postgres_db.events VALUES (3, 'c')")
+
+        assert refresh_accelerator.start_refresh() is True
+        deadline = time.time() + 5
+        while refresh_accelerator.get_statistics()["refreshes"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        refresh_accelerator.stop_refresh()
+
+        assert refresh_accelerator.duckdb_conn.execute("SELECT COUNT(*) FROM events").fetchone() == (3,)
+
+
+class TestPrunedPreload:
+    """Test column-pruned, sorted, and parallel preloading."""
+
+    @pytest.fixture
+    def accelerator(self):
+        import duckdb
+
+        from partitioncache.query_accelerator import DuckDBQueryAccelerator
+
+        accelerator = DuckDBQueryAccelerator(
+            postgresql_connection_params={"host": "localhost"},
+            preload_tables=["trips", "stops"],
+            duckdb_database_path=":memory:",
+            preload_columns={"trips": {"trip_id", "duration", "missing"}, "stops": {"*"}},
+            preload_sort_columns=["trip_id"],
+        )
+        accelerator.duckdb_conn = duckdb.connect(":memory:")
+        accelerator.duckdb_conn.execute("ATTACH ':memory:' AS postgres_db")
+        accelerator.duckdb_conn.execute(
+            "CREATE TABLE postgres_db.trips AS SELECT * FROM (VALUES (3, 30, 'c'), (1, 10, 'a'), (2, 20, 'b')) AS t(trip_id, duration, note)"
+        )
+        accelerator.duckdb_conn.execute("CREATE TABLE postgres_db.stops AS SELECT * FROM (VALUES (1, 'Main')) AS t(trip_id, name)")
+        accelerator._initialized = True
+        accelerator._table_exists_in_postgresql = Mock(return_value=True)
+        accelerator._postgresql_table_columns = Mock(side_effect=lambda table: {"trips": ["trip_id", "duration", "note"], "stops": ["trip_id", "name"]}[table])
+        yield accelerator
+        accelerator.duckdb_conn.close()
+
+    def test_preload_only_analyzed_columns_sorted_by_partition_key(self, accelerator):
+        assert accelerator._preload_table("trips") is True
+
+        conn = accelerator.duckdb_conn
+        assert [row[0] for row in conn.execute("DESCRIBE trips").fetchall()] == ["trip_id", "duration"]
+        assert conn.execute("SELECT * FROM trips").fetchall() == [(1, 10), (2, 20), (3, 30)]
+
+    def test_star_preloads_all_columns(self, accelerator):
+        assert accelerator._preload_table("stops") is True
+        assert [row[0] for row in accelerator.duckdb_conn.execute("DESCRIBE stops").fetchall()] == ["trip_id", "name"]
+
+    def test_refresh_columns_are_preloaded(self, accelerator):
+        accelerator.refresh_tables_config = {"trips": ("note", None)}
+
+        assert accelerator._preload_table("trips") is True
+        assert [row[0] for row in accelerator.duckdb_conn.execute("DESCRIBE trips").fetchall()] == ["trip_id", "duration", "note"]
+
+    @patch("partitioncache.query_accelerator.duckdb")
+    @patch("partitioncache.query_accelerator.psycopg")
+    def test_parallel_preload(self, mock_psycopg, mock_duckdb):
+        from partitioncache.query_accelerator import DuckDBQueryAccelerator
+
+        accelerator = DuckDBQueryAccelerator(
+            postgresql_connection_params={"host": "localhost"},
+            preload_tables=["t1", "t2", "t3"],
+            duckdb_database_path=":memory:",
+            preload_parallelism=3,
+        )
+        accelerator.initialize()
+        accelerator._attach_postgresql = Mock()
+        threads = set()
+
+        def preload_table(table_name):
+            import threading
+
+            threads.add(threading.current_thread().name)
+            return table_name != "t3"
+
+        accelerator._preload_table = Mock(side_effect=preload_table)
+
+        assert accelerator.preload_tables() is True
+        assert accelerator.stats["tables_preloaded"] == 2
+        assert all(name.startswith("duckdb-preload") for name in threads)
+
+
+class TestSnapshots:
+    """Test persistent snapshots of preloaded tables."""
+
+    @staticmethod
+    def make_accelerator(database_path=":memory:", **kwargs):
+        import duckdb
+
+        from partitioncache.query_accelerator import DuckDBQueryAccelerator
+
+        accelerator = DuckDBQueryAccelerator(
+            postgresql_connection_params={"host": "localhost"}, preload_tables=["trips"], duckdb_database_path=database_path, **kwargs
+        )
+        accelerator.duckdb_conn = duckdb.connect(database_path)
+        accelerator.duckdb_conn.execute("ATTACH ':memory:' AS postgres_db")
+        accelerator.duckdb_conn.execute("CREATE TABLE postgres_db.trips AS SELECT * FROM (VALUES (1, 10), (2, 20)) AS t(trip_id, duration)")
+        accelerator._initialized = True
+        accelerator._table_exists_in_postgresql = Mock(return_value=True)
+        accelerator._source_fingerprint = Mock(return_value="16384:2:0:0")
+        return accelerator
+
+    def test_parquet_snapshot_restored_without_postgresql(self, tmp_path):
+        accelerator = self.make_accelerator(snapshot_directory=str(tmp_path))
+        assert accelerator._preload_table("trips") is True
+        assert (tmp_path / "trips.parquet").exists()
+        accelerator.duckdb_conn.close()
+
+        restarted = self.make_accelerator(snapshot_directory=str(tmp_path))
+        restarted.duckdb_conn.execute("DELETE FROM postgres_db.trips")
+        assert restarted._preload_table("trips") is True
+        assert restarted.duckdb_conn.execute("SELECT * FROM trips ORDER BY trip_id").fetchall() == [(1, 10), (2, 20)]
+        assert restarted.stats["snapshots_restored"] == 1
+        restarted.duckdb_conn.close()
+
+    def test_stale_snapshot_reloaded(self, tmp_path):
+        accelerator = self.make_accelerator(snapshot_directory=str(tmp_path))
+        accelerator._preload_table("trips")
+        accelerator.duckdb_conn.close()
+
+        restarted = self.make_accelerator(snapshot_directory=str(tmp_path))
+        restarted.duckdb_conn.execute("INSERT INTO postgres_db.trips VALUES (3, 30)")
+        restarted._source_fingerprint.return_value = "16384:3:0:0"
+        assert restarted._preload_table("trips") is True
+        assert restarted.duckdb_conn.execute("SELECT COUNT(*) FROM trips").fetchone() == (3,)
+        assert restarted.stats["snapshots_restored"] == 0
+        restarted.duckdb_conn.close()
+
+    def test_stale_snapshot_of_refreshed_table_restored(self, tmp_path):
+        accelerator = self.make_accelerator(snapshot_directory=str(tmp_path))
+        accelerator._preload_table("trips")
+        accelerator.duckdb_conn.close()
+
+        restarted = self.make_accelerator(snapshot_directory=str(tmp_path), refresh_tables={"trips": ("trip_id", None)})
+        restarted._source_fingerprint.return_value = "16384:3:0:0"
+        assert restarted._preload_table("trips") is True
+        assert restarted.stats["snapshots_restored"] == 1
+        restarted.duckdb_conn.close()
+
+    def test_database_file_snapshot(self, tmp_path):
+        from partitioncache.query_accelerator import SNAPSHOT_TABLE
+
+        database_path = str(tmp_path / "accel.duckdb")
+        accelerator = self.make_accelerator(database_path)
+        accelerator.duckdb_conn.execute(f"CREATE TABLE {SNAPSHOT_TABLE} (table_name VARCHAR PRIMARY KEY, snapshot_tag VARCHAR, created_at TIMESTAMP)")
+        assert accelerator._preload_table("trips") is True
+        assert accelerator.stats["snapshots_restored"] == 0
+
+        # Unchanged source table is reused, a different column selection is reloaded
+        assert accelerator._preload_table("trips") is True
+        assert accelerator.stats["snapshots_restored"] == 1
+        accelerator.preload_columns = {"trips": {"trip_id"}}
+        accelerator._postgresql_table_columns = Mock(return_value=["trip_id", "duration"])
+        assert accelerator._preload_table("trips") is True
+        assert accelerator.stats["snapshots_restored"] == 1
+        assert [row[0] for row in accelerator.duckdb_conn.execute("DESCRIBE trips").fetchall()] == ["trip_id"]
+        accelerator.duckdb_conn.close()
+
+
+class TestTranspilation:
+    """Test PostgreSQL to DuckDB dialect translation and the query shape record."""
+
+    @pytest.fixture
+    def accelerator(self):
+        import duckdb
+
+        from partitioncache.query_accelerator import DuckDBQueryAccelerator
+
+        accelerator = DuckDBQueryAccelerator(postgresql_connection_params={"host": "localhost"}, duckdb_database_path=":memory:")
+        accelerator.duckdb_conn = duckdb.connect(":memory:")
+        accelerator.duckdb_conn.execute("CREATE TABLE trips AS SELECT range AS trip_id, TIMESTAMP '2024-01-01' + to_days(range::INT) AS start FROM range(5)")
+        accelerator._initialized = True
+        accelerator._execute_fallback = Mock(return_value={"fallback"})
+        yield accelerator
+        accelerator.duckdb_conn.close()
+
+    def test_rejected_query_retried_in_duckdb_dialect(self, accelerator):
+        from partitioncache.query_processor import query_shape
+
+        query = "SELECT t1.trip_id FROM trips AS t1 WHERE to_char(t1.start, 'DD') = '03'"
+
+        assert accelerator.execute_query(query) == {2}
+        assert accelerator._get_shape_mode(query_shape(query)) == "transpiled"
+
+        # Queries of the same shape run the translated variant directly
+        with patch.object(accelerator, "_execute_duckdb", wraps=accelerator._execute_duckdb) as execute:
+            assert accelerator.execute_query("SELECT t1.trip_id FROM trips AS t1 WHERE to_char(t1.start, 'DD') = '04'") == {3}
+        execute.assert_called_once()
+        assert "STRFTIME" in execute.call_args.args[0]
+        assert accelerator.stats["queries_transpiled"] == 2
+        accelerator._execute_fallback.assert_not_called()
+
+    def test_untranspilable_query_of_transpiled_shape_uses_fallback(self, accelerator):
+        query = "SELECT t1.trip_id FROM trips AS t1 WHERE to_char(t1.start, 'DD') = '03'"
+        assert accelerator.execute_query(query) == {2}
+
+        with patch.object(accelerator, "_transpile", return_value=None), patch.object(accelerator, "_execute_duckdb") as execute:
+            assert accelerator.execute_query("SELECT t1.trip_id FROM trips AS t1 WHERE to_char(t1.start, 'DD') = '04'") == {"fallback"}
+        execute.assert_not_called()
+        assert accelerator.stats["queries_fallback"] == 1
+
+    def test_failing_shape_goes_straight_to_fallback(self, accelerator):
+        assert accelerator.execute_query("SELECT t1.trip_id FROM trips AS t1 WHERE t1.trip_id::text ~* '1'") == {"fallback"}
+
+        with patch.object(accelerator, "_execute_duckdb") as execute:
+            assert accelerator.execute_query("SELECT t1.trip_id FROM trips AS t1 WHERE t1.trip_id::text ~* '2'") == {"fallback"}
+        execute.assert_not_called()
+        assert accelerator.stats["shapes_skipped"] == 1
+
+    def test_native_shape_keeps_record_on_failure(self, accelerator):
+        from partitioncache.query_processor import query_shape
+
+        query = "SELECT t1.trip_id FROM trips AS t1 WHERE t1.trip_id = 1"
+        assert accelerator.execute_query(query) == {1}
+
+        with patch.object(accelerator, "_execute_duckdb", side_effect=RuntimeError("Out of Memory")):
+            assert accelerator.execute_query(query) == {"fallback"}
+        assert accelerator._get_shape_mode(query_shape(query)) == "native"
+
+    def test_translation_reused_for_shape(self, accelerator):
+        import sqlglot
+
+        accelerator.transpile_cache_size = 1
+        query = "SELECT t1.trip_id FROM trips AS t1 WHERE t1.trip_id = 1 AND t1.name = 'a' ORDER BY 1"
+        assert accelerator._transpile(query) == sqlglot.transpile(query, read="postgres", write="duckdb")[0]
+
+        with patch.object(accelerator, "_transpile_sql") as transpile_sql:
+            assert accelerator._transpile("SELECT t1.trip_id FROM trips AS t1 WHERE t1.trip_id = 20 AND t1.name = 'it''s' ORDER BY 3") == (
+                "SELECT t1.trip_id FROM trips AS t1 WHERE t1.trip_id = 20 AND t1.name = 'it''s' ORDER BY 3"
+            )
+        transpile_sql.assert_not_called()
+        assert len(accelerator._transpiled_shapes) == 1
+
+    def test_literal_dependent_translation_not_reused(self, accelerator):
+        assert "'%d'" in accelerator._transpile("SELECT t1.trip_id FROM trips AS t1 WHERE to_char(t1.start, 'DD') = '03'")
+        assert "'%m'" in accelerator._transpile("SELECT t1.trip_id FROM trips AS t1 WHERE to_char(t1.start, 'MM') = '01'")
+        assert list(accelerator._transpiled_shapes.values()) == [None]
+
+    def test_failing_shape_retried_after_interval(self, accelerator):
+        from partitioncache.query_processor import query_shape
+
+        query = "SELECT t1.trip_id FROM trips AS t1 WHERE t1.trip_id = 1"
+        with patch.object(accelerator, "_execute_duckdb", side_effect=RuntimeError("Out of Memory")):
+            assert accelerator.execute_query(query) == {"fallback"}
+        assert accelerator.execute_query(query) == {"fallback"}
+        assert accelerator.stats["shapes_skipped"] == 1
+
+        accelerator.fallback_retry_interval = 0
+        assert accelerator.execute_query(query) == {1}
+        assert accelerator._get_shape_mode(query_shape(query)) == "native"
+
+    def test_shape_record_is_bounded(self, accelerator):
+        accelerator.transpile_cache_size = 2
+        for table_number in range(3):
+            accelerator._set_shape_mode(f"select {table_number}", "native")
+
+        assert list(accelerator._shape_modes) == ["select 1", "select 2"]
+
+
+
+class TestFallback:
+    """Test the PostgreSQL fallback of the accelerator."""
+
+    @pytest.fixture
+    def accelerator(self):
+        from partitioncache.query_accelerator import DuckDBQueryAccelerator
+
+        accelerator = DuckDBQueryAccelerator(postgresql_connection_params={"host": "localhost"}, duckdb_database_path=":memory:")
+        accelerator.postgresql_conn = MagicMock()
+        return accelerator
+
+    def test_shared_connection_rolled_back_after_error(self, accelerator):
+        import psycopg
+
+        cursor = accelerator.postgresql_conn.cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = psycopg.errors.QueryCanceled("canceling statement due to statement timeout")
+
+        with pytest.raises(psycopg.errors.QueryCanceled):
+            accelerator.execute_query("SELECT t1.trip_id FROM trips AS t1")
+        accelerator.postgresql_conn.rollback.assert_called_once()
+
+    def test_fallback_handler_streams_until_limit(self, accelerator):
+        consumed = []
+
+        def execute_iter(query):
+            try:
+                for value in range(100):
+                    consumed.append(value)
+                    yield value
+            finally:
+                consumed.append("closed")
+
+        handler = Mock()
+        handler.execute_iter.side_effect = execute_iter
+
+        assert accelerator.execute_query("SELECT t1.trip_id FROM trips AS t1", fallback_handler=handler) == set(range(100))
+        assert accelerator.execute_query("SELECT t1.trip_id FROM trips AS t1", limit=5, fallback_handler=handler) == set(range(5))
+        # The stream is closed when the limit ends the iteration
+        assert consumed[-1] == "closed"
+        assert consumed.count("closed") == 2
+        accelerator.postgresql_conn.cursor.assert_not_called()
+
+
+class TestColumnarResults:
+    """Test fetching integer results as NumPy arrays."""
+
+    @pytest.fixture
+    def accelerator(self):
+        import duckdb
+
+        from partitioncache.query_accelerator import DuckDBQueryAccelerator
+
+        accelerator = DuckDBQueryAccelerator(postgresql_connection_params={"host": "localhost"}, duckdb_database_path=":memory:")
+        accelerator.duckdb_conn = duckdb.connect(":memory:")
+        accelerator.duckdb_conn.execute("CREATE TABLE trips AS SELECT range % 3 AS zone, 'z' || (range % 3) AS name FROM range(6)")
+        accelerator.duckdb_conn.execute("INSERT INTO trips VALUES (NULL, NULL)")
+        accelerator._initialized = True
+        yield accelerator
+        accelerator.duckdb_conn.close()
+
+    def test_integer_column_as_array(self, accelerator):
+        np = pytest.importorskip("numpy")
+
+        for timeout in (0, 10):
+            accelerator.query_timeout = timeout
+            result = accelerator.execute_query("SELECT zone FROM trips", columnar=True)
+            assert isinstance(result, np.ndarray)
+            assert result.tolist() == [0, 1, 2]
+
+    def test_non_integer_column_as_set(self, accelerator):
+        assert accelerator.execute_query("SELECT name FROM trips", columnar=True) == {"z0", "z1", "z2", None}
+
+    def test_without_numpy_returns_set(self, accelerator):
+        with patch("partitioncache.query_accelerator.np", None):
+            assert accelerator.execute_query("SELECT zone FROM trips", columnar=True) == {0, 1, 2, None}
+
+    def test_limit_stops_fetching(self, accelerator):
+        accelerator.duckdb_conn.execute("CREATE TABLE large AS SELECT range AS id FROM range(100000)")
+
+        for timeout in (0, 10):
+            accelerator.query_timeout = timeout
+            with patch("partitioncache.query_accelerator._FETCH_CHUNK_SIZE", 1000):
+                result = accelerator.execute_query("SELECT id FROM large", columnar=True, limit=2500)
+            assert isinstance(result, set)
+            assert len(result) == 3000
+
+
 if __name__ == "__main__":
     # Allow running tests directly for development
     pytest.main([__file__, "-v", "--tb=short"])
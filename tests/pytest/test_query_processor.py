@@ -8,6 +8,7 @@ import pytest
 from partitioncache.query_processor import (
     clean_query,
     extract_conjunctive_conditions,
+    extract_table_columns,
     generate_all_query_hash_pairs,
     is_distance_function,
     normalize_distance_conditions,
@@ -376,5 +377,21 @@ class TestIntegrationScenarios:
         assert len(missing) == 0, f"Found {len(missing)} missing hashes when variations enabled"
 
 
+class TestExtractTableColumns:
+    """Test extraction of the columns referenced per table."""
+
+    def test_aliases_resolved_to_tables(self):
+        query = "SELECT t1.trip_id FROM trips AS t1, stops AS t2 WHERE t1.trip_id = t2.trip_id AND t2.name = 'Main' AND t1.duration > 10"
+        assert extract_table_columns(query) == {"trips": {"trip_id", "duration"}, "stops": {"trip_id", "name"}}
+
+    def test_unqualified_columns_attributed_to_all_tables(self):
+        assert extract_table_columns("SELECT t1.id FROM a AS t1, b AS t2 WHERE flag = 1") == {"a": {"id", "flag"}, "b": {"flag"}}
+
+    def test_star_selection(self):
+        assert extract_table_columns("SELECT t1.* FROM a AS t1, b AS t2 WHERE t2.x = 1") == {"a": {"*"}, "b": {"x"}}
+        assert extract_table_columns("SELECT * FROM a WHERE x = 1") == {"a": {"*", "x"}}
+        assert extract_table_columns("SELECT COUNT(*) FROM a WHERE x = 1") == {"a": {"x"}}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
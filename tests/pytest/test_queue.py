@@ -2,6 +2,7 @@
 Unit tests for the queue module.
 """
 
+import asyncio
 import os
 from unittest.mock import Mock, patch
 
@@ -11,12 +12,19 @@ from partitioncache.queue import (
     clear_all_queues,
     clear_original_query_queue,
     clear_query_fragment_queue,
+    close_queue_producer_async,
+    flush_queue_async,
     get_queue_lengths,
     pop_from_original_query_queue,
     pop_from_query_fragment_queue,
+    pop_many_from_query_fragment_queue,
     push_to_original_query_queue,
+    push_to_original_query_queue_async,
     push_to_query_fragment_queue,
+    push_to_query_fragment_queue_async,
+    reset_queue_handler,
 )
+from partitioncache.queue_handler.async_producer import AsyncQueueProducer
 
 
 @pytest.fixture
@@ -156,6 +164,36 @@ class TestQueryFragmentQueue:
         assert result == ("SELECT * FROM table", "test_hash", "test_partition_key", "integer")
         mock_handler.pop_from_query_fragment_queue.assert_called_once()
 
+    @patch("partitioncache.queue._get_queue_handler")
+    def test_pop_many_from_query_fragment_queue(self, mock_get_handler):
+        """Test popping several query fragments at once."""
+        fragments = [("SELECT 1", "hash1", "test_partition_key", "integer"), ("SELECT 2", "hash2", "test_partition_key", "integer")]
+        mock_handler = Mock()
+        mock_handler.pop_many_from_query_fragment_queue.return_value = fragments
+        mock_get_handler.return_value = mock_handler
+
+        assert pop_many_from_query_fragment_queue(4) == fragments
+        mock_handler.pop_many_from_query_fragment_queue.assert_called_once_with(4)
+
+    @patch("partitioncache.queue._get_queue_handler")
+    def test_pop_many_from_query_fragment_queue_error(self, mock_get_handler):
+        """Test that errors during batch pop return an empty list."""
+        mock_handler = Mock()
+        mock_handler.pop_many_from_query_fragment_queue.side_effect = Exception("Queue error")
+        mock_get_handler.return_value = mock_handler
+
+        assert pop_many_from_query_fragment_queue(4) == []
+
+    @patch("partitioncache.queue._get_queue_handler")
+    def test_pop_many_from_query_fragment_queue_with_affinity(self, mock_get_handler):
+        """Test that partition key affinity is passed to the handler."""
+        mock_handler = Mock()
+        mock_handler.pop_many_from_query_fragment_queue.return_value = []
+        mock_get_handler.return_value = mock_handler
+
+        pop_many_from_query_fragment_queue(4, worker_id="host1:1", active_workers=["host1:1", "host2:1"])
+        mock_handler.pop_many_from_query_fragment_queue.assert_called_once_with(4, worker_id="host1:1", active_workers=["host1:1", "host2:1"])
+
 
 
 
@@ -260,3 +298,97 @@ class TestIntegration:
         # Pop from queue
         pop_result = pop_from_query_fragment_queue()
         assert pop_result == ("SELECT * FROM test", "test_hash", test_partition_key, "integer")
+
+
+class TestAsyncQueue:
+    """Test the asyncio producer API."""
+
+    @pytest.fixture(autouse=True)
+    def reset_handler(self):
+        reset_queue_handler()
+        yield
+        reset_queue_handler()
+
+    @patch("partitioncache.queue._get_queue_handler")
+    def test_push_to_original_query_queue_async(self, mock_get_handler):
+        mock_handler = Mock()
+        mock_handler.push_to_original_query_queue.return_value = True
+        mock_get_handler.return_value = mock_handler
+
+        result = asyncio.run(push_to_original_query_queue_async("SELECT 1", "pk", "integer"))
+
+        assert result is True
+        mock_handler.push_to_original_query_queue.assert_called_once_with("SELECT 1", "pk", "integer")
+
+    @patch("partitioncache.queue._get_queue_handler")
+    def test_push_async_error_returns_false(self, mock_get_handler):
+        mock_get_handler.side_effect = ValueError("missing configuration")
+
+        assert asyncio.run(push_to_query_fragment_queue_async([("SELECT 1", "h1")], "pk")) is False
+
+    @patch("partitioncache.queue._get_queue_handler")
+    def test_buffered_pushes_are_flushed_in_batches(self, mock_get_handler):
+        mock_handler = Mock()
+        mock_handler.push_to_original_query_queue.return_value = True
+        mock_handler.push_to_query_fragment_queue.return_value = True
+        mock_get_handler.return_value = mock_handler
+
+        async def run():
+            assert await push_to_original_query_queue_async("SELECT 1", "pk", buffered=True)
+            assert await push_to_query_fragment_queue_async([("q1", "h1")], "pk", buffered=True)
+            assert await push_to_query_fragment_queue_async([("q2", "h2")], "pk", buffered=True)
+            assert await push_to_query_fragment_queue_async([("q3", "h3")], "other", buffered=True)
+            # Buffered pushes return before anything is written
+            assert mock_handler.push_to_query_fragment_queue.call_count == 0
+            await flush_queue_async()
+            await close_queue_producer_async()
+
+        asyncio.run(run())
+
+        mock_handler.push_to_original_query_queue.assert_called_once_with("SELECT 1", "pk", None)
+        # Fragments of the same partition key are merged into a single batch push
+        assert mock_handler.push_to_query_fragment_queue.call_count == 2
+        calls = {c.args[1]: c.args[0] for c in mock_handler.push_to_query_fragment_queue.call_args_list}
+        assert calls == {"pk": [("q1", "h1"), ("q2", "h2")], "other": [("q3", "h3")]}
+
+    def test_producer_drops_when_buffer_full(self):
+        mock_handler = Mock()
+
+        async def run():
+            producer = AsyncQueueProducer(mock_handler, max_buffer_size=1)
+            assert producer.enqueue_original_query("SELECT 1", "pk")
+            assert not producer.enqueue_original_query("SELECT 2", "pk")
+            assert producer.dropped == 1
+            await producer.close()
+
+        asyncio.run(run())
+        mock_handler.push_to_original_query_queue.assert_called_once_with("SELECT 1", "pk", None)
+
+    def test_producer_counts_failed_writes(self):
+        mock_handler = Mock()
+        mock_handler.push_to_query_fragment_queue.return_value = False
+
+        async def run():
+            producer = AsyncQueueProducer(mock_handler)
+            producer.enqueue_query_fragments([("q1", "h1")], "pk")
+            await producer.close()
+            return producer.failed
+
+        assert asyncio.run(run()) == 1
+
+    def test_producer_survives_flush_interval_with_empty_buffer(self):
+        mock_handler = Mock()
+        mock_handler.push_to_query_fragment_queue.return_value = True
+
+        async def run():
+            producer = AsyncQueueProducer(mock_handler, flush_interval=0.01)
+            producer.enqueue_query_fragments([("q1", "h1")], "pk")
+            # The flush interval passes while waiting for more buffered pushes
+            await asyncio.sleep(0.05)
+            assert not producer._flush_task.done()
+            producer.enqueue_query_fragments([("q2", "h2")], "pk")
+            await producer.close()
+            return producer.failed
+
+        assert asyncio.run(run()) == 0
+        assert [c.args[0] for c in mock_handler.push_to_query_fragment_queue.call_args_list] == [[("q1", "h1")], [("q2", "h2")]]
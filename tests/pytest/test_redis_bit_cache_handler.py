@@ -1,3 +1,4 @@
+from array import array
 from unittest.mock import Mock, patch
 
 import pytest
@@ -103,6 +104,23 @@ def test_set_cache_int(cache_handler, mock_redis):
         expected_bitarray[k] = 1
     mock_redis.set.assert_called_with(cache_key, expected_bitarray.to01())
 
+def test_set_cache_integer_array(cache_handler, mock_redis):
+    cache_key = "cache:partition_key:array_bit_key"
+    cache_handler._get_partition_datatype = lambda pk: "integer"
+    cache_handler._get_partition_bitsize = lambda pk: cache_handler.default_bitsize
+    cache_handler.set_cache("array_bit_key", array("q", [1, 2, 3]))
+    expected_bitarray = bitarray(cache_handler.default_bitsize)
+    expected_bitarray.setall(0)
+    for k in {1, 2, 3}:
+        expected_bitarray[k] = 1
+    mock_redis.set.assert_called_with(cache_key, expected_bitarray.to01())
+
+def test_set_cache_negative_integer_array(cache_handler, mock_redis):
+    cache_handler._get_partition_datatype = lambda pk: "integer"
+    cache_handler._get_partition_bitsize = lambda pk: cache_handler.default_bitsize
+    with pytest.raises(ValueError):
+        cache_handler.set_cache("negative_key", array("q", [-1, 2]))
+
 def test_set_cache_invalid_type(cache_handler, mock_redis):
     cache_handler._get_partition_datatype = lambda pk: "integer"
     cache_handler._get_partition_bitsize = lambda pk: cache_handler.default_bitsize
@@ -208,6 +208,28 @@ def test_get_intersected_multiple_keys(cache_handler, mock_redis):
     mock_redis.sinter.assert_called_with(*[k for k, t in zip(cache_keys, [b"set", b"set", b"hash"], strict=False) if t == b"set"])
 
 
+def test_filter_existing_keys_check_query_pipelined(cache_handler, mock_redis):
+    cache_handler._get_partition_datatype = Mock(return_value="integer")
+    # Per key: limit bit, timeout bit, query exists, query status, cache exists
+    states = {
+        "k_timeout": [0, 1, 1, b"timeout", 0],  # timeout bit -> included
+        "k_ok": [0, 0, 1, b"ok", 1],  # ok with cache entry -> included
+        "k_ok_missing": [0, 0, 1, b"ok", 0],  # ok without cache entry -> excluded
+        "k_failed": [0, 0, 1, b"failed", 0],  # failed status in query metadata -> included
+        "k_unknown": [0, 0, 0, None, 0],  # unknown -> excluded
+    }
+    pipe = mock_redis.pipeline.return_value
+    pipelined_keys = []
+    pipe.hget.side_effect = lambda query_key, field: pipelined_keys.append(query_key.rsplit(":", 1)[1])
+    pipe.execute.side_effect = lambda: [value for key in pipelined_keys for value in states[key]]
+
+    existing = cache_handler.filter_existing_keys(set(states), "partition_key", check_query=True)
+
+    assert existing == {"k_timeout", "k_ok", "k_failed"}
+    pipe.execute.assert_called_once()
+    mock_redis.exists.assert_not_called()
+
+
 def test_close(cache_handler, mock_redis):
     cache_handler.close()
     mock_redis.close.assert_called()
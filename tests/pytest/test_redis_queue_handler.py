@@ -0,0 +1,188 @@
+"""
+Tests for the Redis queue handler (deduplicating priority queue on sorted sets and batch pops).
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from partitioncache.queue_handler.abstract import AbstractPriorityQueueHandler, AbstractQueueHandler
+from partitioncache.queue_handler.redis import (
+    CLAIM_SCRIPT,
+    HEARTBEAT_SCRIPT,
+    POP_AFFINITY_SCRIPT,
+    POP_SCRIPT,
+    PUSH_SCRIPT,
+    RELEASE_LEASE_SCRIPT,
+    RedisQueueHandler,
+)
+
+
+@pytest.fixture
+def handler():
+    queue_handler = RedisQueueHandler("localhost", 6379, 0, queue_key="test_queue")
+    client = Mock()
+    scripts = {
+        PUSH_SCRIPT: Mock(return_value=1),
+        POP_SCRIPT: Mock(return_value=[]),
+        CLAIM_SCRIPT: Mock(return_value=None),
+        RELEASE_LEASE_SCRIPT: Mock(return_value=1),
+        POP_AFFINITY_SCRIPT: Mock(return_value=[]),
+        HEARTBEAT_SCRIPT: Mock(return_value=[]),
+    }
+    client.register_script.side_effect = lambda script: scripts[script]
+    queue_handler._redis_client = client
+    queue_handler.scripts = scripts  # type: ignore[attr-defined]
+    return queue_handler
+
+
+def fragment_payload(query, hash_value, partition_datatype="integer"):
+    return json.dumps({"query": query, "hash": hash_value, "partition_key": "pk", "partition_datatype": partition_datatype}).encode()
+
+
+class TestPriorityPush:
+    def test_is_priority_queue_handler(self, handler):
+        assert isinstance(handler, AbstractPriorityQueueHandler)
+
+    def test_push_fragments_keyed_by_hash_and_partition_key(self, handler):
+        assert handler.push_to_query_fragment_queue([("SELECT 1", "hash1"), ("SELECT 2", "hash2")], "pk", "integer")
+
+        push = handler.scripts[PUSH_SCRIPT]
+        push.assert_called_once()
+        assert push.call_args.kwargs["keys"] == ["test_queue_query_fragment", "test_queue_query_fragment_data"]
+        args = push.call_args.kwargs["args"]
+        assert args[0] == 1
+        assert args[1::2] == ["pk:hash1", "pk:hash2"]
+        assert json.loads(args[2]) == {"query": "SELECT 1", "hash": "hash1", "partition_key": "pk", "partition_datatype": "integer"}
+
+    def test_push_with_priority(self, handler):
+        assert handler.push_to_original_query_queue_with_priority("SELECT 1", "pk", priority=5)
+
+        args = handler.scripts[PUSH_SCRIPT].call_args.kwargs["args"]
+        assert args[0] == 5
+        assert args[1].startswith("pk:")
+        # Same query and partition key map to the same member
+        handler.push_to_original_query_queue("SELECT 1", "pk")
+        assert handler.scripts[PUSH_SCRIPT].call_args.kwargs["args"][1] == args[1]
+
+    def test_push_empty_fragments(self, handler):
+        assert handler.push_to_query_fragment_queue([], "pk")
+        handler.scripts[PUSH_SCRIPT].assert_not_called()
+
+    def test_push_error_returns_false(self, handler):
+        handler.scripts[PUSH_SCRIPT].side_effect = Exception("connection lost")
+        assert handler.push_to_query_fragment_queue([("SELECT 1", "hash1")], "pk") is False
+
+
+class TestPop:
+    def test_blocking_pop_claims_payload(self, handler):
+        handler._redis_client.bzpopmax.return_value = (b"test_queue_query_fragment", b"pk:hash1", 3.0)
+        handler.scripts[CLAIM_SCRIPT].return_value = fragment_payload("SELECT 1", "hash1")
+
+        assert handler.pop_from_query_fragment_queue_blocking(timeout=5) == ("SELECT 1", "hash1", "pk", "integer")
+        handler._redis_client.bzpopmax.assert_called_once_with(["test_queue_query_fragment"], timeout=5)
+        assert handler.scripts[CLAIM_SCRIPT].call_args.kwargs["args"] == [b"pk:hash1"]
+
+    def test_pop_timeout(self, handler):
+        handler._redis_client.bzpopmax.return_value = None
+
+        assert handler.pop_from_original_query_queue() is None
+        handler.scripts[CLAIM_SCRIPT].assert_not_called()
+
+    def test_pop_many_fragments_single_script_call(self, handler):
+        handler.scripts[POP_SCRIPT].return_value = [fragment_payload("SELECT 1", "hash1"), fragment_payload("SELECT 2", "hash2", "text")]
+
+        assert handler.pop_many_from_query_fragment_queue(5) == [("SELECT 1", "hash1", "pk", "integer"), ("SELECT 2", "hash2", "pk", "text")]
+        handler.scripts[POP_SCRIPT].assert_called_once_with(keys=["test_queue_query_fragment", "test_queue_query_fragment_data"], args=[5])
+
+    def test_pop_many_original_queries_empty_queue(self, handler):
+        assert handler.pop_many_from_original_query_queue(3) == []
+        assert handler.scripts[POP_SCRIPT].call_args.kwargs["keys"][0] == "test_queue_original_query"
+
+    def test_pop_many_error_returns_empty(self, handler):
+        handler.scripts[POP_SCRIPT].side_effect = Exception("unknown command")
+
+        assert handler.pop_many_from_query_fragment_queue(2) == []
+
+
+class TestLengthsAndClear:
+    def test_get_queue_lengths_uses_zcard(self, handler):
+        handler._redis_client.zcard.side_effect = [2, 7]
+
+        assert handler.get_queue_lengths() == {"original_query_queue": 2, "query_fragment_queue": 7}
+
+    def test_clear_deletes_queue_and_payloads(self, handler):
+        pipeline = handler._redis_client.pipeline.return_value
+        pipeline.execute.return_value = [4, 2]
+
+        assert handler.clear_query_fragment_queue() == 4
+        pipeline.delete.assert_called_once_with("test_queue_query_fragment", "test_queue_query_fragment_data")
+
+
+class TestFragmentLeases:
+    def test_acquire_lease_set_nx_with_expiry(self, handler):
+        handler._redis_client.set.return_value = True
+
+        assert handler.acquire_fragment_lease("hash1", "pk")
+        key, owner = handler._redis_client.set.call_args.args
+        assert key == "test_queue_lease:pk:hash1"
+        assert handler._redis_client.set.call_args.kwargs == {"nx": True, "ex": 3600}
+
+        handler.release_fragment_lease("hash1", "pk")
+        handler.scripts[RELEASE_LEASE_SCRIPT].assert_called_once_with(keys=[key], args=[owner])
+
+    def test_lease_held_elsewhere(self, handler):
+        handler._redis_client.set.return_value = None
+
+        assert handler.acquire_fragment_lease("hash1", "pk") is False
+
+    def test_lease_error_fails_open(self, handler):
+        handler._redis_client.set.side_effect = Exception("connection lost")
+
+        assert handler.acquire_fragment_lease("hash1", "pk") is True
+
+
+class TestWorkerRegistry:
+    def test_heartbeat_returns_active_workers(self, handler):
+        handler.scripts[HEARTBEAT_SCRIPT].return_value = [b"host2:1", b"host1:1"]
+
+        assert handler.heartbeat_worker("host1:1", 30) == ["host1:1", "host2:1"]
+        handler.scripts[HEARTBEAT_SCRIPT].assert_called_once_with(keys=["test_queue_workers"], args=["host1:1", 30])
+
+    def test_heartbeat_error_returns_empty(self, handler):
+        handler.scripts[HEARTBEAT_SCRIPT].side_effect = Exception("connection lost")
+
+        assert handler.heartbeat_worker("host1:1", 30) == []
+
+    def test_unregister_worker(self, handler):
+        handler.unregister_worker("host1:1")
+
+        handler._redis_client.zrem.assert_called_once_with("test_queue_workers", "host1:1")
+
+    def test_pop_with_affinity_uses_affinity_script(self, handler):
+        handler.scripts[POP_AFFINITY_SCRIPT].return_value = [fragment_payload("SELECT 1", "hash1")]
+
+        results = handler.pop_many_from_query_fragment_queue(2, worker_id="host1:1", active_workers=["host1:1", "host2:1"])
+
+        assert results == [("SELECT 1", "hash1", "pk", "integer")]
+        handler.scripts[POP_AFFINITY_SCRIPT].assert_called_once_with(
+            keys=["test_queue_query_fragment", "test_queue_query_fragment_data"], args=[2, 1000, "host1:1", "host1:1", "host2:1"]
+        )
+        handler.scripts[POP_SCRIPT].assert_not_called()
+
+    def test_pop_with_single_worker_skips_affinity(self, handler):
+        handler.pop_many_from_query_fragment_queue(2, worker_id="host1:1", active_workers=["host1:1"])
+
+        handler.scripts[POP_SCRIPT].assert_called_once()
+        handler.scripts[POP_AFFINITY_SCRIPT].assert_not_called()
+
+
+class TestDefaultPopMany:
+    def test_default_pops_until_empty(self):
+        with patch.multiple(AbstractQueueHandler, __abstractmethods__=frozenset()):
+            queue_handler = AbstractQueueHandler()  # type: ignore[abstract]
+        queue_handler.pop_from_query_fragment_queue = Mock(side_effect=[("SELECT 1", "hash1", "pk", "integer"), None])  # type: ignore[method-assign]
+
+        assert queue_handler.pop_many_from_query_fragment_queue(3) == [("SELECT 1", "hash1", "pk", "integer")]
+        assert queue_handler.pop_from_query_fragment_queue.call_count == 2
@@ -1,3 +1,4 @@
+from array import array
 from unittest.mock import Mock, patch
 
 import pytest
@@ -163,6 +164,14 @@ def test_set_cache_from_bitarray(cache_handler, mock_redis):
     assert stored_bm == BitMap([1, 3])
 
 
+def test_set_cache_from_integer_array(cache_handler, mock_redis):
+    cache_handler._get_partition_datatype = lambda pk: "integer"
+    cache_handler.set_cache("array_key", array("q", [5, 7, 70000]))
+    call_args = mock_redis.set.call_args
+    stored_bm = BitMap.deserialize(call_args[0][1])
+    assert stored_bm == BitMap([5, 7, 70000])
+
+
 def test_set_cache_invalid_type(cache_handler, mock_redis):
     cache_handler._get_partition_datatype = lambda pk: "integer"
     with pytest.raises(ValueError, match="Only integer values"):
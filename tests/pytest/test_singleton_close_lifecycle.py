@@ -15,6 +15,7 @@ def reset_singleton_state():
     PostgreSQLArrayCacheHandler._instance = None
     PostgreSQLArrayCacheHandler._refcount = 0
     DuckDBBitCacheHandler._instance = None
+    DuckDBBitCacheHandler._instance_config = {}
     DuckDBBitCacheHandler._refcount = 0
     RocksDictCacheHandler._instance = None
     RocksDictCacheHandler._refcount = 0
@@ -27,6 +28,7 @@ def reset_singleton_state():
     PostgreSQLArrayCacheHandler._instance = None
     PostgreSQLArrayCacheHandler._refcount = 0
     DuckDBBitCacheHandler._instance = None
+    DuckDBBitCacheHandler._instance_config = {}
     DuckDBBitCacheHandler._refcount = 0
     RocksDictCacheHandler._instance = None
     RocksDictCacheHandler._refcount = 0
@@ -116,6 +118,26 @@ def test_duckdb_close_non_singleton_does_not_affect_singleton_refcount():
         assert DuckDBBitCacheHandler._refcount == 0
 
 
+def test_duckdb_instance_requires_same_configuration():
+    with patch("duckdb.connect", side_effect=lambda *args, **kwargs: Mock()):
+        singleton = DuckDBBitCacheHandler.get_instance(database="cache.duckdb", table_prefix="pc", bitsize=64)
+
+        # The same configuration passed positionally or with explicit defaults shares the instance
+        assert DuckDBBitCacheHandler.get_instance("cache.duckdb", "pc", 64, read_only=False) is singleton
+        with pytest.raises(ValueError, match="read_only"):
+            DuckDBBitCacheHandler.get_instance(database="cache.duckdb", table_prefix="pc", bitsize=64, read_only=True)
+        with pytest.raises(ValueError, match="database, table_prefix"):
+            DuckDBBitCacheHandler.get_instance(database="other.duckdb", table_prefix="other", bitsize=64)
+        assert DuckDBBitCacheHandler._refcount == 2
+
+        singleton.close()
+        singleton.close()
+        # Once closed, the shared instance can be created with another configuration
+        other = DuckDBBitCacheHandler.get_instance(database="other.duckdb", table_prefix="pc", bitsize=64)
+        assert other is not singleton
+        other.close()
+
+
 def test_rocksdict_close_non_singleton_does_not_affect_singleton_refcount(tmp_path):
     singleton_db = Mock()
     non_singleton_db = Mock()